@@ -0,0 +1,229 @@
+"""Columnar container for normalised ``Indicator`` rows.
+
+``normalise_to_indicator`` hands ``IndicatorBatch`` objects to the load
+tasks instead of object-dtype ``DataFrame`` objects.  Seven of the nine
+``Indicator`` columns repeat a handful of strings across thousands of rows,
+so a batch dictionary-encodes them.
+
+Design notes
+------------
+* String columns are ``pd.Categorical``: small integer codes plus one copy
+  of each distinct string.  ``value`` is a ``float64`` array with an
+  explicit null mask and ``reference_period`` a ``datetime64[D]`` array.
+* ``concat`` unions the categories and concatenates the arrays — no string
+  is re-hashed per row.
+* ``to_arrow`` maps categoricals to Arrow dictionary arrays over the same
+  codes, the null mask to the validity bitmap and periods to ``date32``;
+  ``ArrowSerializer`` stores batches this way between tasks.  ``from_arrow``
+  maps them straight back (``Categorical.from_codes`` over the indices and
+  dictionaries), never materialising the strings per row.
+* ``iter_parameter_rows`` builds the DB-API parameter tuples for the
+  staging insert chunk by chunk, looking strings up in the categories, so
+  every row of a chunk shares the same Python string objects and the
+  object-dtype frame the upsert used to build is never materialised.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass
+from datetime import date
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+from pandas.api.types import union_categoricals
+
+#: ``Indicator`` columns held as dictionary-encoded strings.
+STRING_COLUMNS: tuple[str, ...] = (
+    "indicator_id",
+    "indicator_name",
+    "lad_code",
+    "lad_name",
+    "unit",
+    "source",
+    "dataset_code",
+)
+
+#: Column order of ``to_frame`` / ``to_arrow`` and of the parameter rows —
+#: the same as ``db.upsert.INDICATOR_COLUMNS``.
+COLUMNS: tuple[str, ...] = (
+    "indicator_id",
+    "indicator_name",
+    "lad_code",
+    "lad_name",
+    "reference_period",
+    "value",
+    "unit",
+    "source",
+    "dataset_code",
+)
+
+
+@dataclass(frozen=True, eq=False)
+class IndicatorBatch:
+    """Normalised ``Indicator`` rows stored column by column.
+
+    Build with ``from_frame`` or ``from_arrow``; every array has one entry
+    per row.
+    """
+
+    strings: dict[str, pd.Categorical]
+    """One categorical per name in ``STRING_COLUMNS``."""
+
+    reference_period: npt.NDArray[np.datetime64]
+    """``datetime64[D]`` periods."""
+
+    value: npt.NDArray[np.float64]
+    """Values; entries under ``value_missing`` are ``NaN``."""
+
+    value_missing: npt.NDArray[np.bool_]
+    """Null mask for ``value``."""
+
+    def __post_init__(self) -> None:
+        lengths = {len(array) for array in self.strings.values()}
+        lengths |= {len(self.reference_period), len(self.value), len(self.value_missing)}
+        if len(lengths) > 1 or set(self.strings) != set(STRING_COLUMNS):
+            raise ValueError("IndicatorBatch columns must all be present with equal length")
+
+    # -- construction ------------------------------------------------------
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> IndicatorBatch:
+        """Encode a ``DataFrame`` with the ``Indicator`` columns.
+
+        Raises:
+            ValueError: If any of ``COLUMNS`` is missing from ``df``.
+        """
+        missing = [col for col in COLUMNS if col not in df.columns]
+        if missing:
+            raise ValueError(f"DataFrame is missing Indicator columns: {missing}")
+        value = pd.to_numeric(df["value"], errors="coerce").to_numpy(
+            dtype=np.float64, na_value=np.nan
+        )
+        return cls(
+            strings={col: pd.Categorical(df[col]) for col in STRING_COLUMNS},
+            reference_period=pd.to_datetime(df["reference_period"]).to_numpy(dtype="datetime64[D]"),
+            value=value,
+            value_missing=np.isnan(value),
+        )
+
+    @classmethod
+    def from_arrow(cls, table: pa.Table) -> IndicatorBatch:
+        """Decode a table written by ``to_arrow``, without going through a ``DataFrame``.
+
+        Categoricals are built from the dictionary arrays' indices and
+        dictionaries, so no string is decoded per row; ``value`` and its mask
+        come from the value buffer and the validity bitmap.
+        """
+        strings = {}
+        for col in STRING_COLUMNS:
+            array = table.column(col).combine_chunks()
+            if not pa.types.is_dictionary(array.type):
+                array = array.dictionary_encode()
+            codes = pc.fill_null(array.indices, -1).to_numpy(zero_copy_only=False)
+            strings[col] = pd.Categorical.from_codes(
+                codes, categories=pd.Index(array.dictionary.to_pandas())
+            )
+        periods = table.column("reference_period").combine_chunks()
+        values = table.column("value").combine_chunks()
+        return cls(
+            strings=strings,
+            reference_period=periods.to_numpy(zero_copy_only=False).astype("datetime64[D]"),
+            value=pc.fill_null(values, np.nan).to_numpy(zero_copy_only=False),
+            value_missing=values.is_null().to_numpy(zero_copy_only=False),
+        )
+
+    @classmethod
+    def concat(cls, batches: Sequence[IndicatorBatch]) -> IndicatorBatch:
+        """Concatenate batches, unioning each string column's categories."""
+        if not batches:
+            return cls.from_frame(pd.DataFrame({col: [] for col in COLUMNS}))
+        return cls(
+            strings={
+                col: union_categoricals([b.strings[col] for b in batches], ignore_order=True)
+                for col in STRING_COLUMNS
+            },
+            reference_period=np.concatenate([b.reference_period for b in batches]),
+            value=np.concatenate([b.value for b in batches]),
+            value_missing=np.concatenate([b.value_missing for b in batches]),
+        )
+
+    # -- inspection --------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self.value)
+
+    @property
+    def max_reference_period(self) -> date | None:
+        """Latest period in the batch, or ``None`` when it is empty."""
+        if not len(self):
+            return None
+        latest: date = self.reference_period.max().astype(object)
+        return latest
+
+    # -- selection ---------------------------------------------------------
+
+    def take(self, indices: npt.ArrayLike) -> IndicatorBatch:
+        """Return the rows at ``indices`` (categories are kept as they are)."""
+        positions = np.asarray(indices, dtype=np.intp)
+        return IndicatorBatch(
+            strings={col: cat.take(positions) for col, cat in self.strings.items()},
+            reference_period=self.reference_period[positions],
+            value=self.value[positions],
+            value_missing=self.value_missing[positions],
+        )
+
+    def drop_duplicate_keys(self) -> IndicatorBatch:
+        """Keep the last row per ``(indicator_id, lad_code, reference_period)``."""
+        keys = pd.DataFrame(
+            {
+                "indicator_id": self.strings["indicator_id"].codes,
+                "lad_code": self.strings["lad_code"].codes,
+                "reference_period": self.reference_period.view(np.int64),
+            }
+        )
+        duplicated = keys.duplicated(keep="last").to_numpy()
+        return self if not duplicated.any() else self.take(np.flatnonzero(~duplicated))
+
+    # -- conversion --------------------------------------------------------
+
+    def to_frame(self) -> pd.DataFrame:
+        """Return a ``DataFrame`` with categorical string columns."""
+        data: dict[str, Any] = {col: self.strings[col] for col in STRING_COLUMNS}
+        data["reference_period"] = self.reference_period
+        data["value"] = self.value
+        return pd.DataFrame(data)[list(COLUMNS)]
+
+    def to_arrow(self) -> pa.Table:
+        """Return an Arrow table with dictionary-encoded string columns."""
+        arrays = {col: pa.array(self.strings[col]) for col in STRING_COLUMNS}
+        arrays["reference_period"] = pa.array(self.reference_period)
+        arrays["value"] = pa.array(self.value, mask=self.value_missing)
+        return pa.table({col: arrays[col] for col in COLUMNS})
+
+    def iter_parameter_rows(self, chunk_size: int) -> Iterator[list[tuple[Any, ...]]]:
+        """Yield DB-API parameter tuples in ``COLUMNS`` order, ``chunk_size`` rows at a time.
+
+        Missing strings and values become ``None`` and periods
+        ``datetime.date``.
+        """
+        lookups = {
+            col: np.append(cat.categories.to_numpy(dtype=object), np.array([None], dtype=object))
+            for col, cat in self.strings.items()
+        }
+        for start in range(0, len(self), chunk_size):
+            stop = min(start + chunk_size, len(self))
+            columns: dict[str, npt.NDArray[np.object_]] = {
+                # Code -1 (missing) indexes the trailing ``None``.
+                col: lookups[col][self.strings[col].codes[start:stop]]
+                for col in STRING_COLUMNS
+            }
+            columns["reference_period"] = self.reference_period[start:stop].astype(object)
+            value = self.value[start:stop].astype(object)
+            value[self.value_missing[start:stop]] = None
+            columns["value"] = value
+            yield list(zip(*(columns[col] for col in COLUMNS), strict=True))
@@ -12,6 +12,12 @@ Design notes
   reference_period)`` — this triple is the upsert key used by load tasks.
 * ``GeoLookup`` maps LSOA codes → MSOA → LAD → Region, matching the ONS
   December 2021 geography release used throughout the project.
+* ``GeoCrosswalk`` holds weighted old → new code mappings for boundary
+  changes (e.g. the 2023 North Yorkshire districts → ``E06000065``), used to
+  re-base history onto the current geography.
+* ``DatasetMetadata`` doubles as the incremental-extraction watermark store:
+  successful runs record ``release_id`` and ``max_reference_period``, indexed
+  by ``(source, dataset_code)``.
 """
 
 from __future__ import annotations
@@ -20,9 +26,11 @@ import enum
 from datetime import date, datetime
 
 from sqlalchemy import (
+    BigInteger,
     Date,
     DateTime,
     Enum,
+    Float,
     Index,
     MetaData,
     String,
@@ -158,17 +166,54 @@ class DatasetMetadata(Base):
     rows_extracted: Mapped[int | None] = mapped_column(nullable=True)
     rows_loaded: Mapped[int | None] = mapped_column(nullable=True)
 
+    rows_inserted: Mapped[int | None] = mapped_column(nullable=True)
+    """Rows of ``rows_loaded`` whose upsert key was new."""
+
+    rows_updated: Mapped[int | None] = mapped_column(nullable=True)
+    """Rows of ``rows_loaded`` that rewrote an existing row."""
+
+    rows_unchanged: Mapped[int | None] = mapped_column(nullable=True)
+    """Rows skipped by a delta load because their content was unchanged."""
+
     error_message: Mapped[str | None] = mapped_column(Text, nullable=True)
     """Truncated exception message on failure."""
 
     source_url: Mapped[str | None] = mapped_column(Text, nullable=True)
     """API endpoint or file URL that was fetched."""
 
+    release_id: Mapped[str | None] = mapped_column(String(100), nullable=True)
+    """Source release identifier loaded by this run (e.g. publication date,
+    ETag or API dataset version).  Part of the incremental-extraction watermark."""
+
+    max_reference_period: Mapped[date | None] = mapped_column(Date, nullable=True)
+    """Latest ``Indicator.reference_period`` loaded by this run.  Extract tasks
+    only request periods after the highest value across successful runs."""
+
     extracted_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
     loaded_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
 
+    extract_seconds: Mapped[float | None] = mapped_column(nullable=True)
+    """Wall time of this run's extract tasks (see ``utils.instrumentation``)."""
+
+    transform_seconds: Mapped[float | None] = mapped_column(nullable=True)
+    load_seconds: Mapped[float | None] = mapped_column(nullable=True)
+
+    cpu_seconds: Mapped[float | None] = mapped_column(nullable=True)
+    """CPU time across all instrumented tasks of the run."""
+
+    peak_memory_bytes: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    """Highest peak memory reported by any stage."""
+
+    bytes_downloaded: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    http_requests: Mapped[int | None] = mapped_column(nullable=True)
+
+    stage_metrics: Mapped[str | None] = mapped_column(Text, nullable=True)
+    """JSON list of per-stage metrics (timings, rows/sec, memory, HTTP)."""
+
     created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.utcnow)
 
+    __table_args__ = (Index("ix_dataset_metadata_source_dataset", "source", "dataset_code"),)
+
 
 class GeoLookup(Base):
     """ONS geography hierarchy: LSOA → MSOA → LAD → Region.
@@ -205,3 +250,37 @@ class GeoLookup(Base):
         Index("ix_geo_lookup_lad_code", "lad_code"),
         Index("ix_geo_lookup_msoa_code", "msoa_code"),
     )
+
+
+class GeoCrosswalk(Base):
+    """Weighted mapping from abolished or superseded areas to current ones.
+
+    One row per ``(level, from_code, to_code)`` pair.  ``weight`` is the share
+    of the old area's counts allocated to the new area, so the weights of
+    each ``from_code`` sum to 1 — a district absorbed whole into a unitary
+    authority has a single row of weight 1.
+    """
+
+    __tablename__ = "geo_crosswalk"
+
+    level: Mapped[str] = mapped_column(String(10), primary_key=True)
+    """Geography level of both codes: ``"lad"`` or ``"lsoa"``."""
+
+    from_code: Mapped[str] = mapped_column(String(9), primary_key=True)
+    """GSS code on the old boundaries, e.g. ``"E07000163"`` (Craven)."""
+
+    to_code: Mapped[str] = mapped_column(String(9), primary_key=True)
+    """GSS code on the current boundaries, e.g. ``"E06000065"``."""
+
+    to_name: Mapped[str] = mapped_column(String(100), nullable=False)
+
+    weight: Mapped[float] = mapped_column(Float, nullable=False)
+    """Share of ``from_code``'s counts allocated to ``to_code`` (0-1]."""
+
+    weight_basis: Mapped[str | None] = mapped_column(String(100), nullable=True)
+    """How the weight was derived, e.g. ``"whole area"`` or ``"population 2021"``."""
+
+    effective_from: Mapped[date | None] = mapped_column(Date, nullable=True)
+    """Date the boundary change took effect."""
+
+    __table_args__ = (Index("ix_geo_crosswalk_to_code", "level", "to_code"),)
@@ -0,0 +1,155 @@
+"""Process-wide SQLAlchemy engine and session registry for the warehouse.
+
+Load tasks, ``get_geo_lookup``, the watermark and crosswalk readers and
+``write_metadata`` all connect through one pooled ``Engine`` per connection
+string.  Connection setup — an ODBC / TLS handshake and login for SQL
+Server — is then paid once per pooled connection rather than on every task
+call, and the number of connections a worker holds on the warehouse is
+bounded by its pool.
+
+Design notes
+------------
+* Engines are created lazily on first use and cached by connection string;
+  the registry is guarded by a lock so concurrent tasks never build
+  duplicates.  ``Engine`` itself is safe to share between threads.
+* Pool size, overflow, checkout timeout, recycling and ``pool_pre_ping``
+  come from the ``db_*`` fields of ``Settings``.  Each process opens at most
+  ``db_pool_size + db_max_overflow`` connections; tasks beyond that wait up
+  to ``db_pool_timeout_seconds`` for one.
+* ``mssql+pyodbc`` engines are created with ``fast_executemany=True`` so
+  every ``executemany`` uses ODBC array binding, not only the bulk upsert's
+  staging insert.
+* In-memory SQLite (the local stand-in) uses SQLAlchemy's per-thread pool,
+  which takes no sizing options; file-backed SQLite gets the normal pool.
+* ``warm_up_engine`` opens ``Settings.db_warm_up_connections`` connections
+  and returns them to the pool, so the first load tasks of a flow find
+  them ready.  It is a no-op when warm-up is disabled.
+* ``dispose_engines`` closes every pool; it is registered with ``atexit``
+  and is also useful in tests or after changing ``Settings`` at runtime.
+"""
+
+from __future__ import annotations
+
+import atexit
+import threading
+from contextlib import ExitStack
+from typing import Any
+
+from sqlalchemy import Engine, create_engine, make_url
+from sqlalchemy.orm import Session, sessionmaker
+
+from yhovi_pipeline.config import Settings, get_settings
+from yhovi_pipeline.utils.logging import get_logger
+
+_engines: dict[str, Engine] = {}
+_sessions: dict[str, sessionmaker[Session]] = {}
+_registry_lock = threading.Lock()
+
+
+# ---------------------------------------------------------------------------
+# Registry
+# ---------------------------------------------------------------------------
+
+
+def get_engine(connection_string: str | None = None) -> Engine:
+    """Return the shared, pooled ``Engine`` for a warehouse connection string.
+
+    Args:
+        connection_string: SQLAlchemy URL; defaults to
+            ``Settings.sql_server_connection_string``.
+
+    Returns:
+        The process-wide engine for that URL, built from ``Settings`` on
+        first use.
+    """
+    settings = get_settings()
+    url = _resolve(connection_string, settings)
+    engine = _engines.get(url)
+    if engine is not None:
+        return engine
+
+    with _registry_lock:
+        engine = _engines.get(url)
+        if engine is None:
+            engine = create_engine(url, **_engine_options(url, settings))
+            _engines[url] = engine
+            _sessions[url] = sessionmaker(engine, expire_on_commit=False)
+        return engine
+
+
+def get_sessionmaker(connection_string: str | None = None) -> sessionmaker[Session]:
+    """Return the ``sessionmaker`` bound to ``get_engine(connection_string)``.
+
+    Use as ``with get_sessionmaker().begin() as session: ...`` for a
+    session in its own transaction.
+    """
+    url = _resolve(connection_string, get_settings())
+    get_engine(url)
+    return _sessions[url]
+
+
+def warm_up_engine(connections: int | None = None, connection_string: str | None = None) -> int:
+    """Open pooled connections ahead of the first load task.
+
+    All connections are checked out at once (so the pool really holds that
+    many) and then returned.
+
+    Args:
+        connections: How many to open; defaults to
+            ``Settings.db_warm_up_connections`` and is capped at
+            ``Settings.db_pool_size``.
+        connection_string: SQLAlchemy URL; defaults to the warehouse.
+
+    Returns:
+        The number of connections opened.
+    """
+    settings = get_settings()
+    wanted = settings.db_warm_up_connections if connections is None else connections
+    wanted = min(wanted, settings.db_pool_size)
+    if wanted <= 0:
+        return 0
+
+    engine = get_engine(connection_string)
+    with ExitStack() as stack:
+        for _ in range(wanted):
+            stack.enter_context(engine.connect())
+    get_logger(__name__).debug("Warmed up %d warehouse connection(s)", wanted)
+    return wanted
+
+
+def dispose_engines() -> None:
+    """Close every pooled engine and empty the registry."""
+    with _registry_lock:
+        for engine in _engines.values():
+            engine.dispose()
+        _engines.clear()
+        _sessions.clear()
+
+
+# ---------------------------------------------------------------------------
+# Internals
+# ---------------------------------------------------------------------------
+
+
+def _resolve(connection_string: str | None, settings: Settings) -> str:
+    return connection_string or settings.sql_server_connection_string.get_secret_value()
+
+
+def _engine_options(url: str, settings: Settings) -> dict[str, Any]:
+    """Return the ``create_engine`` keyword arguments for ``url``."""
+    parsed = make_url(url)
+    options: dict[str, Any] = {"pool_pre_ping": settings.db_pool_pre_ping}
+    in_memory = parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:")
+    if not in_memory:
+        options.update(
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout_seconds,
+            pool_recycle=settings.db_pool_recycle_seconds,
+        )
+    if parsed.get_backend_name() == "mssql" and parsed.get_driver_name() == "pyodbc":
+        options["fast_executemany"] = True
+    return options
+
+
+atexit.register(dispose_engines)
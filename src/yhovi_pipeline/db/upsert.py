@@ -0,0 +1,364 @@
+"""Set-based bulk upsert engine for the ``indicator`` fact table.
+
+Design notes
+------------
+* Rows are streamed in chunks into a session-scoped staging table and then
+  merged into ``indicator`` with a single set-based statement, so the cost of
+  a load is one round trip per chunk plus one merge — never one per row.
+* SQL Server uses a ``#indicator_stage`` temp table, pyodbc
+  ``fast_executemany`` array binding and a ``MERGE ... WITH (HOLDLOCK)``
+  driven by the ``ix_indicator_upsert_key`` unique index.
+* SQLite is supported as a local stand-in dialect (``TEMP`` staging table +
+  ``INSERT ... ON CONFLICT DO UPDATE``) so the engine can be tested and
+  benchmarked without a SQL Server instance.
+* Input is an ``IndicatorBatch`` (see ``db.batch``); a ``DataFrame`` is
+  encoded into one first.  Staging rows are built from the batch chunk by
+  chunk, never as a full object-dtype frame.
+* Delta mode hashes the value-bearing columns of each incoming row, compares
+  them with a bulk-fetched snapshot of the matching warehouse rows and only
+  stages inserts and genuine changes, so re-delivered history does not
+  rewrite rows or churn ``updated_at``.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import (
+    Column,
+    Connection,
+    DateTime,
+    MetaData,
+    Table,
+    and_,
+    bindparam,
+    func,
+    select,
+    text,
+)
+
+from yhovi_pipeline.db.batch import IndicatorBatch
+from yhovi_pipeline.db.models import Indicator
+
+# ---------------------------------------------------------------------------
+# Constants
+# ---------------------------------------------------------------------------
+
+#: Columns written by the load tasks (``id`` and audit timestamps are managed
+#: by the database / the merge statement).
+INDICATOR_COLUMNS: tuple[str, ...] = (
+    "indicator_id",
+    "indicator_name",
+    "lad_code",
+    "lad_name",
+    "reference_period",
+    "value",
+    "unit",
+    "source",
+    "dataset_code",
+)
+
+#: The natural key backing ``ix_indicator_upsert_key``.
+UPSERT_KEY: tuple[str, ...] = ("indicator_id", "lad_code", "reference_period")
+
+#: Value-bearing columns whose content hash decides whether a row changed.
+HASH_COLUMNS: tuple[str, ...] = ("value", "unit", "indicator_name", "lad_name", "source")
+
+#: Default number of rows bound per staging round trip.
+DEFAULT_CHUNK_SIZE: int = 10_000
+
+_SUPPORTED_DIALECTS: frozenset[str] = frozenset({"mssql", "sqlite"})
+
+#: Maximum ``IN (...)`` list length per snapshot query — keeps well clear of
+#: SQL Server's 2,100 bound-parameter limit.
+_SNAPSHOT_BATCH_SIZE: int = 500
+
+#: Stand-in for ``NULL`` string values when hashing (never a legitimate value).
+_NULL_TOKEN: str = "\x00"
+
+
+# ---------------------------------------------------------------------------
+# Result type
+# ---------------------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class UpsertResult:
+    """Row counts produced by a single bulk upsert."""
+
+    inserted: int = 0
+    """Rows whose upsert key was not yet in ``indicator``."""
+
+    updated: int = 0
+    """Existing rows that were rewritten."""
+
+    unchanged: int = 0
+    """Rows skipped by delta mode because their content hash matched."""
+
+    max_reference_period: date | None = field(default=None, compare=False)
+    """Latest ``reference_period`` in the loaded frame (unchanged rows
+    included) — what ``write_metadata`` records to advance the watermark."""
+
+    @property
+    def rows_loaded(self) -> int:
+        """Rows actually written — the value recorded as ``DatasetMetadata.rows_loaded``."""
+        return self.inserted + self.updated
+
+    def __add__(self, other: UpsertResult) -> UpsertResult:
+        """Combine the results of two loads (e.g. consecutive streamed batches)."""
+        periods = [p for p in (self.max_reference_period, other.max_reference_period) if p]
+        return UpsertResult(
+            inserted=self.inserted + other.inserted,
+            updated=self.updated + other.updated,
+            unchanged=self.unchanged + other.unchanged,
+            max_reference_period=max(periods, default=None),
+        )
+
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+
+
+def bulk_upsert_indicators(
+    connection: Connection,
+    df: pd.DataFrame | IndicatorBatch,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    *,
+    delta: bool = False,
+) -> UpsertResult:
+    """Upsert a normalised ``Indicator`` DataFrame in one set-based merge.
+
+    The caller owns the transaction: the staging table and the merge run on
+    ``connection`` and are committed (or rolled back) with it.
+
+    Args:
+        connection: Open SQLAlchemy connection to a SQL Server or SQLite
+            database containing the ``indicator`` table.
+        df: Batch, or DataFrame with (at least) the columns in
+            ``INDICATOR_COLUMNS``.  Rows sharing an upsert key are
+            collapsed, keeping the last one.
+        chunk_size: Number of rows bound per staging round trip.
+        delta: When ``True``, rows whose ``HASH_COLUMNS`` match the stored
+            row are skipped instead of rewritten.
+
+    Returns:
+        Inserted / updated / unchanged row counts.
+
+    Raises:
+        ValueError: If required columns are missing, ``chunk_size`` is not
+            positive, or the connection's dialect is not supported.
+    """
+    if chunk_size <= 0:
+        raise ValueError(f"chunk_size must be positive, got {chunk_size}")
+
+    dialect = connection.dialect.name
+    if dialect not in _SUPPORTED_DIALECTS:
+        raise ValueError(f"Bulk upsert does not support the {dialect!r} dialect")
+
+    batch = df if isinstance(df, IndicatorBatch) else IndicatorBatch.from_frame(df)
+    batch = batch.drop_duplicate_keys()
+    max_period = batch.max_reference_period
+    unchanged = 0
+    if delta and len(batch):
+        frame = prepare_indicator_frame(batch.to_frame())
+        changed = _changed_rows(frame, _fetch_snapshot(connection, frame)).to_numpy()
+        unchanged = len(batch) - int(changed.sum())
+        batch = batch.take(np.flatnonzero(changed))
+    if not len(batch):
+        return UpsertResult(unchanged=unchanged, max_reference_period=max_period)
+
+    stage = _staging_table(dialect)
+    stage.drop(connection, checkfirst=True)
+    stage.create(connection)
+    try:
+        _stage_rows(connection, stage, batch, chunk_size)
+        updated = _count_matched(connection, stage)
+        _merge_from_stage(connection, stage)
+    finally:
+        stage.drop(connection)
+
+    return UpsertResult(
+        inserted=len(batch) - updated,
+        updated=updated,
+        unchanged=unchanged,
+        max_reference_period=max_period,
+    )
+
+
+def prepare_indicator_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Coerce a normalised DataFrame into DB-API ready staging rows.
+
+    Selects ``INDICATOR_COLUMNS`` in order, drops duplicate upsert keys
+    (last one wins — a MERGE source must not match a target row twice),
+    converts ``reference_period`` to ``datetime.date`` and replaces every
+    missing value with ``None``.
+
+    Args:
+        df: DataFrame with (at least) the columns in ``INDICATOR_COLUMNS``.
+
+    Returns:
+        Object-dtype DataFrame with exactly the ``INDICATOR_COLUMNS`` columns.
+
+    Raises:
+        ValueError: If any of ``INDICATOR_COLUMNS`` is missing from ``df``.
+    """
+    missing = [col for col in INDICATOR_COLUMNS if col not in df.columns]
+    if missing:
+        raise ValueError(f"DataFrame is missing Indicator columns: {missing}")
+
+    frame = df.loc[:, list(INDICATOR_COLUMNS)].drop_duplicates(subset=list(UPSERT_KEY), keep="last")
+    frame = frame.assign(
+        reference_period=pd.to_datetime(frame["reference_period"]).dt.date,
+        value=pd.to_numeric(frame["value"], errors="coerce"),
+    )
+    frame = frame.astype(object)
+    return frame.where(frame.notna(), None).reset_index(drop=True)
+
+
+def content_hash(df: pd.DataFrame) -> pd.Series:
+    """Return a deterministic 64-bit hash of each row's ``HASH_COLUMNS``.
+
+    Values are normalised first (``value`` to ``float64``, missing strings to
+    a sentinel) so rows built by a transform and rows read back from the
+    warehouse hash identically.
+
+    Args:
+        df: DataFrame containing every column in ``HASH_COLUMNS``.
+
+    Returns:
+        ``uint64`` Series aligned with ``df``'s index.
+    """
+    normalised = pd.DataFrame(
+        {
+            col: (
+                pd.to_numeric(df[col], errors="coerce").astype("float64")
+                if col == "value"
+                else df[col].astype(object).where(df[col].notna(), _NULL_TOKEN)
+            )
+            for col in HASH_COLUMNS
+        },
+        index=df.index,
+    )
+    return pd.util.hash_pandas_object(normalised, index=False)
+
+
+# ---------------------------------------------------------------------------
+# Internals
+# ---------------------------------------------------------------------------
+
+
+def _fetch_snapshot(connection: Connection, frame: pd.DataFrame) -> pd.DataFrame:
+    """Bulk-fetch the stored key + hash columns for the rows in ``frame``.
+
+    The query is bounded by the incoming indicator ids and reference period
+    range so it stays an index seek on ``ix_indicator_upsert_key``.
+    """
+    table = Indicator.__table__
+    columns = [table.c[col] for col in (*UPSERT_KEY, *HASH_COLUMNS)]
+    period_filter = table.c.reference_period.between(
+        frame["reference_period"].min(), frame["reference_period"].max()
+    )
+    indicator_ids = sorted(frame["indicator_id"].unique())
+
+    rows: list[tuple[object, ...]] = []
+    for start in range(0, len(indicator_ids), _SNAPSHOT_BATCH_SIZE):
+        batch = indicator_ids[start : start + _SNAPSHOT_BATCH_SIZE]
+        query = select(*columns).where(and_(table.c.indicator_id.in_(batch), period_filter))
+        rows.extend(tuple(row) for row in connection.execute(query))
+
+    return pd.DataFrame(rows, columns=[*UPSERT_KEY, *HASH_COLUMNS], dtype=object)
+
+
+def _changed_rows(frame: pd.DataFrame, snapshot: pd.DataFrame) -> pd.Series:
+    """Return a boolean mask of ``frame`` rows that are new or changed."""
+    # Joining on key *and* hash means a match is exactly an unchanged row.
+    on = [*UPSERT_KEY, "_hash"]
+    incoming = frame[list(UPSERT_KEY)].assign(_hash=content_hash(frame).to_numpy())
+    stored = snapshot[list(UPSERT_KEY)].assign(_hash=content_hash(snapshot).to_numpy())
+    joined = incoming.merge(stored, on=on, how="left", indicator=True, validate="one_to_one")
+    return pd.Series((joined["_merge"] == "left_only").to_numpy(), index=frame.index)
+
+
+def _count_matched(connection: Connection, stage: Table) -> int:
+    """Count staged rows whose upsert key already exists in ``indicator``."""
+    table = Indicator.__table__
+    on_clause = and_(*(table.c[col] == stage.c[col] for col in UPSERT_KEY))
+    query = select(func.count()).select_from(stage.join(table, on_clause))
+    return int(connection.scalar(query) or 0)
+
+
+def _staging_table(dialect: str) -> Table:
+    """Build the session-scoped staging table definition for ``dialect``."""
+    columns = [
+        Column(col.name, col.type, nullable=col.nullable)
+        for col in Indicator.__table__.columns
+        if col.name in INDICATOR_COLUMNS
+    ]
+    if dialect == "mssql":
+        # A leading ``#`` makes SQL Server scope the table to this session.
+        return Table("#indicator_stage", MetaData(), *columns)
+    return Table("indicator_stage", MetaData(), *columns, prefixes=["TEMPORARY"])
+
+
+def _stage_rows(
+    connection: Connection,
+    stage: Table,
+    batch: IndicatorBatch,
+    chunk_size: int,
+) -> None:
+    """Insert ``batch`` into the staging table, one round trip per chunk."""
+    if connection.dialect.name == "mssql" and connection.dialect.driver == "pyodbc":
+        # Bind each chunk as a single parameter array instead of letting the
+        # driver issue one INSERT per row.
+        columns = ", ".join(INDICATOR_COLUMNS)
+        placeholders = ", ".join("?" for _ in INDICATOR_COLUMNS)
+        insert_sql = f"INSERT INTO {stage.name} ({columns}) VALUES ({placeholders})"
+        cursor = connection.connection.cursor()
+        try:
+            # pyodbc-specific attribute, absent from the generic DB-API cursor type.
+            cursor.fast_executemany = True  # type: ignore[attr-defined]
+            for rows in batch.iter_parameter_rows(chunk_size):
+                cursor.executemany(insert_sql, rows)
+        finally:
+            cursor.close()
+        return
+
+    for rows in batch.iter_parameter_rows(chunk_size):
+        connection.execute(
+            stage.insert(), [dict(zip(INDICATOR_COLUMNS, row, strict=True)) for row in rows]
+        )
+
+
+def _merge_from_stage(connection: Connection, stage: Table) -> None:
+    """Merge every staged row into ``indicator`` with one statement."""
+    value_columns = [col for col in INDICATOR_COLUMNS if col not in UPSERT_KEY]
+    all_columns = ", ".join(INDICATOR_COLUMNS)
+
+    if connection.dialect.name == "mssql":
+        on_clause = " AND ".join(f"target.{col} = src.{col}" for col in UPSERT_KEY)
+        set_clause = ", ".join(f"{col} = src.{col}" for col in value_columns)
+        src_columns = ", ".join(f"src.{col}" for col in INDICATOR_COLUMNS)
+        statement = (
+            f"MERGE indicator WITH (HOLDLOCK) AS target "
+            f"USING {stage.name} AS src ON {on_clause} "
+            f"WHEN MATCHED THEN UPDATE SET {set_clause}, updated_at = :now "
+            f"WHEN NOT MATCHED BY TARGET THEN "
+            f"INSERT ({all_columns}, created_at, updated_at) "
+            f"VALUES ({src_columns}, :now, :now);"
+        )
+    else:
+        set_clause = ", ".join(f"{col} = excluded.{col}" for col in value_columns)
+        # ``WHERE true`` disambiguates INSERT ... SELECT from the ON CONFLICT clause.
+        statement = (
+            f"INSERT INTO indicator ({all_columns}, created_at, updated_at) "
+            f"SELECT {all_columns}, :now, :now FROM {stage.name} WHERE true "
+            f"ON CONFLICT ({', '.join(UPSERT_KEY)}) "
+            f"DO UPDATE SET {set_clause}, updated_at = excluded.updated_at"
+        )
+
+    merge = text(statement).bindparams(bindparam("now", type_=DateTime))
+    connection.execute(merge, {"now": datetime.utcnow()})
@@ -11,7 +11,7 @@ from prefect.task_runners import ThreadPoolTaskRunner
 
 
 @flow(
-    name="economy/claimant-count",
+    name="economy-claimant-count",
     description="Extract DWP claimant count data for Yorkshire LADs.",
     retries=1,
     retry_delay_seconds=300,
@@ -21,11 +21,15 @@ def claimant_count_flow() -> None:
     """Orchestrate the claimant count ETL pipeline.
 
     Steps (to be implemented in Phase 2):
+        0. Read the dataset watermark (``utils.watermarks.get_watermark``)
+           and list the periods after it with ``pending_months``; run the
+           extract task once per pending month and stop if there are none.
         1. Extract claimant count data from DWP Stat-Xplore API.
         2. Validate response.
         3. Normalise to the canonical ``Indicator`` schema.
         4. Upsert into the data warehouse.
-        5. Write audit metadata.
+        5. Write audit metadata, passing the ``UpsertResult`` as ``upsert``
+           so its latest ``reference_period`` advances the watermark.
     """
     # TODO: implement — call extract, transform, and load tasks
     raise NotImplementedError("claimant_count_flow not yet implemented")
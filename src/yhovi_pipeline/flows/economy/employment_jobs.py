@@ -11,7 +11,7 @@ from prefect.task_runners import ThreadPoolTaskRunner
 
 
 @flow(
-    name="economy/employment-jobs",
+    name="economy-employment-jobs",
     description="Extract employment and jobs data from NOMIS for Yorkshire LADs.",
     retries=1,
     retry_delay_seconds=300,
@@ -21,11 +21,16 @@ def employment_jobs_flow() -> None:
     """Orchestrate the employment & jobs ETL pipeline.
 
     Steps (to be implemented in Phase 2):
+        0. Read the dataset watermark (``utils.watermarks.get_watermark``)
+           and list the periods after it with ``pending_years``; run the
+           extract task once per pending year and stop if there are none.
         1. Extract BRES / APS data from NOMIS API for all Yorkshire LADs.
         2. Validate raw API response schema.
         3. Normalise to the canonical ``Indicator`` schema.
         4. Upsert rows into the SQL Server data warehouse.
-        5. Write ``DatasetMetadata`` audit record.
+        5. Write ``DatasetMetadata`` audit record, passing the ``UpsertResult``
+           as ``upsert`` so its latest ``reference_period`` advances the
+           watermark.
     """
     # TODO: implement — call extract, transform, and load tasks
     raise NotImplementedError("employment_jobs_flow not yet implemented")
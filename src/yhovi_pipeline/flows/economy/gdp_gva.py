@@ -11,7 +11,7 @@ from prefect.task_runners import ThreadPoolTaskRunner
 
 
 @flow(
-    name="economy/gdp-gva",
+    name="economy-gdp-gva",
     description="Extract ONS GVA / regional GDP data for Yorkshire LADs.",
     retries=1,
     retry_delay_seconds=300,
@@ -22,7 +22,9 @@ def gdp_gva_flow() -> None:
 
     Steps (to be implemented in Phase 2):
         1. Download ONS Regional Accounts tables for Yorkshire.
-        2. Parse XLSX / CSV release.
+        2. Parse XLSX / CSV release — only the needed sheet and range, via
+           ``utils.workbooks.read_workbook_range`` so reruns and retries of
+           the same release read the cached Parquet conversion.
         3. Normalise to the canonical ``Indicator`` schema.
         4. Upsert into the data warehouse.
         5. Write audit metadata.
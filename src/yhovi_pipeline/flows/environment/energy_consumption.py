@@ -11,7 +11,7 @@ from prefect.task_runners import ThreadPoolTaskRunner
 
 
 @flow(
-    name="environment/energy-consumption",
+    name="environment-energy-consumption",
     description="Extract BEIS sub-national energy consumption data for Yorkshire LADs.",
     retries=1,
     retry_delay_seconds=300,
@@ -26,6 +26,11 @@ def energy_consumption_flow() -> None:
         3. Normalise to the canonical ``Indicator`` schema.
         4. Upsert into the data warehouse.
         5. Write audit metadata.
+
+    The LSOA-level files are national, so steps 1-4 run in streaming mode:
+    the extract yields batches, validation and normalisation are applied per
+    batch (``utils.streaming.map_batches``) and ``upsert_indicator_stream``
+    commits each one.
     """
     # TODO: implement — call extract, transform, and load tasks
     raise NotImplementedError("energy_consumption_flow not yet implemented")
@@ -1,30 +1,64 @@
 """Master orchestrator flow.
 
-Runs all domain flows in dependency order.  Useful for a full refresh
+Runs all domain flows as a dependency graph.  Useful for a full refresh
 or for triggering from an external event.
+
+Flows that hit independent APIs run concurrently; the few real dependencies
+(the geography lookup must be refreshed before flows that aggregate through
+it) are declared in ``refresh_plan.FULL_REFRESH_STEPS``.  Each step names the upstream
+sources it calls so per-source limits in ``Settings`` keep e.g. NOMIS and
+ONS from being hit by more than N flows at once.
 """
 
 from __future__ import annotations
 
-from prefect import flow
-from prefect.task_runners import ThreadPoolTaskRunner
+from prefect import flow, get_run_logger
+
+from yhovi_pipeline.config import get_settings
+from yhovi_pipeline.db.session import warm_up_engine
+from yhovi_pipeline.flows.refresh_plan import FULL_REFRESH_STEPS
+from yhovi_pipeline.utils.dag import DagRunSummary, run_dag
 
 
 @flow(
-    name="orchestrator/full-refresh",
-    description="Run all YHODA domain flows in sequence.",
+    name="orchestrator-full-refresh",
+    description="Run all YHODA domain flows as a dependency graph with per-source limits.",
     retries=0,
-    task_runner=ThreadPoolTaskRunner(max_workers=1),  # type: ignore[arg-type]
 )
-def full_refresh_flow() -> None:
+def full_refresh_flow() -> DagRunSummary:
     """Trigger all economy, society, and environment flows.
 
-    Steps (to be implemented in Phase 2/3):
-        1. Run economy flows (employment, claimant count, business demography, GVA).
-        2. Run society flows (health, education, housing, deprivation, crime,
-           physical activity, digital inclusion).
-        3. Run environment flows (air quality, energy consumption).
-        4. Report summary statistics.
+    Steps:
+        0. Open ``Settings.db_warm_up_connections`` pooled warehouse
+           connections (``db.session.warm_up_engine``) so the domain flows'
+           load tasks find them ready.
+        1. Refresh the geography lookup.
+        2. Run every domain flow as soon as its dependencies have succeeded,
+           up to ``Settings.orchestrator_max_workers`` at once and
+           ``Settings.source_concurrency_limits`` per upstream source.
+        3. Log per-flow timings and the critical path.
+
+    Returns:
+        The run summary.
+
+    Raises:
+        RuntimeError: If any domain flow failed (after all others finished).
     """
-    # TODO: implement — submit sub-flows as tasks or use Prefect's flow-of-flows
-    raise NotImplementedError("full_refresh_flow not yet implemented")
+    settings = get_settings()
+    warm_up_engine()
+    summary = run_dag(
+        FULL_REFRESH_STEPS,
+        max_workers=settings.orchestrator_max_workers,
+        source_limits=settings.source_concurrency_limits,
+        default_source_limit=settings.source_concurrency_default,
+    )
+
+    logger = get_run_logger()
+    logger.info(summary.format())
+
+    if summary.failed:
+        raise RuntimeError(
+            f"{len(summary.failed)} flow(s) failed: {', '.join(summary.failed)}; "
+            f"skipped downstream: {', '.join(summary.skipped) or 'none'}"
+        )
+    return summary
@@ -0,0 +1,129 @@
+"""Dependency graph of the full refresh.
+
+Declares which domain flows ``full_refresh_flow`` runs, the upstream sources
+each one calls and the steps each must wait for.  Kept apart from
+``orchestrator`` so the graph can be inspected without importing any flow.
+
+Design notes
+------------
+* Domain flows are referenced by ``prefect.yaml``-style ``module:attribute``
+  entrypoints and imported when their step runs, not when the graph is built.
+* ``sources`` names are the keys of ``Settings.source_concurrency_limits``.
+"""
+
+from __future__ import annotations
+
+import importlib
+from collections.abc import Callable
+
+from prefect import task
+
+from yhovi_pipeline.utils.dag import DagStep
+from yhovi_pipeline.utils.geo_lookups import get_geo_snapshot, invalidate_geo_cache
+
+#: Name of the step that refreshes the cached geography lookup.
+GEO_LOOKUP_STEP = "geography-refresh-lookup"
+
+
+@task(
+    name="orchestrator/refresh-geo-lookup",
+    description="Reload the cached ONS geography lookup before geo-dependent flows run.",
+)
+def refresh_geo_lookup() -> None:
+    """Drop the cached ``GeoLookup`` frame and load the current one."""
+    invalidate_geo_cache()
+    get_geo_snapshot()
+
+
+def _subflow(entrypoint: str) -> Callable[[], object]:
+    """Return a callable that imports and runs the flow at ``entrypoint``.
+
+    ``entrypoint`` uses the ``module:attribute`` form of ``prefect.yaml``.
+    Flows are imported on first run rather than at module import, so
+    building the DAG does not import every domain flow up front.
+    """
+    module_name, attr = entrypoint.split(":")
+
+    def run() -> object:
+        subflow: Callable[[], object] = getattr(importlib.import_module(module_name), attr)
+        return subflow()
+
+    run.__name__ = attr
+    return run
+
+
+#: The full-refresh DAG: every domain flow, the sources it calls and the
+#: steps it must wait for.
+FULL_REFRESH_STEPS: tuple[DagStep, ...] = (
+    DagStep(GEO_LOOKUP_STEP, refresh_geo_lookup, sources=("warehouse",)),
+    # Economy
+    DagStep(
+        "economy-employment-jobs",
+        _subflow("yhovi_pipeline.flows.economy.employment_jobs:employment_jobs_flow"),
+        sources=("nomis",),
+    ),
+    DagStep(
+        "economy-claimant-count",
+        _subflow("yhovi_pipeline.flows.economy.claimant_count:claimant_count_flow"),
+        sources=("dwp",),
+    ),
+    DagStep(
+        "economy-business-demography",
+        _subflow("yhovi_pipeline.flows.economy.business_demography:business_demography_flow"),
+        sources=("ons",),
+    ),
+    DagStep(
+        "economy-gdp-gva",
+        _subflow("yhovi_pipeline.flows.economy.gdp_gva:gdp_gva_flow"),
+        sources=("ons",),
+    ),
+    # Society
+    DagStep(
+        "society-health-outcomes",
+        _subflow("yhovi_pipeline.flows.society.health_outcomes:health_outcomes_flow"),
+        sources=("fingertips",),
+    ),
+    DagStep(
+        "society-education-attainment",
+        _subflow("yhovi_pipeline.flows.society.education_attainment:education_attainment_flow"),
+        sources=("dfe",),
+    ),
+    DagStep(
+        "society-housing-tenure",
+        _subflow("yhovi_pipeline.flows.society.housing_tenure:housing_tenure_flow"),
+        sources=("ons",),
+    ),
+    DagStep(
+        "society-deprivation-imd",
+        _subflow("yhovi_pipeline.flows.society.deprivation_imd:deprivation_imd_flow"),
+        sources=("mhclg",),
+        depends_on=(GEO_LOOKUP_STEP,),
+    ),
+    DagStep(
+        "society-crime-statistics",
+        _subflow("yhovi_pipeline.flows.society.crime_statistics:crime_statistics_flow"),
+        sources=("home_office",),
+    ),
+    DagStep(
+        "society-physical-activity",
+        _subflow("yhovi_pipeline.flows.society.physical_activity:physical_activity_flow"),
+        sources=("sport_england",),
+    ),
+    DagStep(
+        "society-digital-inclusion",
+        _subflow("yhovi_pipeline.flows.society.digital_inclusion:digital_inclusion_flow"),
+        sources=("ofcom",),
+    ),
+    # Environment
+    DagStep(
+        "environment-air-quality",
+        _subflow("yhovi_pipeline.flows.environment.air_quality:air_quality_flow"),
+        sources=("defra",),
+        depends_on=(GEO_LOOKUP_STEP,),
+    ),
+    DagStep(
+        "environment-energy-consumption",
+        _subflow("yhovi_pipeline.flows.environment.energy_consumption:energy_consumption_flow"),
+        sources=("beis",),
+    ),
+)
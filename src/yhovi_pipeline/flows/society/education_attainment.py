@@ -11,7 +11,7 @@ from prefect.task_runners import ThreadPoolTaskRunner
 
 
 @flow(
-    name="society/education-attainment",
+    name="society-education-attainment",
     description="Extract education attainment data for Yorkshire LADs.",
     retries=1,
     retry_delay_seconds=300,
@@ -11,7 +11,7 @@ from prefect.task_runners import ThreadPoolTaskRunner
 
 
 @flow(
-    name="society/health-outcomes",
+    name="society-health-outcomes",
     description="Extract NHS Fingertips health outcome indicators for Yorkshire LADs.",
     retries=1,
     retry_delay_seconds=300,
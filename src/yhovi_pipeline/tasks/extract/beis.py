@@ -8,22 +8,39 @@ from __future__ import annotations
 
 import pandas as pd
 from prefect import task
+from prefect.tasks import exponential_backoff
+
+from yhovi_pipeline.utils.instrumentation import instrumented
+from yhovi_pipeline.utils.results import ARROW_SERIALIZER, EXTRACT_CACHE_POLICY
+from yhovi_pipeline.utils.retry import retry_if_transient
 
 
 @task(
     name="extract/beis/energy-consumption",
     description="Extract BEIS sub-national energy consumption data for Yorkshire LADs.",
-    retries=3,
-    retry_delay_seconds=60,
+    retries=2,
+    retry_delay_seconds=exponential_backoff(backoff_factor=5),
+    retry_jitter_factor=0.5,
+    retry_condition_fn=retry_if_transient,
+    persist_result=True,
+    result_serializer=ARROW_SERIALIZER,
+    cache_policy=EXTRACT_CACHE_POLICY,
 )
-def extract_energy_consumption(reference_year: int) -> pd.DataFrame:
+@instrumented
+def extract_energy_consumption(reference_year: int, release_id: str | None = None) -> pd.DataFrame:
     """Fetch sub-national electricity and gas consumption statistics.
 
     Args:
         reference_year: The calendar year to extract.
+        release_id: Upstream release identifier; when given, the result is
+            cached for that release (see ``utils.results``).
 
     Returns:
         DataFrame with electricity and gas consumption for Yorkshire LADs.
     """
+    # Parse with utils.readers.iter_csv_filtered(..., wanted_geography_codes(), columns)
+    # so only Yorkshire rows are materialised, and yield its batches (streaming
+    # mode) rather than building one frame.
     # TODO: implement — download from GOV.UK open data portal
+    # release = fetch("beis", release_path, skip_unchanged=True)
     raise NotImplementedError("extract_energy_consumption not yet implemented")
@@ -8,19 +8,32 @@ from __future__ import annotations
 
 import pandas as pd
 from prefect import task
+from prefect.tasks import exponential_backoff
+
+from yhovi_pipeline.utils.instrumentation import instrumented
+from yhovi_pipeline.utils.results import ARROW_SERIALIZER, EXTRACT_CACHE_POLICY
+from yhovi_pipeline.utils.retry import retry_if_transient
 
 
 @task(
     name="extract/defra/aurn",
     description="Extract DEFRA AURN air quality data for Yorkshire monitoring stations.",
-    retries=3,
-    retry_delay_seconds=60,
+    retries=2,
+    retry_delay_seconds=exponential_backoff(backoff_factor=5),
+    retry_jitter_factor=0.5,
+    retry_condition_fn=retry_if_transient,
+    persist_result=True,
+    result_serializer=ARROW_SERIALIZER,
+    cache_policy=EXTRACT_CACHE_POLICY,
 )
-def extract_aurn(reference_year: int) -> pd.DataFrame:
+@instrumented
+def extract_aurn(reference_year: int, release_id: str | None = None) -> pd.DataFrame:
     """Fetch annual mean air quality data from DEFRA AURN.
 
     Args:
         reference_year: The calendar year to extract.
+        release_id: Upstream release identifier; when given, the result is
+            cached for that release (see ``utils.results``).
 
     Returns:
         DataFrame with annual mean concentrations (PM2.5, PM10, NO2, O3)
@@ -10,24 +10,39 @@ from __future__ import annotations
 
 import pandas as pd
 from prefect import task
+from prefect.tasks import exponential_backoff
+
+from yhovi_pipeline.utils.instrumentation import instrumented
+from yhovi_pipeline.utils.results import ARROW_SERIALIZER, EXTRACT_CACHE_POLICY
+from yhovi_pipeline.utils.retry import retry_if_transient
 
 
 @task(
     name="extract/dwp/claimant-count",
     description="Extract Universal Credit / JSA claimant count from DWP Stat-Xplore.",
-    retries=3,
-    retry_delay_seconds=60,
+    retries=2,
+    retry_delay_seconds=exponential_backoff(backoff_factor=5),
+    retry_jitter_factor=0.5,
+    retry_condition_fn=retry_if_transient,
+    persist_result=True,
+    result_serializer=ARROW_SERIALIZER,
+    cache_policy=EXTRACT_CACHE_POLICY,
 )
-def extract_claimant_count(reference_month: str) -> pd.DataFrame:
+@instrumented
+def extract_claimant_count(reference_month: str, release_id: str | None = None) -> pd.DataFrame:
     """Fetch claimant count data from DWP Stat-Xplore.
 
     Args:
         reference_month: ISO 8601 year-month string, e.g. ``"2024-04"``.
+            Flows request one task per month returned by
+            ``utils.watermarks.pending_months`` rather than the full series.
+        release_id: Upstream release identifier; when given, the result is
+            cached for that release (see ``utils.results``).
 
     Returns:
         DataFrame with claimant count by LAD for the given month.
     """
     # TODO: implement
-    # settings = get_settings()
-    # api_key = settings.dwp_api_key.get_secret_value()
+    # client = get_http_client("dwp")  # APIKey header is attached by the registry
+    # response = client.post("/table", json=query)
     raise NotImplementedError("extract_claimant_count not yet implemented")
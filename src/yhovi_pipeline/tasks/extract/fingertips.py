@@ -8,28 +8,49 @@ API docs: https://fingertips.phe.org.uk/api
 
 from __future__ import annotations
 
+from datetime import date
+
 import pandas as pd
 from prefect import task
+from prefect.tasks import exponential_backoff
+
+from yhovi_pipeline.utils.instrumentation import instrumented
+from yhovi_pipeline.utils.results import ARROW_SERIALIZER, EXTRACT_CACHE_POLICY
+from yhovi_pipeline.utils.retry import retry_if_transient
 
 
 @task(
     name="extract/fingertips/indicators",
     description="Extract health outcome indicators from NHS Fingertips for Yorkshire LADs.",
-    retries=3,
-    retry_delay_seconds=60,
+    retries=2,
+    retry_delay_seconds=exponential_backoff(backoff_factor=5),
+    retry_jitter_factor=0.5,
+    retry_condition_fn=retry_if_transient,
+    persist_result=True,
+    result_serializer=ARROW_SERIALIZER,
+    cache_policy=EXTRACT_CACHE_POLICY,
 )
+@instrumented
 def extract_fingertips_indicators(
     profile_id: int,
     indicator_ids: list[int],
+    since: date | None = None,
+    release_id: str | None = None,
 ) -> pd.DataFrame:
     """Fetch indicator data from the Fingertips API.
 
     Args:
         profile_id: The Fingertips profile identifier (e.g. 19 for Public Health Outcomes Framework).
         indicator_ids: List of Fingertips indicator IDs to fetch.
+        since: Only return observations for periods after this date — pass the
+            dataset watermark's ``max_reference_period``.  ``None`` returns the
+            full history.
+        release_id: Upstream release identifier; when given, the result is
+            cached for that release (see ``utils.results``).
 
     Returns:
         DataFrame with indicator values for Yorkshire LADs.
     """
     # TODO: implement using fingertips-py or direct HTTP requests
+    # drop rows whose period is not after ``since`` before returning
     raise NotImplementedError("extract_fingertips_indicators not yet implemented")
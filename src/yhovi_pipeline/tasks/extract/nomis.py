@@ -11,19 +11,34 @@ from __future__ import annotations
 
 import pandas as pd
 from prefect import task
+from prefect.tasks import exponential_backoff
+
+from yhovi_pipeline.utils.instrumentation import instrumented
+from yhovi_pipeline.utils.results import ARROW_SERIALIZER, EXTRACT_CACHE_POLICY
+from yhovi_pipeline.utils.retry import retry_if_transient
 
 
 @task(
     name="extract/nomis/bres",
     description="Extract BRES employment data from NOMIS for Yorkshire LADs.",
-    retries=3,
-    retry_delay_seconds=60,
+    retries=2,
+    retry_delay_seconds=exponential_backoff(backoff_factor=5),
+    retry_jitter_factor=0.5,
+    retry_condition_fn=retry_if_transient,
+    persist_result=True,
+    result_serializer=ARROW_SERIALIZER,
+    cache_policy=EXTRACT_CACHE_POLICY,
 )
-def extract_bres(reference_year: int) -> pd.DataFrame:
+@instrumented
+def extract_bres(reference_year: int, release_id: str | None = None) -> pd.DataFrame:
     """Fetch Business Register and Employment Survey data from NOMIS.
 
     Args:
-        reference_year: The survey year to extract (e.g. 2023).
+        reference_year: The survey year to extract (e.g. 2023).  Flows
+            request one task per year returned by
+            ``utils.watermarks.pending_years`` rather than the full series.
+        release_id: Upstream release identifier; when given, the result is
+            cached for that release (see ``utils.results``).
 
     Returns:
         DataFrame with raw NOMIS BRES response for all Yorkshire LADs.
@@ -31,21 +46,31 @@ def extract_bres(reference_year: int) -> pd.DataFrame:
     # TODO: implement
     # settings = get_settings()
     # lad_codes = settings.yorkshire_lad_codes
-    # api_key = settings.nomis_api_key
+    # client = get_http_client("nomis")  # uid=<nomis_api_key> is attached when set
     raise NotImplementedError("extract_bres not yet implemented")
 
 
 @task(
     name="extract/nomis/aps",
     description="Extract Annual Population Survey data from NOMIS for Yorkshire LADs.",
-    retries=3,
-    retry_delay_seconds=60,
+    retries=2,
+    retry_delay_seconds=exponential_backoff(backoff_factor=5),
+    retry_jitter_factor=0.5,
+    retry_condition_fn=retry_if_transient,
+    persist_result=True,
+    result_serializer=ARROW_SERIALIZER,
+    cache_policy=EXTRACT_CACHE_POLICY,
 )
-def extract_aps(reference_year: int) -> pd.DataFrame:
+@instrumented
+def extract_aps(reference_year: int, release_id: str | None = None) -> pd.DataFrame:
     """Fetch Annual Population Survey data from NOMIS.
 
     Args:
-        reference_year: The survey year to extract (e.g. 2023).
+        reference_year: The survey year to extract (e.g. 2023).  Flows
+            request one task per year returned by
+            ``utils.watermarks.pending_years`` rather than the full series.
+        release_id: Upstream release identifier; when given, the result is
+            cached for that release (see ``utils.results``).
 
     Returns:
         DataFrame with raw NOMIS APS response for all Yorkshire LADs.
@@ -8,57 +8,88 @@ from __future__ import annotations
 
 import pandas as pd
 from prefect import task
+from prefect.tasks import exponential_backoff
+
+from yhovi_pipeline.utils.instrumentation import instrumented
+from yhovi_pipeline.utils.results import ARROW_SERIALIZER, EXTRACT_CACHE_POLICY
+from yhovi_pipeline.utils.retry import retry_if_transient
 
 
 @task(
     name="extract/ons/regional-accounts",
     description="Download ONS Regional Accounts (GVA) data for Yorkshire.",
-    retries=3,
-    retry_delay_seconds=60,
+    retries=2,
+    retry_delay_seconds=exponential_backoff(backoff_factor=5),
+    retry_jitter_factor=0.5,
+    retry_condition_fn=retry_if_transient,
+    persist_result=True,
+    result_serializer=ARROW_SERIALIZER,
+    cache_policy=EXTRACT_CACHE_POLICY,
 )
-def extract_regional_accounts(reference_year: int) -> pd.DataFrame:
+@instrumented
+def extract_regional_accounts(reference_year: int, release_id: str | None = None) -> pd.DataFrame:
     """Fetch ONS Regional Accounts publication data.
 
     Args:
         reference_year: The reference year to extract.
+        release_id: Upstream release identifier; when given, the result is
+            cached for that release (see ``utils.results``).
 
     Returns:
         DataFrame with raw GVA / GDP data for Yorkshire LADs.
     """
-    # TODO: implement
+    # TODO: implement — parse the release workbook with
+    # read_workbook_range(path, sheet, "A<header>:<last col>") (cached as Parquet)
     raise NotImplementedError("extract_regional_accounts not yet implemented")
 
 
 @task(
     name="extract/ons/business-demography",
     description="Download ONS Business Demography release for Yorkshire LADs.",
-    retries=3,
-    retry_delay_seconds=60,
+    retries=2,
+    retry_delay_seconds=exponential_backoff(backoff_factor=5),
+    retry_jitter_factor=0.5,
+    retry_condition_fn=retry_if_transient,
+    persist_result=True,
+    result_serializer=ARROW_SERIALIZER,
+    cache_policy=EXTRACT_CACHE_POLICY,
 )
-def extract_business_demography(reference_year: int) -> pd.DataFrame:
+@instrumented
+def extract_business_demography(reference_year: int, release_id: str | None = None) -> pd.DataFrame:
     """Fetch ONS Business Demography publication data.
 
     Args:
         reference_year: The reference year to extract.
+        release_id: Upstream release identifier; when given, the result is
+            cached for that release (see ``utils.results``).
 
     Returns:
         DataFrame with business births, deaths, and survival data.
     """
-    # TODO: implement
+    # TODO: implement — parse the release workbook with
+    # read_workbook_range(path, sheet, "A<header>:<last col>") (cached as Parquet)
     raise NotImplementedError("extract_business_demography not yet implemented")
 
 
 @task(
     name="extract/ons/housing-tenure",
     description="Download ONS housing tenure data for Yorkshire LADs.",
-    retries=3,
-    retry_delay_seconds=60,
+    retries=2,
+    retry_delay_seconds=exponential_backoff(backoff_factor=5),
+    retry_jitter_factor=0.5,
+    retry_condition_fn=retry_if_transient,
+    persist_result=True,
+    result_serializer=ARROW_SERIALIZER,
+    cache_policy=EXTRACT_CACHE_POLICY,
 )
-def extract_housing_tenure(reference_year: int) -> pd.DataFrame:
+@instrumented
+def extract_housing_tenure(reference_year: int, release_id: str | None = None) -> pd.DataFrame:
     """Fetch ONS housing tenure statistics.
 
     Args:
         reference_year: The reference year to extract.
+        release_id: Upstream release identifier; when given, the result is
+            cached for that release (see ``utils.results``).
 
     Returns:
         DataFrame with housing tenure breakdowns for Yorkshire LADs.
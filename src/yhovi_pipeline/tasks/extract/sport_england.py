@@ -8,22 +8,36 @@ from __future__ import annotations
 
 import pandas as pd
 from prefect import task
+from prefect.tasks import exponential_backoff
+
+from yhovi_pipeline.utils.instrumentation import instrumented
+from yhovi_pipeline.utils.results import ARROW_SERIALIZER, EXTRACT_CACHE_POLICY
+from yhovi_pipeline.utils.retry import retry_if_transient
 
 
 @task(
     name="extract/sport-england/active-lives",
     description="Extract Sport England Active Lives data for Yorkshire LADs.",
-    retries=3,
-    retry_delay_seconds=60,
+    retries=2,
+    retry_delay_seconds=exponential_backoff(backoff_factor=5),
+    retry_jitter_factor=0.5,
+    retry_condition_fn=retry_if_transient,
+    persist_result=True,
+    result_serializer=ARROW_SERIALIZER,
+    cache_policy=EXTRACT_CACHE_POLICY,
 )
-def extract_active_lives(survey_year: str) -> pd.DataFrame:
+@instrumented
+def extract_active_lives(survey_year: str, release_id: str | None = None) -> pd.DataFrame:
     """Fetch Active Lives participation data from Sport England.
 
     Args:
         survey_year: Survey year string, e.g. ``"2023-24"``.
+        release_id: Upstream release identifier; when given, the result is
+            cached for that release (see ``utils.results``).
 
     Returns:
         DataFrame with physical activity rates for Yorkshire LADs.
     """
     # TODO: implement — download from Sport England open data portal
+    # release = fetch("sport_england", release_path, skip_unchanged=True)
     raise NotImplementedError("extract_active_lives not yet implemented")
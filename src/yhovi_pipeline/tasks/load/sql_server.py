@@ -1,38 +1,141 @@
 """SQL Server load tasks.
 
 Writes normalised ``Indicator`` rows to the SQL Server data warehouse using
-an idempotent upsert strategy (MERGE or DELETE + INSERT).
+an idempotent, set-based upsert (staging table + a single MERGE — see
+``yhovi_pipeline.db.upsert``).  ``upsert_indicator_stream`` is the streaming
+counterpart: it commits batch by batch (see ``utils.streaming``).
+Every task connects through the process-wide pooled engine in ``db.session``.
 """
 
 from __future__ import annotations
 
+import itertools
+from collections.abc import Iterable, Iterator, Sequence
+from datetime import date, datetime
+
 import pandas as pd
 from prefect import task
+from prefect.cache_policies import NO_CACHE
+from prefect.runtime import flow_run
 
+from yhovi_pipeline.config import get_settings
+from yhovi_pipeline.db.batch import IndicatorBatch
 from yhovi_pipeline.db.models import ExtractionStatus
+from yhovi_pipeline.db.session import get_engine, get_sessionmaker
+from yhovi_pipeline.db.upsert import UpsertResult, bulk_upsert_indicators
+from yhovi_pipeline.utils.instrumentation import (
+    StageMetrics,
+    drain_metrics,
+    instrumented,
+    publish_metrics_artifact,
+    summarise,
+)
+from yhovi_pipeline.utils.logging import get_logger
+from yhovi_pipeline.utils.metadata import build_metadata_record
+from yhovi_pipeline.utils.streaming import ThroughputMeter, rebatch, rebatch_indicators
+
+#: ``error_message`` is truncated to this many characters before it is stored.
+MAX_ERROR_MESSAGE_LENGTH: int = 4000
 
 
 @task(
     name="load/sql-server/upsert-indicators",
     description="Upsert a normalised Indicator DataFrame into the SQL Server data warehouse.",
 )
-def upsert_indicators(df: pd.DataFrame, dataset_code: str) -> int:
+@instrumented
+def upsert_indicators(
+    df: IndicatorBatch | pd.DataFrame, dataset_code: str, delta: bool = False
+) -> UpsertResult:
     """Upsert rows into the ``indicator`` table.
 
     Uses the unique index on ``(indicator_id, lad_code, reference_period)``
     as the merge key.  Existing rows are updated; new rows are inserted.
+    Rows are staged in chunks of ``Settings.load_chunk_size`` and merged in a
+    single statement inside one transaction.
+
+    In delta mode, rows whose value-bearing columns (``value``, ``unit``,
+    ``indicator_name``, ``lad_name``, ``source``) are identical to the stored
+    row are skipped, so re-delivered history is not rewritten.
+
+    Args:
+        df: Output of ``normalise_to_indicator``, or a DataFrame matching
+            the ``Indicator`` schema.
+        dataset_code: Dataset identifier for logging.
+        delta: Only write inserts and rows whose content changed.
+
+    Returns:
+        Inserted / updated / unchanged counts.  Pass the result to
+        ``write_metadata`` as ``upsert`` to record them.
+    """
+    settings = get_settings()
+    with get_engine().begin() as connection:
+        result = bulk_upsert_indicators(
+            connection, df, chunk_size=settings.load_chunk_size, delta=delta
+        )
+
+    get_logger(__name__).info(
+        "Loaded dataset %s: %d inserted, %d updated, %d unchanged",
+        dataset_code,
+        result.inserted,
+        result.updated,
+        result.unchanged,
+    )
+    return result
+
+
+@task(
+    name="load/sql-server/upsert-indicator-stream",
+    description="Upsert a stream of normalised Indicator batches, committing each batch.",
+    # A stream can only be consumed once, so there is nothing to cache.
+    cache_policy=NO_CACHE,
+)
+@instrumented
+def upsert_indicator_stream(
+    batches: Iterable[IndicatorBatch] | Iterable[pd.DataFrame],
+    dataset_code: str,
+    delta: bool = False,
+) -> UpsertResult:
+    """Upsert batches into the ``indicator`` table as they arrive.
+
+    The stream is re-chunked to ``Settings.stream_batch_size`` rows and each
+    batch is merged and committed in its own transaction, so memory stays
+    bounded whatever the size of the source.  A failure part-way leaves the
+    earlier batches committed; because the upsert is idempotent, re-running
+    the flow completes the load.
+
+    A key repeated in a later batch overwrites the earlier row and is
+    counted as updated.
 
     Args:
-        df: Normalised DataFrame matching the ``Indicator`` schema.
+        batches: Normalised ``Indicator`` batches (or frames), typically an
+            extractor's batches passed through ``utils.streaming.map_batches``
+            up to ``normalise_to_indicator``.
         dataset_code: Dataset identifier for logging.
+        delta: Only write inserts and rows whose content changed.
 
     Returns:
-        Number of rows upserted.
+        Totals over every batch.  Pass to ``write_metadata`` as ``upsert``.
     """
-    # TODO: implement
-    # settings = get_settings()
-    # engine = create_engine(settings.sql_server_connection_string.get_secret_value())
-    raise NotImplementedError("upsert_indicators not yet implemented")
+    settings = get_settings()
+    meter = ThroughputMeter(dataset_code, settings.stream_progress_interval_seconds)
+    result = UpsertResult()
+    engine = get_engine()
+    for batch in _rebatch(batches, settings.stream_batch_size):
+        with engine.begin() as connection:
+            result += bulk_upsert_indicators(
+                connection, batch, chunk_size=settings.load_chunk_size, delta=delta
+            )
+        meter.update(len(batch))
+    meter.finish()
+
+    get_logger(__name__).info(
+        "Loaded dataset %s: %d inserted, %d updated, %d unchanged",
+        dataset_code,
+        result.inserted,
+        result.updated,
+        result.unchanged,
+    )
+    return result
 
 
 @task(
@@ -48,6 +151,10 @@ def write_metadata(
     rows_loaded: int | None = None,
     error_message: str | None = None,
     source_url: str | None = None,
+    release_id: str | None = None,
+    max_reference_period: date | None = None,
+    upsert: UpsertResult | None = None,
+    metrics: Sequence[StageMetrics] | None = None,
 ) -> None:
     """Insert an audit record into the ``dataset_metadata`` table.
 
@@ -55,11 +162,66 @@ def write_metadata(
         dataset_code: Dataset identifier.
         source: Source system identifier.
         status: Final ``ExtractionStatus`` for this run.
-        prefect_flow_run_id: UUID of the Prefect flow run, if available.
+        prefect_flow_run_id: UUID of the Prefect flow run.  Defaults to the
+            current flow run when called inside one.
         rows_extracted: Number of rows returned by the extract step.
-        rows_loaded: Number of rows written to the warehouse.
-        error_message: Truncated exception message on failure.
+        rows_loaded: Number of rows written to the warehouse (inserted +
+            updated).  Taken from ``upsert`` when that is given.
+        error_message: Exception message on failure; truncated to
+            ``MAX_ERROR_MESSAGE_LENGTH`` characters.
         source_url: API endpoint or file URL that was fetched.
+        release_id: Source release identifier that was loaded.
+        max_reference_period: Latest ``reference_period`` loaded.  Together
+            with ``release_id`` this advances the dataset's watermark (see
+            ``utils.watermarks``) when ``status`` is ``SUCCESS``.  Defaults
+            to ``upsert.max_reference_period``.
+        upsert: Result of ``upsert_indicators``; its inserted / updated /
+            unchanged breakdown is stored alongside ``rows_loaded``, and its
+            latest period moves the watermark.
+        metrics: Per-stage metrics to store and publish as the run's
+            ``stage-metrics-<dataset>`` table artifact.  Defaults to those
+            recorded by this flow run's ``@instrumented`` tasks.
     """
-    # TODO: implement
-    raise NotImplementedError("write_metadata not yet implemented")
+    now = datetime.utcnow()
+    record = build_metadata_record(
+        dataset_code=dataset_code,
+        source=source,
+        status=status,
+        prefect_flow_run_id=prefect_flow_run_id or flow_run.get_id(),
+    )
+    record.rows_extracted = rows_extracted
+    if upsert is not None:
+        rows_loaded = upsert.rows_loaded
+        max_reference_period = max_reference_period or upsert.max_reference_period
+        record.rows_inserted = upsert.inserted
+        record.rows_updated = upsert.updated
+        record.rows_unchanged = upsert.unchanged
+    record.rows_loaded = rows_loaded
+    record.error_message = error_message[:MAX_ERROR_MESSAGE_LENGTH] if error_message else None
+    record.source_url = source_url
+    record.release_id = release_id
+    record.max_reference_period = max_reference_period
+    record.extracted_at = now if rows_extracted is not None else None
+    record.loaded_at = now if rows_loaded is not None else None
+    metrics = drain_metrics(record.prefect_flow_run_id) if metrics is None else metrics
+    if metrics:
+        for column, value in summarise(metrics).items():
+            setattr(record, column, value)
+
+    with get_sessionmaker().begin() as session:
+        session.add(record)
+    if metrics and flow_run.get_id() is not None:
+        publish_metrics_artifact(dataset_code, metrics)
+
+
+def _rebatch(
+    batches: Iterable[IndicatorBatch] | Iterable[pd.DataFrame], batch_size: int
+) -> Iterator[IndicatorBatch] | Iterator[pd.DataFrame]:
+    """Re-chunk a stream of batches or frames, whichever it holds."""
+    stream = iter(batches)
+    first = next(stream, None)
+    if first is None:
+        return iter(())
+    if isinstance(first, IndicatorBatch):
+        return rebatch_indicators(itertools.chain([first], stream), batch_size)
+    return rebatch(itertools.chain([first], stream), batch_size)
@@ -1,33 +1,162 @@
 """Geo aggregation transform tasks.
 
 Aggregates sub-LAD data (LSOA / MSOA level) up to LAD level using the
-``GeoLookup`` table.
+``GeoLookup`` table, via the compiled integer index in ``utils.geo_index``,
+and rolls it up to every level of the hierarchy at once via the sparse
+matrices in ``utils.rollup``.  LAD series published on superseded boundaries
+are re-based onto the current LADs with ``utils.crosswalk``.
 """
 
 from __future__ import annotations
 
+from collections.abc import Mapping, Sequence
+
 import pandas as pd
 from prefect import task
 
+from yhovi_pipeline.utils.crosswalk import Crosswalk, Kind, get_crosswalk
+from yhovi_pipeline.utils.geo_index import Aggregation, GeoIndex, Level, get_geo_index
+from yhovi_pipeline.utils.instrumentation import instrumented
+from yhovi_pipeline.utils.logging import get_logger
+from yhovi_pipeline.utils.results import (
+    ARROW_SERIALIZER,
+    GEO_CACHE_POLICY,
+    REBASE_CACHE_POLICY,
+)
+from yhovi_pipeline.utils.rollup import HierarchyRollup, Rate, get_hierarchy_rollup
+
 
 @task(
     name="transform/geo/aggregate-to-lad",
     description="Aggregate sub-LAD data to LAD level using the ONS geo lookup.",
+    persist_result=True,
+    result_serializer=ARROW_SERIALIZER,
+    cache_policy=GEO_CACHE_POLICY,
 )
+@instrumented
 def aggregate_to_lad(
     df: pd.DataFrame,
-    value_col: str,
+    value_col: str | Sequence[str],
     geo_col: str = "lsoa_code",
+    level: Level = "lsoa",
+    how: Aggregation = "sum",
+    weight_col: str | None = None,
+    index: GeoIndex | None = None,
 ) -> pd.DataFrame:
-    """Join sub-LAD data to the geo lookup and aggregate to LAD level.
+    """Aggregate sub-LAD data to LAD level.
+
+    Codes are resolved to integer ids and every value column is reduced in
+    one vectorised pass — no string merge or ``groupby``.
 
     Args:
         df: Input DataFrame with sub-LAD rows.
-        value_col: Name of the numeric column to aggregate.
+        value_col: Numeric column to aggregate, or several columns at once.
         geo_col: Name of the geography code column in ``df`` (default: ``lsoa_code``).
+        level: Geography level of ``geo_col`` — ``"lsoa"`` or ``"msoa"``.
+        how: ``"sum"``, ``"mean"`` or ``"weighted_mean"``.
+        weight_col: Weight column (e.g. population) for ``"weighted_mean"``.
+        index: Geography index to use; defaults to ``get_geo_index()``.
+
+    Returns:
+        DataFrame aggregated to LAD level with columns ``[lad_code, lad_name, value]``
+        for a single ``value_col``, or ``[lad_code, lad_name, *value_col]``
+        for several.
+    """
+    single = isinstance(value_col, str)
+    value_cols = [value_col] if isinstance(value_col, str) else list(value_col)
+
+    result, unmatched = (index or get_geo_index()).aggregate(
+        df, value_cols, geo_col, level=level, to="lad", how=how, weight_col=weight_col
+    )
+    if unmatched:
+        get_logger(__name__).warning(
+            "%d rows had %s codes not found in GeoLookup", unmatched, level
+        )
+
+    if single:
+        result = result.rename(columns={value_cols[0]: "value"})
+    return result
+
+
+@task(
+    name="transform/geo/rollup-hierarchy",
+    description="Aggregate sub-LAD data to MSOA, LAD and region level in one pass.",
+    persist_result=True,
+    result_serializer=ARROW_SERIALIZER,
+    cache_policy=GEO_CACHE_POLICY,
+)
+@instrumented
+def rollup_hierarchy(
+    df: pd.DataFrame,
+    value_cols: Sequence[str] = (),
+    geo_col: str = "lsoa_code",
+    level: Level = "lsoa",
+    to: Sequence[Level] = ("msoa", "lad", "region"),
+    weight_col: str | None = None,
+    rates: Mapping[str, Rate] | None = None,
+    rollup: HierarchyRollup | None = None,
+) -> dict[str, pd.DataFrame]:
+    """Roll sub-LAD data up to several geography levels at once.
+
+    Args:
+        df: Input DataFrame with sub-LAD rows.
+        value_cols: Columns to sum, or to average when ``weight_col`` is set.
+        geo_col: Name of the geography code column in ``df``.
+        level: Geography level of ``geo_col``.
+        to: Output levels, e.g. ``("lad", "region")``.
+        weight_col: Weight column (e.g. population) for weighted means.
+        rates: Rate columns to recompute at each level from summed
+            numerators and denominators, e.g.
+            ``{"claimant_rate": Rate("claimants", "population_16_64", per=100)}``.
+        rollup: Hierarchy matrices to use; defaults to ``get_hierarchy_rollup()``.
+
+    Returns:
+        One DataFrame per level, keyed by level name, with ``<level>_code``,
+        ``<level>_name`` and the value and rate columns.
+    """
+    result = (rollup or get_hierarchy_rollup()).rollup_frame(
+        df, value_cols, geo_col, level=level, to=to, weight_col=weight_col, rates=rates
+    )
+    if result.unmatched:
+        get_logger(__name__).warning(
+            "%d rows had %s codes not found in GeoLookup", result.unmatched, level
+        )
+    return result.levels
+
+
+@task(
+    name="transform/geo/rebase-to-current-geography",
+    description="Re-base LAD series on superseded boundaries onto the current LADs.",
+    persist_result=True,
+    result_serializer=ARROW_SERIALIZER,
+    cache_policy=REBASE_CACHE_POLICY,
+)
+@instrumented
+def rebase_to_current_geography(
+    df: pd.DataFrame,
+    kind: Kind = "count",
+    denominators: Mapping[str, float] | pd.Series | None = None,
+    crosswalk: Crosswalk | None = None,
+) -> pd.DataFrame:
+    """Replace rows on abolished LADs with rows on the LADs that succeeded them.
+
+    Args:
+        df: Normalised ``Indicator`` rows.
+        kind: ``"count"`` for additive values, ``"rate"`` for rates and
+            percentages (recomputed as a weighted mean).
+        denominators: Per-old-LAD denominators (e.g. population) for rates.
+        crosswalk: Crosswalk to use; defaults to ``get_crosswalk("lad")``.
 
     Returns:
-        DataFrame aggregated to LAD level with columns ``[lad_code, lad_name, value]``.
+        ``df`` with every old-boundary row replaced by current-boundary rows.
     """
-    # TODO: implement — query GeoLookup, merge, groupby lad_code, aggregate
-    raise NotImplementedError("aggregate_to_lad not yet implemented")
+    crosswalk = crosswalk or get_crosswalk("lad")
+    result = crosswalk.rebase(df, kind=kind, denominators=denominators)
+    old_rows = int(df["lad_code"].isin(crosswalk.from_codes).sum())
+    if old_rows:
+        get_logger(__name__).info(
+            "Re-based %d rows on superseded LADs into %d current-LAD rows",
+            old_rows,
+            len(result) - (len(df) - old_rows),
+        )
+    return result
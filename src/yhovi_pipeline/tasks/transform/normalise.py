@@ -1,21 +1,69 @@
 """Normalisation transform tasks.
 
 Converts source-specific DataFrames into the canonical ``Indicator`` schema
-used by the load tasks.
+used by the load tasks.  The result is an ``IndicatorBatch`` (see
+``db.batch``) rather than a ``DataFrame``: the constant columns are encoded
+once instead of being repeated on every row.
+
+Design notes
+------------
+* ``normalise_wide_to_indicator`` handles wide releases (Fingertips
+  profiles, APS tables, Business Demography, multi-year GVA sheets) in one
+  task run: ``columns`` maps each value column to an ``IndicatorColumn``,
+  and every column is melted into rows in one vectorised step.
+  ``normalise_to_indicator`` is the one-column case.
+* A column's period is either fixed (``IndicatorColumn.reference_period``,
+  e.g. a ``"2021"`` column of a GVA sheet) or read per row from
+  ``period_col``, whose labels go through ``utils.periods.parse_periods``.
+* Values are parsed in the same pass: suppression markers
+  (``SUPPRESSION_MARKERS``, shared with ``utils.readers``) become ``NULL``,
+  thousands separators are dropped, and any other text is an error rather
+  than a silent ``NULL``.
 """
 
 from __future__ import annotations
 
+from collections.abc import Collection, Mapping
+from dataclasses import dataclass
 from datetime import date
 
+import numpy as np
+import numpy.typing as npt
 import pandas as pd
 from prefect import task
 
+from yhovi_pipeline.db.batch import IndicatorBatch
+from yhovi_pipeline.utils.instrumentation import instrumented
+from yhovi_pipeline.utils.periods import parse_periods
+from yhovi_pipeline.utils.readers import SUPPRESSION_MARKERS
+from yhovi_pipeline.utils.results import ARROW_SERIALIZER, TRANSFORM_CACHE_POLICY
+
+
+@dataclass(frozen=True)
+class IndicatorColumn:
+    """How one value column of a source table maps onto ``Indicator`` rows."""
+
+    indicator_id: str
+    """Machine-readable indicator identifier."""
+
+    indicator_name: str
+    """Human-readable indicator name."""
+
+    unit: str | None = None
+    """Unit of measurement."""
+
+    reference_period: date | None = None
+    """Period of every value in the column; ``None`` reads it from ``period_col``."""
+
 
 @task(
     name="transform/normalise/to-indicator",
     description="Normalise a source DataFrame to the canonical Indicator schema.",
+    persist_result=True,
+    result_serializer=ARROW_SERIALIZER,
+    cache_policy=TRANSFORM_CACHE_POLICY,
 )
+@instrumented
 def normalise_to_indicator(
     df: pd.DataFrame,
     indicator_id: str,
@@ -27,9 +75,12 @@ def normalise_to_indicator(
     lad_name_col: str,
     value_col: str,
     unit: str | None = None,
-) -> pd.DataFrame:
+) -> IndicatorBatch:
     """Map source-specific columns to the canonical ``Indicator`` schema.
 
+    Row-local, so it can be applied batch by batch in streaming mode
+    (``utils.streaming.map_batches``).
+
     Args:
         df: Input DataFrame from the validate step.
         indicator_id: Machine-readable indicator identifier.
@@ -43,7 +94,173 @@ def normalise_to_indicator(
         unit: Optional unit of measurement.
 
     Returns:
-        DataFrame with columns matching the ``Indicator`` ORM model.
+        Batch with one row per input row that has a LAD code.  Missing
+        values and suppression markers are loaded as ``NULL``.
+
+    Raises:
+        ValueError: If a value is neither numeric nor a suppression marker.
+    """
+    return _melt(
+        df,
+        columns={value_col: IndicatorColumn(indicator_id, indicator_name, unit, reference_period)},
+        source=source,
+        dataset_code=dataset_code,
+        lad_col=lad_col,
+        lad_name_col=lad_name_col,
+    )
+
+
+@task(
+    name="transform/normalise/wide-to-indicator",
+    description="Melt a wide source DataFrame into Indicator rows for many indicators at once.",
+    persist_result=True,
+    result_serializer=ARROW_SERIALIZER,
+    cache_policy=TRANSFORM_CACHE_POLICY,
+)
+@instrumented
+def normalise_wide_to_indicator(
+    df: pd.DataFrame,
+    columns: Mapping[str, IndicatorColumn],
+    source: str,
+    dataset_code: str,
+    lad_col: str,
+    lad_name_col: str,
+    period_col: str | None = None,
+    suppression_markers: Collection[str] = SUPPRESSION_MARKERS,
+) -> IndicatorBatch:
+    """Melt every mapped value column of a wide table into ``Indicator`` rows.
+
+    Row-local, so it can be applied batch by batch in streaming mode.
+
+    Args:
+        df: Input DataFrame from the validate step.
+        columns: Value column name → the indicator (and optionally the
+            period) its values belong to.  Unmapped columns are ignored.
+        source: Source system identifier (e.g. ``"fingertips"``).
+        dataset_code: Dataset / series code within the source.
+        lad_col: Column name for LAD GSS code.
+        lad_name_col: Column name for LAD name.
+        period_col: Column holding each row's period label (any format
+            ``utils.periods`` recognises), for columns without a fixed
+            ``reference_period``.
+        suppression_markers: Values loaded as ``NULL``.
+
+    Returns:
+        Batch with one row per mapped column per input row that has a LAD
+        code (and a period, when ``period_col`` is used), column by column.
+
+    Raises:
+        ValueError: If ``columns`` is empty, names a missing column, needs
+            ``period_col`` without one being given, a period label is not
+            recognised, or a value is neither numeric nor a suppression
+            marker.
+    """
+    return _melt(
+        df, columns, source, dataset_code, lad_col, lad_name_col, period_col, suppression_markers
+    )
+
+
+def parse_values(
+    values: pd.Series, suppression_markers: Collection[str] = SUPPRESSION_MARKERS
+) -> npt.NDArray[np.float64]:
+    """Parse source values to ``float64``, turning suppression markers into ``NaN``.
+
+    Raises:
+        ValueError: If a value is neither numeric nor a suppression marker.
+    """
+    if pd.api.types.is_numeric_dtype(values.dtype):
+        numeric: npt.NDArray[np.float64] = values.to_numpy(dtype=np.float64, na_value=np.nan)
+        return numeric
+    text = values.astype("str").str.strip()
+    markers = {marker.lower() for marker in suppression_markers}
+    suppressed = text.isna() | text.str.lower().isin(markers)
+    parsed = pd.to_numeric(text.mask(suppressed).str.replace(",", "", regex=False), errors="coerce")
+    invalid = parsed.isna() & ~suppressed
+    if invalid.any():
+        examples = sorted(set(text[invalid]))[:5]
+        raise ValueError(
+            f"{int(invalid.sum())} values are neither numeric nor suppressed: {examples}"
+        )
+    result: npt.NDArray[np.float64] = parsed.to_numpy(dtype=np.float64, na_value=np.nan)
+    return result
+
+
+def _melt(
+    df: pd.DataFrame,
+    columns: Mapping[str, IndicatorColumn],
+    source: str,
+    dataset_code: str,
+    lad_col: str,
+    lad_name_col: str,
+    period_col: str | None = None,
+    suppression_markers: Collection[str] = SUPPRESSION_MARKERS,
+) -> IndicatorBatch:
+    """Body of both normalise tasks (see ``normalise_wide_to_indicator``).
+
+    Kept outside the tasks so that ``normalise_to_indicator`` records one
+    instrumented stage, not a nested second one.
     """
-    # TODO: implement — rename columns, set constants, handle nulls
-    raise NotImplementedError("normalise_to_indicator not yet implemented")
+    if not columns:
+        raise ValueError("columns must map at least one value column")
+    needs_period = any(spec.reference_period is None for spec in columns.values())
+    if needs_period and period_col is None:
+        raise ValueError("period_col is required for columns without a reference_period")
+    wanted = [*columns, lad_col, lad_name_col, *([period_col] if period_col else [])]
+    missing = [col for col in wanted if col not in df.columns]
+    if missing:
+        raise ValueError(f"DataFrame is missing columns: {missing}")
+
+    keep = df[lad_col].notna()
+    if needs_period and period_col is not None:
+        keep &= df[period_col].notna()
+    frame = df.loc[keep]
+    rows, width = len(frame), len(columns)
+    specs = list(columns.values())
+
+    row_periods: npt.NDArray[np.datetime64] | None = None
+    if needs_period and period_col is not None:
+        row_periods = parse_periods(frame[period_col]).start
+    reference_period = np.concatenate(
+        [
+            np.full(rows, np.datetime64(spec.reference_period, "D"))
+            if spec.reference_period is not None
+            else row_periods
+            for spec in specs
+        ]
+        or [np.array([], dtype="datetime64[D]")]
+    )
+
+    value = parse_values(
+        pd.concat([frame[col] for col in columns], ignore_index=True), suppression_markers
+    )
+    return IndicatorBatch(
+        strings={
+            "indicator_id": _per_column([spec.indicator_id for spec in specs], rows),
+            "indicator_name": _per_column([spec.indicator_name for spec in specs], rows),
+            "lad_code": _tiled(frame[lad_col], width),
+            "lad_name": _tiled(frame[lad_name_col], width),
+            "unit": _per_column([spec.unit for spec in specs], rows),
+            "source": _constant(source, rows * width),
+            "dataset_code": _constant(dataset_code, rows * width),
+        },
+        reference_period=reference_period,
+        value=value,
+        value_missing=np.isnan(value),
+    )
+
+
+def _per_column(values: list[str | None], rows: int) -> pd.Categorical:
+    """Return a categorical holding ``values[i]`` for the ``i``-th block of ``rows``."""
+    per_column = pd.Categorical(values)
+    return pd.Categorical.from_codes(np.repeat(per_column.codes, rows), dtype=per_column.dtype)
+
+
+def _tiled(column: pd.Series, width: int) -> pd.Categorical:
+    """Return ``column`` as a categorical repeated ``width`` times."""
+    encoded = pd.Categorical(column)
+    return pd.Categorical.from_codes(np.tile(encoded.codes, width), dtype=encoded.dtype)
+
+
+def _constant(value: str | None, rows: int) -> pd.Categorical:
+    """Return a categorical repeating ``value`` (``None`` → all missing)."""
+    return _per_column([value], rows)
@@ -1,19 +1,77 @@
 """Data validation transform tasks.
 
 Validates raw extracted DataFrames against expected schemas and business rules
-before passing them to the normalise step.
+before passing them to the normalise step.  All three tasks run a
+``utils.validation.RuleSet``; ``validate_dataset`` takes a dataset's full
+rule set so every check runs in one task and one pass over the frame.
+
+Design notes
+------------
+* ``validate_schema`` and ``validate_yorkshire_lads`` build their rule sets
+  once per argument combination (``functools.lru_cache``), not once per
+  call or streamed batch.
+* A report with a failed or skipped rule is published as a
+  ``validation-<dataset>`` table artifact when running inside a flow, and
+  failed warnings are logged; clean reports are only logged at debug level
+  so that streamed batches stay quiet.
 """
 
 from __future__ import annotations
 
+import functools
+
 import pandas as pd
 from prefect import task
+from prefect.runtime import flow_run
+
+from yhovi_pipeline.utils.instrumentation import instrumented
+from yhovi_pipeline.utils.logging import get_logger
+from yhovi_pipeline.utils.results import ARROW_SERIALIZER, VALIDATE_CACHE_POLICY
+from yhovi_pipeline.utils.validation import (
+    RequiredColumns,
+    RuleSet,
+    ValidationReport,
+    YorkshireLads,
+    publish_report_artifact,
+)
+
+
+@task(
+    name="transform/validate/dataset",
+    description="Run a dataset's validation rules over a DataFrame in one pass.",
+    persist_result=True,
+    result_serializer=ARROW_SERIALIZER,
+    cache_policy=VALIDATE_CACHE_POLICY,
+)
+@instrumented
+def validate_dataset(df: pd.DataFrame, rules: RuleSet) -> pd.DataFrame:
+    """Check ``df`` against every rule of ``rules``.
+
+    Row-local, so it can be applied batch by batch in streaming mode
+    (``utils.streaming.map_batches``).
+
+    Args:
+        df: The raw extracted DataFrame to validate.
+        rules: The dataset's rule set, built once at module level.
+
+    Returns:
+        The input DataFrame unchanged.
+
+    Raises:
+        ValueError: If any ``"error"`` rule fails.
+    """
+    _report(rules.validate(df)).raise_for_errors()
+    return df
 
 
 @task(
     name="transform/validate/schema",
     description="Validate a raw extracted DataFrame against the expected schema.",
+    persist_result=True,
+    result_serializer=ARROW_SERIALIZER,
+    cache_policy=VALIDATE_CACHE_POLICY,
 )
+@instrumented
 def validate_schema(
     df: pd.DataFrame,
     required_columns: list[str],
@@ -21,6 +79,9 @@ def validate_schema(
 ) -> pd.DataFrame:
     """Check that a DataFrame has the required columns and non-zero rows.
 
+    Row-local, so it can be applied batch by batch in streaming mode
+    (``utils.streaming.map_batches``).
+
     Args:
         df: The raw extracted DataFrame to validate.
         required_columns: List of column names that must be present.
@@ -32,14 +93,18 @@ def validate_schema(
     Raises:
         ValueError: If required columns are missing or the DataFrame is empty.
     """
-    # TODO: implement
-    raise NotImplementedError("validate_schema not yet implemented")
+    _report(_schema_rules(source, tuple(required_columns)).validate(df)).raise_for_errors()
+    return df
 
 
 @task(
     name="transform/validate/yorkshire-lads",
     description="Check that all expected Yorkshire LAD codes are present in the data.",
+    persist_result=True,
+    result_serializer=ARROW_SERIALIZER,
+    cache_policy=VALIDATE_CACHE_POLICY,
 )
+@instrumented
 def validate_yorkshire_lads(df: pd.DataFrame, lad_col: str = "lad_code") -> pd.DataFrame:
     """Warn (but do not fail) if any expected Yorkshire LAD codes are absent.
 
@@ -50,5 +115,27 @@ def validate_yorkshire_lads(df: pd.DataFrame, lad_col: str = "lad_code") -> pd.D
     Returns:
         The input DataFrame unchanged.
     """
-    # TODO: implement — compare df[lad_col].unique() against YORKSHIRE_LAD_CODES
-    raise NotImplementedError("validate_yorkshire_lads not yet implemented")
+    _report(_yorkshire_rules(lad_col).validate(df))
+    return df
+
+
+@functools.lru_cache(maxsize=256)
+def _schema_rules(source: str, required_columns: tuple[str, ...]) -> RuleSet:
+    return RuleSet(source, [RequiredColumns(required_columns, non_empty=True)])
+
+
+@functools.lru_cache(maxsize=16)
+def _yorkshire_rules(lad_col: str) -> RuleSet:
+    return RuleSet(lad_col, [YorkshireLads(lad_col, require_all=True, severity="warning")])
+
+
+def _report(report: ValidationReport) -> ValidationReport:
+    """Log a report and publish it as an artifact if any rule failed or was skipped."""
+    logger = get_logger(__name__)
+    logger.debug(report.summary())
+    for result in report.warnings:
+        logger.warning("%s: %s failed (%s)", report.dataset, result.rule, result.detail)
+    noteworthy = any(r.skipped or not r.passed for r in report.results)
+    if noteworthy and flow_run.get_id() is not None:
+        publish_report_artifact(report)
+    return report
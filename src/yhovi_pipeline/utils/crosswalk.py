@@ -0,0 +1,226 @@
+"""Re-basing historical series onto the current geography.
+
+Sources publish history on the boundaries in force at the time and new data
+on the current ones — e.g. the seven North Yorkshire districts
+(``E07000163``-``E07000169``) up to March 2023 and the unitary authority
+``E06000065`` after.  ``Crosswalk`` re-bases a whole long-format series (all
+indicators and periods at once) onto the current codes, so trend queries
+never remap rows at read time.
+
+Design notes
+------------
+* The ``GeoCrosswalk`` rows of one level form a sparse ``new x old`` weight
+  matrix.  Input rows on old codes are scattered into a sparse
+  ``old x series`` matrix (a series is one combination of ``series_cols``,
+  e.g. indicator and period), so re-basing everything is one sparse matmul.
+* Counts are re-based as ``Σ w·x``.  Rates and percentages are recomputed as
+  ``Σ w·d·x / Σ w·d`` with ``d`` an optional per-area denominator (e.g.
+  population); without one, the crosswalk weights alone weight the mean.
+* A new area is only produced for a series when every old area mapping into
+  it reported (``min_coverage``), so a total is never silently short.  Where
+  the source already published the new area for a series, its own value
+  wins over the re-based one.
+* Mappings must point straight at the current geography; chains
+  (old → intermediate → current) are not followed.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+from typing import Literal
+
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+from scipy import sparse
+from sqlalchemy import Connection, select
+
+from yhovi_pipeline.db.models import GeoCrosswalk
+from yhovi_pipeline.db.session import get_engine
+
+Kind = Literal["count", "rate"]
+
+#: Tolerance when checking that each old area's weights sum to 1.
+WEIGHT_TOLERANCE = 1e-6
+
+
+@dataclass(frozen=True)
+class Crosswalk:
+    """Sparse old → new mapping for one geography level.
+
+    Build with ``Crosswalk.from_frame`` or ``get_crosswalk()``.
+    """
+
+    from_codes: npt.NDArray[np.str_]
+    """Sorted old codes (matrix columns)."""
+
+    to_codes: npt.NDArray[np.str_]
+    """Sorted new codes (matrix rows)."""
+
+    to_names: npt.NDArray[np.object_]
+    """Names of ``to_codes``."""
+
+    weights: sparse.csr_matrix
+    """``len(to_codes) x len(from_codes)`` allocation weights."""
+
+    @classmethod
+    def from_frame(cls, frame: pd.DataFrame) -> Crosswalk:
+        """Compile a crosswalk from ``from_code`` / ``to_code`` / ``to_name`` / ``weight`` rows.
+
+        Raises:
+            ValueError: If a column is missing, a weight is not positive, or
+                an old code's weights do not sum to 1.
+        """
+        missing = {"from_code", "to_code", "to_name", "weight"} - set(frame.columns)
+        if missing:
+            raise ValueError(f"Crosswalk is missing columns: {sorted(missing)}")
+        weight = frame["weight"].to_numpy(dtype=np.float64)
+        if (weight <= 0).any():
+            raise ValueError("Crosswalk weights must be positive")
+        totals = frame.groupby("from_code")["weight"].sum()
+        unbalanced = totals[(totals - 1.0).abs() > WEIGHT_TOLERANCE]
+        if not unbalanced.empty:
+            raise ValueError(f"Crosswalk weights do not sum to 1 for {list(unbalanced.index)}")
+
+        from_codes, from_ids = np.unique(
+            frame["from_code"].to_numpy(dtype=str), return_inverse=True
+        )
+        to_codes, first, to_ids = np.unique(
+            frame["to_code"].to_numpy(dtype=str), return_index=True, return_inverse=True
+        )
+        weights = sparse.csr_matrix(
+            (weight, (to_ids, from_ids)), shape=(len(to_codes), len(from_codes))
+        )
+        return cls(
+            from_codes=from_codes,
+            to_codes=to_codes,
+            to_names=frame["to_name"].to_numpy(dtype=object)[first],
+            weights=weights,
+        )
+
+    def rebase(
+        self,
+        df: pd.DataFrame,
+        kind: Kind = "count",
+        value_col: str = "value",
+        code_col: str = "lad_code",
+        name_col: str | None = "lad_name",
+        series_cols: Sequence[str] = ("indicator_id", "reference_period"),
+        denominators: Mapping[str, float] | pd.Series | None = None,
+        min_coverage: float = 1.0,
+    ) -> pd.DataFrame:
+        """Return ``df`` with every row on an old code replaced by current-code rows.
+
+        Args:
+            df: Long-format rows, one per area and series.
+            kind: ``"count"`` to sum, ``"rate"`` to recompute a weighted mean.
+            value_col: Column holding the values.
+            code_col: Column holding the area codes.
+            name_col: Column holding area names, filled for re-based rows.
+            series_cols: Columns identifying a series; any other column is
+                copied from the series' first row (e.g. ``unit``, ``source``).
+            denominators: Per-old-area denominators for ``"rate"``, keyed by
+                code (e.g. population); areas without one count as 1.
+            min_coverage: Share of a new area's total weight that must have
+                reported for it to be produced.
+
+        Returns:
+            Rows already on current codes, unchanged, followed by the
+            re-based rows.  Rows for old codes never appear in the output.
+        """
+        series_cols = list(series_cols)
+        on_old = df[code_col].isin(self.from_codes).to_numpy()
+        direct = df.loc[~on_old]
+        # Missing values count as "not reported" for the coverage check.
+        source = df.loc[on_old & df[value_col].notna().to_numpy()]
+        if source.empty:
+            return direct.reset_index(drop=True)
+
+        series_ids = source.groupby(series_cols, sort=False, dropna=False).ngroup().to_numpy()
+        n_series = int(series_ids.max()) + 1
+        area_ids = np.searchsorted(self.from_codes, source[code_col].to_numpy(dtype=str))
+        shape = (len(self.from_codes), n_series)
+
+        def scatter(values: npt.NDArray[np.float64]) -> sparse.csr_matrix:
+            return sparse.csr_matrix((values, (area_ids, series_ids)), shape=shape)
+
+        values = source[value_col].to_numpy(dtype=np.float64)
+        ones = np.ones(len(source))
+        if denominators is not None:
+            weight = (
+                pd.Series(denominators, dtype=np.float64)
+                .reindex(source[code_col].to_numpy())
+                .fillna(1.0)
+                .to_numpy()
+            )
+        else:
+            weight = ones
+
+        reported = self.weights @ scatter(ones)
+        expected = np.asarray(self.weights.sum(axis=1)).ravel()
+        if kind == "count":
+            totals = self.weights @ scatter(values)
+            divisor = None
+        else:
+            totals = self.weights @ scatter(values * weight)
+            divisor = self.weights @ scatter(weight)
+
+        # Every (new area, series) cell that received any input.
+        cells = reported.tocoo()
+        rows, cols = cells.row, cells.col
+        coverage = cells.data / expected[rows]
+        keep = coverage >= min_coverage - WEIGHT_TOLERANCE
+        rows, cols = rows[keep], cols[keep]
+        if not len(rows):
+            return direct.reset_index(drop=True)
+
+        result = np.asarray(totals[rows, cols]).ravel()
+        if divisor is not None:
+            with np.errstate(invalid="ignore", divide="ignore"):
+                denom = np.asarray(divisor[rows, cols]).ravel()
+                result = np.where(denom > 0, result / denom, np.nan)
+
+        _, first_rows = np.unique(series_ids, return_index=True)
+        rebased = source.iloc[first_rows[cols]].reset_index(drop=True)
+        rebased[code_col] = self.to_codes[rows]
+        if name_col is not None and name_col in rebased.columns:
+            rebased[name_col] = self.to_names[rows]
+        rebased[value_col] = result
+
+        # A value published directly on the new boundary wins.
+        key = [code_col, *series_cols]
+        published = pd.MultiIndex.from_frame(direct[key])
+        rebased = rebased.loc[~pd.MultiIndex.from_frame(rebased[key]).isin(published)]
+        return pd.concat([direct, rebased], ignore_index=True)
+
+
+def load_crosswalk(connection: Connection, level: str = "lad") -> Crosswalk:
+    """Read the ``GeoCrosswalk`` rows of ``level`` on ``connection``."""
+    frame = pd.read_sql(select(GeoCrosswalk).where(GeoCrosswalk.level == level), connection)
+    return Crosswalk.from_frame(frame)
+
+
+def crosswalk_digest(level: str = "lad") -> str:
+    """Return a content hash of the ``GeoCrosswalk`` rows of ``level``.
+
+    Reads only the mapping columns, ordered, so it is cheap enough to key a
+    task cache on (a level holds a few dozen mappings).
+    """
+    query = (
+        select(
+            GeoCrosswalk.from_code, GeoCrosswalk.to_code, GeoCrosswalk.to_name, GeoCrosswalk.weight
+        )
+        .where(GeoCrosswalk.level == level)
+        .order_by(GeoCrosswalk.from_code, GeoCrosswalk.to_code)
+    )
+    with get_engine().connect() as connection:
+        rows = connection.execute(query).all()
+    return hashlib.sha256(repr([tuple(row) for row in rows]).encode()).hexdigest()
+
+
+def get_crosswalk(level: str = "lad") -> Crosswalk:
+    """Read the ``GeoCrosswalk`` rows of ``level`` from the data warehouse."""
+    with get_engine().connect() as connection:
+        return load_crosswalk(connection, level)
@@ -0,0 +1,252 @@
+"""Dependency-aware concurrent runner for flow-of-flows orchestration.
+
+Runs a set of named steps as a DAG: a step starts as soon as every step it
+depends on has succeeded, independent steps run concurrently on a thread
+pool, and per-source limits cap how many running steps may hit the same
+upstream API at once.  At the end a ``DagRunSummary`` reports per-step
+timings and the critical path — the chain of dependent steps that
+determined the total wall-clock time.
+
+Design notes
+------------
+* Scheduling decisions are made on the calling thread, so a step is only
+  submitted when both a worker and all of its sources' slots are free — a
+  worker never sits blocked waiting for a source slot.
+* Each step runs in a copy of the caller's ``contextvars`` context, so
+  Prefect flows called from a step are recorded as sub-flows of the parent.
+* A failed step marks every step downstream of it as skipped; unrelated
+  branches keep running.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import time
+from collections import Counter
+from collections.abc import Callable, Iterable, Mapping
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from enum import StrEnum
+
+
+class StepStatus(StrEnum):
+    """Outcome of one DAG step."""
+
+    SUCCESS = "success"
+    FAILED = "failed"
+    SKIPPED = "skipped"
+
+
+@dataclass(frozen=True)
+class DagStep:
+    """One unit of work in the DAG."""
+
+    name: str
+    run: Callable[[], object]
+    sources: tuple[str, ...] = ()
+    """Upstream sources the step calls; each holds one slot of that source's limit."""
+
+    depends_on: tuple[str, ...] = ()
+    """Names of steps that must succeed before this one starts."""
+
+
+@dataclass(frozen=True)
+class StepTiming:
+    """Timing and outcome of one step, relative to the start of the run."""
+
+    name: str
+    status: StepStatus
+    started: float = 0.0
+    finished: float = 0.0
+    error: str | None = None
+
+    @property
+    def duration(self) -> float:
+        """Seconds the step spent running."""
+        return self.finished - self.started
+
+
+@dataclass
+class DagRunSummary:
+    """Result of ``run_dag``."""
+
+    timings: dict[str, StepTiming]
+    wall_seconds: float
+    critical_path: list[str] = field(default_factory=list)
+
+    @property
+    def failed(self) -> list[str]:
+        """Names of steps that raised."""
+        return [t.name for t in self.timings.values() if t.status is StepStatus.FAILED]
+
+    @property
+    def skipped(self) -> list[str]:
+        """Names of steps not run because an upstream step failed."""
+        return [t.name for t in self.timings.values() if t.status is StepStatus.SKIPPED]
+
+    def format(self) -> str:
+        """Render a human-readable timing table and critical path."""
+        lines = [f"Full refresh finished in {self.wall_seconds:.1f}s"]
+        for timing in sorted(self.timings.values(), key=lambda t: (t.started, t.name)):
+            lines.append(
+                f"  {timing.name:<40} {timing.status.value:<8} "
+                f"start +{timing.started:7.1f}s  took {timing.duration:7.1f}s"
+            )
+        if self.critical_path:
+            path = " -> ".join(
+                f"{name} ({self.timings[name].duration:.1f}s)" for name in self.critical_path
+            )
+            total = sum(self.timings[name].duration for name in self.critical_path)
+            lines.append(f"Critical path ({total:.1f}s): {path}")
+        return "\n".join(lines)
+
+
+def run_dag(
+    steps: Iterable[DagStep],
+    max_workers: int,
+    source_limits: Mapping[str, int] | None = None,
+    default_source_limit: int = 1,
+) -> DagRunSummary:
+    """Run ``steps`` concurrently in dependency order.
+
+    Args:
+        steps: Steps to run.  Names must be unique.
+        max_workers: Maximum number of steps running at once.
+        source_limits: Maximum concurrent steps per source name.
+        default_source_limit: Limit for sources absent from ``source_limits``.
+
+    Returns:
+        Per-step timings and the critical path.  Step failures are reported
+        in the summary rather than raised.
+
+    Raises:
+        ValueError: If step names repeat, a dependency is unknown, the graph
+            has a cycle, or a limit is not positive.
+    """
+    steps = list(steps)
+    duplicates = sorted(name for name, n in Counter(s.name for s in steps).items() if n > 1)
+    if duplicates:
+        raise ValueError(f"DAG step names must be unique; repeated: {duplicates}")
+    graph = {step.name: step for step in steps}
+    _validate(graph, max_workers, source_limits or {}, default_source_limit)
+    limits = dict(source_limits or {})
+
+    def limit(source: str) -> int:
+        return limits.get(source, default_source_limit)
+
+    timings: dict[str, StepTiming] = {}
+    pending = dict(graph)
+    running: dict[Future[object], tuple[DagStep, float]] = {}
+    in_use: Counter[str] = Counter()
+    start = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="dag") as pool:
+        while pending or running:
+            # Skip anything whose upstream failed or was itself skipped.  Repeat
+            # until nothing changes so a skip reaches every descendant whatever
+            # order the steps were declared in.
+            skipped_any = True
+            while skipped_any:
+                skipped_any = False
+                for name, step in list(pending.items()):
+                    if any(
+                        dep in timings and timings[dep].status is not StepStatus.SUCCESS
+                        for dep in step.depends_on
+                    ):
+                        timings[name] = StepTiming(name, StepStatus.SKIPPED)
+                        del pending[name]
+                        skipped_any = True
+
+            for name, step in sorted(pending.items()):
+                if len(running) >= max_workers:
+                    break
+                deps_done = all(
+                    dep in timings and timings[dep].status is StepStatus.SUCCESS
+                    for dep in step.depends_on
+                )
+                slots_free = all(in_use[src] < limit(src) for src in step.sources)
+                if deps_done and slots_free:
+                    in_use.update(step.sources)
+                    context = contextvars.copy_context()
+                    future = pool.submit(context.run, step.run)
+                    running[future] = (step, time.perf_counter() - start)
+                    del pending[name]
+
+            if not running:
+                continue
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                step, started = running.pop(future)
+                in_use.subtract(step.sources)
+                error = future.exception()
+                timings[step.name] = StepTiming(
+                    name=step.name,
+                    status=StepStatus.FAILED if error else StepStatus.SUCCESS,
+                    started=started,
+                    finished=time.perf_counter() - start,
+                    error=f"{type(error).__name__}: {error}" if error else None,
+                )
+
+    return DagRunSummary(
+        timings=timings,
+        wall_seconds=time.perf_counter() - start,
+        critical_path=_critical_path(graph, timings),
+    )
+
+
+def _validate(
+    graph: Mapping[str, DagStep],
+    max_workers: int,
+    source_limits: Mapping[str, int],
+    default_source_limit: int,
+) -> None:
+    """Reject malformed graphs before anything runs."""
+    if max_workers < 1 or default_source_limit < 1 or any(v < 1 for v in source_limits.values()):
+        raise ValueError("max_workers and source limits must be positive")
+
+    for step in graph.values():
+        unknown = set(step.depends_on) - graph.keys()
+        if unknown:
+            raise ValueError(f"Step {step.name!r} depends on unknown steps {sorted(unknown)}")
+
+    visiting: set[str] = set()
+    visited: set[str] = set()
+
+    def visit(name: str) -> None:
+        if name in visited:
+            return
+        if name in visiting:
+            raise ValueError(f"DAG has a dependency cycle through {name!r}")
+        visiting.add(name)
+        for dep in graph[name].depends_on:
+            visit(dep)
+        visiting.discard(name)
+        visited.add(name)
+
+    for name in graph:
+        visit(name)
+
+
+def _critical_path(graph: Mapping[str, DagStep], timings: Mapping[str, StepTiming]) -> list[str]:
+    """Return the dependency chain with the greatest total run time."""
+    cost: dict[str, float] = {}
+    via: dict[str, str | None] = {}
+
+    def path_cost(name: str) -> float:
+        if name not in cost:
+            best_dep = max(graph[name].depends_on, key=path_cost, default=None)
+            via[name] = best_dep
+            cost[name] = timings[name].duration + (path_cost(best_dep) if best_dep else 0.0)
+        return cost[name]
+
+    ran = [name for name, t in timings.items() if t.status is not StepStatus.SKIPPED]
+    if not ran:
+        return []
+
+    tail: str | None = max(ran, key=path_cost)
+    path: list[str] = []
+    while tail is not None:
+        path.append(tail)
+        tail = via[tail]
+    return path[::-1]
@@ -0,0 +1,270 @@
+"""Compiled integer index over the ONS geography hierarchy.
+
+``GeoIndex`` turns the string-keyed ``GeoLookup`` frame into sorted code
+arrays and dense integer parent arrays.  Aggregating LSOA or MSOA data to a
+coarser level then reduces to an integer lookup (codes → ids) and a
+``bincount`` per value column, which is far cheaper in time and memory than
+a string merge followed by ``groupby``.
+
+Design notes
+------------
+* Ids are positions in the sorted, de-duplicated code array of each level.
+  GSS codes are packed into order-preserving ``int64`` keys (6 bits per
+  character), and a whole column of codes is resolved with one integer
+  hash lookup (``pd.Index.get_indexer``) rather than a string merge.
+* Parent arrays are ``int32`` and map every LSOA (and MSOA, LAD) id to the id
+  of its MSOA, LAD and region.  Region ids are ``-1`` where ``GeoLookup``
+  has no region.
+* Unknown codes resolve to ``-1`` and are dropped from aggregates; callers
+  get the count back so they can log or fail on it.
+* Missing values are ignored by ``mean`` and ``weighted_mean`` (each column
+  uses its own non-missing rows) and treated as zero by ``sum``.
+"""
+
+from __future__ import annotations
+
+import functools
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Literal
+
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+
+from yhovi_pipeline.utils.geo_lookups import GeoSnapshot, get_geo_snapshot
+
+Level = Literal["lsoa", "msoa", "lad", "region"]
+
+#: Geography levels in ``GeoLookup``, finest first.
+LEVELS: tuple[Level, ...] = ("lsoa", "msoa", "lad", "region")
+Aggregation = Literal["sum", "mean", "weighted_mean"]
+
+IntArray = npt.NDArray[np.int32]
+
+
+def gss_keys(codes: npt.ArrayLike | pd.Series) -> npt.NDArray[np.int64]:
+    """Pack 9-character GSS codes into order-preserving ``int64`` keys.
+
+    Each character (``0-9``, ``A-Z``) takes 6 bits, so comparing and
+    looking up keys is plain integer work instead of string hashing.  Codes
+    that are not 9 characters of that alphabet map to ``-1``.
+    """
+    raw = _arrow_code_bytes(codes)
+    if raw is None:
+        padded = np.asarray(codes, dtype="S10").view(np.uint8).reshape(-1, 10)
+        raw, invalid = padded[:, :9], padded[:, 9] != 0
+    else:
+        invalid = np.zeros(len(raw), dtype=bool)
+
+    keys = np.zeros(len(raw), dtype=np.int64)
+    for position in range(9):
+        # uint8 wrap-around sends bytes below "0" above 64 as well.
+        char = raw[:, position] - np.uint8(ord("0"))
+        invalid |= char >= 64
+        keys = (keys << 6) | char
+    return np.where(invalid, -1, keys)
+
+
+def _arrow_code_bytes(codes: object) -> npt.NDArray[np.uint8] | None:
+    """View Arrow-backed 9-character codes as an ``(n, 9)`` byte array, without copying.
+
+    pandas stores ``str`` columns in Arrow buffers; when every value is
+    exactly 9 bytes the data buffer already is the fixed-width matrix.
+    Returns ``None`` for anything else (nulls, other widths, NumPy storage).
+    """
+    if not isinstance(codes, pd.Series) or getattr(codes.dtype, "storage", None) != "pyarrow":
+        return None
+    import pyarrow as pa
+
+    array = pa.array(codes)
+    if isinstance(array, pa.ChunkedArray):
+        array = array.combine_chunks()
+    if len(array) == 0 or array.null_count:
+        return None
+    offset_type = np.int64 if pa.types.is_large_string(array.type) else np.int32
+    _, offsets_buffer, data_buffer = array.buffers()
+    offsets = np.frombuffer(offsets_buffer, dtype=offset_type)
+    offsets = offsets[array.offset : array.offset + len(array) + 1]
+    if not (np.diff(offsets) == 9).all():
+        return None
+    data = np.frombuffer(data_buffer, dtype=np.uint8)[offsets[0] : offsets[-1]]
+    return data.reshape(-1, 9)
+
+
+@dataclass(frozen=True)
+class GeoLevel:
+    """Sorted codes and names of one geography level."""
+
+    codes: npt.NDArray[np.str_]
+    names: npt.NDArray[np.object_]
+    keys: npt.NDArray[np.int64]
+    """``gss_keys(codes)`` — sorted, since the packing preserves order."""
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def ids(self, codes: npt.ArrayLike | pd.Series) -> IntArray:
+        """Map GSS codes to dense ids; unknown codes map to ``-1``."""
+        keys = gss_keys(codes)
+        return np.asarray(self._key_index.get_indexer(keys), dtype=np.int32)
+
+    @functools.cached_property
+    def _key_index(self) -> pd.Index:
+        """Hash index over ``keys`` for O(1) lookups."""
+        return pd.Index(self.keys)
+
+
+@dataclass(frozen=True)
+class GeoIndex:
+    """Integer-coded LSOA → MSOA → LAD → Region hierarchy.
+
+    Build with ``GeoIndex.from_lookup`` (or ``get_geo_index()`` for the
+    process-wide instance built from ``GeoLookup``).
+    """
+
+    levels: dict[str, GeoLevel]
+    """Codes and names per level, keyed by ``LEVELS`` entries."""
+
+    parents: dict[tuple[str, str], IntArray]
+    """``parents[(child, parent)][child_id]`` is the id of the parent area."""
+
+    @classmethod
+    def from_lookup(cls, lookup: pd.DataFrame) -> GeoIndex:
+        """Compile an index from a ``get_geo_lookup()``-shaped frame.
+
+        Args:
+            lookup: One row per LSOA with ``<level>_code`` / ``<level>_name``
+                columns for every level in ``LEVELS``.
+
+        Raises:
+            ValueError: If a required column is missing or an LSOA repeats.
+        """
+        required = [f"{level}_{part}" for level in LEVELS for part in ("code", "name")]
+        missing = set(required) - set(lookup.columns)
+        if missing:
+            raise ValueError(f"Geo lookup is missing columns: {sorted(missing)}")
+        if lookup["lsoa_code"].duplicated().any():
+            raise ValueError("Geo lookup has duplicate lsoa_code values")
+
+        levels: dict[str, GeoLevel] = {}
+        lsoa_to: dict[str, IntArray] = {}
+        for level in LEVELS:
+            codes = lookup[f"{level}_code"]
+            present = codes.notna().to_numpy()
+            unique, first, inverse = np.unique(
+                codes[present].to_numpy(dtype=str), return_index=True, return_inverse=True
+            )
+            names = lookup.loc[present, f"{level}_name"].to_numpy(dtype=object)[first]
+            keys = gss_keys(unique)
+            if (keys < 0).any():
+                raise ValueError(f"Geo lookup has malformed {level}_code values")
+            levels[level] = GeoLevel(codes=unique, names=names, keys=keys)
+
+            ids = np.full(len(lookup), -1, dtype=np.int32)
+            ids[present] = inverse
+            lsoa_to[level] = ids
+
+        parents: dict[tuple[str, str], IntArray] = {}
+        for i, child in enumerate(LEVELS):
+            child_ids = lsoa_to[child]
+            has_child = child_ids >= 0
+            for parent in LEVELS[i + 1 :]:
+                mapping = np.full(len(levels[child]), -1, dtype=np.int32)
+                mapping[child_ids[has_child]] = lsoa_to[parent][has_child]
+                parents[(child, parent)] = mapping
+
+        return cls(levels=levels, parents=parents)
+
+    def parent_ids(self, codes: npt.ArrayLike | pd.Series, level: Level, to: Level) -> IntArray:
+        """Map ``level`` codes to ids of their ``to`` ancestors (``-1`` if unknown)."""
+        ids = self.levels[level].ids(codes)
+        if level == to:
+            return ids
+        mapping = self.parents[(level, to)]
+        return np.where(ids >= 0, mapping[np.maximum(ids, 0)], -1).astype(np.int32)
+
+    def aggregate(
+        self,
+        df: pd.DataFrame,
+        value_cols: Sequence[str],
+        geo_col: str,
+        level: Level = "lsoa",
+        to: Level = "lad",
+        how: Aggregation = "sum",
+        weight_col: str | None = None,
+    ) -> tuple[pd.DataFrame, int]:
+        """Aggregate ``value_cols`` of ``df`` from ``level`` up to ``to``.
+
+        Args:
+            df: Rows keyed by ``level`` GSS codes in ``geo_col``.
+            value_cols: Numeric columns to aggregate, all in one pass.
+            geo_col: Column of ``df`` holding the codes.
+            level: Geography level of ``geo_col``.
+            to: Target level; must be coarser than (or equal to) ``level``.
+            how: ``"sum"``, ``"mean"`` or ``"weighted_mean"``.
+            weight_col: Weight column (e.g. population) for ``"weighted_mean"``.
+
+        Returns:
+            A frame with ``<to>_code``, ``<to>_name`` and one column per value
+            column (only areas with at least one input row), and the number
+            of input rows whose code was not found in the index.
+
+        Raises:
+            ValueError: For an unknown ``how``, a missing ``weight_col`` or a
+                target level finer than ``level``.
+        """
+        if LEVELS.index(to) < LEVELS.index(level):
+            raise ValueError(f"Cannot aggregate {level!r} data down to {to!r}")
+        if how == "weighted_mean" and weight_col is None:
+            raise ValueError("weighted_mean requires weight_col")
+        if how not in ("sum", "mean", "weighted_mean"):
+            raise ValueError(f"Unknown aggregation {how!r}")
+
+        ids = self.parent_ids(df[geo_col], level, to)
+        known = ids >= 0
+        unmatched = int((~known).sum())
+        if unmatched:
+            ids = ids[known]
+            df = df.loc[known]
+        size = len(self.levels[to])
+
+        # Column-major so each bincount below reads one contiguous column.
+        values = np.array(df[list(value_cols)].to_numpy(np.float64).T, order="C")
+        missing = np.isnan(values)
+        values[missing] = 0.0
+
+        def reduce(rows: npt.NDArray[np.float64]) -> npt.NDArray[np.float64]:
+            return np.stack([np.bincount(ids, weights=row, minlength=size) for row in rows], 1)
+
+        if how == "sum":
+            totals = reduce(values)
+        else:
+            divisors = (~missing).astype(np.float64)
+            if how == "weighted_mean":
+                assert weight_col is not None
+                weights = np.nan_to_num(df[weight_col].to_numpy(dtype=np.float64))
+                values *= weights
+                divisors *= weights
+            with np.errstate(invalid="ignore", divide="ignore"):
+                counts = reduce(divisors)
+                totals = np.where(counts > 0, reduce(values) / counts, np.nan)
+
+        hit = np.bincount(ids, minlength=size) > 0
+        target = self.levels[to]
+        columns = {f"{to}_code": target.codes[hit], f"{to}_name": target.names[hit]}
+        columns.update(zip(value_cols, totals[hit].T, strict=True))
+        return pd.DataFrame(columns), unmatched
+
+
+def geo_index_for(snapshot: GeoSnapshot) -> GeoIndex:
+    """Return the ``GeoIndex`` of ``snapshot``, compiling it on first use."""
+    return snapshot.derived("geo_index", lambda s: GeoIndex.from_lookup(s.frame))
+
+
+def get_geo_index() -> GeoIndex:
+    """Return the process-wide ``GeoIndex`` compiled from the cached ``GeoLookup``.
+
+    It is rebuilt whenever the geography cache loads a new snapshot.
+    """
+    return geo_index_for(get_geo_snapshot())
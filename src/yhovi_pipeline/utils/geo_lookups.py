@@ -2,28 +2,369 @@
 
 Helpers for loading and caching the ONS geography hierarchy from the
 ``GeoLookup`` table, used by transform tasks.
+
+Design notes
+------------
+* ``GeoLookupCache`` holds one immutable ``GeoSnapshot`` per process.
+  Loading is single-flight: when the cache is empty or stale, exactly one
+  thread queries the database while concurrent callers wait for (and share)
+  its result — or its exception.
+* Snapshots expire after ``geo_cache_ttl_seconds``.  An expired snapshot is
+  first revalidated against the geography vintage (the ``release_id`` of
+  the latest successful ``ons`` / ``GEO_LOOKUP`` load in ``DatasetMetadata``);
+  the table is only re-read when the vintage has changed or is unknown.
+  Whatever reloads ``GeoLookup`` records the vintage with
+  ``record_geo_vintage``; until a vintage is recorded only the TTL applies
+  and every expiry re-reads the table.
+* The process-wide cache loads a vintage from its memory-mapped on-disk
+  snapshot when one exists (see ``utils.geo_snapshot``), and otherwise reads
+  the table and writes the snapshot for the next process.
+* ``invalidate_geo_cache()`` drops the snapshot outright, e.g. after the
+  lookup has been reloaded.  It also bumps a generation counter, so a load
+  that was already in flight cannot store its (possibly stale) result.
+* Structures derived from the lookup (the LSOA → LAD map here, ``GeoIndex``
+  and ``HierarchyRollup`` elsewhere) are memoised on the snapshot via
+  ``GeoSnapshot.derived``, so they are rebuilt exactly when it is replaced.
+* ``GeoSnapshot.frame`` hands out a shallow copy of the cached frame; under
+  pandas Copy-on-Write (always on from pandas 3), modifying it never
+  touches the cached data.
 """
 
 from __future__ import annotations
 
 import functools
+import logging
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field, replace
+from datetime import datetime
+from typing import Any, TypeVar, cast
 
+import numpy as np
+import numpy.typing as npt
 import pandas as pd
+from sqlalchemy import Connection, insert, select
+
+from yhovi_pipeline.config import get_settings
+from yhovi_pipeline.db.models import DatasetMetadata, ExtractionStatus, GeoLookup
+from yhovi_pipeline.db.session import get_engine
+from yhovi_pipeline.utils.geo_snapshot import read_geo_snapshot, write_geo_snapshot
+from yhovi_pipeline.utils.watermarks import read_watermark
+
+#: ``DatasetMetadata`` key under which loads of ``GeoLookup`` are recorded;
+#: the ``release_id`` of the latest successful load is the geography vintage.
+GEO_LOOKUP_SOURCE = "ons"
+GEO_LOOKUP_DATASET_CODE = "GEO_LOOKUP"
+
+T = TypeVar("T")
+
+# A plain module logger: the cache must work without ``Settings`` (which
+# ``get_logger`` reads for the level), e.g. when used with a custom loader.
+_logger = logging.getLogger(__name__)
+
+
+# ---------------------------------------------------------------------------
+# Snapshot and cache
+# ---------------------------------------------------------------------------
+
+
+@dataclass(frozen=True, eq=False)
+class GeoSnapshot:
+    """One loaded copy of ``GeoLookup`` plus structures derived from it."""
+
+    _frame: pd.DataFrame
+    """The cached lookup; exposed read-only through ``frame``."""
+
+    vintage: str | None
+    """Geography vintage the frame was loaded at, if one has been recorded."""
+
+    loaded_at: float
+    """``time.monotonic()`` when the snapshot was loaded or last revalidated."""
+
+    _derived: dict[str, Any] = field(default_factory=dict, repr=False)
+    _lock: threading.RLock = field(default_factory=threading.RLock, repr=False)
+
+    @property
+    def frame(self) -> pd.DataFrame:
+        """The lookup, one row per LSOA, ordered by ``lsoa_code``.
+
+        A shallow copy: with Copy-on-Write, writes to it copy the touched
+        columns and leave the snapshot unchanged.
+        """
+        return self._frame.copy(deep=False)
+
+    def derived(self, name: str, build: Callable[[GeoSnapshot], T]) -> T:
+        """Return ``build(self)``, computed once per snapshot and cached under ``name``."""
+        with self._lock:
+            if name not in self._derived:
+                self._derived[name] = build(self)
+            return cast(T, self._derived[name])
+
+
+@dataclass
+class CacheStats:
+    """Counters describing how a ``GeoLookupCache`` has been used."""
+
+    hits: int = 0
+    """Calls served from a fresh snapshot without touching the database."""
+
+    misses: int = 0
+    """Calls that loaded the full table."""
+
+    revalidations: int = 0
+    """Expired snapshots kept because the geography vintage had not changed."""
+
+    coalesced: int = 0
+    """Calls that waited for another thread's load instead of querying."""
+
+    load_seconds: float = 0.0
+    """Total time spent loading the table."""
+
+    last_load_seconds: float | None = None
+    """Duration of the most recent load."""
+
+
+@dataclass
+class _Flight:
+    """A load in progress, shared by every caller that arrives during it."""
+
+    generation: int
+    """Cache generation the load started in; stale once ``invalidate()`` runs."""
+
+    done: threading.Event = field(default_factory=threading.Event)
+    snapshot: GeoSnapshot | None = None
+    error: BaseException | None = None
+
+
+class GeoLookupCache:
+    """Single-flight, TTL-aware cache of the geography lookup.
+
+    Args:
+        load: Returns the full lookup frame, given the vintage just read.
+        vintage: Returns the current geography vintage, or ``None`` if none
+            has been recorded (the snapshot then simply expires).
+        ttl_seconds: Age after which a snapshot is revalidated; ``None``
+            keeps it until ``invalidate()``.
+        clock: Monotonic clock, overridable for testing.
+    """
+
+    def __init__(
+        self,
+        load: Callable[[str | None], pd.DataFrame],
+        vintage: Callable[[], str | None],
+        ttl_seconds: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._load = load
+        self._vintage = vintage
+        self._ttl = ttl_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._snapshot: GeoSnapshot | None = None
+        self._flight: _Flight | None = None
+        self._generation = 0
+        self._stats = CacheStats()
+
+    @property
+    def stats(self) -> CacheStats:
+        """A copy of the usage counters."""
+        with self._lock:
+            return replace(self._stats)
+
+    def snapshot(self) -> GeoSnapshot:
+        """Return the current snapshot, loading or revalidating it if needed.
+
+        Raises:
+            Exception: Whatever the loader raised; every caller waiting on the
+                same load sees the same exception, and the next call retries.
+        """
+        with self._lock:
+            current = self._snapshot
+            if current is not None and not self._expired(current):
+                self._stats.hits += 1
+                return current
+            flight = self._flight
+            leader = flight is None
+            if leader:
+                flight = self._flight = _Flight(generation=self._generation)
+            else:
+                self._stats.coalesced += 1
+        assert flight is not None
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            assert flight.snapshot is not None
+            return flight.snapshot
+
+        try:
+            flight.snapshot = self._refresh(current)
+        except BaseException as exc:
+            flight.error = exc
+            raise
+        finally:
+            with self._lock:
+                # A load that an ``invalidate()`` overtook is handed to the
+                # callers that were already waiting, but never cached.
+                if flight.snapshot is not None and flight.generation == self._generation:
+                    self._snapshot = flight.snapshot
+                if self._flight is flight:
+                    self._flight = None
+            flight.done.set()
+        return flight.snapshot
+
+    def invalidate(self) -> None:
+        """Drop the current snapshot; the next call reloads the table.
+
+        A load already in progress is detached: its result is not cached,
+        and callers arriving from now on start a fresh load.
+        """
+        with self._lock:
+            self._snapshot = None
+            self._flight = None
+            self._generation += 1
+
+    def _expired(self, snapshot: GeoSnapshot) -> bool:
+        return self._ttl is not None and self._clock() - snapshot.loaded_at >= self._ttl
+
+    def _refresh(self, current: GeoSnapshot | None) -> GeoSnapshot:
+        """Revalidate ``current`` against the vintage, or load a new snapshot."""
+        vintage = self._vintage()
+        if current is not None and vintage is not None and vintage == current.vintage:
+            with self._lock:
+                self._stats.revalidations += 1
+            return replace(current, loaded_at=self._clock())
+
+        started = time.perf_counter()
+        frame = self._load(vintage)
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self._stats.misses += 1
+            self._stats.load_seconds += elapsed
+            self._stats.last_load_seconds = elapsed
+        _logger.info("Loaded %d GeoLookup rows (vintage %s) in %.2fs", len(frame), vintage, elapsed)
+        return GeoSnapshot(_frame=frame, vintage=vintage, loaded_at=self._clock())
+
+
+# ---------------------------------------------------------------------------
+# Process-wide cache
+# ---------------------------------------------------------------------------
+
+
+def _query_geo_lookup() -> pd.DataFrame:
+    with get_engine().connect() as connection:
+        return pd.read_sql(select(GeoLookup).order_by(GeoLookup.lsoa_code), connection)
+
+
+def _load_geo_lookup(vintage: str | None) -> pd.DataFrame:
+    """Read the lookup from its on-disk snapshot, or from the warehouse."""
+    settings = get_settings()
+    directory = settings.geo_snapshot_dir
+    use_snapshot = settings.geo_snapshot_enabled and vintage is not None
+    if use_snapshot:
+        assert vintage is not None
+        frame = read_geo_snapshot(directory, vintage)
+        if frame is not None:
+            _logger.info("Memory-mapped GeoLookup snapshot for vintage %s", vintage)
+            return frame
+
+    frame = _query_geo_lookup()
+    # Only label the rows with the vintage if no reload committed meanwhile.
+    if use_snapshot and query_geo_vintage() == vintage:
+        assert vintage is not None
+        try:
+            write_geo_snapshot(frame, vintage, directory)
+        except OSError as exc:
+            _logger.warning("Could not write GeoLookup snapshot to %s: %s", directory, exc)
+    return frame
+
+
+def query_geo_vintage() -> str | None:
+    """Return the geography vintage from its watermark, without loading ``GeoLookup``.
+
+    One indexed ``dataset_metadata`` read; ``None`` if no vintage is recorded.
+    """
+    with get_engine().connect() as connection:
+        watermark = read_watermark(connection, GEO_LOOKUP_SOURCE, GEO_LOOKUP_DATASET_CODE)
+    return watermark.release_id if watermark is not None else None
+
+
+def record_geo_vintage(connection: Connection, vintage: str, rows_loaded: int) -> None:
+    """Record a successful ``GeoLookup`` reload and its geography vintage.
+
+    Call this in the same transaction that rewrites ``geo_lookup`` so that
+    caches in other processes notice the new vintage at their next TTL
+    check instead of reloading blindly.
+
+    Args:
+        connection: Connection with the reload's open transaction.
+        vintage: Identifier of the boundary release, e.g. ``"LSOA21-2024"``.
+        rows_loaded: Number of ``geo_lookup`` rows written.
+    """
+    now = datetime.utcnow()
+    connection.execute(
+        insert(DatasetMetadata).values(
+            dataset_code=GEO_LOOKUP_DATASET_CODE,
+            source=GEO_LOOKUP_SOURCE,
+            extraction_status=ExtractionStatus.SUCCESS,
+            release_id=vintage,
+            rows_loaded=rows_loaded,
+            loaded_at=now,
+            created_at=now,
+        )
+    )
 
 
 @functools.lru_cache(maxsize=1)
+def geo_lookup_cache() -> GeoLookupCache:
+    """Return the process-wide ``GeoLookupCache`` backed by the warehouse."""
+    return GeoLookupCache(
+        load=_load_geo_lookup,
+        vintage=query_geo_vintage,
+        ttl_seconds=get_settings().geo_cache_ttl_seconds,
+    )
+
+
+def get_geo_snapshot() -> GeoSnapshot:
+    """Return the current ``GeoSnapshot`` from the process-wide cache."""
+    return geo_lookup_cache().snapshot()
+
+
+def invalidate_geo_cache() -> None:
+    """Drop the cached lookup and everything derived from it."""
+    geo_lookup_cache().invalidate()
+
+
 def get_geo_lookup() -> pd.DataFrame:
     """Load the full LSOA → MSOA → LAD → Region lookup into a DataFrame.
 
-    The result is cached in memory for the duration of the process so that
-    multiple tasks in the same flow run do not re-query the database.
+    The result is cached in memory so that multiple tasks in the same flow
+    run do not re-query the database; see ``GeoLookupCache``.
 
     Returns:
         DataFrame with columns: ``lsoa_code``, ``lsoa_name``, ``msoa_code``,
         ``msoa_name``, ``lad_code``, ``lad_name``, ``region_code``, ``region_name``.
     """
-    # TODO: implement — query GeoLookup table via SQLAlchemy session
-    raise NotImplementedError("get_geo_lookup not yet implemented")
+    return get_geo_snapshot().frame
+
+
+# ---------------------------------------------------------------------------
+# LSOA → LAD
+# ---------------------------------------------------------------------------
+
+
+def _lad_by_lsoa(snapshot: GeoSnapshot) -> dict[str, str]:
+    frame = snapshot.frame
+    return dict(zip(frame["lsoa_code"], frame["lad_code"], strict=True))
+
+
+def _lsoa_positions(snapshot: GeoSnapshot) -> tuple[pd.Index, npt.NDArray[np.object_]]:
+    frame = snapshot.frame
+    lads = np.empty(len(frame) + 1, dtype=object)
+    lads[:-1] = frame["lad_code"].to_numpy(dtype=object)
+    return pd.Index(frame["lsoa_code"]), lads
 
 
 def lsoa_to_lad(lsoa_code: str) -> str | None:
@@ -35,5 +376,19 @@ def lsoa_to_lad(lsoa_code: str) -> str | None:
     Returns:
         The corresponding LAD GSS code, or ``None`` if not found.
     """
-    # TODO: implement
-    raise NotImplementedError("lsoa_to_lad not yet implemented")
+    return get_geo_snapshot().derived("lad_by_lsoa", _lad_by_lsoa).get(lsoa_code)
+
+
+def lsoa_to_lad_batch(lsoa_codes: npt.ArrayLike | pd.Series) -> npt.NDArray[np.object_]:
+    """Look up the LAD codes for many LSOA codes in one vectorised pass.
+
+    Args:
+        lsoa_codes: LSOA GSS codes, in any order and possibly repeated.
+
+    Returns:
+        LAD codes aligned with ``lsoa_codes``; ``None`` where not found.
+    """
+    index, lads = get_geo_snapshot().derived("lsoa_positions", _lsoa_positions)
+    # get_indexer returns -1 for unknown codes, which selects the trailing None.
+    found: npt.NDArray[np.object_] = lads[index.get_indexer(lsoa_codes)]
+    return found
@@ -0,0 +1,113 @@
+"""Versioned on-disk snapshots of the ``GeoLookup`` table.
+
+Every worker used to read the whole ``geo_lookup`` table from the warehouse
+before its first transform.  The first process to load a given geography
+vintage now also writes it to an Arrow IPC file under
+``Settings.geo_snapshot_dir``.  Later processes memory-map that file instead
+of querying, so startup is near-instant and processes on one host share the
+same page-cache pages.
+
+Design notes
+------------
+* One uncompressed Arrow IPC (Feather v2) file per vintage,
+  ``geo_lookup-<vintage>.arrow``.  Uncompressed IPC is the one columnar
+  format that can be memory-mapped without decoding — Parquet would have to
+  be decompressed into private memory by every process.
+* The vintage and row count are stored in the schema metadata.  A file is
+  only used when its vintage equals the warehouse's current one (see ``geo_lookups.GEO_LOOKUP_DATASET_CODE``); with no
+  recorded vintage the snapshot is bypassed, since there is nothing to
+  check it against.
+* Writes go to a temporary file that is renamed into place, so a reader
+  never sees a half-written snapshot.  Files for other vintages are then
+  removed; processes still mapping them keep their pages until they exit.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+#: Schema-metadata keys written into every snapshot.
+VINTAGE_KEY = b"yhovi.geo_vintage"
+ROWS_KEY = b"yhovi.geo_rows"
+
+_PREFIX = "geo_lookup-"
+_SUFFIX = ".arrow"
+
+
+def snapshot_path(directory: Path, vintage: str) -> Path:
+    """Return the snapshot file for ``vintage`` in ``directory``."""
+    safe = re.sub(r"[^A-Za-z0-9._-]", "_", vintage)
+    return directory / f"{_PREFIX}{safe}{_SUFFIX}"
+
+
+def write_geo_snapshot(frame: pd.DataFrame, vintage: str, directory: Path) -> Path:
+    """Write ``frame`` as the snapshot for ``vintage`` and drop older ones.
+
+    Args:
+        frame: The full lookup, as returned by the warehouse query.
+        vintage: Geography vintage the frame was read at.
+        directory: Snapshot directory; created if missing.
+
+    Returns:
+        Path of the written snapshot.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    table = table.replace_schema_metadata(
+        {
+            **(table.schema.metadata or {}),
+            VINTAGE_KEY: vintage.encode(),
+            ROWS_KEY: str(len(frame)).encode(),
+        }
+    )
+
+    target = snapshot_path(directory, vintage)
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=_SUFFIX)
+    os.close(fd)
+    try:
+        feather.write_feather(table, tmp, compression="uncompressed")
+        os.replace(tmp, target)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+    for stale in directory.glob(f"{_PREFIX}*{_SUFFIX}"):
+        if stale != target:
+            stale.unlink(missing_ok=True)
+    return target
+
+
+def read_geo_snapshot(directory: Path, vintage: str) -> pd.DataFrame | None:
+    """Memory-map the snapshot for ``vintage``, if there is a valid one.
+
+    Args:
+        directory: Snapshot directory.
+        vintage: The warehouse's current geography vintage.
+
+    Returns:
+        The lookup frame, or ``None`` when no snapshot exists for
+        ``vintage`` or the file's metadata does not match it.
+    """
+    path = snapshot_path(directory, vintage)
+    if not path.exists():
+        return None
+    try:
+        # The table's buffers point into the mapping, which stays open for as
+        # long as the frame built from them is alive.
+        table = pa.ipc.open_file(pa.memory_map(str(path))).read_all()
+    except (OSError, pa.ArrowInvalid):
+        return None
+
+    metadata = table.schema.metadata or {}
+    if metadata.get(VINTAGE_KEY) != vintage.encode():
+        return None
+    if metadata.get(ROWS_KEY) != str(table.num_rows).encode():
+        return None
+    return table.to_pandas()
@@ -0,0 +1,298 @@
+"""Shared HTTP client registry for extract tasks.
+
+Every extract task talks to its upstream through one process-wide
+``httpx.Client`` per source, so the 4-worker thread pools in each flow reuse
+pooled keep-alive connections (and TLS sessions) instead of paying a new
+handshake per call.
+
+Design notes
+------------
+* Clients are created lazily on first use and cached per source name; the
+  registry is guarded by a lock so concurrent tasks never build duplicates.
+  ``httpx.Client`` itself is safe to share between threads.
+* Base URL, timeouts, pool limits and HTTP/2 are configured per source via
+  the ``<source>_http`` fields of ``Settings`` (see ``HttpSourceSettings``).
+* HTTP/2 is negotiated via ALPN and falls back to HTTP/1.1 where the host
+  does not support it.  ``gzip`` / ``deflate`` / ``br`` are advertised in
+  ``Accept-Encoding`` and decoded transparently by httpx.
+* Source credentials are attached to the client once (DWP ``APIKey``
+  header, NOMIS ``uid`` parameter) so extract tasks never handle secrets.
+* Sources with ``requests_per_second`` set get a request hook that takes a
+  token from the cross-process bucket in ``utils.rate_limit`` before every
+  request, so all workers together stay under the source's rate limit.
+* ``fetch()`` is the single GET entry point for extract tasks.  It layers the
+  on-disk conditional-GET cache (``utils.http_cache``) over the pooled
+  client: cached validators are replayed and a ``304`` is served from disk.
+  Transient failures are retried under the source's circuit breaker (see
+  ``utils.retry``).  Every response sent is counted (with its body size)
+  against the running task's ``utils.instrumentation`` stage.
+"""
+
+from __future__ import annotations
+
+import atexit
+import threading
+from dataclasses import dataclass
+from typing import Any
+
+import httpx
+
+from yhovi_pipeline import __version__
+from yhovi_pipeline.config import HTTP_SOURCES, HttpSourceSettings, Settings, get_settings
+from yhovi_pipeline.utils.http_cache import ResponseCache
+from yhovi_pipeline.utils.instrumentation import record_http
+from yhovi_pipeline.utils.rate_limit import rate_limit_hook
+from yhovi_pipeline.utils.retry import call_with_retry
+
+_USER_AGENT = f"yhovi-pipeline/{__version__}"
+
+_clients: dict[str, httpx.Client] = {}
+_clients_lock = threading.Lock()
+
+
+# ---------------------------------------------------------------------------
+# Results and signals
+# ---------------------------------------------------------------------------
+
+
+class SourceNotModified(Exception):
+    """Raised when a source answers ``304 Not Modified`` for a release.
+
+    Flows catch this around an extract call to short-circuit transform and
+    load and record ``ExtractionStatus.SKIPPED`` instead.
+    """
+
+    def __init__(self, source: str, url: str) -> None:
+        super().__init__(f"{source}: {url} has not changed since it was last downloaded")
+        self.source = source
+        self.url = url
+
+
+@dataclass(frozen=True)
+class FetchResult:
+    """Body and provenance of a ``fetch()`` call."""
+
+    url: str
+    """Request URL without credentials — suitable for ``DatasetMetadata.source_url``."""
+
+    content: bytes
+    """Response body (from disk when ``not_modified``)."""
+
+    not_modified: bool = False
+    """``True`` when the source answered ``304`` and the body came from the cache."""
+
+    etag: str | None = None
+    last_modified: str | None = None
+    content_type: str | None = None
+
+
+# ---------------------------------------------------------------------------
+# Client registry
+# ---------------------------------------------------------------------------
+
+
+def get_http_client(source: str) -> httpx.Client:
+    """Return the shared, pooled ``httpx.Client`` for ``source``.
+
+    Args:
+        source: Source name, one of ``config.HTTP_SOURCES`` (e.g. ``"nomis"``).
+
+    Returns:
+        A client whose ``base_url`` is the source's configured root, so
+        callers pass paths relative to it.
+
+    Raises:
+        ValueError: If ``source`` is not a known HTTP source.
+    """
+    client = _clients.get(source)
+    if client is not None and not client.is_closed:
+        return client
+
+    with _clients_lock:
+        client = _clients.get(source)
+        if client is None or client.is_closed:
+            client = _build_client(source, get_settings())
+            _clients[source] = client
+        return client
+
+
+def close_http_clients() -> None:
+    """Close every pooled client and empty the registry.
+
+    Registered with ``atexit``; also useful in tests or after changing
+    ``Settings`` at runtime.
+    """
+    with _clients_lock:
+        for client in _clients.values():
+            client.close()
+        _clients.clear()
+
+
+def source_settings(source: str, settings: Settings | None = None) -> HttpSourceSettings:
+    """Return the ``HttpSourceSettings`` configured for ``source``.
+
+    Args:
+        source: Source name, one of ``config.HTTP_SOURCES``.
+        settings: Settings to read from; defaults to ``get_settings()``.
+
+    Raises:
+        ValueError: If ``source`` is not a known HTTP source.
+    """
+    if source not in HTTP_SOURCES:
+        raise ValueError(f"Unknown HTTP source {source!r}; expected one of {HTTP_SOURCES}")
+    config: HttpSourceSettings = getattr(settings or get_settings(), f"{source}_http")
+    return config
+
+
+# ---------------------------------------------------------------------------
+# Requests
+# ---------------------------------------------------------------------------
+
+
+def fetch(
+    source: str,
+    path: str,
+    params: dict[str, Any] | None = None,
+    *,
+    skip_unchanged: bool = False,
+) -> FetchResult:
+    """GET ``path`` from ``source`` through the pooled client and response cache.
+
+    When a cached copy exists its validators are sent as ``If-None-Match`` /
+    ``If-Modified-Since``; a ``304`` answer is served from disk.  Responses
+    carrying an ``ETag`` or ``Last-Modified`` header are cached for next time.
+
+    Args:
+        source: Source name, one of ``config.HTTP_SOURCES``.
+        path: Path relative to the source's ``base_url``.
+        params: Query parameters.
+        skip_unchanged: Raise ``SourceNotModified`` on a ``304`` instead of
+            returning the cached body — use for single-release downloads so
+            the flow can skip transform and load.
+
+    Returns:
+        The response body and its validators.
+
+    Raises:
+        SourceNotModified: On ``304`` when ``skip_unchanged`` is set.
+        CircuitOpenError: If the source's circuit breaker is open.
+        httpx.HTTPStatusError: On any other non-2xx response, after retries
+            for transient statuses, or on a ``304`` with no cached body even
+            after one unconditional retry.
+    """
+    settings = get_settings()
+    client = get_http_client(source)
+    request = client.build_request("GET", path, params=params)
+    url = _public_url(client, request)
+
+    cache = _response_cache(settings) if settings.http_cache_enabled else None
+    cached = cache.get(url) if cache is not None else None
+    if cached is not None:
+        request.headers.update(cached[0].conditional_headers())
+
+    response = call_with_retry(source, lambda: _send(client, request))
+
+    if response.status_code == httpx.codes.NOT_MODIFIED and cached is None:
+        # Nothing on disk to serve: the cache is off, the entry was evicted,
+        # or the server answered an unconditional request with a 304.  Ask
+        # once more explicitly for the full body rather than return nothing.
+        fresh = client.build_request(
+            "GET", path, params=params, headers={"Cache-Control": "no-cache"}
+        )
+        response = call_with_retry(source, lambda: _send(client, fresh))
+        if response.status_code == httpx.codes.NOT_MODIFIED:
+            raise httpx.HTTPStatusError(
+                f"304 Not Modified for {url} with no cached copy to serve",
+                request=fresh,
+                response=response,
+            )
+
+    if response.status_code == httpx.codes.NOT_MODIFIED and cache is not None and cached:
+        entry = cache.touch(cached[0])
+        if skip_unchanged:
+            raise SourceNotModified(source, url)
+        return FetchResult(
+            url=url,
+            content=cached[1],
+            not_modified=True,
+            etag=entry.etag,
+            last_modified=entry.last_modified,
+            content_type=entry.content_type,
+        )
+
+    etag = response.headers.get("ETag")
+    last_modified = response.headers.get("Last-Modified")
+    content_type = response.headers.get("Content-Type")
+    if cache is not None and (etag or last_modified):
+        cache.put(url, response.content, etag, last_modified, content_type)
+
+    return FetchResult(
+        url=url,
+        content=response.content,
+        etag=etag,
+        last_modified=last_modified,
+        content_type=content_type,
+    )
+
+
+# ---------------------------------------------------------------------------
+# Internals
+# ---------------------------------------------------------------------------
+
+
+def _send(client: httpx.Client, request: httpx.Request) -> httpx.Response:
+    """Send ``request``, raising for error statuses other than ``304``."""
+    response = client.send(request)
+    record_http(len(response.content))
+    if response.status_code != httpx.codes.NOT_MODIFIED:
+        response.raise_for_status()
+    return response
+
+
+def _public_url(client: httpx.Client, request: httpx.Request) -> str:
+    """Return ``request``'s URL with client-level (credential) params removed."""
+    url = request.url
+    for key in client.params:
+        url = url.copy_remove_param(key)
+    return str(url)
+
+
+def _response_cache(settings: Settings) -> ResponseCache:
+    """Build the response cache described by ``settings``."""
+    return ResponseCache(
+        directory=settings.http_cache_dir,
+        max_bytes=settings.http_cache_max_bytes,
+        max_age_seconds=settings.http_cache_max_age_days * 86_400,
+    )
+
+
+def _build_client(source: str, settings: Settings) -> httpx.Client:
+    """Construct a pooled client for ``source`` from ``settings``."""
+    config = source_settings(source, settings)
+
+    headers = {"User-Agent": _USER_AGENT}
+    params: dict[str, str] = {}
+    if source == "dwp":
+        headers["APIKey"] = settings.dwp_api_key.get_secret_value()
+    elif source == "nomis" and settings.nomis_api_key is not None:
+        params["uid"] = settings.nomis_api_key.get_secret_value()
+
+    hook = rate_limit_hook(source, settings)
+
+    return httpx.Client(
+        base_url=config.base_url,
+        headers=headers,
+        params=params,
+        http2=config.http2,
+        timeout=httpx.Timeout(config.timeout_seconds, connect=config.connect_timeout_seconds),
+        limits=httpx.Limits(
+            max_connections=config.max_connections,
+            max_keepalive_connections=config.max_keepalive_connections,
+            keepalive_expiry=config.keepalive_expiry_seconds,
+        ),
+        follow_redirects=True,
+        event_hooks={"request": [hook] if hook is not None else []},
+    )
+
+
+atexit.register(close_http_clients)
@@ -0,0 +1,171 @@
+"""On-disk HTTP response cache with conditional-GET validators.
+
+Stores each cacheable response body next to its ``ETag`` / ``Last-Modified``
+validators so the next run can replay them as ``If-None-Match`` /
+``If-Modified-Since`` and, on ``304 Not Modified``, serve the body from disk
+instead of re-downloading it.
+
+Design notes
+------------
+* One entry per request URL: ``<sha256>.body`` holds the raw bytes and
+  ``<sha256>.json`` the validators and bookkeeping.  Writes go through a
+  temporary file + ``os.replace`` so concurrent workers never observe a
+  half-written entry.
+* The URL recorded in an entry never includes credentials — callers pass the
+  URL without client-level auth parameters.
+* ``evict()`` drops entries older than ``max_age_seconds`` and then the
+  least recently used entries until the cache fits in ``max_bytes``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+_BODY_SUFFIX = ".body"
+_META_SUFFIX = ".json"
+
+
+@dataclass(frozen=True)
+class CacheEntry:
+    """Validators and bookkeeping for one cached response."""
+
+    url: str
+    etag: str | None
+    last_modified: str | None
+    content_type: str | None
+    size: int
+    stored_at: float
+    """Unix time the body was last downloaded or revalidated."""
+
+    def conditional_headers(self) -> dict[str, str]:
+        """Return the request headers that revalidate this entry."""
+        headers: dict[str, str] = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """Size- and age-bounded store of response bodies keyed by URL.
+
+    Args:
+        directory: Cache directory; created on first write.
+        max_bytes: Upper bound on the total size of cached bodies.
+        max_age_seconds: Entries not revalidated for this long are evicted.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int, max_age_seconds: float) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+
+    # -- Lookup / store -----------------------------------------------------
+
+    def get(self, url: str) -> tuple[CacheEntry, bytes] | None:
+        """Return the cached entry and body for ``url``, or ``None`` on a miss."""
+        meta_path, body_path = self._paths(url)
+        try:
+            entry = CacheEntry(**json.loads(meta_path.read_text(encoding="utf-8")))
+            body = body_path.read_bytes()
+        except (FileNotFoundError, json.JSONDecodeError, TypeError):
+            return None
+        if entry.url != url or len(body) != entry.size:
+            return None
+        return entry, body
+
+    def put(
+        self,
+        url: str,
+        body: bytes,
+        etag: str | None,
+        last_modified: str | None,
+        content_type: str | None = None,
+    ) -> CacheEntry:
+        """Store ``body`` and its validators for ``url``, then enforce the limits."""
+        entry = CacheEntry(
+            url=url,
+            etag=etag,
+            last_modified=last_modified,
+            content_type=content_type,
+            size=len(body),
+            stored_at=time.time(),
+        )
+        meta_path, body_path = self._paths(url)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        _atomic_write(body_path, body)
+        _atomic_write(meta_path, json.dumps(asdict(entry)).encode("utf-8"))
+        self.evict()
+        return entry
+
+    def touch(self, entry: CacheEntry) -> CacheEntry:
+        """Mark ``entry`` as freshly revalidated (after a ``304``)."""
+        refreshed = CacheEntry(**{**asdict(entry), "stored_at": time.time()})
+        meta_path, _ = self._paths(entry.url)
+        _atomic_write(meta_path, json.dumps(asdict(refreshed)).encode("utf-8"))
+        return refreshed
+
+    # -- Eviction -----------------------------------------------------------
+
+    def evict(self) -> int:
+        """Remove expired entries, then LRU entries until under ``max_bytes``.
+
+        Returns:
+            Number of entries removed.
+        """
+        if not self.directory.is_dir():
+            return 0
+
+        now = time.time()
+        entries: list[tuple[float, int, Path]] = []
+        removed = 0
+        for meta_path in self.directory.glob(f"*{_META_SUFFIX}"):
+            try:
+                entry = CacheEntry(**json.loads(meta_path.read_text(encoding="utf-8")))
+            except (FileNotFoundError, json.JSONDecodeError, TypeError):
+                continue
+            if now - entry.stored_at > self.max_age_seconds:
+                removed += _remove_entry(meta_path)
+            else:
+                entries.append((entry.stored_at, entry.size, meta_path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, meta_path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            removed += _remove_entry(meta_path)
+            total -= size
+        return removed
+
+    # -- Internals ----------------------------------------------------------
+
+    def _paths(self, url: str) -> tuple[Path, Path]:
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return self.directory / f"{key}{_META_SUFFIX}", self.directory / f"{key}{_BODY_SUFFIX}"
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    """Write ``data`` to ``path`` via a temporary file in the same directory."""
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(data)
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+def _remove_entry(meta_path: Path) -> int:
+    """Delete an entry's metadata and body; return 1 if it existed."""
+    existed = meta_path.exists()
+    meta_path.unlink(missing_ok=True)
+    meta_path.with_suffix(_BODY_SUFFIX).unlink(missing_ok=True)
+    return int(existed)
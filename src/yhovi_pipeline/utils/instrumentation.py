@@ -0,0 +1,233 @@
+"""Per-stage performance metrics for extract, transform and load tasks.
+
+Every task function is wrapped with ``@instrumented`` (under ``@task``), which
+records one ``StageMetrics`` per call: wall and CPU time, peak memory, rows
+and rows/sec, and the bytes and requests that went through ``utils.http``.
+``write_metadata`` collects the flow run's metrics, stores them on its
+``DatasetMetadata`` row and publishes them as a Prefect table artifact, so
+regressions between monthly runs show up without attaching a profiler.
+
+Design notes
+------------
+* The active stage lives in a ``ContextVar``; ``utils.http.fetch`` reports
+  each response to it through ``record_http``.  Each task runs in its own
+  thread with its own context, so concurrent tasks never mix counters.
+* CPU time is the calling thread's (``time.thread_time``), which is what a
+  task on a thread-pool runner actually used.
+* Peak memory is the process's peak RSS when the stage finished.  When
+  ``tracemalloc`` is running (e.g. the worker was started with
+  ``PYTHONTRACEMALLOC=1``) it is instead the stage's peak of traced Python
+  allocations — closer to the stage's own footprint, but tracing slows
+  allocation-heavy code, so it is opt-in; with concurrent tasks the peak
+  includes their allocations too.
+* Recording costs a few clock reads per task call, so it is always on.
+* Metrics are kept per flow run (``prefect.runtime.flow_run``) until
+  ``drain_metrics`` takes them; only the latest ``_MAX_PENDING`` per run
+  are kept, so calls outside a flow cannot grow without bound.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import functools
+import json
+import threading
+import time
+import tracemalloc
+from collections import deque
+from collections.abc import Callable, Iterator, Sequence, Sized
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Any, ParamSpec, TypeVar
+
+from prefect.artifacts import create_table_artifact
+from prefect.context import TaskRunContext
+from prefect.runtime import flow_run
+
+from yhovi_pipeline.db.upsert import UpsertResult
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - Windows workers
+    resource = None  # type: ignore[assignment]
+
+_P = ParamSpec("_P")
+_T = TypeVar("_T")
+
+_MAX_PENDING = 1000
+
+#: Task name prefixes reported as stage kinds; anything else is ``"other"``.
+STAGE_KINDS: tuple[str, ...] = ("extract", "transform", "load")
+
+
+@dataclass
+class StageMetrics:
+    """Resource use of one task call."""
+
+    stage: str
+    """Task name, e.g. ``"extract/nomis/bres"``."""
+
+    wall_seconds: float = 0.0
+    cpu_seconds: float = 0.0
+    peak_memory_bytes: int | None = None
+    rows: int | None = None
+    bytes_downloaded: int = 0
+    http_requests: int = 0
+
+    @property
+    def kind(self) -> str:
+        """``"extract"``, ``"transform"``, ``"load"`` or ``"other"``."""
+        prefix = self.stage.split("/", 1)[0]
+        return prefix if prefix in STAGE_KINDS else "other"
+
+    @property
+    def rows_per_second(self) -> float | None:
+        if self.rows is None or self.wall_seconds <= 0:
+            return None
+        return self.rows / self.wall_seconds
+
+    def as_row(self) -> dict[str, Any]:
+        """Return the metrics as one artifact / JSON row."""
+        row = asdict(self)
+        row["wall_seconds"] = round(self.wall_seconds, 4)
+        row["cpu_seconds"] = round(self.cpu_seconds, 4)
+        rate = self.rows_per_second
+        row["rows_per_second"] = round(rate, 1) if rate is not None else None
+        return row
+
+
+_current: contextvars.ContextVar[StageMetrics | None] = contextvars.ContextVar(
+    "yhovi_stage_metrics", default=None
+)
+_pending: dict[str | None, deque[StageMetrics]] = {}
+_pending_lock = threading.Lock()
+
+
+# ---------------------------------------------------------------------------
+# Recording
+# ---------------------------------------------------------------------------
+
+
+@contextmanager
+def measure_stage(stage: str) -> Iterator[StageMetrics]:
+    """Measure the enclosed block as one stage and keep it for the flow run.
+
+    Set ``rows`` on the yielded metrics to report throughput.
+    """
+    metrics = StageMetrics(stage)
+    use_tracemalloc = tracemalloc.is_tracing()
+    if use_tracemalloc:
+        tracemalloc.reset_peak()
+    token = _current.set(metrics)
+    wall, cpu = time.perf_counter(), time.thread_time()
+    try:
+        yield metrics
+    finally:
+        metrics.wall_seconds = time.perf_counter() - wall
+        metrics.cpu_seconds = time.thread_time() - cpu
+        metrics.peak_memory_bytes = (
+            tracemalloc.get_traced_memory()[1] if use_tracemalloc else _peak_rss()
+        )
+        _current.reset(token)
+        _keep(metrics)
+
+
+def instrumented(fn: Callable[_P, _T]) -> Callable[_P, _T]:
+    """Record a ``StageMetrics`` for every call of a task function.
+
+    Apply under ``@task``.  The stage is named after the running Prefect
+    task (the function's name outside one), and ``rows`` is taken from the
+    result: its length, or an ``UpsertResult``'s rows written and skipped.
+    """
+
+    @functools.wraps(fn)
+    def wrapper(*args: _P.args, **kwargs: _P.kwargs) -> _T:
+        with measure_stage(_stage_name(fn)) as metrics:
+            result = fn(*args, **kwargs)
+            metrics.rows = _rows(result)
+        return result
+
+    return wrapper
+
+
+def record_http(bytes_downloaded: int) -> None:
+    """Count one HTTP response against the active stage (if any)."""
+    metrics = _current.get()
+    if metrics is not None:
+        metrics.http_requests += 1
+        metrics.bytes_downloaded += bytes_downloaded
+
+
+# ---------------------------------------------------------------------------
+# Collection
+# ---------------------------------------------------------------------------
+
+
+def drain_metrics(flow_run_id: str | None = None) -> list[StageMetrics]:
+    """Return and forget the metrics recorded for a flow run.
+
+    Args:
+        flow_run_id: Defaults to the current flow run (``None`` outside one).
+    """
+    key = flow_run_id if flow_run_id is not None else flow_run.get_id()
+    with _pending_lock:
+        return list(_pending.pop(key, ()))
+
+
+def summarise(metrics: Sequence[StageMetrics]) -> dict[str, Any]:
+    """Return the ``DatasetMetadata`` instrumentation columns for ``metrics``."""
+    seconds = dict.fromkeys(STAGE_KINDS, 0.0)
+    for m in metrics:
+        if m.kind in seconds:
+            seconds[m.kind] += m.wall_seconds
+    peaks = [m.peak_memory_bytes for m in metrics if m.peak_memory_bytes is not None]
+    return {
+        "extract_seconds": seconds["extract"],
+        "transform_seconds": seconds["transform"],
+        "load_seconds": seconds["load"],
+        "cpu_seconds": sum(m.cpu_seconds for m in metrics),
+        "peak_memory_bytes": max(peaks, default=None),
+        "bytes_downloaded": sum(m.bytes_downloaded for m in metrics),
+        "http_requests": sum(m.http_requests for m in metrics),
+        "stage_metrics": json.dumps([m.as_row() for m in metrics]),
+    }
+
+
+def publish_metrics_artifact(dataset_code: str, metrics: Sequence[StageMetrics]) -> None:
+    """Publish ``metrics`` as a table artifact on the current flow run."""
+    create_table_artifact(
+        table=[m.as_row() for m in metrics],
+        key=f"stage-metrics-{dataset_code.lower().replace('_', '-')}",
+        description=f"Per-stage timings and resource use for {dataset_code}.",
+    )
+
+
+# ---------------------------------------------------------------------------
+# Internals
+# ---------------------------------------------------------------------------
+
+
+def _keep(metrics: StageMetrics) -> None:
+    key = flow_run.get_id()
+    with _pending_lock:
+        _pending.setdefault(key, deque(maxlen=_MAX_PENDING)).append(metrics)
+
+
+def _stage_name(fn: Callable[..., Any]) -> str:
+    context = TaskRunContext.get()
+    return context.task.name if context is not None else fn.__name__
+
+
+def _rows(result: object) -> int | None:
+    if isinstance(result, UpsertResult):
+        return result.rows_loaded + result.unchanged
+    if isinstance(result, Sized) and not isinstance(result, str | bytes):
+        return len(result)
+    return None
+
+
+def _peak_rss() -> int | None:
+    if resource is None:
+        return None
+    # ``ru_maxrss`` is in KiB on Linux.
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
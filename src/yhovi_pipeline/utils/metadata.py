@@ -26,5 +26,9 @@ def build_metadata_record(
     Returns:
         Unpersisted ``DatasetMetadata`` instance.
     """
-    # TODO: implement
-    raise NotImplementedError("build_metadata_record not yet implemented")
+    return DatasetMetadata(
+        dataset_code=dataset_code,
+        source=source,
+        extraction_status=status,
+        prefect_flow_run_id=prefect_flow_run_id,
+    )
@@ -0,0 +1,214 @@
+"""Parse source reference periods into ``Indicator.reference_period`` dates.
+
+Sources label periods in many shapes: ISO months (``"2024-04"``), years
+(``2023``), financial years (``"2022/23"``, Sport England's ``"2022-23"``),
+quarters (``"2024 Q1"``, ``"2024/25 Q2"``) and Fingertips' rolling periods
+(``"2018 - 20"``).  ``Indicator.reference_period`` is the first day of the
+period, so every label becomes a ``date`` plus its ``Granularity``.
+
+Design notes
+------------
+* Formats are a registry of ``PeriodRule`` objects (regular expression →
+  builder), tried in registration order; ``register_period_rule`` adds one
+  for a new source without touching the parser.  A builder raises
+  ``NoMatch`` to pass a label on to the next rule.
+* ``"YYYY-MM"`` labels are ISO months whenever ``MM`` is a valid month, so
+  ``"2022-23"`` is a financial year but ``"2011-12"`` is December 2011;
+  financial years before 2013 should be written ``"2011/12"``.
+* ``parse_periods`` works on whole columns: it factorises the column,
+  parses each *distinct* label once and maps the results back through the
+  codes, so a multi-year load with millions of rows and a few dozen
+  distinct periods costs a few dozen parses.
+* ``parse_period`` memoises every label across calls (and batches), so a
+  streamed load parses each label once per process.  Registering a rule
+  clears the memo.
+* Financial years and quarters start in April; Fingertips rolling periods
+  (``"2018 - 20"``) start on 1 January of their first year.
+"""
+
+from __future__ import annotations
+
+import calendar
+import functools
+import re
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import date
+from typing import Literal, NamedTuple
+
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+
+Granularity = Literal["day", "month", "quarter", "year", "financial_year", "multi_year"]
+
+
+class ParsedPeriod(NamedTuple):
+    """One parsed period label."""
+
+    start: date
+    """First day of the period."""
+
+    granularity: Granularity
+
+
+@dataclass(frozen=True)
+class PeriodRule:
+    """One recognised period format."""
+
+    name: str
+    pattern: re.Pattern[str]
+    """Matched in full against the stripped label, case-insensitively."""
+
+    granularity: Granularity
+    build: Callable[[re.Match[str]], date]
+    """Turn a match into the period's first day."""
+
+
+class NoMatch(Exception):
+    """Raised by a rule's builder to pass the label on to the next rule."""
+
+
+_RULES: list[PeriodRule] = []
+
+
+def register_period_rule(
+    name: str, pattern: str, granularity: Granularity
+) -> Callable[[Callable[[re.Match[str]], date]], Callable[[re.Match[str]], date]]:
+    """Register the decorated builder as a period format (tried after existing ones)."""
+
+    def decorator(build: Callable[[re.Match[str]], date]) -> Callable[[re.Match[str]], date]:
+        _RULES.append(PeriodRule(name, re.compile(pattern, re.IGNORECASE), granularity, build))
+        parse_period.cache_clear()
+        return build
+
+    return decorator
+
+
+# ---------------------------------------------------------------------------
+# Parsing
+# ---------------------------------------------------------------------------
+
+
+@functools.lru_cache(maxsize=65_536)
+def parse_period(label: str) -> ParsedPeriod:
+    """Parse one period label (memoised).
+
+    Raises:
+        ValueError: If no registered rule matches ``label``.
+    """
+    text = " ".join(label.split())
+    for rule in _RULES:
+        match = rule.pattern.fullmatch(text)
+        if match:
+            try:
+                return ParsedPeriod(rule.build(match), rule.granularity)
+            except NoMatch:
+                continue
+    raise ValueError(f"Unrecognised reference period: {label!r}")
+
+
+@dataclass(frozen=True)
+class ParsedPeriods:
+    """A parsed period column."""
+
+    start: npt.NDArray[np.datetime64]
+    """``datetime64[D]`` first days; ``NaT`` where the label was missing."""
+
+    granularity: pd.Categorical
+    """Granularity of each row (missing where the label was)."""
+
+
+def parse_periods(labels: pd.Series) -> ParsedPeriods:
+    """Parse a column of period labels, parsing each distinct label once.
+
+    Integers and strings may be mixed (e.g. ``2023`` and ``"2023"``).
+
+    Raises:
+        ValueError: If a label matches no registered rule.
+    """
+    codes, uniques = pd.factorize(labels.astype("str"))
+    parsed = [parse_period(label) for label in uniques]
+    # Index ``-1`` (a missing label) picks the trailing NaT / None.
+    starts = np.array([p.start for p in parsed] + [None], dtype="datetime64[D]")
+    kinds = pd.Categorical([p.granularity for p in parsed] + [None])
+    return ParsedPeriods(
+        start=starts[codes],
+        granularity=pd.Categorical.from_codes(
+            np.where(codes < 0, -1, kinds.codes[codes]), dtype=kinds.dtype
+        ),
+    )
+
+
+# ---------------------------------------------------------------------------
+# Built-in rules
+# ---------------------------------------------------------------------------
+
+_MONTHS = {name.lower(): number for number, name in enumerate(calendar.month_name) if name}
+_MONTHS.update({name.lower(): number for number, name in enumerate(calendar.month_abbr) if name})
+
+
+def _full_year(first: int, second: str) -> int:
+    """Expand the second year of a span (``"23"`` after 2022 → 2023)."""
+    return int(second) if len(second) == 4 else first // 100 * 100 + int(second)
+
+
+@register_period_rule("iso-date", r"(\d{4})-(\d{2})-(\d{2})(?:T[\d:.]+Z?)?", "day")
+def _iso_date(match: re.Match[str]) -> date:
+    return date(int(match[1]), int(match[2]), int(match[3]))
+
+
+@register_period_rule("iso-month", r"(\d{4})-(\d{2})", "month")
+def _iso_month(match: re.Match[str]) -> date:
+    if not 1 <= int(match[2]) <= 12:
+        raise NoMatch
+    return date(int(match[1]), int(match[2]), 1)
+
+
+@register_period_rule("month-name", r"([a-z]{3,9})\.? (\d{4})", "month")
+def _month_name(match: re.Match[str]) -> date:
+    month = _MONTHS.get(match[1].lower())
+    if month is None:
+        raise NoMatch
+    return date(int(match[2]), month, 1)
+
+
+@register_period_rule("year", r"(\d{4})(?:\.0)?", "year")
+def _year(match: re.Match[str]) -> date:
+    return date(int(match[1]), 1, 1)
+
+
+@register_period_rule("quarter", r"(\d{4}) ?Q([1-4])|Q([1-4]) (\d{4})", "quarter")
+def _quarter(match: re.Match[str]) -> date:
+    year, quarter = (match[1], match[2]) if match[1] else (match[4], match[3])
+    return date(int(year), 3 * int(quarter) - 2, 1)
+
+
+@register_period_rule("financial-quarter", r"(\d{4})/(\d{2}|\d{4}) ?Q([1-4])", "quarter")
+def _financial_quarter(match: re.Match[str]) -> date:
+    months_in = 3 * (int(match[3]) - 1)
+    start = int(match[1])
+    return date(start + (3 + months_in) // 12, (3 + months_in) % 12 + 1, 1)
+
+
+@register_period_rule("financial-year", r"(?:FY ?)?(\d{4}) ?[-/] ?(\d{2}|\d{4})", "financial_year")
+def _financial_year(match: re.Match[str]) -> date:
+    # A one-year span is a financial year; longer spans are rolling periods,
+    # which this rule rejects so the multi-year rule below can take them.
+    first = int(match[1])
+    if _full_year(first, match[2]) != first + 1:
+        raise NoMatch
+    return date(first, 4, 1)
+
+
+@register_period_rule("multi-year", r"(\d{4}) ?- ?(\d{2}|\d{4})", "multi_year")
+def _multi_year(match: re.Match[str]) -> date:
+    first = int(match[1])
+    if _full_year(first, match[2]) <= first:
+        raise NoMatch
+    return date(first, 1, 1)
+
+
+@register_period_rule("multi-financial-year", r"(\d{4})/(\d{2}) ?- ?(\d{2})/(\d{2})", "multi_year")
+def _multi_financial_year(match: re.Match[str]) -> date:
+    return date(int(match[1]), 4, 1)
@@ -0,0 +1,143 @@
+"""Cross-process token-bucket rate limiter for upstream APIs.
+
+NOMIS, DWP Stat-Xplore and Fingertips throttle callers.  All deployments of
+the pipeline share one bucket per source, so together they send requests at
+the permitted rate instead of bursting into ``429`` responses and backing
+off for minutes.
+
+Design notes
+------------
+* Bucket state (tokens and last refill time) lives in a small SQLite file
+  (``Settings.rate_limit_db``).  Each ``acquire()`` runs one short
+  ``BEGIN IMMEDIATE`` transaction, which SQLite serialises across threads
+  *and* processes on the same host.
+* Callers *reserve* a token: the balance may go negative and the caller
+  sleeps outside the transaction until its token is due.  Waiters are
+  therefore served in arrival order and nobody polls the database.
+* Wall-clock ``time.time()`` is used because ``time.monotonic()`` is not
+  comparable between processes.
+* Sources without a configured rate are not limited.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from collections.abc import Callable
+from contextlib import closing
+from pathlib import Path
+
+import httpx
+
+from yhovi_pipeline.config import Settings
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS token_bucket (
+    source   TEXT PRIMARY KEY,
+    tokens   REAL NOT NULL,
+    updated  REAL NOT NULL
+)
+"""
+
+
+class TokenBucket:
+    """Token bucket for one source, shared through a SQLite file.
+
+    Args:
+        path: SQLite database holding the bucket state; created on first use.
+        source: Bucket name, normally the ``config.HTTP_SOURCES`` entry.
+        rate: Tokens added per second — the sustained request rate.
+        capacity: Maximum tokens held — the largest permitted burst.
+
+    Raises:
+        ValueError: If ``rate`` or ``capacity`` is not positive.
+    """
+
+    def __init__(self, path: Path, source: str, rate: float, capacity: float = 1.0) -> None:
+        if rate <= 0 or capacity <= 0:
+            raise ValueError("rate and capacity must be positive")
+        self.path = Path(path)
+        self.source = source
+        self.rate = rate
+        self.capacity = capacity
+        self._schema_ready = False
+        self._schema_lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Take ``tokens`` from the bucket, sleeping until they are available.
+
+        Args:
+            tokens: Tokens to take; one per request.
+
+        Returns:
+            Seconds spent waiting.
+        """
+        delay = self.reserve(tokens)
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """Reserve ``tokens`` without sleeping.
+
+        Returns:
+            Seconds the caller must wait before using the reservation.
+        """
+        with closing(self._connect()) as connection, connection:
+            connection.execute("BEGIN IMMEDIATE")
+            now = time.time()
+            row = connection.execute(
+                "SELECT tokens, updated FROM token_bucket WHERE source = ?", (self.source,)
+            ).fetchone()
+            available = self.capacity if row is None else row[0]
+            updated = now if row is None else row[1]
+
+            available = min(self.capacity, available + max(0.0, now - updated) * self.rate)
+            available -= tokens
+            connection.execute(
+                "INSERT INTO token_bucket (source, tokens, updated) VALUES (?, ?, ?) "
+                "ON CONFLICT (source) DO UPDATE SET tokens = excluded.tokens, "
+                "updated = excluded.updated",
+                (self.source, available, now),
+            )
+
+        return 0.0 if available >= 0 else -available / self.rate
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open an autocommit connection, creating the schema once per bucket."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(self.path, timeout=60.0, isolation_level=None)
+        if not self._schema_ready:
+            with self._schema_lock:
+                connection.execute(_SCHEMA)
+                self._schema_ready = True
+        return connection
+
+
+def rate_limit_hook(source: str, settings: Settings) -> Callable[[httpx.Request], None] | None:
+    """Build an ``httpx`` request hook that rate-limits ``source``.
+
+    Args:
+        source: Source name, one of ``config.HTTP_SOURCES``.
+        settings: Settings holding ``<source>_http`` and ``rate_limit_db``.
+
+    Returns:
+        A hook for ``httpx.Client(event_hooks={"request": [...]})``, or
+        ``None`` when the source has no ``requests_per_second`` configured.
+    """
+    config = getattr(settings, f"{source}_http")
+    if config.requests_per_second is None:
+        return None
+
+    bucket = TokenBucket(
+        settings.rate_limit_db,
+        source,
+        rate=config.requests_per_second,
+        capacity=config.burst,
+    )
+
+    def hook(request: httpx.Request) -> None:
+        bucket.acquire()
+
+    return hook
@@ -0,0 +1,340 @@
+"""Filtered readers for national CSV, XLSX and zipped CSV releases.
+
+Most sources publish England-wide files, while we keep only the rows for
+``Settings.yorkshire_lad_codes`` and the LSOAs / MSOAs under them.  These
+readers apply that filter while parsing, reading only the columns an
+extractor asks for with explicit types, so the rest of the country is never
+materialised as a ``DataFrame``.
+
+Design notes
+------------
+* A read is described by ``columns`` — a mapping of source column name to
+  ``ColumnType`` — and a ``geo_col`` whose value must be in ``wanted``
+  (usually ``wanted_geography_codes()``).  Column selection and typing are
+  pushed into the parser; unlisted columns are skipped outright.
+* There is one CSV path, ``iter_csv``: the streaming ``pyarrow.csv``
+  reader, yielding one frame per parsed block.  The ``*_csv_filtered``
+  readers pass it a ``where`` filter, applied to each block with ``is_in``
+  in Arrow so only the surviving rows are converted to pandas, and
+  ``utils.streaming.read_csv_batches`` rebatches its output.
+* There is one XLSX path, ``utils.workbooks``: ``read_xlsx_filtered`` asks
+  it for the sheet below ``header_row`` with the same ``where`` filter, so
+  path sources also go through its Parquet cache.
+* Numeric columns are read as text and parsed in Arrow: published
+  suppression markers (``SUPPRESSION_MARKERS``, e.g. ``x``, ``..``,
+  ``[c]``) become nulls and thousands separators are dropped; any other
+  text raises ``ValueError``.
+* ``"int"`` columns come back as nullable ``Int64`` and ``"str"`` as the
+  pandas string dtype, whichever format they were read from.
+"""
+
+from __future__ import annotations
+
+import fnmatch
+import zipfile
+from collections.abc import Collection, Iterator, Mapping, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Literal
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+from pandas.api.types import is_numeric_dtype
+
+from yhovi_pipeline.config import get_settings
+from yhovi_pipeline.utils.geo_lookups import GeoSnapshot, get_geo_snapshot
+from yhovi_pipeline.utils.workbooks import MAX_ROW, parse_workbook_range, read_workbook_range
+
+ColumnType = Literal["str", "float", "int"]
+GeoLevel = Literal["lad", "msoa", "lsoa"]
+
+_ARROW_TYPES: dict[ColumnType, pa.DataType] = {
+    "str": pa.string(),
+    "float": pa.float64(),
+    "int": pa.int64(),
+}
+_PANDAS_DTYPES: dict[ColumnType, str] = {"str": "str", "float": "float64", "int": "Int64"}
+
+#: Cell values that stand for a suppressed or unavailable figure (compared
+#: after stripping whitespace, case-insensitively).
+SUPPRESSION_MARKERS: frozenset[str] = frozenset(
+    {"", "*", "x", "..", ".", ":", "-", "c", "[c]", "[x]", "[z]", "[low]", "[u]", "n/a"}
+)
+_MARKERS = pa.array(sorted(SUPPRESSION_MARKERS), type=pa.string())
+
+
+@dataclass(frozen=True)
+class CsvOptions:
+    """Layout of a CSV release."""
+
+    delimiter: str = ","
+    """Field delimiter."""
+
+    skip_rows: int = 0
+    """Lines to skip before the header (title rows)."""
+
+    block_size: int = 1 << 22
+    """Bytes parsed per block — bounds memory per step."""
+
+
+DEFAULT_CSV_OPTIONS = CsvOptions()
+
+
+# ---------------------------------------------------------------------------
+# Wanted geographies
+# ---------------------------------------------------------------------------
+
+
+def wanted_geography_codes(levels: Sequence[GeoLevel] = ("lad", "msoa", "lsoa")) -> frozenset[str]:
+    """Return the codes of ``levels`` that fall inside the configured LADs.
+
+    LAD codes come from ``Settings.yorkshire_lad_codes``; MSOA and LSOA codes
+    are those whose ``GeoLookup`` row points at one of them.  The set is
+    memoised on the geography snapshot.
+    """
+    lads = tuple(sorted(get_settings().yorkshire_lad_codes))
+    name = f"readers.wanted:{','.join(levels)}:{','.join(lads)}"
+
+    def build(snapshot: GeoSnapshot) -> frozenset[str]:
+        frame = snapshot.frame
+        inside = frame.loc[frame["lad_code"].isin(lads)]
+        codes: set[str] = set(lads) if "lad" in levels else set()
+        for level in levels:
+            if level != "lad":
+                codes.update(inside[f"{level}_code"].dropna())
+        return frozenset(codes)
+
+    return get_geo_snapshot().derived(name, build)
+
+
+# ---------------------------------------------------------------------------
+# CSV
+# ---------------------------------------------------------------------------
+
+
+def iter_csv(
+    source: str | Path | IO[bytes],
+    columns: Mapping[str, ColumnType] | None = None,
+    options: CsvOptions = DEFAULT_CSV_OPTIONS,
+    where: tuple[str, Collection[str]] | None = None,
+) -> Iterator[pd.DataFrame]:
+    """Yield a CSV one frame per parsed block.
+
+    Args:
+        source: Path or binary file object.
+        columns: Columns to read and their types; ``None`` reads every
+            column with the types Arrow infers.
+        options: Delimiter, title rows and block size.
+        where: ``(column, values)``: keep only the rows whose ``column``
+            holds one of ``values``.  ``column`` is read as ``"str"``.
+
+    Yields:
+        Non-empty frames with exactly the ``columns`` (plus the ``where``
+        column).
+
+    Raises:
+        ValueError: If a numeric column holds text that is not a
+            suppression marker.
+    """
+    types: dict[str, ColumnType] = dict(columns or {})
+    if where is not None:
+        types[where[0]] = "str"
+        value_set = pa.array(sorted(where[1]), type=pa.string())
+    reader = pacsv.open_csv(
+        str(source) if isinstance(source, str | Path) else source,
+        read_options=pacsv.ReadOptions(skip_rows=options.skip_rows, block_size=options.block_size),
+        parse_options=pacsv.ParseOptions(delimiter=options.delimiter),
+        convert_options=pacsv.ConvertOptions(
+            include_columns=list(types) if columns is not None else [],
+            # Numeric columns are parsed after filtering; see _parse_numeric.
+            column_types={name: pa.string() for name in types},
+            strings_can_be_null=True,
+        ),
+    )
+    for batch in reader:
+        if where is not None:
+            batch = batch.filter(pc.is_in(batch.column(where[0]), value_set=value_set))
+        if not batch.num_rows:
+            continue
+        table = pa.Table.from_batches([batch])
+        for name, kind in types.items():
+            if kind != "str":
+                position = table.schema.get_field_index(name)
+                table = table.set_column(
+                    position, name, _parse_numeric(table.column(name), kind, name)
+                )
+        yield _to_pandas(table, types)
+
+
+def iter_csv_filtered(
+    source: str | Path | IO[bytes],
+    geo_col: str,
+    wanted: Collection[str],
+    columns: Mapping[str, ColumnType],
+    options: CsvOptions = DEFAULT_CSV_OPTIONS,
+) -> Iterator[pd.DataFrame]:
+    """Yield the wanted rows of a CSV, one frame per parsed block.
+
+    Args:
+        source: Path or binary file object.
+        geo_col: Column holding the geography code to filter on.
+        wanted: Codes to keep.
+        columns: Columns to read and their types; ``geo_col`` is read as
+            ``"str"`` whether listed or not.
+        options: Delimiter, title rows and block size.
+
+    Yields:
+        Non-empty frames with exactly the ``columns`` (plus ``geo_col``).
+    """
+    return iter_csv(source, _column_types(geo_col, columns), options, where=(geo_col, wanted))
+
+
+def read_csv_filtered(
+    source: str | Path | IO[bytes],
+    geo_col: str,
+    wanted: Collection[str],
+    columns: Mapping[str, ColumnType],
+    options: CsvOptions = DEFAULT_CSV_OPTIONS,
+) -> pd.DataFrame:
+    """Read the wanted rows of a CSV into one frame (see ``iter_csv_filtered``)."""
+    frames = list(iter_csv_filtered(source, geo_col, wanted, columns, options))
+    return _concat(frames, _column_types(geo_col, columns))
+
+
+def iter_zip_csv_filtered(
+    archive: str | Path | IO[bytes],
+    geo_col: str,
+    wanted: Collection[str],
+    columns: Mapping[str, ColumnType],
+    members: str = "*.csv",
+    options: CsvOptions = DEFAULT_CSV_OPTIONS,
+) -> Iterator[pd.DataFrame]:
+    """Yield the wanted rows of every CSV in a zip archive matching ``members``.
+
+    Members are decompressed as a stream, in archive order, so e.g. a
+    police.uk archive of one CSV per force and month is read one block at a
+    time.
+
+    Raises:
+        FileNotFoundError: If no member matches ``members``.
+    """
+    with zipfile.ZipFile(archive) as zf:
+        names = [name for name in zf.namelist() if fnmatch.fnmatch(name, members)]
+        if not names:
+            raise FileNotFoundError(f"No member of {archive!r} matches {members!r}")
+        for name in names:
+            with zf.open(name) as member:
+                yield from iter_csv_filtered(member, geo_col, wanted, columns, options)
+
+
+def read_zip_csv_filtered(
+    archive: str | Path | IO[bytes],
+    geo_col: str,
+    wanted: Collection[str],
+    columns: Mapping[str, ColumnType],
+    members: str = "*.csv",
+    options: CsvOptions = DEFAULT_CSV_OPTIONS,
+) -> pd.DataFrame:
+    """Read the wanted rows of a zipped CSV release into one frame."""
+    frames = list(iter_zip_csv_filtered(archive, geo_col, wanted, columns, members, options))
+    return _concat(frames, _column_types(geo_col, columns))
+
+
+# ---------------------------------------------------------------------------
+# XLSX
+# ---------------------------------------------------------------------------
+
+
+def read_xlsx_filtered(
+    source: str | Path | IO[bytes],
+    sheet: str,
+    geo_col: str,
+    wanted: Collection[str],
+    columns: Mapping[str, ColumnType],
+    header_row: int = 1,
+) -> pd.DataFrame:
+    """Read the wanted rows of one worksheet.
+
+    Workbooks on disk are parsed through the ``utils.workbooks`` cache;
+    file objects are parsed directly.
+
+    Args:
+        source: Path or binary file object of the workbook.
+        sheet: Worksheet name.
+        geo_col: Header of the column holding the geography code.
+        wanted: Codes to keep.
+        columns: Columns (by header) to read and their types.
+        header_row: 1-based row holding the column headers.
+
+    Raises:
+        KeyError: If ``sheet`` or one of the columns does not exist.
+        ValueError: If a numeric column holds text that is not a
+            suppression marker.
+    """
+    types = _column_types(geo_col, columns)
+    cell_range = f"{header_row}:{MAX_ROW}"
+    where = (geo_col, wanted)
+    if isinstance(source, str | Path):
+        frame = read_workbook_range(Path(source), sheet, cell_range, where=where)
+    else:
+        frame = parse_workbook_range(source, sheet, cell_range, where=where)
+    missing = [name for name in types if name not in frame.columns]
+    if missing:
+        raise KeyError(f"Sheet {sheet!r} has no columns {missing}")
+    return pd.DataFrame(
+        {name: _coerce(frame[name], kind) for name, kind in types.items()}, index=frame.index
+    )
+
+
+# ---------------------------------------------------------------------------
+# Internals
+# ---------------------------------------------------------------------------
+
+
+def _column_types(geo_col: str, columns: Mapping[str, ColumnType]) -> dict[str, ColumnType]:
+    """Return ``columns`` with ``geo_col`` typed as a string."""
+    return {**columns, geo_col: "str"}
+
+
+def _parse_numeric(
+    text: pa.ChunkedArray | pa.Array, kind: ColumnType, name: str
+) -> pa.ChunkedArray | pa.Array:
+    """Parse a text column as ``kind``, turning suppression markers into nulls."""
+    trimmed = pc.utf8_trim_whitespace(text)
+    suppressed = pc.is_in(pc.utf8_lower(trimmed), value_set=_MARKERS)
+    cleaned = pc.if_else(
+        suppressed, pa.scalar(None, pa.string()), pc.replace_substring(trimmed, ",", "")
+    )
+    try:
+        return pc.cast(cleaned, _ARROW_TYPES[kind])
+    except pa.ArrowInvalid as exc:
+        raise ValueError(f"Column {name!r} has values that are not numbers: {exc}") from exc
+
+
+def _coerce(values: pd.Series, kind: ColumnType) -> pd.Series:
+    """Give a parsed worksheet column its ``ColumnType``."""
+    dtype = _PANDAS_DTYPES[kind]
+    if kind != "str" and is_numeric_dtype(values):
+        return values.astype(dtype)
+    text = [None if pd.isna(value) else str(value) for value in values]
+    if kind == "str":
+        return pd.Series(text, index=values.index, name=values.name, dtype=dtype)
+    # Text cells (e.g. numbers next to "[c]") go through the CSV marker parser.
+    parsed = _parse_numeric(pa.array(text, type=pa.string()), "float", str(values.name))
+    return pd.Series(parsed.to_pandas(), index=values.index, name=values.name).astype(dtype)
+
+
+def _to_pandas(table: pa.Table, types: Mapping[str, ColumnType]) -> pd.DataFrame:
+    """Convert a filtered Arrow table, giving every column its pandas dtype."""
+    return table.to_pandas().astype({name: _PANDAS_DTYPES[kind] for name, kind in types.items()})
+
+
+def _concat(frames: list[pd.DataFrame], types: Mapping[str, ColumnType]) -> pd.DataFrame:
+    """Concatenate reader output, keeping typed columns when nothing matched."""
+    if frames:
+        return pd.concat(frames, ignore_index=True)
+    return pd.DataFrame(
+        {name: pd.Series(dtype=_PANDAS_DTYPES[kind]) for name, kind in types.items()}
+    )
@@ -0,0 +1,188 @@
+"""Persisted task results: Arrow serialisation and content-based cache keys.
+
+Flows retry as a whole (``retries=1``), so without persisted results a load
+failure re-ran every extract and transform.  Extract and transform tasks now
+persist their results and carry a cache policy keyed on what they actually
+depend on, so a flow retry or a manual re-run of the same release resumes
+from the last stage that succeeded.
+
+Design notes
+------------
+* ``ArrowSerializer`` writes ``DataFrame`` results as an Arrow IPC stream
+  (``zstd``-compressed by default) instead of a pickle: smaller and faster
+  to write and read.  Prefect embeds results in a JSON record, so the stream
+  is base64-encoded like Prefect's own pickles; once decoded, an
+  ``"uncompressed"`` stream is read in place without further copies.
+  ``IndicatorBatch`` results are written the same way from ``to_arrow``,
+  keeping their dictionary encoding, behind their own tag.  Any
+  other result (e.g. an ``UpsertResult``) falls back to Prefect's pickle
+  serializer, behind a one-byte tag.
+* ``ContentInputs`` keys a run on the task's source plus its inputs, with
+  ``DataFrame`` inputs hashed by content in one vectorised pass
+  (``pd.util.hash_pandas_object``) rather than pickled.
+* Extract tasks use ``EXTRACT_CACHE_POLICY``, which also requires a
+  ``release_id`` input: without one there is no way to tell a new release
+  from the last one, so the task is simply not cached.
+* Geography transforms use ``GEO_CACHE_POLICY``, which adds the
+  ``GeoLookup`` vintage, since their output depends on the lookup as well as
+  their inputs.  The vintage is read from its watermark row, never by
+  loading the lookup.  ``rebase_to_current_geography`` depends on
+  ``GeoCrosswalk`` instead, so ``REBASE_CACHE_POLICY`` adds a digest of the
+  LAD crosswalk rows.
+* Validate tasks use ``VALIDATE_CACHE_POLICY``, which adds
+  ``Settings.yorkshire_lad_codes`` (the ``YorkshireLads`` rule checks
+  against it).  Load tasks are never cached.
+* Inputs that cannot be hashed (neither as JSON nor pickled) make the run
+  uncached rather than failing it.
+* Results go to Prefect's result storage
+  (``PREFECT_RESULTS_LOCAL_STORAGE_PATH``), which must be shared by every
+  worker for a re-run on another worker to reuse them.
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Literal
+
+import pandas as pd
+import pyarrow as pa
+from prefect.cache_policies import TASK_SOURCE, CachePolicy
+from prefect.exceptions import HashError
+from prefect.serializers import PickleSerializer, Serializer
+from prefect.utilities.hashing import hash_objects
+from pydantic import Field
+
+from yhovi_pipeline.config import get_settings
+from yhovi_pipeline.db.batch import IndicatorBatch
+from yhovi_pipeline.utils.crosswalk import crosswalk_digest
+from yhovi_pipeline.utils.geo_lookups import query_geo_vintage
+
+if TYPE_CHECKING:
+    from prefect.context import TaskRunContext
+
+_ARROW_TAG = b"A"
+_BATCH_TAG = b"B"
+_PICKLE_TAG = b"P"
+
+
+# ---------------------------------------------------------------------------
+# Serializer
+# ---------------------------------------------------------------------------
+
+
+# Unsubscripted on purpose: pydantic turns ``Serializer[Any]`` into a new
+# class, which Prefect would try to register as a serializer type of its own.
+class ArrowSerializer(Serializer):
+    """Serialise ``DataFrame`` and ``IndicatorBatch`` results as Arrow IPC, anything else as a pickle."""
+
+    type: str = Field(default="arrow", frozen=True)
+
+    compression: Literal["zstd", "lz4", "uncompressed"] = "zstd"
+    """IPC buffer compression; ``"uncompressed"`` trades size for zero-copy reads."""
+
+    def dumps(self, obj: Any) -> bytes:
+        if isinstance(obj, IndicatorBatch):
+            tag, table = _BATCH_TAG, obj.to_arrow()
+        elif isinstance(obj, pd.DataFrame):
+            tag, table = _ARROW_TAG, pa.Table.from_pandas(obj)
+        else:
+            return _PICKLE_TAG + PickleSerializer().dumps(obj)
+        options = pa.ipc.IpcWriteOptions(
+            compression=None if self.compression == "uncompressed" else self.compression
+        )
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema, options=options) as writer:
+            writer.write_table(table)
+        return tag + base64.b64encode(sink.getvalue())
+
+    def loads(self, blob: bytes) -> Any:
+        tag, body = blob[:1], blob[1:]
+        if tag == _PICKLE_TAG:
+            return PickleSerializer().loads(body)
+        if tag not in (_ARROW_TAG, _BATCH_TAG):
+            raise ValueError(f"Not an ArrowSerializer payload (tag {tag!r})")
+        stream = pa.py_buffer(base64.b64decode(body))
+        table = pa.ipc.open_stream(stream).read_all()
+        return IndicatorBatch.from_arrow(table) if tag == _BATCH_TAG else table.to_pandas()
+
+
+#: Shared serializer instance for ``@task(result_serializer=...)``.
+ARROW_SERIALIZER = ArrowSerializer()
+
+
+# ---------------------------------------------------------------------------
+# Cache policies
+# ---------------------------------------------------------------------------
+
+
+def frame_digest(frame: pd.DataFrame) -> str:
+    """Return a content hash of ``frame``: values, index, column names and dtypes."""
+    digest = hashlib.sha256()
+    digest.update(repr([(str(col), str(dtype)) for col, dtype in frame.dtypes.items()]).encode())
+    digest.update(pd.util.hash_pandas_object(frame, index=True).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+@dataclass
+class ContentInputs(CachePolicy):
+    """Key a task run on its source code and inputs, hashing frames by content.
+
+    Args:
+        require: Inputs that must be set for the run to be cached at all
+            (e.g. ``release_id``); when one is missing no key is produced.
+        context: Extra state the result depends on (e.g. the geography
+            vintage); ``None`` from it also disables caching.
+    """
+
+    require: tuple[str, ...] = ()
+    context: Callable[[], object] | None = None
+
+    def compute_key(
+        self,
+        task_ctx: TaskRunContext,
+        inputs: dict[str, Any],
+        flow_parameters: dict[str, Any],
+        **kwargs: Any,
+    ) -> str | None:
+        if any(inputs.get(name) is None or inputs.get(name) == "" for name in self.require):
+            return None
+        context = self.context() if self.context is not None else None
+        if self.context is not None and context is None:
+            return None
+        source = TASK_SOURCE.compute_key(task_ctx, inputs, flow_parameters, **kwargs)
+        try:
+            hashed = {
+                name: frame_digest(value) if isinstance(value, pd.DataFrame) else value
+                for name, value in inputs.items()
+            }
+            return hash_objects(source, hashed, context, raise_on_failure=True)
+        except (TypeError, HashError):
+            # Unhashable cell values (e.g. lists) or inputs: run the task uncached.
+            return None
+
+
+def _lad_crosswalk_digest() -> str:
+    return crosswalk_digest("lad")
+
+
+def _yorkshire_lads() -> tuple[str, ...]:
+    return tuple(sorted(get_settings().yorkshire_lad_codes))
+
+
+#: Extract tasks: cached per task source, inputs and ``release_id``.
+EXTRACT_CACHE_POLICY = ContentInputs(require=("release_id",))
+
+#: Row-local transforms (normalise): cached on input content.
+TRANSFORM_CACHE_POLICY = ContentInputs()
+
+#: Validate tasks: cached on input content and the configured Yorkshire LADs.
+VALIDATE_CACHE_POLICY = ContentInputs(context=_yorkshire_lads)
+
+#: Geography transforms: cached on input content and the ``GeoLookup`` vintage.
+GEO_CACHE_POLICY = ContentInputs(context=query_geo_vintage)
+
+#: Boundary re-basing: cached on input content and the LAD ``GeoCrosswalk`` rows.
+REBASE_CACHE_POLICY = ContentInputs(context=_lad_crosswalk_digest)
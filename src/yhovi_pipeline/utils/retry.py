@@ -0,0 +1,274 @@
+"""Retry policy and per-source circuit breaker for upstream HTTP calls.
+
+Transient upstream failures are retried inside ``utils.http.fetch`` with
+``tenacity``.  The first retry comes after well under a second, so a single
+``502`` costs almost nothing.  A source that is clearly down trips its
+circuit breaker, and the remaining tasks for that source then fail at once
+instead of each sitting through its own back-off.
+
+Design notes
+------------
+* Retriable: connection and read errors, timeouts, and ``408 / 425 / 429 /
+  5xx`` gateway-style statuses.  Anything else (``400``, ``401``, ``404``,
+  parse errors, ...) is fatal and surfaces immediately.
+* Waits use exponential back-off with full jitter, starting at
+  ``Settings.retry_initial_wait_seconds``.  A ``Retry-After`` header
+  (delta-seconds or HTTP-date) overrides it, capped at
+  ``Settings.retry_max_wait_seconds``.
+* One ``CircuitBreaker`` per source and process.  It opens after
+  ``Settings.circuit_breaker_threshold`` consecutive outages: connection
+  errors, timeouts and ``5xx`` responses.  ``408 / 425 / 429`` are retried
+  but count as the source being up — it is throttling, not down — so one
+  rate-limited request cannot fail fast every task for that source.
+  After ``Settings.circuit_breaker_reset_seconds`` it lets one trial call
+  through (half-open); a success closes it again.
+* Extract tasks keep a short Prefect retry as a last resort, gated by
+  ``retry_if_transient`` so fatal errors, open circuits and
+  ``SourceNotModified`` are never retried at task level.
+"""
+
+from __future__ import annotations
+
+import random
+import threading
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime
+from email.utils import parsedate_to_datetime
+from typing import Any, TypeVar
+
+import httpx
+from prefect import Task
+from prefect.client.schemas.objects import State, TaskRun
+from tenacity import RetryCallState, Retrying, retry_if_exception, stop_after_attempt
+from tenacity.wait import wait_base
+
+from yhovi_pipeline.config import Settings, get_settings
+
+T = TypeVar("T")
+
+#: HTTP statuses worth retrying: timeouts, rate limiting and gateway errors.
+RETRIABLE_STATUS_CODES: frozenset[int] = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+_breakers: dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+# ---------------------------------------------------------------------------
+# Classification
+# ---------------------------------------------------------------------------
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a source whose circuit breaker is open."""
+
+    def __init__(self, source: str, retry_in: float) -> None:
+        super().__init__(
+            f"{source}: circuit open after repeated failures; next trial in {retry_in:.0f}s"
+        )
+        self.source = source
+        self.retry_in = retry_in
+
+
+def is_retriable(exc: BaseException) -> bool:
+    """Return ``True`` if ``exc`` is a transient upstream failure."""
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code in RETRIABLE_STATUS_CODES
+    return isinstance(exc, httpx.TransportError)
+
+
+def is_outage(exc: BaseException) -> bool:
+    """Return ``True`` if ``exc`` suggests the source is down, not just busy."""
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code >= 500
+    return isinstance(exc, httpx.TransportError)
+
+
+def retry_after_seconds(exc: BaseException | None) -> float | None:
+    """Return the delay requested by a ``Retry-After`` header on ``exc``'s response.
+
+    Returns:
+        Seconds to wait, or ``None`` if there is no usable header.
+    """
+    if not isinstance(exc, httpx.HTTPStatusError):
+        return None
+    value = exc.response.headers.get("Retry-After")
+    if value is None:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=UTC)
+    return max(0.0, (when - datetime.now(UTC)).total_seconds())
+
+
+def retry_if_transient(task: Task[..., Any], task_run: TaskRun, state: State) -> bool:
+    """Prefect ``retry_condition_fn`` that only retries transient failures.
+
+    Fatal responses, open circuits and expected outcomes such as
+    ``SourceNotModified`` fail straight through to the flow.
+    """
+    if not state.is_failed():
+        return True
+    try:
+        state.result()
+    except Exception as exc:
+        return is_retriable(exc)
+    return True
+
+
+# ---------------------------------------------------------------------------
+# Waiting
+# ---------------------------------------------------------------------------
+
+
+class wait_retry_after(wait_base):
+    """Honour ``Retry-After``, otherwise back off exponentially with full jitter.
+
+    Args:
+        initial: Upper bound of the first jittered wait, in seconds.
+        maximum: Cap on any single wait, including ``Retry-After``.
+    """
+
+    def __init__(self, initial: float, maximum: float) -> None:
+        self.initial = initial
+        self.maximum = maximum
+
+    def __call__(self, retry_state: RetryCallState) -> float:
+        outcome = retry_state.outcome
+        requested = retry_after_seconds(outcome.exception() if outcome else None)
+        if requested is not None:
+            return min(requested, self.maximum)
+        ceiling = min(self.maximum, self.initial * 2 ** (retry_state.attempt_number - 1))
+        return random.uniform(0, ceiling)
+
+
+# ---------------------------------------------------------------------------
+# Circuit breaker
+# ---------------------------------------------------------------------------
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker for one source.
+
+    Args:
+        source: Source name, used in error messages.
+        threshold: Consecutive failures that open the circuit.
+        reset_seconds: How long the circuit stays open before a trial call.
+    """
+
+    def __init__(self, source: str, threshold: int, reset_seconds: float) -> None:
+        self.source = source
+        self.threshold = threshold
+        self.reset_seconds = reset_seconds
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        """``True`` while calls are being refused."""
+        with self._lock:
+            return self._opened_at is not None
+
+    def before_call(self) -> None:
+        """Admit a call, or raise ``CircuitOpenError`` while the circuit is open."""
+        with self._lock:
+            if self._opened_at is None:
+                return
+            remaining = self._opened_at + self.reset_seconds - time.monotonic()
+            if remaining > 0 or self._trial_in_flight:
+                raise CircuitOpenError(self.source, max(remaining, 0.0))
+            self._trial_in_flight = True
+
+    def record_success(self) -> None:
+        """Close the circuit and reset the failure count."""
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        """Count an outage, opening the circuit at the threshold."""
+        with self._lock:
+            self._failures += 1
+            if self._trial_in_flight or self._failures >= self.threshold:
+                self._opened_at = time.monotonic()
+            self._trial_in_flight = False
+
+
+def get_circuit_breaker(source: str) -> CircuitBreaker:
+    """Return the process-wide circuit breaker for ``source``."""
+    with _breakers_lock:
+        breaker = _breakers.get(source)
+        if breaker is None:
+            settings = get_settings()
+            breaker = CircuitBreaker(
+                source,
+                threshold=settings.circuit_breaker_threshold,
+                reset_seconds=settings.circuit_breaker_reset_seconds,
+            )
+            _breakers[source] = breaker
+        return breaker
+
+
+def reset_circuit_breakers() -> None:
+    """Forget all breaker state (tests, or after changing ``Settings``)."""
+    with _breakers_lock:
+        _breakers.clear()
+
+
+# ---------------------------------------------------------------------------
+# Policy
+# ---------------------------------------------------------------------------
+
+
+def retrying(settings: Settings | None = None) -> Retrying:
+    """Build the ``tenacity`` retry policy described by ``settings``."""
+    settings = settings or get_settings()
+    return Retrying(
+        stop=stop_after_attempt(settings.retry_max_attempts),
+        wait=wait_retry_after(settings.retry_initial_wait_seconds, settings.retry_max_wait_seconds),
+        retry=retry_if_exception(is_retriable),
+        reraise=True,
+    )
+
+
+def call_with_retry(source: str, call: Callable[[], T]) -> T:
+    """Run ``call`` under the retry policy and ``source``'s circuit breaker.
+
+    Args:
+        source: Source name, one of ``config.HTTP_SOURCES``.
+        call: Zero-argument callable making one request; it should raise
+            ``httpx.HTTPStatusError`` for error responses.
+
+    Returns:
+        Whatever ``call`` returns on its first successful attempt.
+
+    Raises:
+        CircuitOpenError: If the source's circuit is open.
+        Exception: The last error once attempts are exhausted, or the first
+            fatal one.
+    """
+    breaker = get_circuit_breaker(source)
+
+    def attempt() -> T:
+        breaker.before_call()
+        try:
+            result = call()
+        except Exception as exc:
+            if is_outage(exc):
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+            raise
+        breaker.record_success()
+        return result
+
+    return retrying()(attempt)
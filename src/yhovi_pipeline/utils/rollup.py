@@ -0,0 +1,223 @@
+"""Sparse-matrix rollups over the LSOA → MSOA → LAD → Region hierarchy.
+
+Each step of the hierarchy is a sparse 0/1 aggregation matrix built once
+from ``GeoIndex`` (``msoa x lsoa``, ``lad x msoa``, ``region x lad``).
+Rolling a wide indicator matrix (LSOAs x indicators) up to every level is
+then a short chain of sparse matmuls — one per level for all indicators —
+instead of a ``groupby`` per indicator per level.
+
+Design notes
+------------
+* Input rows are scattered onto LSOA ids by a one-hot sparse matrix, so
+  duplicate, missing or unordered LSOAs need no special handling; rows with
+  unknown codes are dropped and counted.
+* Sums are chained level to level (``LSOA → MSOA → LAD → Region``), so each
+  matmul only touches the previous level's rows.
+* Weighted means roll up ``Σ w·x`` and ``Σ w`` (over non-missing ``x``)
+  separately and divide at each level.  Rates are recomputed the same way
+  from rolled-up numerators and denominators — never averaged.  Missing
+  numerators or denominators count as zero.
+* LADs without a region in ``GeoLookup`` contribute to no region.
+"""
+
+from __future__ import annotations
+
+import itertools
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+from scipy import sparse
+
+from yhovi_pipeline.utils.geo_index import LEVELS, GeoIndex, Level, geo_index_for
+from yhovi_pipeline.utils.geo_lookups import get_geo_snapshot
+
+FloatMatrix = npt.NDArray[np.float64]
+
+
+@dataclass(frozen=True)
+class Rate:
+    """A rate recomputed at each level from a numerator and denominator column."""
+
+    numerator: str
+    denominator: str
+    per: float = 1.0
+    """Scale, e.g. ``1000`` for a rate per 1,000."""
+
+
+@dataclass(frozen=True)
+class RollupResult:
+    """Per-level outputs of ``HierarchyRollup.rollup_frame``."""
+
+    levels: dict[str, pd.DataFrame]
+    """``<level>_code``, ``<level>_name`` and value / rate columns, keyed by level."""
+
+    unmatched: int
+    """Input rows whose geography code was not found in the index."""
+
+
+class HierarchyRollup:
+    """Sparse aggregation matrices for every step of the geography hierarchy.
+
+    Args:
+        index: Compiled geography index; the matrices are built from its
+            parent arrays.
+    """
+
+    def __init__(self, index: GeoIndex) -> None:
+        self.index = index
+        self.steps: dict[str, sparse.csr_matrix] = {}
+        for child, parent in itertools.pairwise(LEVELS):
+            self.steps[parent] = _aggregation_matrix(
+                index.parents[(child, parent)], len(index.levels[parent])
+            )
+
+    def rollup(
+        self, values: FloatMatrix, level: Level = "lsoa", to: Sequence[Level] = LEVELS
+    ) -> dict[str, FloatMatrix]:
+        """Sum a dense ``level``-ids x indicators matrix up to every level in ``to``.
+
+        Args:
+            values: One row per ``level`` id (``len(index.levels[level])`` rows).
+            level: Level the rows of ``values`` are indexed by.
+            to: Levels to return; ``level`` itself may be included.
+
+        Returns:
+            Dense area x indicator sums keyed by level.
+        """
+        wanted = set(to)
+        start = LEVELS.index(level)
+        out: dict[str, FloatMatrix] = {}
+        current = np.asarray(values, dtype=np.float64)
+        if level in wanted:
+            out[level] = current
+        for parent in LEVELS[start + 1 :]:
+            if not wanted - out.keys():
+                break
+            current = np.asarray(self.steps[parent] @ current)
+            if parent in wanted:
+                out[parent] = current
+        return out
+
+    def rollup_frame(
+        self,
+        df: pd.DataFrame,
+        value_cols: Sequence[str] = (),
+        geo_col: str = "lsoa_code",
+        level: Level = "lsoa",
+        to: Sequence[Level] = ("msoa", "lad", "region"),
+        weight_col: str | None = None,
+        rates: Mapping[str, Rate] | None = None,
+    ) -> RollupResult:
+        """Aggregate ``df`` to every level in ``to`` in one pass.
+
+        Args:
+            df: Rows keyed by ``level`` codes in ``geo_col``.
+            value_cols: Columns to aggregate — summed, or weighted means when
+                ``weight_col`` is given.
+            geo_col: Column of ``df`` holding the codes.
+            level: Geography level of ``geo_col``.
+            to: Output levels, each coarser than or equal to ``level``.
+            weight_col: Weight column (e.g. population) for weighted means.
+            rates: Output rate columns recomputed from summed numerators and
+                denominators, keyed by output column name.
+
+        Returns:
+            One frame per level with only areas that received input rows.
+
+        Raises:
+            ValueError: If an output level is finer than ``level``.
+        """
+        finer = [t for t in to if LEVELS.index(t) < LEVELS.index(level)]
+        if finer:
+            raise ValueError(f"Cannot roll {level!r} data down to {finer}")
+        rates = dict(rates or {})
+        value_cols = list(value_cols)
+        rate_inputs = list(
+            dict.fromkeys(c for r in rates.values() for c in (r.numerator, r.denominator))
+        )
+
+        ids = self.index.levels[level].ids(df[geo_col])
+        known = ids >= 0
+        unmatched = int((~known).sum())
+        if unmatched:
+            ids, df = ids[known], df.loc[known]
+
+        n_areas = len(self.index.levels[level])
+        scatter = _aggregation_matrix(ids, n_areas)
+
+        values = _float_matrix(df, value_cols)
+        missing = np.isnan(values)
+        values[missing] = 0.0
+        if weight_col is not None:
+            weights = np.nan_to_num(df[weight_col].to_numpy(dtype=np.float64))[:, None]
+            divisors = (~missing) * weights
+            values *= weights
+        else:
+            divisors = np.empty((len(df), 0))
+
+        stacked = np.hstack(
+            [values, divisors, np.nan_to_num(_float_matrix(df, rate_inputs)), np.ones((len(df), 1))]
+        )
+        rolled = self.rollup(np.asarray(scatter @ stacked), level=level, to=to)
+
+        # Column blocks of ``stacked``: values | divisors | rate inputs | row count.
+        width, n_divisors = len(value_cols), divisors.shape[1]
+        results: dict[str, pd.DataFrame] = {}
+        for name, matrix in rolled.items():
+            hit = matrix[:, -1] > 0
+            matrix = matrix[hit]
+            area = self.index.levels[name]
+            columns: dict[str, object] = {
+                f"{name}_code": area.codes[hit],
+                f"{name}_name": area.names[hit],
+            }
+            sums = matrix[:, :width]
+            if weight_col is not None:
+                with np.errstate(invalid="ignore", divide="ignore"):
+                    weight_sums = matrix[:, width : width + n_divisors]
+                    sums = np.where(weight_sums > 0, sums / weight_sums, np.nan)
+            columns.update(zip(value_cols, sums.T, strict=True))
+
+            inputs = dict(zip(rate_inputs, matrix[:, width + n_divisors : -1].T, strict=True))
+            for rate_name, rate in rates.items():
+                with np.errstate(invalid="ignore", divide="ignore"):
+                    denominator = inputs[rate.denominator]
+                    columns[rate_name] = np.where(
+                        denominator != 0, inputs[rate.numerator] / denominator * rate.per, np.nan
+                    )
+            results[name] = pd.DataFrame(columns)
+
+        return RollupResult(levels=results, unmatched=unmatched)
+
+
+def _aggregation_matrix(parent_ids: npt.NDArray[np.int32], n_parents: int) -> sparse.csr_matrix:
+    """Return the ``n_parents x len(parent_ids)`` 0/1 matrix mapping children to parents.
+
+    Children whose parent id is ``-1`` get an empty column.
+    """
+    children = np.flatnonzero(parent_ids >= 0)
+    return sparse.csr_matrix(
+        (np.ones(len(children)), (parent_ids[children], children)),
+        shape=(n_parents, len(parent_ids)),
+    )
+
+
+def _float_matrix(df: pd.DataFrame, columns: Sequence[str]) -> FloatMatrix:
+    """Return ``df[columns]`` as a writable float64 matrix (``n x 0`` if no columns)."""
+    if not columns:
+        return np.empty((len(df), 0))
+    return np.array(df[list(columns)].to_numpy(dtype=np.float64))
+
+
+def get_hierarchy_rollup() -> HierarchyRollup:
+    """Return the process-wide ``HierarchyRollup`` for the cached ``GeoLookup``.
+
+    Like ``get_geo_index()``, it is rebuilt whenever the geography cache
+    loads a new snapshot.
+    """
+    return get_geo_snapshot().derived(
+        "hierarchy_rollup", lambda s: HierarchyRollup(geo_index_for(s))
+    )
@@ -0,0 +1,194 @@
+"""Streaming (batched) execution of extract → validate → normalise → load.
+
+National files such as BEIS LSOA energy consumption, Ofcom Connected Nations
+postcode data or police.uk archives are far larger than the slice we keep.
+In streaming mode an extractor yields record batches instead of returning
+one ``DataFrame``; each batch is validated, normalised and committed before
+the next is read, so peak memory is bounded by ``Settings.stream_batch_size``
+rather than by the size of the file.
+
+Design notes
+------------
+* A stream is a plain ``Iterator[pd.DataFrame]``.  Steps are applied lazily
+  with ``map_batches``, so nothing is read until the loader pulls the next
+  batch — the loader's progress is therefore the end-to-end rate.
+* ``rebatch`` normalises whatever sizes a reader produces (one huge sheet,
+  thousands of tiny API pages) to batches of at most ``batch_size`` rows;
+  at most one batch plus one input frame is buffered.
+  ``rebatch_indicators`` does the same for ``IndicatorBatch`` streams, the
+  output of ``normalise_to_indicator``.
+* Transform steps must be row-local (no cross-batch aggregation) to be
+  streamed; aggregations such as ``aggregate_to_lad`` run on the loaded
+  result, or on batches whose grouping keys do not straddle a boundary.
+* ``ThroughputMeter`` reports rows/sec at most every
+  ``Settings.stream_progress_interval_seconds`` plus once at the end.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from pathlib import Path
+from typing import IO, Concatenate, ParamSpec, TypeVar
+
+import numpy as np
+import pandas as pd
+
+from yhovi_pipeline.db.batch import IndicatorBatch
+from yhovi_pipeline.utils.readers import DEFAULT_CSV_OPTIONS, ColumnType, CsvOptions, iter_csv
+
+_P = ParamSpec("_P")
+_R = TypeVar("_R", pd.DataFrame, IndicatorBatch)
+
+_logger = logging.getLogger(__name__)
+
+
+def map_batches(
+    batches: Iterable[pd.DataFrame],
+    step: Callable[Concatenate[pd.DataFrame, _P], _R],
+    *args: _P.args,
+    **kwargs: _P.kwargs,
+) -> Iterator[_R]:
+    """Lazily apply ``step(batch, *args, **kwargs)`` to every batch.
+
+    Pass a task's underlying function (``validate_schema.fn``) rather than
+    the task itself, so a stream does not create one task run per batch.
+    Empty results are dropped.
+    """
+    for batch in batches:
+        result = step(batch, *args, **kwargs)
+        if len(result):
+            yield result
+
+
+def rebatch(batches: Iterable[pd.DataFrame], batch_size: int) -> Iterator[pd.DataFrame]:
+    """Re-chunk a stream into batches of exactly ``batch_size`` rows (the last may be short).
+
+    Raises:
+        ValueError: If ``batch_size`` is not positive.
+    """
+    if batch_size <= 0:
+        raise ValueError(f"batch_size must be positive, got {batch_size}")
+
+    pending: list[pd.DataFrame] = []
+    buffered = 0
+    for batch in batches:
+        if batch.empty:
+            continue
+        pending.append(batch)
+        buffered += len(batch)
+        if buffered < batch_size:
+            continue
+        merged = pd.concat(pending, ignore_index=True) if len(pending) > 1 else batch
+        cut = buffered - buffered % batch_size
+        for start in range(0, cut, batch_size):
+            yield merged.iloc[start : start + batch_size].reset_index(drop=True)
+        pending = [merged.iloc[cut:]] if cut < buffered else []
+        buffered -= cut
+    if buffered:
+        yield pd.concat(pending, ignore_index=True)
+
+
+def rebatch_indicators(
+    batches: Iterable[IndicatorBatch], batch_size: int
+) -> Iterator[IndicatorBatch]:
+    """``rebatch`` for ``IndicatorBatch`` streams.
+
+    Raises:
+        ValueError: If ``batch_size`` is not positive.
+    """
+    if batch_size <= 0:
+        raise ValueError(f"batch_size must be positive, got {batch_size}")
+
+    pending: list[IndicatorBatch] = []
+    buffered = 0
+    for batch in batches:
+        if not len(batch):
+            continue
+        pending.append(batch)
+        buffered += len(batch)
+        if buffered < batch_size:
+            continue
+        merged = IndicatorBatch.concat(pending) if len(pending) > 1 else batch
+        cut = buffered - buffered % batch_size
+        for start in range(0, cut, batch_size):
+            yield merged.take(np.arange(start, start + batch_size))
+        pending = [merged.take(np.arange(cut, buffered))] if cut < buffered else []
+        buffered -= cut
+    if buffered:
+        yield IndicatorBatch.concat(pending)
+
+
+def read_csv_batches(
+    source: str | Path | IO[bytes],
+    batch_size: int,
+    columns: Mapping[str, ColumnType] | None = None,
+    options: CsvOptions = DEFAULT_CSV_OPTIONS,
+) -> Iterator[pd.DataFrame]:
+    """Yield a CSV file (path or binary file) ``batch_size`` rows at a time.
+
+    Reads through ``utils.readers.iter_csv`` — list ``columns`` to keep
+    each batch small and typed.  Use the ``*_csv_filtered`` readers there to
+    drop rows outside Yorkshire as well.
+    """
+    return rebatch(iter_csv(source, columns, options), batch_size)
+
+
+class ThroughputMeter:
+    """Count rows through a stream and log progress in rows/sec.
+
+    Args:
+        label: Name used in log messages (e.g. the dataset code).
+        interval_seconds: Minimum time between progress lines.
+        clock: Monotonic time source; injectable for tests.
+    """
+
+    def __init__(
+        self,
+        label: str,
+        interval_seconds: float = 10.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.label = label
+        self.rows = 0
+        self.batches = 0
+        self._interval = interval_seconds
+        self._clock = clock
+        self._started = clock()
+        self._last_report = self._started
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds since the meter was created."""
+        return self._clock() - self._started
+
+    @property
+    def rows_per_second(self) -> float:
+        """Average throughput so far."""
+        elapsed = self.elapsed
+        return self.rows / elapsed if elapsed > 0 else 0.0
+
+    def update(self, rows: int) -> None:
+        """Record one processed batch of ``rows`` rows, logging if due."""
+        self.rows += rows
+        self.batches += 1
+        now = self._clock()
+        if now - self._last_report >= self._interval:
+            self._last_report = now
+            self._log("progress")
+
+    def finish(self) -> None:
+        """Log the final totals."""
+        self._log("done")
+
+    def _log(self, stage: str) -> None:
+        _logger.info(
+            "%s %s: %d rows in %d batches, %.1fs, %.0f rows/s",
+            self.label,
+            stage,
+            self.rows,
+            self.batches,
+            self.elapsed,
+            self.rows_per_second,
+        )
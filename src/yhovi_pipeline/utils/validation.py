@@ -0,0 +1,461 @@
+"""Declarative validation rules, checked together in one pass per frame.
+
+A dataset declares its checks once as a ``RuleSet``; ``RuleSet.validate``
+runs them all over a ``DataFrame`` (or a streamed batch) and returns a
+``ValidationReport`` with a failure count and timing per rule.
+
+Design notes
+------------
+* Rules are small frozen dataclasses (``RequiredColumns``, ``InSet``,
+  ``YorkshireLads``, ``ValueRange``, ``MaxNullRate``, ``UniqueKey``,
+  ``PeriodBounds``).  Constructing a ``RuleSet`` compiles them once: allowed
+  sets become ``pd.Index`` lookups, bounds become ``datetime64`` scalars.
+  ``YorkshireLads`` reads ``Settings.yorkshire_lad_codes`` when it runs, so
+  rule sets can be module-level constants.
+* During a run, column-level work is done once per column and shared by
+  every rule that needs it (``_Columns``): a column is dictionary-encoded
+  once, so membership checks test its *distinct* values against the
+  allowed set and map the result back through the codes.  Adding a rule on
+  an already-checked column adds little more than one vectorised compare.
+* ``"error"`` rules fail the task (``ValidationReport.raise_for_errors``);
+  ``"warning"`` rules are logged and reported only.  Rules whose columns
+  are missing are skipped and reported as such, leaving the failure to
+  ``RequiredColumns``.
+* ``RequiredColumns`` only rejects empty frames when asked
+  (``non_empty=True``): a streamed batch may legitimately be empty.
+  ``UniqueKey`` ignores rows with a null key part, as the upsert does.
+* ``publish_report_artifact`` turns a report into a Prefect table
+  artifact, one row per rule.
+"""
+
+from __future__ import annotations
+
+import re
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Collection, Sequence
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Literal
+
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+from prefect.artifacts import create_table_artifact
+
+from yhovi_pipeline.config import get_settings
+from yhovi_pipeline.db.batch import IndicatorBatch
+
+Severity = Literal["error", "warning"]
+
+
+# ---------------------------------------------------------------------------
+# Report
+# ---------------------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class RuleResult:
+    """Outcome of one rule over one frame."""
+
+    rule: str
+    severity: Severity
+    failures: int
+    """Failing rows (or missing columns / values, depending on the rule)."""
+
+    seconds: float
+    detail: str = ""
+    skipped: bool = False
+
+    @property
+    def passed(self) -> bool:
+        return self.failures == 0
+
+
+@dataclass(frozen=True)
+class ValidationReport:
+    """Every rule's result for one frame."""
+
+    dataset: str
+    rows: int
+    results: tuple[RuleResult, ...]
+    seconds: float
+    """Total time, including the shared column work."""
+
+    @property
+    def errors(self) -> list[RuleResult]:
+        """Failed ``"error"`` rules."""
+        return [r for r in self.results if r.severity == "error" and not r.passed]
+
+    @property
+    def warnings(self) -> list[RuleResult]:
+        """Failed ``"warning"`` rules."""
+        return [r for r in self.results if r.severity == "warning" and not r.passed]
+
+    def raise_for_errors(self) -> None:
+        """Raise if any ``"error"`` rule failed.
+
+        Raises:
+            ValueError: Listing every failed error rule.
+        """
+        if self.errors:
+            failed = "; ".join(f"{r.rule}: {r.detail}" for r in self.errors)
+            raise ValueError(f"{self.dataset} failed validation: {failed}")
+
+    def summary(self) -> str:
+        """One line per rule: status, failures and timing."""
+        lines = [f"{self.dataset}: {self.rows} rows validated in {self.seconds * 1000:.1f} ms"]
+        for r in self.results:
+            status = "skipped" if r.skipped else "ok" if r.passed else r.severity
+            lines.append(
+                f"  {r.rule}: {status}, {r.failures} failures, {r.seconds * 1000:.2f} ms"
+                + (f" ({r.detail})" if r.detail and not r.passed else "")
+            )
+        return "\n".join(lines)
+
+    def as_rows(self) -> list[dict[str, object]]:
+        """One artifact / JSON row per rule."""
+        return [
+            {
+                "rule": r.rule,
+                "severity": r.severity,
+                "status": "skipped" if r.skipped else "ok" if r.passed else "failed",
+                "failures": r.failures,
+                "detail": r.detail,
+                "milliseconds": round(r.seconds * 1000, 3),
+            }
+            for r in self.results
+        ]
+
+
+def publish_report_artifact(report: ValidationReport) -> None:
+    """Publish ``report`` as a ``validation-<dataset>`` table artifact on the current run."""
+    create_table_artifact(
+        table=report.as_rows(),
+        key="validation-" + re.sub(r"[^a-z0-9]+", "-", report.dataset.lower()).strip("-"),
+        description=f"Validation of {report.rows} {report.dataset} rows.",
+    )
+
+
+# ---------------------------------------------------------------------------
+# Shared column work
+# ---------------------------------------------------------------------------
+
+
+class _Columns:
+    """Per-run cache of column encodings shared between rules."""
+
+    def __init__(self, frame: pd.DataFrame) -> None:
+        self.frame = frame
+        self._categorical: dict[str, pd.Categorical] = {}
+        self._numeric: dict[str, npt.NDArray[np.float64]] = {}
+
+    def has(self, columns: Collection[str]) -> bool:
+        return all(col in self.frame.columns for col in columns)
+
+    def categorical(self, column: str) -> pd.Categorical:
+        if column not in self._categorical:
+            values = self.frame[column]
+            self._categorical[column] = (
+                values.array
+                if isinstance(values.dtype, pd.CategoricalDtype)
+                else pd.Categorical(values)
+            )
+        return self._categorical[column]
+
+    def numeric(self, column: str) -> npt.NDArray[np.float64]:
+        if column not in self._numeric:
+            self._numeric[column] = pd.to_numeric(self.frame[column], errors="coerce").to_numpy(
+                dtype=np.float64, na_value=np.nan
+            )
+        return self._numeric[column]
+
+
+# ---------------------------------------------------------------------------
+# Rules
+# ---------------------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class Rule(ABC):
+    """Base class: a named, vectorised check of some columns."""
+
+    severity: Severity = field(default="error", kw_only=True)
+
+    @property
+    def name(self) -> str:
+        return type(self).__name__
+
+    @property
+    def columns(self) -> tuple[str, ...]:
+        """Columns the rule reads; it is skipped when any is missing."""
+        return ()
+
+    @abstractmethod
+    def compile(self) -> Callable[[_Columns], tuple[int, str]]:
+        """Return the check: columns → ``(failures, detail)``."""
+
+
+@dataclass(frozen=True)
+class RequiredColumns(Rule):
+    """The frame has these columns (and, with ``non_empty``, at least one row)."""
+
+    required: tuple[str, ...]
+    non_empty: bool = False
+
+    @property
+    def name(self) -> str:
+        return "required-columns"
+
+    def compile(self) -> Callable[[_Columns], tuple[int, str]]:
+        required, non_empty = self.required, self.non_empty
+
+        def check(cols: _Columns) -> tuple[int, str]:
+            missing = [col for col in required if col not in cols.frame.columns]
+            if missing:
+                return len(missing), f"missing columns {missing}"
+            if non_empty and cols.frame.empty:
+                return 1, "no rows"
+            return 0, ""
+
+        return check
+
+
+@dataclass(frozen=True)
+class InSet(Rule):
+    """Every non-null value of ``column`` is in ``allowed``."""
+
+    column: str
+    allowed: Collection[str]
+
+    @property
+    def name(self) -> str:
+        return f"in-set:{self.column}"
+
+    @property
+    def columns(self) -> tuple[str, ...]:
+        return (self.column,)
+
+    def compile(self) -> Callable[[_Columns], tuple[int, str]]:
+        allowed = pd.Index(sorted(self.allowed))
+        column = self.column
+
+        def check(cols: _Columns) -> tuple[int, str]:
+            cat = cols.categorical(column)
+            bad = ~cat.categories.isin(allowed)
+            if not bad.any():
+                return 0, ""
+            codes = cat.codes
+            failing = int(bad[codes[codes >= 0]].sum())
+            return failing, f"unexpected values {list(cat.categories[bad][:5])}"
+
+        return check
+
+
+@dataclass(frozen=True)
+class YorkshireLads(Rule):
+    """``column`` holds only Yorkshire LAD codes.
+
+    With ``require_all`` (a ``"warning"`` by default), also report
+    configured LADs that are absent from the frame.
+    """
+
+    column: str = "lad_code"
+    require_all: bool = False
+
+    @property
+    def name(self) -> str:
+        return f"yorkshire-lads:{self.column}" + (":complete" if self.require_all else "")
+
+    @property
+    def columns(self) -> tuple[str, ...]:
+        return (self.column,)
+
+    def compile(self) -> Callable[[_Columns], tuple[int, str]]:
+        column, require_all = self.column, self.require_all
+
+        def check(cols: _Columns) -> tuple[int, str]:
+            # Settings are read per run, so rule sets can be built at import.
+            lads = frozenset(get_settings().yorkshire_lad_codes)
+            if not require_all:
+                return InSet(column, lads).compile()(cols)
+            cat = cols.categorical(column)
+            present = set(cat.categories[np.unique(cat.codes[cat.codes >= 0])])
+            absent = sorted(lads - present)
+            return len(absent), f"absent LADs {absent[:5]}" if absent else ""
+
+        return check
+
+
+@dataclass(frozen=True)
+class ValueRange(Rule):
+    """Non-null numeric values of ``column`` lie in ``[minimum, maximum]``."""
+
+    column: str
+    minimum: float | None = None
+    maximum: float | None = None
+
+    @property
+    def name(self) -> str:
+        return f"range:{self.column}"
+
+    @property
+    def columns(self) -> tuple[str, ...]:
+        return (self.column,)
+
+    def compile(self) -> Callable[[_Columns], tuple[int, str]]:
+        low = -np.inf if self.minimum is None else self.minimum
+        high = np.inf if self.maximum is None else self.maximum
+        column = self.column
+
+        def check(cols: _Columns) -> tuple[int, str]:
+            values = cols.numeric(column)
+            failing = int(((values < low) | (values > high)).sum())
+            return failing, f"outside [{low}, {high}]" if failing else ""
+
+        return check
+
+
+@dataclass(frozen=True)
+class MaxNullRate(Rule):
+    """At most ``rate`` of ``column`` is null (or, if numeric, unparseable)."""
+
+    column: str
+    rate: float
+    numeric: bool = False
+
+    @property
+    def name(self) -> str:
+        return f"null-rate:{self.column}"
+
+    @property
+    def columns(self) -> tuple[str, ...]:
+        return (self.column,)
+
+    def compile(self) -> Callable[[_Columns], tuple[int, str]]:
+        column, rate, numeric = self.column, self.rate, self.numeric
+
+        def check(cols: _Columns) -> tuple[int, str]:
+            if numeric:
+                nulls = int(np.isnan(cols.numeric(column)).sum())
+            else:
+                nulls = int((cols.categorical(column).codes < 0).sum())
+            rows = len(cols.frame)
+            if not rows or nulls / rows <= rate:
+                return 0, ""
+            return nulls, f"{nulls / rows:.1%} null, limit {rate:.1%}"
+
+        return check
+
+
+@dataclass(frozen=True)
+class UniqueKey(Rule):
+    """No two rows share the same ``key`` (e.g. the upsert key).
+
+    Rows with a null in any key column are not compared.
+    """
+
+    key: tuple[str, ...] = ("indicator_id", "lad_code", "reference_period")
+
+    @property
+    def name(self) -> str:
+        return f"unique-key:{','.join(self.key)}"
+
+    @property
+    def columns(self) -> tuple[str, ...]:
+        return self.key
+
+    def compile(self) -> Callable[[_Columns], tuple[int, str]]:
+        key = self.key
+
+        def check(cols: _Columns) -> tuple[int, str]:
+            codes = pd.DataFrame({col: cols.categorical(col).codes for col in key})
+            complete = (codes >= 0).all(axis=1)
+            failing = int(codes.loc[complete].duplicated().sum())
+            return failing, "duplicate keys" if failing else ""
+
+        return check
+
+
+@dataclass(frozen=True)
+class PeriodBounds(Rule):
+    """Every ``column`` date lies within ``[earliest, latest]``."""
+
+    column: str = "reference_period"
+    earliest: date | None = None
+    latest: date | None = None
+
+    @property
+    def name(self) -> str:
+        return f"period-bounds:{self.column}"
+
+    @property
+    def columns(self) -> tuple[str, ...]:
+        return (self.column,)
+
+    def compile(self) -> Callable[[_Columns], tuple[int, str]]:
+        low = np.datetime64(self.earliest or date.min, "D")
+        high = np.datetime64(self.latest or date.max, "D")
+        column = self.column
+
+        def check(cols: _Columns) -> tuple[int, str]:
+            # Bounds are checked per distinct period, not per row.
+            cat = cols.categorical(column)
+            periods = pd.to_datetime(cat.categories).to_numpy(dtype="datetime64[D]")
+            bad = (periods < low) | (periods > high)
+            if not bad.any():
+                return 0, ""
+            codes = cat.codes
+            failing = int(bad[codes[codes >= 0]].sum())
+            return failing, f"outside [{low}, {high}]"
+
+        return check
+
+
+# ---------------------------------------------------------------------------
+# Rule sets
+# ---------------------------------------------------------------------------
+
+
+class RuleSet:
+    """A dataset's rules, compiled once and run together.
+
+    Args:
+        dataset: Name used in reports and errors.
+        rules: Rules in reporting order.
+    """
+
+    def __init__(self, dataset: str, rules: Sequence[Rule]) -> None:
+        self.dataset = dataset
+        self.rules = tuple(rules)
+        self._checks = [(rule, rule.compile()) for rule in self.rules]
+
+    def validate(self, data: pd.DataFrame | IndicatorBatch) -> ValidationReport:
+        """Run every rule over ``data`` in one pass."""
+        started = time.perf_counter()
+        frame = data.to_frame() if isinstance(data, IndicatorBatch) else data
+        cols = _Columns(frame)
+        results = []
+        for rule, check in self._checks:
+            rule_started = time.perf_counter()
+            if not cols.has(rule.columns):
+                results.append(
+                    RuleResult(rule.name, rule.severity, 0, 0.0, "columns missing", skipped=True)
+                )
+                continue
+            failures, detail = check(cols)
+            results.append(
+                RuleResult(
+                    rule.name,
+                    rule.severity,
+                    failures,
+                    time.perf_counter() - rule_started,
+                    detail,
+                )
+            )
+        return ValidationReport(
+            dataset=self.dataset,
+            rows=len(frame),
+            results=tuple(results),
+            seconds=time.perf_counter() - started,
+        )
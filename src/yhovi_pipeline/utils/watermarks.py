@@ -0,0 +1,137 @@
+"""Incremental-extraction watermarks backed by ``DatasetMetadata``.
+
+Every successful load records the source ``release_id`` and the latest
+``reference_period`` it wrote (see ``write_metadata``).  Reading those back
+per ``(source, dataset_code)`` gives a watermark, and extract tasks then only
+request periods after it — so a monthly run of a long series fetches and
+loads a one-month delta instead of the whole history.
+
+Only ``SUCCESS`` runs move the watermark; failed and skipped runs are
+ignored.  The period watermark is the *maximum* across successful runs, so a
+later backfill of older periods never winds it back.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date
+
+from sqlalchemy import Connection, func, select
+
+from yhovi_pipeline.db.models import DatasetMetadata, ExtractionStatus
+from yhovi_pipeline.db.session import get_engine
+
+
+@dataclass(frozen=True)
+class Watermark:
+    """High-water mark of what has been loaded for one dataset."""
+
+    source: str
+    dataset_code: str
+
+    max_reference_period: date | None
+    """Latest reference period loaded by any successful run."""
+
+    release_id: str | None
+    """Release identifier recorded by the most recent successful run."""
+
+    def is_newer(self, period: date) -> bool:
+        """Return ``True`` if ``period`` lies after the watermark."""
+        return self.max_reference_period is None or period > self.max_reference_period
+
+
+def read_watermark(connection: Connection, source: str, dataset_code: str) -> Watermark | None:
+    """Read the watermark for ``(source, dataset_code)`` on ``connection``.
+
+    Args:
+        connection: Open connection to the data warehouse.
+        source: Source system identifier, e.g. ``"dwp"``.
+        dataset_code: Dataset identifier within the source.
+
+    Returns:
+        The watermark, or ``None`` if the dataset has never loaded successfully.
+    """
+    successful = (
+        DatasetMetadata.source == source,
+        DatasetMetadata.dataset_code == dataset_code,
+        DatasetMetadata.extraction_status == ExtractionStatus.SUCCESS,
+    )
+
+    max_period = connection.scalar(
+        select(func.max(DatasetMetadata.max_reference_period)).where(*successful)
+    )
+    latest = connection.execute(
+        select(DatasetMetadata.release_id)
+        .where(*successful)
+        .order_by(DatasetMetadata.id.desc())
+        .limit(1)
+    ).first()
+
+    if latest is None:
+        return None
+    return Watermark(
+        source=source,
+        dataset_code=dataset_code,
+        max_reference_period=max_period,
+        release_id=latest.release_id,
+    )
+
+
+def get_watermark(source: str, dataset_code: str) -> Watermark | None:
+    """Read the watermark for ``(source, dataset_code)`` from the data warehouse.
+
+    Args:
+        source: Source system identifier, e.g. ``"dwp"``.
+        dataset_code: Dataset identifier within the source.
+
+    Returns:
+        The watermark, or ``None`` if the dataset has never loaded successfully.
+    """
+    with get_engine().connect() as connection:
+        return read_watermark(connection, source, dataset_code)
+
+
+def pending_months(watermark: Watermark | None, first: date, last: date) -> list[str]:
+    """List the ISO ``"YYYY-MM"`` months after the watermark, up to ``last``.
+
+    Args:
+        watermark: Current watermark, or ``None`` for a full backfill.
+        first: Earliest month of the series (used when there is no watermark).
+        last: Latest month that may have been published.
+
+    Returns:
+        Months to extract, oldest first — empty when already up to date.
+    """
+    start = first.replace(day=1)
+    if watermark is not None and watermark.max_reference_period is not None:
+        start = max(start, _add_months(watermark.max_reference_period.replace(day=1), 1))
+
+    months: list[str] = []
+    current = start
+    while current <= last:
+        months.append(current.strftime("%Y-%m"))
+        current = _add_months(current, 1)
+    return months
+
+
+def pending_years(watermark: Watermark | None, first: int, last: int) -> list[int]:
+    """List the reference years after the watermark, up to ``last``.
+
+    Args:
+        watermark: Current watermark, or ``None`` for a full backfill.
+        first: Earliest year of the series (used when there is no watermark).
+        last: Latest year that may have been published.
+
+    Returns:
+        Years to extract, oldest first — empty when already up to date.
+    """
+    start = first
+    if watermark is not None and watermark.max_reference_period is not None:
+        start = max(start, watermark.max_reference_period.year + 1)
+    return list(range(start, last + 1))
+
+
+def _add_months(value: date, months: int) -> date:
+    """Return the first day of the month ``months`` after ``value``'s month."""
+    index = value.year * 12 + value.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
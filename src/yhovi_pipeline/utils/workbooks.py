@@ -0,0 +1,224 @@
+"""Targeted XLSX parsing with a converted-file cache.
+
+ONS Regional Accounts, Business Demography and IMD are released as large
+multi-sheet workbooks, and parsing them is the slowest step of those flows.
+``read_workbook_range`` parses only the sheet and cell range an extractor
+needs, and caches the result as Parquet keyed by the workbook's checksum,
+so a rerun or retry of the same release never parses the XLSX again.
+
+Design notes
+------------
+* Workbooks are opened with openpyxl in read-only mode, which streams the
+  sheet's XML instead of building the whole cell tree, and rows are only
+  read inside the requested range.  ``where`` keeps only the rows whose
+  value in one column is wanted, as they stream past — this is how
+  ``utils.readers.read_xlsx_filtered`` drops the rest of the country.
+  This module is the pipeline's only openpyxl reader.
+* A cache entry is keyed by the SHA-256 of the workbook bytes plus the
+  sheet, range, header flag, ``where`` filter and ``_FORMAT_VERSION`` (bump it when the
+  parsing rules change).  A new release has a new checksum, so entries never
+  need invalidating; old ones are simply left behind for housekeeping.
+* Column types are inferred the same way whether or not the cache is used:
+  all-integer columns become ``Int64``, numeric columns ``float64``, date
+  columns ``datetime64`` and anything mixed (e.g. numbers with suppression
+  markers such as ``[c]``) the string dtype, so every column is Parquet-safe.
+* Entries are written to a temporary file and renamed into place, so a
+  concurrent reader never sees a partial file.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+import tempfile
+from collections.abc import Collection
+from datetime import date, datetime
+from pathlib import Path
+from typing import IO
+
+import pandas as pd
+from openpyxl import load_workbook
+from openpyxl.utils.cell import range_boundaries
+
+from yhovi_pipeline.config import get_settings
+
+#: Part of every cache key; bump to invalidate entries after a parser change.
+_FORMAT_VERSION = 1
+
+#: The last row of an XLSX sheet, used to close ranges such as ``"A5:H"``.
+MAX_ROW = 1_048_576
+
+_OPEN_RANGE = re.compile(r"^([A-Z]+\d+:[A-Z]+)$", re.IGNORECASE)
+
+
+def read_workbook_range(
+    path: Path,
+    sheet: str,
+    cell_range: str | None = None,
+    header: bool = True,
+    where: tuple[str, Collection[str]] | None = None,
+) -> pd.DataFrame:
+    """Parse one sheet (or one range of it), through the Parquet cache.
+
+    Args:
+        path: Workbook on disk (e.g. a cached download).
+        sheet: Worksheet name.
+        cell_range: Excel range such as ``"A5:H400"``, ``"A5:H"`` (to the
+            last row), ``"A:H"`` or ``"5:400"``.  ``None`` reads the whole
+            sheet.
+        header: Use the range's first row as column names (blank ones
+            become ``column_<i>``, repeats get a ``.1``, ``.2`` suffix);
+            otherwise every column is named ``column_<i>``.
+        where: ``(column, values)``: keep only the rows whose ``column``
+            (a header name) holds one of ``values``.
+
+    Returns:
+        The parsed range with fully blank rows dropped.
+
+    Raises:
+        KeyError: If ``sheet`` or the ``where`` column does not exist.
+        ValueError: If ``cell_range`` is not a valid range, or ``where`` is
+            given without ``header``.
+    """
+    settings = get_settings()
+    if not settings.workbook_cache_enabled:
+        return parse_workbook_range(path, sheet, cell_range, header, where)
+
+    target = _cache_path(settings.workbook_cache_dir, path, sheet, cell_range, header, where)
+    if target.exists():
+        return pd.read_parquet(target)
+
+    frame = parse_workbook_range(path, sheet, cell_range, header, where)
+    _write_parquet(frame, target)
+    return frame
+
+
+def parse_workbook_range(
+    source: Path | IO[bytes],
+    sheet: str,
+    cell_range: str | None = None,
+    header: bool = True,
+    where: tuple[str, Collection[str]] | None = None,
+) -> pd.DataFrame:
+    """Parse a sheet range without the cache (see ``read_workbook_range``).
+
+    ``source`` may also be an open binary file.
+    """
+    if where is not None and not header:
+        raise ValueError("where filters by header name, so it needs header=True")
+    min_col, min_row, max_col, max_row = _bounds(cell_range)
+    workbook = load_workbook(source, read_only=True, data_only=True)
+    try:
+        cells = workbook[sheet].iter_rows(
+            min_row=min_row,
+            max_row=max_row,
+            min_col=min_col,
+            max_col=max_col,
+            values_only=True,
+        )
+        rows = (tuple(row) for row in cells if any(cell is not None for cell in row))
+        header_cells = next(rows, ()) if header else ()
+        if where is not None:
+            column, values = where
+            names = _column_names(header_cells)
+            if column not in names:
+                raise KeyError(f"Sheet {sheet!r} has no column {column!r}")
+            position = names.index(column)
+            wanted = values if isinstance(values, frozenset | set) else frozenset(values)
+            rows = (row for row in rows if position < len(row) and row[position] in wanted)
+        kept = list(rows)
+    finally:
+        workbook.close()
+
+    width = max([len(header_cells), *(len(row) for row in kept)])
+    kept = [row + (None,) * (width - len(row)) for row in kept]
+    if header:
+        names = _column_names(header_cells + (None,) * (width - len(header_cells)))
+    else:
+        names = [f"column_{i}" for i in range(width)]
+    return pd.DataFrame(kept, columns=names, dtype=object).apply(_infer_column)
+
+
+def file_checksum(path: Path) -> str:
+    """Return the hex SHA-256 of ``path``, read in 1 MiB blocks."""
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for block in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+# ---------------------------------------------------------------------------
+# Internals
+# ---------------------------------------------------------------------------
+
+
+def _bounds(cell_range: str | None) -> tuple[int | None, int | None, int | None, int | None]:
+    """Return ``(min_col, min_row, max_col, max_row)`` for an Excel range."""
+    if cell_range is None:
+        return None, None, None, None
+    if _OPEN_RANGE.match(cell_range):
+        cell_range = f"{cell_range}{MAX_ROW}"
+    min_col, min_row, max_col, max_row = range_boundaries(cell_range)
+    return min_col, min_row, max_col, max_row
+
+
+def _column_names(cells: tuple[object, ...]) -> list[str]:
+    """Turn a header row into unique column names."""
+    names: list[str] = []
+    seen: dict[str, int] = {}
+    for position, cell in enumerate(cells):
+        name = " ".join(str(cell).split()) if cell is not None else ""
+        name = name or f"column_{position}"
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        names.append(name)
+    return names
+
+
+def _infer_column(column: pd.Series) -> pd.Series:
+    """Give a column of raw cell values a single, Parquet-safe dtype."""
+    values = column.dropna()
+    if values.empty:
+        return column.astype("float64")
+    kinds = {type(value) for value in values}
+    if kinds <= {int}:
+        return column.astype("Int64")
+    if kinds <= {int, float}:
+        return column.astype("float64")
+    if kinds <= {datetime, date}:
+        return pd.to_datetime(column)
+    return column.map(lambda value: None if pd.isna(value) else str(value)).astype("str")
+
+
+def _cache_path(
+    directory: Path,
+    path: Path,
+    sheet: str,
+    cell_range: str | None,
+    header: bool,
+    where: tuple[str, Collection[str]] | None,
+) -> Path:
+    """Return the cache file for one parse of one workbook."""
+    options = f"{_FORMAT_VERSION}|{sheet}|{cell_range or ''}|{int(header)}"
+    if where is not None:
+        options += "|" + "\x1f".join([where[0], *sorted(where[1])])
+    suffix = hashlib.sha256(options.encode()).hexdigest()[:16]
+    return directory / f"{file_checksum(path)}-{suffix}.parquet"
+
+
+def _write_parquet(frame: pd.DataFrame, target: Path) -> None:
+    """Write ``frame`` to ``target`` atomically."""
+    target.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=target.parent, prefix=".tmp-", suffix=".parquet")
+    os.close(fd)
+    try:
+        frame.to_parquet(tmp, index=False)
+        os.replace(tmp, target)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
@@ -0,0 +1,117 @@
+"""Benchmark: extract throughput through ``utils.http.fetch`` against the replay server.
+
+Serves synthetic release files from ``tests.replay.server`` and downloads
+them with the extract-flow thread pool, once per fault profile, so the
+effect of latency, bandwidth caps, throttling and 5xx retries on a refresh
+can be measured offline and deterministically.  Pass ``--fixtures`` to
+replay recorded responses instead (every fixture is fetched).  Run
+directly::
+
+    python -m tests.benchmarks.bench_extract
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest import mock
+from urllib.parse import parse_qsl
+
+from tests.replay.server import Faults, FixtureStore, Recording, ReplayServer
+
+SOURCE = "ons"
+N_FILES = 200
+FILE_BYTES = 256 * 1024
+WORKERS = 4  # the extract flows' ThreadPoolTaskRunner size
+
+PROFILES: dict[str, Faults] = {
+    "local": Faults(),
+    "latency 50ms, 8 MB/s": Faults(latency_seconds=0.05, bandwidth_bytes_per_second=8e6),
+    "throttled 40 req/s": Faults(latency_seconds=0.05, requests_per_second=40, burst=8),
+    "10% 503s": Faults(latency_seconds=0.05, error_rate=0.1),
+}
+
+
+def synthetic_release(directory: Path, files: int, size: int) -> list[tuple[str, str, str]]:
+    """Write ``files`` recordings of ``size`` bytes; return (source, path, query) triples."""
+    store = FixtureStore(directory)
+    body = b"x" * size
+    for i in range(files):
+        store.put(SOURCE, f"release/file-{i:04d}.csv", "", Recording(200, body))
+    return [(SOURCE, f"release/file-{i:04d}.csv", "") for i in range(files)]
+
+
+def recorded_requests(directory: Path) -> list[tuple[str, str, str]]:
+    """Return a (source, path, query) triple for every fixture under ``directory``."""
+    requests = []
+    for meta in sorted(directory.glob("*/*.json")):
+        recorded = json.loads(meta.read_text())
+        requests.append((meta.parent.name, recorded["path"], recorded["query"]))
+    return requests
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--fixtures", type=Path, default=None)
+    parser.add_argument("--workers", type=int, default=WORKERS)
+    args = parser.parse_args(argv)
+
+    # Work files and environment changes last only for the run.
+    with mock.patch.dict(os.environ), tempfile.TemporaryDirectory(prefix="yhovi-replay-") as tmp:
+        run(Path(tmp), args.fixtures, args.workers)
+
+
+def run(workdir: Path, recorded: Path | None, workers: int) -> None:
+    """Download every request once per fault profile and print the rates."""
+    if recorded is None:
+        fixtures = workdir / "fixtures"
+        requests = synthetic_release(fixtures, N_FILES, FILE_BYTES)
+    else:
+        fixtures = recorded
+        requests = recorded_requests(fixtures)
+
+    os.environ.setdefault("SQL_SERVER_CONNECTION_STRING", "sqlite://")
+    os.environ.setdefault("DWP_API_KEY", "benchmark")
+    os.environ["HTTP_CACHE_ENABLED"] = "false"
+    os.environ["RATE_LIMIT_DB"] = str(workdir / "rate_limits.sqlite3")
+    os.environ["CIRCUIT_BREAKER_THRESHOLD"] = "1000"
+
+    # Client-side rate limits (``<SOURCE>_HTTP__REQUESTS_PER_SECOND``) stay as
+    # configured: pacing recorded NOMIS or DWP traffic is part of what is measured.
+    from yhovi_pipeline.config import get_settings
+    from yhovi_pipeline.utils.http import close_http_clients, fetch
+    from yhovi_pipeline.utils.retry import reset_circuit_breakers
+
+    print(f"{len(requests)} requests, {workers} workers")
+    print(f"  {'profile':<24} {'req/s':>8} {'MB/s':>8} {'429s':>6} {'5xx':>6}")
+    for name, faults in PROFILES.items():
+        with ReplayServer(fixtures, faults) as server:
+            os.environ.update(server.environ())
+            get_settings.cache_clear()
+            close_http_clients()
+            reset_circuit_breakers()
+
+            def download(request: tuple[str, str, str]) -> int:
+                source, path, query = request
+                return len(fetch(source, path, dict(parse_qsl(query)) or None).content)
+
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                downloaded = sum(pool.map(download, requests))
+            elapsed = time.perf_counter() - started
+            stats = server.stats()
+        print(
+            f"  {name:<24} {len(requests) / elapsed:8.1f} {downloaded / elapsed / 1e6:8.1f}"
+            f" {stats['throttled']:6d} {stats['error']:6d}"
+        )
+    close_http_clients()
+    get_settings.cache_clear()
+
+
+if __name__ == "__main__":
+    main()
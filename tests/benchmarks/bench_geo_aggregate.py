@@ -0,0 +1,100 @@
+"""Benchmark: ``GeoIndex.aggregate`` vs string merge + ``groupby``.
+
+Builds an England-sized synthetic hierarchy (~33.7k LSOAs, ~6.8k MSOAs,
+296 LADs, 9 regions) and aggregates 20 LSOA indicators to LAD level both
+ways.  Not collected by pytest; run directly::
+
+    python -m tests.benchmarks.bench_geo_aggregate
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Callable
+
+import numpy as np
+import pandas as pd
+
+from yhovi_pipeline.utils.geo_index import GeoIndex
+
+N_LSOA = 33_755
+N_MSOA = 6_856
+N_LAD = 296
+N_REGION = 9
+N_INDICATORS = 20
+
+
+def synthetic_lookup(seed: int = 0) -> pd.DataFrame:
+    """Return a ``GeoLookup``-shaped frame with England-like cardinalities."""
+    rng = np.random.default_rng(seed)
+    msoa_of_lsoa = np.sort(rng.integers(0, N_MSOA, N_LSOA))
+    lad_of_msoa = np.sort(rng.integers(0, N_LAD, N_MSOA))
+    region_of_lad = np.sort(rng.integers(0, N_REGION, N_LAD))
+
+    msoa = msoa_of_lsoa
+    lad = lad_of_msoa[msoa]
+    region = region_of_lad[lad]
+    return pd.DataFrame(
+        {
+            "lsoa_code": [f"E01{i:06d}" for i in range(N_LSOA)],
+            "lsoa_name": [f"LSOA {i}" for i in range(N_LSOA)],
+            "msoa_code": [f"E02{i:06d}" for i in msoa],
+            "msoa_name": [f"MSOA {i}" for i in msoa],
+            "lad_code": [f"E08{i:06d}" for i in lad],
+            "lad_name": [f"LAD {i}" for i in lad],
+            "region_code": [f"E12{i:06d}" for i in region],
+            "region_name": [f"Region {i}" for i in region],
+        }
+    )
+
+
+def synthetic_indicators(lookup: pd.DataFrame, seed: int = 1) -> pd.DataFrame:
+    """Return one row per LSOA with ``N_INDICATORS`` values and a population."""
+    rng = np.random.default_rng(seed)
+    values = rng.uniform(0, 100, (len(lookup), N_INDICATORS))
+    df = pd.DataFrame(values, columns=[f"ind_{i:02d}" for i in range(N_INDICATORS)])
+    df.insert(0, "lsoa_code", lookup["lsoa_code"].sample(frac=1.0, random_state=seed).to_numpy())
+    df["population"] = rng.integers(1_000, 3_000, len(lookup)).astype(float)
+    return df
+
+
+def best_of(
+    fn: Callable[[], object], repeat: int = 5, setup: Callable[[], object] | None = None
+) -> float:
+    """Return the fastest of ``repeat`` runs of ``fn``, in seconds.
+
+    ``setup``, if given, runs untimed before every run.
+    """
+    timings = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    lookup = synthetic_lookup()
+    data = synthetic_indicators(lookup)
+    cols = [c for c in data.columns if c.startswith("ind_")]
+
+    def merge_groupby() -> pd.DataFrame:
+        merged = data.merge(lookup[["lsoa_code", "lad_code"]], on="lsoa_code")
+        return merged.groupby("lad_code")[cols].sum()
+
+    build = best_of(lambda: GeoIndex.from_lookup(lookup), repeat=3)
+    index = GeoIndex.from_lookup(lookup)
+    vectorised = best_of(lambda: index.aggregate(data, cols, "lsoa_code"))
+    baseline = best_of(merge_groupby)
+
+    print(f"{len(data):,} LSOA rows x {len(cols)} indicators -> {N_LAD} LADs")
+    print(f"  GeoIndex build (once per process): {build * 1e3:8.1f} ms")
+    print(f"  merge + groupby:                   {baseline * 1e3:8.1f} ms")
+    print(f"  GeoIndex.aggregate:                {vectorised * 1e3:8.1f} ms")
+    print(f"  speed-up:                          {baseline / vectorised:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,322 @@
+"""Benchmark suite: the transform and load tasks on national-scale inputs.
+
+Generates synthetic inputs shaped like the real releases — an England-sized
+``GeoLookup`` (from ``bench_geo_aggregate``), a wide Fingertips-style LSOA
+profile, a multi-year monthly claimant series per LAD and a postcode-level
+broadband file — and times ``aggregate_to_lad``, ``validate_schema``,
+``validate_dataset``, ``normalise_to_indicator``,
+``normalise_wide_to_indicator`` and ``upsert_indicators`` against a local
+SQLite stand-in for the warehouse, created in a temporary directory and
+removed (with the environment restored) when the run ends.  The upsert is
+timed twice: a full insert into an empty table, and a monthly delta (new
+rows plus 1% revised values) on top of the loaded history; the table is
+reset before every repeat.
+
+Each run is appended to a JSON history (see ``history``), and the run fails
+when a case is more than ``--threshold`` slower than its recent median on
+this host.  Not collected by pytest; run directly::
+
+    python -m tests.benchmarks.bench_pipeline --threshold 0.25
+"""
+
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import os
+import sys
+import tempfile
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from datetime import date
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import create_engine
+
+from tests.benchmarks.bench_geo_aggregate import best_of, synthetic_indicators, synthetic_lookup
+from tests.benchmarks.history import append_run, compare, load_history
+
+N_CLAIMANT_YEARS = 20
+N_POSTCODES = 1_500_000
+N_PROFILE_PERIODS = 4
+
+DEFAULT_HISTORY = Path("data/benchmarks/history.json")
+
+
+# ---------------------------------------------------------------------------
+# Synthetic inputs
+# ---------------------------------------------------------------------------
+
+
+def synthetic_claimant_series(lookup: pd.DataFrame, years: int, seed: int = 2) -> pd.DataFrame:
+    """Return a monthly claimant count per LAD over ``years`` years (NOMIS-shaped)."""
+    rng = np.random.default_rng(seed)
+    lads = lookup[["lad_code", "lad_name"]].drop_duplicates("lad_code")
+    months = pd.period_range("2005-01", periods=12 * years, freq="M").strftime("%Y-%m")
+    frame = lads.merge(pd.DataFrame({"DATE": months}), how="cross")
+    frame = frame.rename(columns={"lad_code": "GEOGRAPHY_CODE", "lad_name": "GEOGRAPHY_NAME"})
+    frame["OBS_VALUE"] = rng.integers(100, 20_000, len(frame)).astype(float)
+    # Roughly 1 in 200 cells is suppressed in the real series.
+    frame.loc[rng.random(len(frame)) < 0.005, "OBS_VALUE"] = np.nan
+    return frame
+
+
+def synthetic_profile(lookup: pd.DataFrame, periods: int, seed: int = 3) -> pd.DataFrame:
+    """Return a wide Fingertips-style LSOA profile: 20 indicators, ``periods`` years."""
+    frames = []
+    for offset in range(periods):
+        frame = synthetic_indicators(lookup, seed=seed + offset).drop(columns="population")
+        frame = frame.astype({col: object for col in frame.columns if col.startswith("ind_")})
+        frame.iloc[offset::97, 1] = "*"  # suppression markers, as published
+        frame["Time period"] = f"{2019 + offset}/{20 + offset}"
+        frames.append(frame)
+    profile = pd.concat(frames, ignore_index=True)
+    names = lookup.set_index("lsoa_code")["lsoa_name"]
+    profile["Area Name"] = profile["lsoa_code"].map(names)
+    return profile
+
+
+def synthetic_broadband(lookup: pd.DataFrame, postcodes: int, seed: int = 4) -> pd.DataFrame:
+    """Return a postcode-level broadband file (Ofcom Connected Nations-shaped)."""
+    rng = np.random.default_rng(seed)
+    lsoa = lookup["lsoa_code"].to_numpy()[rng.integers(0, len(lookup), postcodes)]
+    premises = rng.integers(1, 60, postcodes).astype(float)
+    return pd.DataFrame(
+        {
+            "postcode": [f"PC{i:07d}" for i in range(postcodes)],
+            "lsoa_code": lsoa,
+            "premises": premises,
+            "gigabit_premises": np.floor(premises * rng.random(postcodes)),
+            "sfbb_premises": np.floor(premises * rng.random(postcodes)),
+        }
+    )
+
+
+# ---------------------------------------------------------------------------
+# Warehouse stand-in
+# ---------------------------------------------------------------------------
+
+
+@contextmanager
+def sqlite_warehouse(lookup: pd.DataFrame) -> Iterator[str]:
+    """Point ``Settings`` at a fresh SQLite warehouse holding ``lookup``, for the block.
+
+    The warehouse lives in a temporary directory that is deleted afterwards,
+    and ``os.environ`` is restored on exit.
+    """
+    from yhovi_pipeline.config import get_settings
+    from yhovi_pipeline.db.models import Base
+    from yhovi_pipeline.db.session import dispose_engines
+
+    with mock.patch.dict(os.environ), tempfile.TemporaryDirectory(prefix="yhovi-bench-") as tmp:
+        directory = Path(tmp)
+        url = f"sqlite:///{directory / 'warehouse.db'}"
+        os.environ["SQL_SERVER_CONNECTION_STRING"] = url
+        os.environ.setdefault("DWP_API_KEY", "benchmark")
+        os.environ["GEO_SNAPSHOT_DIR"] = str(directory / "geo_lookup")
+        get_settings.cache_clear()
+
+        engine = create_engine(url)
+        try:
+            Base.metadata.create_all(engine)
+            with engine.begin() as connection:
+                lookup.to_sql("geo_lookup", connection, if_exists="append", index=False)
+        finally:
+            engine.dispose()
+        try:
+            yield url
+        finally:
+            dispose_engines()
+            get_settings.cache_clear()
+
+
+# ---------------------------------------------------------------------------
+# Cases
+# ---------------------------------------------------------------------------
+
+
+@dataclasses.dataclass(frozen=True)
+class Case:
+    """One timed call, with optional untimed preparation before every repeat."""
+
+    run: Callable[[], object]
+    setup: Callable[[], object] | None = None
+
+
+def build_cases(lookup: pd.DataFrame, scale: float) -> dict[str, Case]:
+    """Generate the inputs and return the timed cases by name.
+
+    Needs the warehouse stand-in (``sqlite_warehouse``) to be active.
+    """
+    from sqlalchemy import delete
+
+    from yhovi_pipeline.db.batch import IndicatorBatch
+    from yhovi_pipeline.db.models import Indicator
+    from yhovi_pipeline.db.session import get_engine
+    from yhovi_pipeline.tasks.load.sql_server import upsert_indicators
+    from yhovi_pipeline.tasks.transform.geo import aggregate_to_lad
+    from yhovi_pipeline.tasks.transform.normalise import (
+        IndicatorColumn,
+        normalise_to_indicator,
+        normalise_wide_to_indicator,
+    )
+    from yhovi_pipeline.tasks.transform.validate import validate_dataset, validate_schema
+    from yhovi_pipeline.utils.validation import (
+        MaxNullRate,
+        RequiredColumns,
+        RuleSet,
+        UniqueKey,
+        ValueRange,
+    )
+
+    claimant = synthetic_claimant_series(lookup, max(1, round(N_CLAIMANT_YEARS * scale)))
+    profile = synthetic_profile(lookup, N_PROFILE_PERIODS)
+    broadband = synthetic_broadband(lookup, max(1, round(N_POSTCODES * scale)))
+    lsoa_values = synthetic_indicators(lookup)
+    value_cols = [c for c in lsoa_values.columns if c.startswith("ind_")]
+
+    claimant_rules = RuleSet(
+        "CLAIMANT",
+        [
+            RequiredColumns(("GEOGRAPHY_CODE", "DATE", "OBS_VALUE")),
+            ValueRange("OBS_VALUE", 0, None),
+            MaxNullRate("OBS_VALUE", 0.05, numeric=True),
+            UniqueKey(("GEOGRAPHY_CODE", "DATE")),
+        ],
+    )
+
+    def normalise_claimant() -> object:
+        return normalise_wide_to_indicator.fn(
+            claimant,
+            {"OBS_VALUE": IndicatorColumn("claimant_count", "Claimant count", "count")},
+            source="nomis",
+            dataset_code="CLAIMANT_COUNT",
+            lad_col="GEOGRAPHY_CODE",
+            lad_name_col="GEOGRAPHY_NAME",
+            period_col="DATE",
+        )
+
+    claimant_batch = normalise_claimant()
+    assert isinstance(claimant_batch, IndicatorBatch)
+    periods = claimant_batch.reference_period
+    history = claimant_batch.take(np.flatnonzero(periods < periods.max()))
+    revised = history.take(np.arange(0, len(history), 100))
+    delta = IndicatorBatch.concat(
+        [
+            claimant_batch.take(np.flatnonzero(periods == periods.max())),
+            dataclasses.replace(revised, value=revised.value + 1),
+        ]
+    )
+
+    def empty_table() -> None:
+        with get_engine().begin() as connection:
+            connection.execute(delete(Indicator))
+
+    def preload_history() -> None:
+        empty_table()
+        upsert_indicators.fn(history, "CLAIMANT_COUNT")
+
+    profile_columns = {
+        col: IndicatorColumn(f"profile_{col}", f"Profile indicator {col}") for col in value_cols
+    }
+
+    transforms: dict[str, Callable[[], object]] = {
+        "aggregate_to_lad/lsoa-profile": lambda: aggregate_to_lad.fn(lsoa_values, value_cols),
+        "aggregate_to_lad/broadband-postcodes": lambda: aggregate_to_lad.fn(
+            broadband, ["premises", "gigabit_premises", "sfbb_premises"]
+        ),
+        "validate_schema/claimant": lambda: validate_schema.fn(
+            claimant, ["GEOGRAPHY_CODE", "DATE", "OBS_VALUE"], source="nomis"
+        ),
+        "validate_dataset/claimant": lambda: validate_dataset.fn(claimant, claimant_rules),
+        "normalise_to_indicator/claimant-month": lambda: normalise_to_indicator.fn(
+            claimant.loc[claimant["DATE"] == claimant["DATE"].iloc[-1]],
+            indicator_id="claimant_count",
+            indicator_name="Claimant count",
+            source="nomis",
+            dataset_code="CLAIMANT_COUNT",
+            reference_period=date(2024, 12, 1),
+            lad_col="GEOGRAPHY_CODE",
+            lad_name_col="GEOGRAPHY_NAME",
+            value_col="OBS_VALUE",
+        ),
+        "normalise_wide_to_indicator/claimant-series": normalise_claimant,
+        "normalise_wide_to_indicator/lsoa-profile": lambda: normalise_wide_to_indicator.fn(
+            profile,
+            profile_columns,
+            source="fingertips",
+            dataset_code="PROFILE",
+            lad_col="lsoa_code",
+            lad_name_col="Area Name",
+            period_col="Time period",
+        ),
+    }
+    cases = {name: Case(run) for name, run in transforms.items()}
+    cases["upsert_indicators/claimant-insert"] = Case(
+        lambda: upsert_indicators.fn(claimant_batch, "CLAIMANT_COUNT"), setup=empty_table
+    )
+    cases["upsert_indicators/claimant-delta"] = Case(
+        lambda: upsert_indicators.fn(delta, "CLAIMANT_COUNT"), setup=preload_history
+    )
+    return cases
+
+
+# ---------------------------------------------------------------------------
+# Runner
+# ---------------------------------------------------------------------------
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--history", type=Path, default=DEFAULT_HISTORY)
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="Allowed slow-down against the recent median before the run fails (0.25 = 25%%)",
+    )
+    parser.add_argument("--window", type=int, default=5, help="Recent runs in the baseline")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per case; the best counts")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiplier on input sizes")
+    parser.add_argument(
+        "--record-regressions",
+        action="store_true",
+        help="Record the run even if it regressed (accepts a deliberate slow-down)",
+    )
+    args = parser.parse_args(argv)
+
+    lookup = synthetic_lookup()
+    results = {}
+    with sqlite_warehouse(lookup):
+        for name, case in build_cases(lookup, args.scale).items():
+            # Warm caches (geography index, period memo, SQLite pages).
+            if case.setup is not None:
+                case.setup()
+            case.run()
+            results[name] = best_of(case.run, repeat=args.repeat, setup=case.setup)
+
+    comparisons = compare(results, load_history(args.history), args.threshold, args.window)
+    print(f"{'case':<48} {'ms':>10} {'baseline':>10} {'ratio':>7}")
+    for c in comparisons:
+        baseline = f"{c.baseline * 1e3:10.1f}" if c.baseline is not None else f"{'-':>10}"
+        ratio = f"{c.ratio:6.2f}x" if c.ratio is not None else f"{'-':>7}"
+        flag = "  REGRESSED" if c.regressed else ""
+        print(f"{c.case:<48} {c.seconds * 1e3:10.1f} {baseline} {ratio}{flag}")
+
+    regressed = [c for c in comparisons if c.regressed]
+    if not regressed or args.record_regressions:
+        append_run(args.history, results)
+    if regressed:
+        print(
+            f"{len(regressed)} case(s) slower than {1 + args.threshold:.2f}x their baseline",
+            file=sys.stderr,
+        )
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
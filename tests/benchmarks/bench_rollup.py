@@ -0,0 +1,41 @@
+"""Benchmark: ``HierarchyRollup`` vs a ``groupby`` per level.
+
+Rolls 20 LSOA indicators up to MSOA, LAD and region level on the
+England-sized synthetic hierarchy from ``bench_geo_aggregate``.  Run
+directly::
+
+    python -m tests.benchmarks.bench_rollup
+"""
+
+from __future__ import annotations
+
+import pandas as pd
+
+from tests.benchmarks.bench_geo_aggregate import best_of, synthetic_indicators, synthetic_lookup
+from yhovi_pipeline.utils.geo_index import GeoIndex
+from yhovi_pipeline.utils.rollup import HierarchyRollup
+
+LEVELS = ("msoa", "lad", "region")
+
+
+def main() -> None:
+    lookup = synthetic_lookup()
+    data = synthetic_indicators(lookup)
+    cols = [c for c in data.columns if c.startswith("ind_")]
+
+    def groupby_per_level() -> list[pd.DataFrame]:
+        merged = data.merge(lookup, on="lsoa_code")
+        return [merged.groupby(f"{level}_code")[cols].sum() for level in LEVELS]
+
+    rollup = HierarchyRollup(GeoIndex.from_lookup(lookup))
+    sparse = best_of(lambda: rollup.rollup_frame(data, cols, to=LEVELS))
+    baseline = best_of(groupby_per_level)
+
+    print(f"{len(data):,} LSOA rows x {len(cols)} indicators -> {', '.join(LEVELS)}")
+    print(f"  merge + groupby per level: {baseline * 1e3:8.1f} ms")
+    print(f"  HierarchyRollup:           {sparse * 1e3:8.1f} ms")
+    print(f"  speed-up:                  {baseline / sparse:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
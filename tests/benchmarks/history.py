@@ -0,0 +1,86 @@
+"""JSON run history and regression checks for the benchmark suite.
+
+Every run of ``bench_pipeline`` appends one entry — timestamp, host, Python
+version and the best time per case — to a JSON history file.  A case has
+regressed when it is more than ``threshold`` slower than the median of the
+last ``window`` recorded runs *on the same host*, so timings from a laptop
+are never compared with CI.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import platform
+import statistics
+import tempfile
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+
+@dataclass(frozen=True)
+class Comparison:
+    """One case's time against its baseline."""
+
+    case: str
+    seconds: float
+    baseline: float | None
+    """Median of the recent history; ``None`` when there is none yet."""
+
+    threshold: float
+
+    @property
+    def ratio(self) -> float | None:
+        return self.seconds / self.baseline if self.baseline else None
+
+    @property
+    def regressed(self) -> bool:
+        return self.ratio is not None and self.ratio > 1 + self.threshold
+
+
+def host() -> str:
+    """Identify the machine a run belongs to."""
+    return f"{platform.node()}/{platform.machine()}/py{platform.python_version()}"
+
+
+def load_history(path: Path) -> list[dict[str, Any]]:
+    """Return the recorded runs, oldest first (empty if the file is missing)."""
+    if not path.exists():
+        return []
+    runs: list[dict[str, Any]] = json.loads(path.read_text())
+    return runs
+
+
+def append_run(path: Path, results: dict[str, float]) -> None:
+    """Append a run to the history, writing the file atomically."""
+    runs = load_history(path)
+    runs.append(
+        {
+            "timestamp": datetime.now(UTC).isoformat(timespec="seconds"),
+            "host": host(),
+            "results": results,
+        }
+    )
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-", suffix=".json")
+    with os.fdopen(fd, "w") as handle:
+        json.dump(runs, handle, indent=2)
+    os.replace(tmp, path)
+
+
+def compare(
+    results: dict[str, float],
+    history: list[dict[str, Any]],
+    threshold: float,
+    window: int = 5,
+) -> list[Comparison]:
+    """Compare ``results`` with the last ``window`` runs from this host."""
+    mine = [run["results"] for run in history if run.get("host") == host()]
+    comparisons = []
+    for case, seconds in results.items():
+        previous = [run[case] for run in mine if case in run][-window:]
+        baseline = statistics.median(previous) if previous else None
+        comparisons.append(Comparison(case, seconds, baseline, threshold))
+    return comparisons
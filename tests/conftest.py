@@ -6,9 +6,17 @@ should be defined here.
 
 from __future__ import annotations
 
+from collections.abc import Iterator
+from pathlib import Path
+
+import pandas as pd
 import pytest
+from sqlalchemy import Engine, create_engine
 
 from yhovi_pipeline.config import Settings, get_settings
+from yhovi_pipeline.db.models import Base
+from yhovi_pipeline.db.session import dispose_engines
+from yhovi_pipeline.utils.geo_lookups import geo_lookup_cache, record_geo_vintage
 
 
 @pytest.fixture(autouse=False)
@@ -41,3 +49,87 @@ def test_settings(monkeypatch: pytest.MonkeyPatch) -> Settings:
 
     # Clear cache again after the test so subsequent tests start fresh.
     get_settings.cache_clear()
+
+
+@pytest.fixture()
+def sqlite_engine(tmp_path: Path) -> Iterator[Engine]:
+    """Return a file-backed SQLite engine with the full warehouse schema.
+
+    SQLite is the local stand-in dialect for the SQL Server warehouse, so
+    load and lookup code can be exercised without a database server.
+    """
+    engine = create_engine(f"sqlite:///{tmp_path}/warehouse.db")
+    Base.metadata.create_all(engine)
+
+    yield engine
+
+    engine.dispose()
+
+
+@pytest.fixture()
+def sqlite_settings(sqlite_engine: Engine, monkeypatch: pytest.MonkeyPatch) -> Iterator[Settings]:
+    """Return ``Settings`` whose warehouse connection points at ``sqlite_engine``."""
+    get_settings.cache_clear()
+
+    monkeypatch.setenv("SQL_SERVER_CONNECTION_STRING", sqlite_engine.url.render_as_string())
+    monkeypatch.setenv("DWP_API_KEY", "test-dwp-key")
+
+    yield get_settings()
+
+    # Close the pooled registry engine before the database file goes away.
+    dispose_engines()
+    get_settings.cache_clear()
+
+
+@pytest.fixture()
+def geo_lookup_frame() -> pd.DataFrame:
+    """Return a small synthetic ``GeoLookup`` frame in shuffled row order.
+
+    Two regions, four LADs, three MSOAs per LAD and four LSOAs per MSOA
+    (48 LSOAs).  LAD ``E06000014`` has no region, as happens for areas the
+    ONS has not yet assigned.
+    """
+    lads = [
+        ("E08000035", "Leeds", "E12000003", "Yorkshire and The Humber"),
+        ("E08000019", "Sheffield", "E12000003", "Yorkshire and The Humber"),
+        ("E06000014", "York", None, None),
+        ("E06000001", "Hartlepool", "E12000001", "North East"),
+    ]
+    rows = []
+    for lad_i, (lad_code, lad_name, region_code, region_name) in enumerate(lads):
+        for msoa_i in range(3):
+            msoa = lad_i * 3 + msoa_i
+            for lsoa_i in range(4):
+                lsoa = msoa * 4 + lsoa_i
+                rows.append(
+                    {
+                        "lsoa_code": f"E01{lsoa:06d}",
+                        "lsoa_name": f"{lad_name} {msoa_i:03d}{chr(65 + lsoa_i)}",
+                        "msoa_code": f"E02{msoa:06d}",
+                        "msoa_name": f"{lad_name} {msoa_i:03d}",
+                        "lad_code": lad_code,
+                        "lad_name": lad_name,
+                        "region_code": region_code,
+                        "region_name": region_name,
+                    }
+                )
+    return pd.DataFrame(rows).sample(frac=1.0, random_state=7).reset_index(drop=True)
+
+
+@pytest.fixture()
+def warehouse_lookup(
+    sqlite_settings: Settings,
+    sqlite_engine: Engine,
+    geo_lookup_frame: pd.DataFrame,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> Iterator[None]:
+    """Populate ``geo_lookup`` and record its vintage; reset the process-wide cache."""
+    monkeypatch.setenv("GEO_SNAPSHOT_DIR", str(tmp_path / "geo_lookup"))
+    get_settings.cache_clear()
+    with sqlite_engine.begin() as connection:
+        geo_lookup_frame.to_sql("geo_lookup", connection, if_exists="append", index=False)
+        record_geo_vintage(connection, "2021", len(geo_lookup_frame))
+    geo_lookup_cache.cache_clear()
+    yield
+    geo_lookup_cache.cache_clear()
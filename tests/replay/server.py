@@ -0,0 +1,472 @@
+"""Record/replay HTTP stand-in for the upstream sources.
+
+Serves recorded responses for every source in ``config.HTTP_SOURCES`` from
+one local server, so extract throughput, connection pooling, rate limiting
+and the retry paths in ``utils.retry`` can be measured without touching
+NOMIS, Stat-Xplore, Fingertips and the rest.  Point the pipeline at it with
+the ``Settings`` base-URL overrides the server prints (or ``environ()``)::
+
+    python -m tests.replay.server --fixtures tests/fixtures/http --record
+    python -m tests.replay.server --fixtures tests/fixtures/http \\
+        --latency 0.2 --requests-per-second 2 --error-rate 0.05 --bandwidth 2e6
+
+Design notes
+------------
+* Requests are routed by their first path segment: ``/<source>/<path>``
+  maps to ``<path>`` relative to that source's real ``base_url``, so
+  ``NOMIS_HTTP__BASE_URL=http://127.0.0.1:8765/nomis`` is the only change
+  an extract task sees.
+* With ``record`` set, a request with no fixture is forwarded to the real
+  source (credentials the pipeline attached go along) and a ``2xx``
+  answer is saved.  Credentials are never written: the NOMIS ``uid``
+  parameter is left out of the fixture key and request headers are not
+  stored.
+* Fixtures live under ``<fixtures>/<source>/`` as a ``.json`` description
+  (path, status, ``Content-Type`` / ``ETag`` / ``Last-Modified``) plus a
+  ``.body`` file, keyed by a hash of the path and sorted query, so they
+  can be reviewed and committed.
+* ``Faults`` shapes every replayed response: latency before the first
+  byte, a bandwidth cap on the body, ``429`` + ``Retry-After`` from a
+  per-source token bucket or at a fixed rate, and injected ``5xx``.
+  Injection draws from a seeded RNG per source, so a run with the same
+  request order sees the same faults.
+* Conditional requests are honoured (``If-None-Match`` /
+  ``If-Modified-Since`` answer ``304``), so the ``utils.http_cache`` path
+  can be exercised too.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import math
+import random
+import threading
+import time
+from collections import Counter
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from types import TracebackType
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import httpx
+
+from yhovi_pipeline.config import HTTP_SOURCES, HttpSourceSettings, Settings
+
+#: Query parameters that carry credentials and never form part of a fixture key.
+CREDENTIAL_PARAMS: frozenset[str] = frozenset({"uid"})
+
+#: Response headers kept in a fixture and replayed.
+RECORDED_HEADERS: tuple[str, ...] = ("Content-Type", "ETag", "Last-Modified")
+
+#: Request headers forwarded to the real source when recording.
+FORWARDED_HEADERS: tuple[str, ...] = ("APIKey", "Accept", "User-Agent")
+
+_CHUNK_BYTES = 16 * 1024
+
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class Recording:
+    """One recorded response."""
+
+    status: int
+    body: bytes
+    headers: dict[str, str] = field(default_factory=dict)
+
+
+class FixtureStore:
+    """Recorded responses on disk, one ``.json`` + ``.body`` pair per request."""
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+
+    @staticmethod
+    def key(path: str, query: str = "") -> str:
+        """Return the fixture key for a request path and raw query string."""
+        params = sorted(
+            (name, value)
+            for name, value in parse_qsl(query, keep_blank_values=True)
+            if name not in CREDENTIAL_PARAMS
+        )
+        target = "/" + path.lstrip("/") + ("?" + urlencode(params) if params else "")
+        return hashlib.sha256(target.encode()).hexdigest()[:24]
+
+    def get(self, source: str, path: str, query: str = "") -> Recording | None:
+        """Return the recording for a request, or ``None`` if there is none."""
+        stem = self.root / source / self.key(path, query)
+        meta_path = stem.with_suffix(".json")
+        if not meta_path.exists():
+            return None
+        meta = json.loads(meta_path.read_text())
+        return Recording(meta["status"], stem.with_suffix(".body").read_bytes(), meta["headers"])
+
+    def put(self, source: str, path: str, query: str, recording: Recording) -> None:
+        """Save ``recording`` as the response to a request."""
+        directory = self.root / source
+        directory.mkdir(parents=True, exist_ok=True)
+        stem = directory / self.key(path, query)
+        stem.with_suffix(".body").write_bytes(recording.body)
+        public_query = urlencode(
+            [
+                (k, v)
+                for k, v in parse_qsl(query, keep_blank_values=True)
+                if k not in CREDENTIAL_PARAMS
+            ]
+        )
+        meta = {
+            "path": "/" + path.lstrip("/"),
+            "query": public_query,
+            "status": recording.status,
+            "headers": recording.headers,
+        }
+        stem.with_suffix(".json").write_text(json.dumps(meta, indent=2) + "\n")
+
+
+# ---------------------------------------------------------------------------
+# Faults
+# ---------------------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class Faults:
+    """How replayed responses are degraded.  The defaults serve them untouched."""
+
+    latency_seconds: float = 0.0
+    """Delay before the response starts."""
+
+    jitter_seconds: float = 0.0
+    """Uniform random extra delay, up to this much, on top of ``latency_seconds``."""
+
+    bandwidth_bytes_per_second: float | None = None
+    """Cap on the body transfer rate of each response; ``None`` is uncapped."""
+
+    requests_per_second: float | None = None
+    """Per-source rate above which requests get ``429``; ``None`` never throttles."""
+
+    burst: int = 1
+    """Requests a source accepts back-to-back before ``requests_per_second`` applies."""
+
+    throttle_rate: float = 0.0
+    """Fraction of requests answered ``429`` regardless of rate."""
+
+    retry_after_seconds: int = 1
+    """``Retry-After`` sent with ``throttle_rate`` 429s (rate 429s send the real wait)."""
+
+    error_rate: float = 0.0
+    """Fraction of requests answered with ``error_status``."""
+
+    error_status: int = HTTPStatus.SERVICE_UNAVAILABLE
+    seed: int = 0
+
+
+class _SourceState:
+    """Token bucket and fault RNG for one source."""
+
+    def __init__(self, faults: Faults, source: str) -> None:
+        self.lock = threading.Lock()
+        self.rng = random.Random(f"{faults.seed}/{source}")
+        self.tokens = float(faults.burst)
+        self.updated = time.monotonic()
+
+
+# ---------------------------------------------------------------------------
+# Server
+# ---------------------------------------------------------------------------
+
+
+class ReplayServer:
+    """Local HTTP server replaying (and optionally recording) source responses.
+
+    Use as a context manager; the server runs on a background thread::
+
+        with ReplayServer(fixtures, Faults(latency_seconds=0.1)) as server:
+            monkeypatch.setenv("NOMIS_HTTP__BASE_URL", server.base_url("nomis"))
+
+    Args:
+        fixtures: Directory holding the recorded responses.
+        faults: Degradation applied to every replayed response.
+        record: Forward requests with no fixture to the real source and
+            save the answers.
+        upstreams: Real base URL per source when recording; defaults to the
+            ``Settings`` defaults.
+        host: Interface to bind.
+        port: Port to bind; ``0`` picks a free one.
+    """
+
+    def __init__(
+        self,
+        fixtures: Path,
+        faults: Faults | None = None,
+        *,
+        record: bool = False,
+        upstreams: Mapping[str, str] | None = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        self.store = FixtureStore(fixtures)
+        self.faults = faults or Faults()
+        self.record = record
+        self.upstreams = dict(upstreams or default_upstreams())
+        self._states = {source: _SourceState(self.faults, source) for source in HTTP_SOURCES}
+        self._stats: Counter[tuple[str, str]] = Counter()
+        self._stats_lock = threading.Lock()
+        self._upstream_client = (
+            httpx.Client(follow_redirects=True, timeout=120.0) if record else None
+        )
+        self._httpd = ThreadingHTTPServer((host, port), _make_handler(self))
+        self._httpd.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    # -- lifecycle ----------------------------------------------------------
+
+    def start(self) -> ReplayServer:
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever,
+            kwargs={"poll_interval": 0.05},  # how quickly stop() returns
+            name="replay-server",
+            daemon=True,
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+        if self._upstream_client is not None:
+            self._upstream_client.close()
+
+    def __enter__(self) -> ReplayServer:
+        return self.start()
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.stop()
+
+    # -- addressing -----------------------------------------------------------
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host!s}:{port}"
+
+    def base_url(self, source: str) -> str:
+        """Return the ``base_url`` that routes ``source``'s requests here."""
+        return f"{self.url}/{source}"
+
+    def environ(self) -> dict[str, str]:
+        """Return the ``Settings`` overrides pointing every source here."""
+        return {
+            f"{source.upper()}_HTTP__BASE_URL": self.base_url(source) for source in HTTP_SOURCES
+        }
+
+    # -- statistics -----------------------------------------------------------
+
+    def stats(self, source: str | None = None) -> Counter[str]:
+        """Count responses by outcome: ``replayed``, ``recorded``, ``missing``,
+        ``not_modified``, ``throttled`` and ``error``."""
+        with self._stats_lock:
+            counts: Counter[str] = Counter()
+            for (src, outcome), n in self._stats.items():
+                if source is None or src == source:
+                    counts[outcome] += n
+            return counts
+
+    def reset_stats(self) -> None:
+        with self._stats_lock:
+            self._stats.clear()
+
+    # -- request handling -----------------------------------------------------
+
+    def _count(self, source: str, outcome: str) -> None:
+        with self._stats_lock:
+            self._stats[source, outcome] += 1
+
+    def _inject(self, source: str) -> tuple[int, dict[str, str]] | None:
+        """Return an injected error status and headers, or ``None`` to serve normally."""
+        faults, state = self.faults, self._states[source]
+        with state.lock:
+            if faults.requests_per_second is not None:
+                now = time.monotonic()
+                state.tokens = min(
+                    float(faults.burst),
+                    state.tokens + (now - state.updated) * faults.requests_per_second,
+                )
+                state.updated = now
+                if state.tokens < 1:
+                    wait = (1 - state.tokens) / faults.requests_per_second
+                    self._count(source, "throttled")
+                    return HTTPStatus.TOO_MANY_REQUESTS, {"Retry-After": str(math.ceil(wait))}
+                state.tokens -= 1
+            if faults.throttle_rate and state.rng.random() < faults.throttle_rate:
+                self._count(source, "throttled")
+                return HTTPStatus.TOO_MANY_REQUESTS, {
+                    "Retry-After": str(faults.retry_after_seconds)
+                }
+            if faults.error_rate and state.rng.random() < faults.error_rate:
+                self._count(source, "error")
+                return faults.error_status, {}
+            delay = faults.latency_seconds
+            if faults.jitter_seconds:
+                delay += state.rng.uniform(0, faults.jitter_seconds)
+        time.sleep(delay)
+        return None
+
+    def _forward(self, source: str, path: str, query: str, headers: Mapping[str, str]) -> Recording:
+        """Fetch a request from the real source (recording mode)."""
+        assert self._upstream_client is not None
+        upstream = self.upstreams[source].rstrip("/") + "/" + path.lstrip("/")
+        response = self._upstream_client.get(
+            upstream + ("?" + query if query else ""),
+            headers=dict(headers),
+        )
+        kept = {
+            name: response.headers[name] for name in RECORDED_HEADERS if name in response.headers
+        }
+        recording = Recording(response.status_code, response.content, kept)
+        if response.is_success:
+            self.store.put(source, path, query, recording)
+            self._count(source, "recorded")
+        return recording
+
+
+def default_upstreams() -> dict[str, str]:
+    """Return the real base URL of every source (the ``Settings`` defaults)."""
+    urls = {}
+    for source in HTTP_SOURCES:
+        config = Settings.model_fields[f"{source}_http"].default
+        assert isinstance(config, HttpSourceSettings)
+        urls[source] = config.base_url
+    return urls
+
+
+def _make_handler(server: ReplayServer) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive, so client pooling is exercised
+        disable_nagle_algorithm = True  # headers and body go out in separate writes
+
+        def do_GET(self) -> None:
+            parts = urlsplit(self.path)
+            source, _, path = parts.path.lstrip("/").partition("/")
+            if source not in HTTP_SOURCES:
+                self._reply(HTTPStatus.NOT_FOUND, b"unknown source", {})
+                return
+
+            injected = server._inject(source)
+            if injected is not None:
+                self._reply(injected[0], b"", injected[1])
+                return
+
+            recording = server.store.get(source, path, parts.query)
+            if recording is None and server.record:
+                forwarded = {h: self.headers[h] for h in FORWARDED_HEADERS if h in self.headers}
+                recording = server._forward(source, path, parts.query, forwarded)
+            if recording is None:
+                server._count(source, "missing")
+                message = f"no recording for {source} /{path}?{parts.query}"
+                self._reply(HTTPStatus.NOT_FOUND, message.encode(), {})
+                return
+
+            if self._not_modified(recording.headers):
+                server._count(source, "not_modified")
+                self._reply(HTTPStatus.NOT_MODIFIED, b"", recording.headers)
+                return
+            server._count(source, "replayed")
+            self._reply(recording.status, recording.body, recording.headers)
+
+        def _not_modified(self, headers: Mapping[str, str]) -> bool:
+            etag = headers.get("ETag")
+            if etag is not None and self.headers.get("If-None-Match") == etag:
+                return True
+            modified = headers.get("Last-Modified")
+            return modified is not None and self.headers.get("If-Modified-Since") == modified
+
+        def _reply(self, status: int, body: bytes, headers: Mapping[str, str]) -> None:
+            self.send_response(status)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            rate = server.faults.bandwidth_bytes_per_second
+            if rate is None:
+                self.wfile.write(body)
+                return
+            for start in range(0, len(body), _CHUNK_BYTES):
+                chunk = body[start : start + _CHUNK_BYTES]
+                self.wfile.write(chunk)
+                time.sleep(len(chunk) / rate)
+
+        def log_message(self, format: str, *args: object) -> None:
+            pass
+
+    return Handler
+
+
+# ---------------------------------------------------------------------------
+# Command line
+# ---------------------------------------------------------------------------
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--fixtures", type=Path, default=Path("tests/fixtures/http"))
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--record", action="store_true", help="Record missing responses")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds before each response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra random latency, seconds")
+    parser.add_argument("--bandwidth", type=float, default=None, help="Bytes/sec per response")
+    parser.add_argument("--requests-per-second", type=float, default=None)
+    parser.add_argument("--burst", type=int, default=1)
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Fraction sent 429")
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After on those 429s")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction sent 5xx")
+    parser.add_argument("--error-status", type=int, default=HTTPStatus.SERVICE_UNAVAILABLE)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    faults = Faults(
+        latency_seconds=args.latency,
+        jitter_seconds=args.jitter,
+        bandwidth_bytes_per_second=args.bandwidth,
+        requests_per_second=args.requests_per_second,
+        burst=args.burst,
+        throttle_rate=args.throttle_rate,
+        retry_after_seconds=args.retry_after,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        seed=args.seed,
+    )
+    server = ReplayServer(
+        args.fixtures, faults, record=args.record, host=args.host, port=args.port
+    ).start()
+    mode = "recording" if args.record else "replaying"
+    print(f"{mode} {args.fixtures} on {server.url}; point the pipeline here with:")
+    for name, value in server.environ().items():
+        print(f"  export {name}={value}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+        print(dict(server.stats()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""Unit tests for yhovi_pipeline.db.batch and normalise_to_indicator."""
+
+from __future__ import annotations
+
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+from sqlalchemy import Engine, select
+
+from yhovi_pipeline.db.batch import COLUMNS, IndicatorBatch
+from yhovi_pipeline.db.models import Indicator
+from yhovi_pipeline.db.upsert import UpsertResult, bulk_upsert_indicators
+from yhovi_pipeline.tasks.transform.normalise import normalise_to_indicator
+from yhovi_pipeline.utils.results import ARROW_SERIALIZER
+from yhovi_pipeline.utils.streaming import rebatch_indicators
+
+
+def _frame(values: list[float | None], lads: list[str] | None = None) -> pd.DataFrame:
+    lads = lads or [f"E0800003{i}" for i in range(len(values))]
+    return pd.DataFrame(
+        {
+            "indicator_id": "claimant_rate",
+            "indicator_name": "Claimant rate",
+            "lad_code": lads,
+            "lad_name": [f"LAD {code}" for code in lads],
+            "reference_period": date(2024, 4, 1),
+            "value": values,
+            "unit": None,
+            "source": "dwp",
+            "dataset_code": "UC_MONTHLY",
+        }
+    )
+
+
+def test_from_frame_round_trips() -> None:
+    """Encoding and decoding should keep every column's values."""
+    batch = IndicatorBatch.from_frame(_frame([1.0, None]))
+    frame = batch.to_frame()
+
+    assert list(frame.columns) == list(COLUMNS)
+    assert isinstance(frame["lad_code"].dtype, pd.CategoricalDtype)
+    assert frame["lad_code"].tolist() == ["E08000030", "E08000031"]
+    assert frame["unit"].isna().all()
+    assert batch.value_missing.tolist() == [False, True]
+    assert batch.max_reference_period == date(2024, 4, 1)
+
+
+def test_from_frame_missing_columns() -> None:
+    """A frame without the Indicator columns should be rejected."""
+    with pytest.raises(ValueError, match="missing Indicator columns"):
+        IndicatorBatch.from_frame(pd.DataFrame({"lad_code": ["E08000035"]}))
+
+
+def test_concat_unions_categories() -> None:
+    """Batches with different categories should concatenate without loss."""
+    merged = IndicatorBatch.concat(
+        [
+            IndicatorBatch.from_frame(_frame([1.0], ["E08000035"])),
+            IndicatorBatch.from_frame(_frame([2.0, 3.0], ["E06000014", "E08000035"])),
+        ]
+    )
+
+    assert len(merged) == 3
+    assert list(merged.strings["lad_code"]) == ["E08000035", "E06000014", "E08000035"]
+    assert len(merged.strings["lad_code"].categories) == 2
+    assert merged.value.tolist() == [1.0, 2.0, 3.0]
+
+
+def test_to_arrow_uses_dictionaries_and_validity() -> None:
+    """Strings become dictionary arrays, missing values Arrow nulls."""
+    table = IndicatorBatch.from_frame(_frame([1.0, None])).to_arrow()
+
+    assert pa.types.is_dictionary(table.schema.field("lad_code").type)
+    assert table.schema.field("reference_period").type == pa.date32()
+    assert table.column("value").to_pylist() == [1.0, None]
+    assert IndicatorBatch.from_arrow(table).value_missing.tolist() == [False, True]
+
+
+def test_from_arrow_reuses_dictionaries() -> None:
+    """Decoding keeps codes, categories, periods and nulls, across chunks too."""
+    parts = [
+        IndicatorBatch.from_frame(_frame([1.0, None], ["E08000035", "E06000014"])),
+        IndicatorBatch.from_frame(_frame([3.0], ["E08000035"])),
+    ]
+    batch = IndicatorBatch.concat(parts)
+    chunked = pa.concat_tables([part.to_arrow() for part in parts])
+
+    decoded = IndicatorBatch.from_arrow(chunked)
+
+    pd.testing.assert_frame_equal(decoded.to_frame(), batch.to_frame())
+    assert decoded.value_missing.tolist() == [False, True, False]
+    assert decoded.reference_period.dtype == np.dtype("datetime64[D]")
+    assert list(decoded.strings["lad_code"].categories) == ["E06000014", "E08000035"]
+
+
+def test_iter_parameter_rows_uses_none_for_missing() -> None:
+    """Parameter rows follow COLUMNS and hold plain Python values."""
+    batch = IndicatorBatch.from_frame(_frame([1.0, None, 3.0]))
+    chunks = list(batch.iter_parameter_rows(chunk_size=2))
+
+    assert [len(chunk) for chunk in chunks] == [2, 1]
+    first, second = chunks[0]
+    assert first[COLUMNS.index("reference_period")] == date(2024, 4, 1)
+    assert first[COLUMNS.index("unit")] is None
+    assert second[COLUMNS.index("value")] is None
+
+
+def test_drop_duplicate_keys_keeps_last() -> None:
+    """Rows sharing an upsert key collapse to the last one."""
+    batch = IndicatorBatch.from_frame(
+        _frame([1.0, 2.0, 9.0], ["E08000035", "E06000014", "E08000035"])
+    )
+    deduped = batch.drop_duplicate_keys()
+
+    assert list(deduped.strings["lad_code"]) == ["E06000014", "E08000035"]
+    assert deduped.value.tolist() == [2.0, 9.0]
+
+
+def test_normalise_to_indicator_builds_batch() -> None:
+    """Source columns map onto a batch; rows without a LAD are dropped."""
+    source = pd.DataFrame(
+        {
+            "code": ["E08000035", None, "E06000014"],
+            "name": ["Leeds", "?", "York"],
+            "rate": ["1.5", "2", "[c]"],
+        }
+    )
+    batch = normalise_to_indicator.fn(
+        source,
+        indicator_id="claimant_rate",
+        indicator_name="Claimant rate",
+        source="dwp",
+        dataset_code="UC_MONTHLY",
+        reference_period=date(2024, 4, 1),
+        lad_col="code",
+        lad_name_col="name",
+        value_col="rate",
+    )
+
+    frame = batch.to_frame()
+    assert frame["lad_name"].tolist() == ["Leeds", "York"]
+    assert frame["indicator_id"].tolist() == ["claimant_rate"] * 2
+    assert frame["unit"].isna().all()
+    assert np.isnan(frame["value"].iloc[1])
+    assert batch.max_reference_period == date(2024, 4, 1)
+
+
+def test_rebatch_indicators_sizes() -> None:
+    """Batches should be re-cut to the requested size."""
+    batches = [IndicatorBatch.from_frame(_frame([float(i)] * n)) for i, n in enumerate((3, 1, 4))]
+    sizes = [len(b) for b in rebatch_indicators(batches, batch_size=3)]
+
+    assert sizes == [3, 3, 2]
+
+
+def test_serializer_round_trips_batches() -> None:
+    """Batches persist through the Arrow serializer as batches."""
+    restored = ARROW_SERIALIZER.loads(
+        ARROW_SERIALIZER.dumps(IndicatorBatch.from_frame(_frame([1.0, None])))
+    )
+
+    assert isinstance(restored, IndicatorBatch)
+    assert restored.value_missing.tolist() == [False, True]
+
+
+def test_bulk_upsert_accepts_batch(sqlite_engine: Engine) -> None:
+    """A batch should load exactly like the equivalent DataFrame."""
+    with sqlite_engine.begin() as connection:
+        result = bulk_upsert_indicators(connection, IndicatorBatch.from_frame(_frame([1.0, None])))
+
+    assert result == UpsertResult(inserted=2, max_reference_period=date(2024, 4, 1))
+    with sqlite_engine.connect() as connection:
+        rows = dict(connection.execute(select(Indicator.lad_code, Indicator.value)).all())
+    assert rows == {"E08000030": 1.0, "E08000031": None}
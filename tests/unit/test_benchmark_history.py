@@ -0,0 +1,30 @@
+"""Unit tests for the benchmark suite's run history (tests.benchmarks.history)."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from tests.benchmarks.history import append_run, compare, host, load_history
+
+
+def test_compare_uses_median_of_recent_runs_on_this_host(tmp_path: Path) -> None:
+    """Older runs and other machines' runs do not move the baseline."""
+    path = tmp_path / "history.json"
+    for seconds in (9.0, 1.0, 1.2, 1.0):
+        append_run(path, {"upsert": seconds})
+    history = load_history(path)
+    history.append({"host": "ci-runner", "results": {"upsert": 50.0}})
+
+    [ok] = compare({"upsert": 1.2}, history, threshold=0.25, window=3)
+    [slow] = compare({"upsert": 1.3}, history, threshold=0.25, window=3)
+
+    assert ok.baseline == 1.0 and not ok.regressed
+    assert slow.regressed
+    assert all(run["host"] == host() for run in load_history(path)[:4])
+
+
+def test_new_cases_have_no_baseline(tmp_path: Path) -> None:
+    """A case with no history never fails the run."""
+    [comparison] = compare({"new": 3.0}, load_history(tmp_path / "missing.json"), 0.25)
+    assert comparison.baseline is None and comparison.ratio is None
+    assert not comparison.regressed
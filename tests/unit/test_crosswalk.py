@@ -0,0 +1,146 @@
+"""Unit tests for yhovi_pipeline.utils.crosswalk."""
+
+from __future__ import annotations
+
+from datetime import date
+
+import pandas as pd
+import pytest
+from sqlalchemy import Engine, insert
+
+from yhovi_pipeline.db.models import GeoCrosswalk
+from yhovi_pipeline.utils.crosswalk import Crosswalk, crosswalk_digest, load_crosswalk
+
+OLD = ["E07000163", "E07000164", "E07000165"]
+NEW = "E06000065"
+
+
+@pytest.fixture()
+def crosswalk() -> Crosswalk:
+    return Crosswalk.from_frame(
+        pd.DataFrame(
+            {
+                "from_code": OLD,
+                "to_code": NEW,
+                "to_name": "North Yorkshire",
+                "weight": 1.0,
+            }
+        )
+    )
+
+
+def series(codes: list[str], values: list[float], period: date = date(2020, 1, 1)) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "indicator_id": "jobs",
+            "reference_period": period,
+            "lad_code": codes,
+            "lad_name": [f"name {code}" for code in codes],
+            "value": values,
+            "unit": "count",
+        }
+    )
+
+
+def test_counts_are_summed_per_series(crosswalk: Crosswalk) -> None:
+    df = pd.concat(
+        [
+            series([*OLD, "E08000035"], [1.0, 2.0, 3.0, 10.0]),
+            series(OLD, [4.0, 5.0, 6.0], period=date(2021, 1, 1)),
+        ]
+    )
+
+    result = crosswalk.rebase(df).set_index(["lad_code", "reference_period"])
+
+    assert not result.index.get_level_values("lad_code").isin(OLD).any()
+    assert result.loc[(NEW, date(2020, 1, 1)), "value"] == 6.0
+    assert result.loc[(NEW, date(2021, 1, 1)), "value"] == 15.0
+    assert result.loc[(NEW, date(2020, 1, 1)), "lad_name"] == "North Yorkshire"
+    assert result.loc[(NEW, date(2020, 1, 1)), "unit"] == "count"
+    assert result.loc[("E08000035", date(2020, 1, 1)), "value"] == 10.0
+
+
+def test_rates_are_weighted_by_denominators(crosswalk: Crosswalk) -> None:
+    df = series(OLD, [10.0, 20.0, 40.0])
+    population = {"E07000163": 100.0, "E07000164": 100.0, "E07000165": 200.0}
+
+    result = crosswalk.rebase(df, kind="rate", denominators=population)
+
+    assert result["value"].tolist() == [pytest.approx(27.5)]
+    unweighted = crosswalk.rebase(df, kind="rate")
+    assert unweighted["value"].tolist() == [pytest.approx(70.0 / 3)]
+
+
+def test_partially_reported_series_is_dropped(crosswalk: Crosswalk) -> None:
+    df = series(OLD, [1.0, None, 3.0])
+
+    assert crosswalk.rebase(df).empty
+    assert crosswalk.rebase(df, min_coverage=0.5)["value"].tolist() == [4.0]
+
+
+def test_directly_published_value_wins(crosswalk: Crosswalk) -> None:
+    df = series([*OLD, NEW], [1.0, 2.0, 3.0, 7.0])
+
+    result = crosswalk.rebase(df)
+
+    assert result["lad_code"].tolist() == [NEW]
+    assert result["value"].tolist() == [7.0]
+
+
+@pytest.mark.parametrize(
+    ("weights", "match"),
+    [([0.5, 0.4], "do not sum to 1"), ([1.0, 0.0], "must be positive")],
+)
+def test_from_frame_rejects_bad_weights(weights: list[float], match: str) -> None:
+    frame = pd.DataFrame(
+        {
+            "from_code": ["E07000163", "E07000163"],
+            "to_code": [NEW, "E06000014"],
+            "to_name": ["North Yorkshire", "York"],
+            "weight": weights,
+        }
+    )
+    with pytest.raises(ValueError, match=match):
+        Crosswalk.from_frame(frame)
+
+
+def test_load_crosswalk_reads_one_level(sqlite_engine: Engine) -> None:
+    rows = [
+        {
+            "level": "lad",
+            "from_code": code,
+            "to_code": NEW,
+            "to_name": "North Yorkshire",
+            "weight": 1.0,
+        }
+        for code in OLD
+    ]
+    rows.append(
+        {
+            "level": "lsoa",
+            "from_code": "E01000001",
+            "to_code": "E01099999",
+            "to_name": "x",
+            "weight": 1.0,
+        }
+    )
+    with sqlite_engine.begin() as connection:
+        connection.execute(insert(GeoCrosswalk), rows)
+        crosswalk = load_crosswalk(connection)
+
+    assert crosswalk.from_codes.tolist() == OLD
+    assert crosswalk.to_codes.tolist() == [NEW]
+    assert crosswalk.weights.toarray().tolist() == [[1.0, 1.0, 1.0]]
+
+
+@pytest.mark.usefixtures("sqlite_settings")
+def test_crosswalk_digest_follows_one_level(sqlite_engine: Engine) -> None:
+    empty = crosswalk_digest()
+    row = {"level": "lsoa", "from_code": "E01000001", "to_code": "E01099999", "to_name": "x"}
+    with sqlite_engine.begin() as connection:
+        connection.execute(insert(GeoCrosswalk), [{**row, "weight": 1.0}])
+    assert crosswalk_digest() == empty
+
+    with sqlite_engine.begin() as connection:
+        connection.execute(insert(GeoCrosswalk), [{**row, "level": "lad", "weight": 1.0}])
+    assert crosswalk_digest() != empty
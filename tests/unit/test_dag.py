@@ -0,0 +1,164 @@
+"""Unit tests for yhovi_pipeline.utils.dag."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable
+
+import pytest
+
+from yhovi_pipeline.utils.dag import DagStep, StepStatus, run_dag
+
+
+def _sleeper(seconds: float, log: list[str] | None = None, name: str = "") -> Callable[[], None]:
+    def run() -> None:
+        if log is not None:
+            log.append(name)
+        time.sleep(seconds)
+
+    return run
+
+
+def test_independent_steps_run_concurrently() -> None:
+    """Four independent 0.2s steps should take ~0.2s, not ~0.8s."""
+    steps = [DagStep(f"s{i}", _sleeper(0.2), sources=(f"src{i}",)) for i in range(4)]
+
+    summary = run_dag(steps, max_workers=4)
+
+    assert summary.wall_seconds < 0.6
+    assert all(t.status is StepStatus.SUCCESS for t in summary.timings.values())
+
+
+def test_dependencies_run_in_order() -> None:
+    """A step only starts after its dependencies have finished."""
+    log: list[str] = []
+    steps = [
+        DagStep("geo", _sleeper(0.05, log, "geo")),
+        DagStep("imd", _sleeper(0.0, log, "imd"), depends_on=("geo",)),
+        DagStep("air", _sleeper(0.0, log, "air"), depends_on=("geo",)),
+    ]
+
+    summary = run_dag(steps, max_workers=4)
+
+    assert log[0] == "geo"
+    assert summary.timings["imd"].started >= summary.timings["geo"].finished
+    assert summary.critical_path[0] == "geo"
+
+
+def test_source_limits_cap_concurrency() -> None:
+    """No more than the source's limit may run against it at once."""
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def run() -> None:
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.05)
+        with lock:
+            active -= 1
+
+    steps = [DagStep(f"nomis-{i}", run, sources=("nomis",)) for i in range(5)]
+
+    run_dag(steps, max_workers=5, source_limits={"nomis": 2})
+
+    assert peak == 2
+
+
+def test_failure_skips_downstream_only() -> None:
+    """A failed step skips its dependants but not unrelated branches."""
+
+    def boom() -> None:
+        raise RuntimeError("upstream down")
+
+    steps = [
+        DagStep("geo", boom),
+        DagStep("imd", _sleeper(0.0), depends_on=("geo",)),
+        DagStep("gva", _sleeper(0.0)),
+    ]
+
+    summary = run_dag(steps, max_workers=2)
+
+    assert summary.failed == ["geo"]
+    assert summary.skipped == ["imd"]
+    assert summary.timings["gva"].status is StepStatus.SUCCESS
+    assert "RuntimeError: upstream down" in (summary.timings["geo"].error or "")
+
+
+def test_failure_skips_every_descendant() -> None:
+    """A skip propagates down the whole chain, even when children are declared first."""
+    ran: list[str] = []
+
+    def boom() -> None:
+        raise RuntimeError("upstream down")
+
+    steps = [
+        DagStep("c", _sleeper(0.0, ran, "c"), depends_on=("b",)),
+        DagStep("b", _sleeper(0.0, ran, "b"), depends_on=("a",)),
+        DagStep("a", boom),
+    ]
+
+    summary = run_dag(steps, max_workers=2)
+
+    assert summary.failed == ["a"]
+    assert sorted(summary.skipped) == ["b", "c"]
+    assert ran == []
+
+
+def test_critical_path_follows_longest_chain() -> None:
+    """The critical path is the dependency chain with the most run time."""
+    steps = [
+        DagStep("a", _sleeper(0.02)),
+        DagStep("b", _sleeper(0.15), depends_on=("a",)),
+        DagStep("c", _sleeper(0.05)),
+        DagStep("d", _sleeper(0.01), depends_on=("b", "c")),
+    ]
+
+    summary = run_dag(steps, max_workers=4)
+
+    assert summary.critical_path == ["a", "b", "d"]
+    assert "Critical path" in summary.format()
+
+
+@pytest.mark.parametrize(
+    "steps",
+    [
+        [DagStep("a", _sleeper(0), depends_on=("missing",))],
+        [
+            DagStep("a", _sleeper(0), depends_on=("b",)),
+            DagStep("b", _sleeper(0), depends_on=("a",)),
+        ],
+        [DagStep("a", _sleeper(0)), DagStep("a", _sleeper(0))],
+    ],
+)
+def test_invalid_graphs_rejected(steps: list[DagStep]) -> None:
+    """Unknown dependencies, cycles and repeated names fail before anything runs."""
+    with pytest.raises(ValueError):
+        run_dag(steps, max_workers=1)
+
+
+def test_full_refresh_graph_is_valid() -> None:
+    """The declared full-refresh DAG covers all 13 flows and is acyclic."""
+    from yhovi_pipeline.flows.refresh_plan import FULL_REFRESH_STEPS, GEO_LOOKUP_STEP
+    from yhovi_pipeline.utils.dag import _validate
+
+    graph = {step.name: step for step in FULL_REFRESH_STEPS}
+    _validate(graph, 1, {}, 1)
+
+    assert len(graph) == 14
+    assert GEO_LOOKUP_STEP in graph["society-deprivation-imd"].depends_on
+    assert GEO_LOOKUP_STEP in graph["environment-air-quality"].depends_on
+
+
+def test_every_flow_module_imports() -> None:
+    """Flow names must pass Prefect's validation, or the full refresh cannot load them."""
+    import importlib
+    import pkgutil
+
+    import yhovi_pipeline.flows as flows
+
+    for module in pkgutil.walk_packages(flows.__path__, f"{flows.__name__}."):
+        importlib.import_module(module.name)
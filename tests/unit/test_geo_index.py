@@ -0,0 +1,115 @@
+"""Unit tests for yhovi_pipeline.utils.geo_index and transform.geo."""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from yhovi_pipeline.tasks.transform.geo import aggregate_to_lad
+from yhovi_pipeline.utils.geo_index import GeoIndex
+
+
+@pytest.fixture()
+def index(geo_lookup_frame: pd.DataFrame) -> GeoIndex:
+    return GeoIndex.from_lookup(geo_lookup_frame)
+
+
+@pytest.fixture()
+def lsoa_data(geo_lookup_frame: pd.DataFrame) -> pd.DataFrame:
+    """Two indicators and a population weight per LSOA, with some gaps."""
+    rng = np.random.default_rng(42)
+    n = len(geo_lookup_frame)
+    df = pd.DataFrame(
+        {
+            "lsoa_code": geo_lookup_frame["lsoa_code"],
+            "income": rng.uniform(0, 1, n),
+            "employment": rng.uniform(0, 1, n),
+            "population": rng.integers(1_000, 3_000, n).astype(float),
+        }
+    )
+    df.loc[[3, 17], "income"] = np.nan
+    return df
+
+
+def _groupby(lookup: pd.DataFrame, df: pd.DataFrame, how: str) -> pd.DataFrame:
+    """Reference implementation: string merge then groupby."""
+    merged = df.merge(lookup[["lsoa_code", "lad_code"]], on="lsoa_code")
+    cols = ["income", "employment"]
+    if how == "weighted_mean":
+        weighted = merged[cols].mul(merged["population"], axis=0)
+        weights = merged[cols].notna().mul(merged["population"], axis=0)
+        grouped = (
+            weighted.groupby(merged["lad_code"]).sum() / weights.groupby(merged["lad_code"]).sum()
+        )
+    else:
+        grouped = merged.groupby("lad_code")[cols].agg(how)
+    return grouped.sort_index()
+
+
+def test_ids_resolve_and_flag_unknown(index: GeoIndex) -> None:
+    """Codes map to positions in the sorted code array; unknowns to -1."""
+    ids = index.levels["lad"].ids(["E08000035", "E99999999", "E06000001"])
+
+    assert index.levels["lad"].codes[ids[0]] == "E08000035"
+    assert ids[1] == -1
+    assert index.levels["lad"].codes[ids[2]] == "E06000001"
+
+
+def test_parent_arrays_match_lookup(index: GeoIndex, geo_lookup_frame: pd.DataFrame) -> None:
+    """Every LSOA's parents agree with the string lookup."""
+    lads = index.parent_ids(geo_lookup_frame["lsoa_code"], "lsoa", "lad")
+    msoa_lads = index.parent_ids(geo_lookup_frame["msoa_code"], "msoa", "lad")
+    regions = index.parent_ids(geo_lookup_frame["lsoa_code"], "lsoa", "region")
+
+    assert (index.levels["lad"].codes[lads] == geo_lookup_frame["lad_code"]).all()
+    assert (msoa_lads == lads).all()
+    assert ((regions == -1) == geo_lookup_frame["region_code"].isna()).all()
+
+
+@pytest.mark.parametrize("how", ["sum", "mean", "weighted_mean"])
+def test_aggregate_matches_merge_groupby(
+    index: GeoIndex, geo_lookup_frame: pd.DataFrame, lsoa_data: pd.DataFrame, how: str
+) -> None:
+    """All reductions agree with the merge + groupby reference."""
+    result, unmatched = index.aggregate(
+        lsoa_data,
+        ["income", "employment"],
+        "lsoa_code",
+        how=how,  # type: ignore[arg-type]
+        weight_col="population",
+    )
+    expected = _groupby(geo_lookup_frame, lsoa_data, how)
+
+    assert unmatched == 0
+    assert list(result["lad_code"]) == list(expected.index)
+    np.testing.assert_allclose(result[["income", "employment"]], expected)
+
+
+def test_aggregate_msoa_level_and_unknown_codes(index: GeoIndex) -> None:
+    """MSOA input aggregates too; unknown codes are dropped and counted."""
+    df = pd.DataFrame(
+        {"msoa_code": ["E02000000", "E02000001", "E02999999"], "jobs": [10.0, 5.0, 99.0]}
+    )
+
+    result, unmatched = index.aggregate(df, ["jobs"], "msoa_code", level="msoa", to="lad")
+
+    assert unmatched == 1
+    assert result.to_dict("records") == [
+        {"lad_code": "E08000035", "lad_name": "Leeds", "jobs": 15.0}
+    ]
+
+
+def test_aggregate_rejects_bad_arguments(index: GeoIndex, lsoa_data: pd.DataFrame) -> None:
+    with pytest.raises(ValueError, match="weight_col"):
+        index.aggregate(lsoa_data, ["income"], "lsoa_code", how="weighted_mean")
+    with pytest.raises(ValueError, match="down to"):
+        index.aggregate(lsoa_data, ["income"], "lsoa_code", level="lad", to="lsoa")
+
+
+def test_aggregate_to_lad_task_single_column(index: GeoIndex, lsoa_data: pd.DataFrame) -> None:
+    """A single value column comes back as ``value``."""
+    result = aggregate_to_lad.fn(lsoa_data, "population", index=index)
+
+    assert list(result.columns) == ["lad_code", "lad_name", "value"]
+    assert result["value"].sum() == lsoa_data["population"].sum()
@@ -0,0 +1,180 @@
+"""Unit tests for yhovi_pipeline.utils.geo_lookups."""
+
+from __future__ import annotations
+
+import threading
+
+import pandas as pd
+import pytest
+from sqlalchemy import Engine
+
+from yhovi_pipeline.db.models import GeoLookup
+from yhovi_pipeline.utils.geo_index import get_geo_index
+from yhovi_pipeline.utils.geo_lookups import (
+    GeoLookupCache,
+    geo_lookup_cache,
+    get_geo_lookup,
+    invalidate_geo_cache,
+    lsoa_to_lad,
+    lsoa_to_lad_batch,
+    record_geo_vintage,
+)
+from yhovi_pipeline.utils.rollup import get_hierarchy_rollup
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_concurrent_callers_share_one_load(geo_lookup_frame: pd.DataFrame) -> None:
+    """Only one thread queries; the others wait for and reuse its snapshot."""
+    calls = 0
+    release = threading.Event()
+
+    def load(vintage: str | None) -> pd.DataFrame:
+        nonlocal calls
+        calls += 1
+        release.wait(5)
+        return geo_lookup_frame
+
+    cache = GeoLookupCache(load=load, vintage=lambda: "2021")
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.snapshot())) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    while cache.stats.coalesced < 7:
+        threading.Event().wait(0.001)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert calls == 1
+    assert len({id(snapshot) for snapshot in results}) == 1
+    assert cache.stats.misses == 1
+    assert cache.snapshot() is results[0]
+    assert cache.stats.hits == 1
+
+
+def test_load_errors_reach_waiters_and_are_retried(geo_lookup_frame: pd.DataFrame) -> None:
+    outcomes: list[BaseException | pd.DataFrame] = [RuntimeError("db down"), geo_lookup_frame]
+
+    def load(vintage: str | None) -> pd.DataFrame:
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return outcome
+
+    cache = GeoLookupCache(load=load, vintage=lambda: None)
+
+    with pytest.raises(RuntimeError, match="db down"):
+        cache.snapshot()
+    assert cache.snapshot().frame.equals(geo_lookup_frame)
+
+
+def test_invalidate_discards_load_in_flight(geo_lookup_frame: pd.DataFrame) -> None:
+    """A load overtaken by ``invalidate()`` is not cached; the next call reloads."""
+    started, release = threading.Event(), threading.Event()
+    loads = 0
+
+    def load(vintage: str | None) -> pd.DataFrame:
+        nonlocal loads
+        loads += 1
+        if loads == 1:
+            started.set()
+            release.wait(5)
+        return geo_lookup_frame
+
+    cache = GeoLookupCache(load=load, vintage=lambda: None)
+    stale = threading.Thread(target=cache.snapshot)
+    stale.start()
+    started.wait(5)
+    cache.invalidate()
+    release.set()
+    stale.join()
+
+    cache.snapshot()
+    assert loads == 2
+
+
+def test_ttl_revalidates_against_vintage(geo_lookup_frame: pd.DataFrame) -> None:
+    """An expired snapshot is kept while the vintage is unchanged."""
+    clock = FakeClock()
+    vintage = "2021-v1"
+    loads = 0
+
+    def load(vintage: str | None) -> pd.DataFrame:
+        nonlocal loads
+        loads += 1
+        return geo_lookup_frame
+
+    cache = GeoLookupCache(load=load, vintage=lambda: vintage, ttl_seconds=60, clock=clock)
+    first = cache.snapshot()
+    built = first.derived("n", lambda s: object())
+
+    clock.now = 61
+    second = cache.snapshot()
+    assert loads == 1
+    assert cache.stats.revalidations == 1
+    assert second.derived("n", lambda s: object()) is built
+
+    vintage = "2021-v2"
+    clock.now = 130
+    third = cache.snapshot()
+    assert loads == 2
+    assert third.vintage == "2021-v2"
+    assert third.derived("n", lambda s: object()) is not built
+
+
+@pytest.mark.usefixtures("warehouse_lookup")
+def test_lookups_from_warehouse(geo_lookup_frame: pd.DataFrame) -> None:
+    assert lsoa_to_lad("E01000000") == "E08000035"
+    assert lsoa_to_lad("E01999999") is None
+    assert list(lsoa_to_lad_batch(["E01000047", "E01999999", "E01000000"])) == [
+        "E06000001",
+        None,
+        "E08000035",
+    ]
+    batch = lsoa_to_lad_batch(geo_lookup_frame["lsoa_code"])
+    assert (batch == geo_lookup_frame["lad_code"].to_numpy()).all()
+    assert geo_lookup_cache().stats.misses == 1
+    assert geo_lookup_cache().snapshot().vintage == "2021"
+
+
+@pytest.mark.usefixtures("warehouse_lookup")
+def test_derived_structures_follow_invalidation() -> None:
+    """``GeoIndex`` and ``HierarchyRollup`` are rebuilt with a new snapshot."""
+    index, rollup = get_geo_index(), get_hierarchy_rollup()
+    assert get_geo_index() is index
+    assert rollup.index is index
+
+    frame = get_geo_lookup()
+    frame.loc[0, "lad_code"] = "changed"
+    assert get_geo_lookup().loc[0, "lad_code"] != "changed"
+    assert (index.levels["lad"].codes != "changed").all()
+
+    invalidate_geo_cache()
+    assert get_geo_index() is not index
+    assert get_hierarchy_rollup().index is get_geo_index()
+    assert geo_lookup_cache().stats.misses == 2
+
+
+@pytest.mark.usefixtures("warehouse_lookup")
+def test_next_process_loads_from_snapshot(
+    sqlite_engine: Engine, geo_lookup_frame: pd.DataFrame
+) -> None:
+    """A fresh cache with an unchanged vintage reads the snapshot, not the table."""
+    first = get_geo_lookup()
+    with sqlite_engine.begin() as connection:
+        connection.execute(GeoLookup.__table__.delete())
+
+    geo_lookup_cache.cache_clear()
+    assert get_geo_lookup().equals(first)
+
+    with sqlite_engine.begin() as connection:
+        record_geo_vintage(connection, "2024", 0)
+    geo_lookup_cache.cache_clear()
+    assert get_geo_lookup().empty
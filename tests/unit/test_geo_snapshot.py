@@ -0,0 +1,42 @@
+"""Unit tests for yhovi_pipeline.utils.geo_snapshot."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pandas as pd
+
+from yhovi_pipeline.utils.geo_snapshot import (
+    read_geo_snapshot,
+    snapshot_path,
+    write_geo_snapshot,
+)
+
+
+def test_round_trip_and_vintage_check(tmp_path: Path, geo_lookup_frame: pd.DataFrame) -> None:
+    """A snapshot only serves the vintage it was written for."""
+    write_geo_snapshot(geo_lookup_frame, "LSOA21/2024", tmp_path)
+
+    loaded = read_geo_snapshot(tmp_path, "LSOA21/2024")
+
+    assert loaded is not None
+    pd.testing.assert_frame_equal(loaded, geo_lookup_frame)
+    assert read_geo_snapshot(tmp_path, "LSOA21/2025") is None
+    # The sanitised file name collides, but the stored vintage does not.
+    assert read_geo_snapshot(tmp_path, "LSOA21_2024") is None
+
+
+def test_new_vintage_replaces_old(tmp_path: Path, geo_lookup_frame: pd.DataFrame) -> None:
+    write_geo_snapshot(geo_lookup_frame, "v1", tmp_path)
+    write_geo_snapshot(geo_lookup_frame.head(3), "v2", tmp_path)
+
+    assert [p.name for p in tmp_path.iterdir()] == [snapshot_path(tmp_path, "v2").name]
+    loaded = read_geo_snapshot(tmp_path, "v2")
+    assert loaded is not None
+    assert len(loaded) == 3
+
+
+def test_corrupt_file_is_ignored(tmp_path: Path) -> None:
+    snapshot_path(tmp_path, "v1").write_bytes(b"not arrow")
+
+    assert read_geo_snapshot(tmp_path, "v1") is None
@@ -0,0 +1,83 @@
+"""Unit tests for yhovi_pipeline.utils.http."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import pytest
+
+from yhovi_pipeline.config import HTTP_SOURCES, Settings, get_settings
+from yhovi_pipeline.utils.http import close_http_clients, get_http_client, source_settings
+
+
+@pytest.fixture(autouse=True)
+def _fresh_registry() -> Iterator[None]:
+    """Start and finish every test with an empty client registry."""
+    close_http_clients()
+    yield
+    close_http_clients()
+
+
+def test_every_source_has_settings(test_settings: Settings) -> None:
+    """Each registered source should have a configured base URL."""
+    for source in HTTP_SOURCES:
+        assert source_settings(source).base_url.startswith("https://")
+
+
+def test_client_is_shared_per_source(test_settings: Settings) -> None:
+    """Repeated lookups return the same pooled client; sources do not share."""
+    nomis = get_http_client("nomis")
+
+    assert get_http_client("nomis") is nomis
+    assert get_http_client("fingertips") is not nomis
+
+
+def test_client_is_built_once_under_concurrency(test_settings: Settings) -> None:
+    """Concurrent cold-start lookups should all receive one client."""
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        clients = list(pool.map(lambda _: get_http_client("ons"), range(32)))
+
+    assert len({id(client) for client in clients}) == 1
+
+
+def test_client_uses_source_configuration(test_settings: Settings) -> None:
+    """Base URL and timeouts come from the source's settings."""
+    client = get_http_client("dwp")
+    config = test_settings.dwp_http
+
+    assert str(client.base_url).rstrip("/") == config.base_url
+    assert client.timeout == httpx.Timeout(
+        config.timeout_seconds, connect=config.connect_timeout_seconds
+    )
+    assert client.headers["APIKey"] == "test-dwp-key"
+    assert "br" in client.headers["Accept-Encoding"]
+
+
+def test_source_settings_env_override(
+    test_settings: Settings, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """A single nested key can be overridden without restating the rest."""
+    monkeypatch.setenv("NOMIS_HTTP__TIMEOUT_SECONDS", "5")
+    get_settings.cache_clear()
+
+    config = source_settings("nomis")
+
+    assert config.timeout_seconds == 5.0
+    assert config.base_url == test_settings.nomis_http.base_url
+
+
+def test_closed_clients_are_rebuilt(test_settings: Settings) -> None:
+    """close_http_clients should close clients and let new ones be created."""
+    client = get_http_client("beis")
+    close_http_clients()
+
+    assert client.is_closed
+    assert get_http_client("beis") is not client
+
+
+def test_unknown_source_rejected(test_settings: Settings) -> None:
+    """Only sources listed in HTTP_SOURCES are served."""
+    with pytest.raises(ValueError, match="Unknown HTTP source"):
+        get_http_client("police_uk")
@@ -0,0 +1,207 @@
+"""Unit tests for yhovi_pipeline.utils.http_cache and utils.http.fetch."""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+import httpx
+import pytest
+
+from yhovi_pipeline.config import Settings, get_settings
+from yhovi_pipeline.utils import http
+from yhovi_pipeline.utils.http_cache import ResponseCache
+from yhovi_pipeline.utils.retry import reset_circuit_breakers
+
+# ---------------------------------------------------------------------------
+# ResponseCache
+# ---------------------------------------------------------------------------
+
+
+def test_cache_round_trip(tmp_path: Path) -> None:
+    """A stored body should come back with its validators."""
+    cache = ResponseCache(tmp_path, max_bytes=1024, max_age_seconds=60)
+    cache.put("https://example.test/a.csv", b"a,b\n1,2\n", '"v1"', None, "text/csv")
+
+    cached = cache.get("https://example.test/a.csv")
+
+    assert cached is not None
+    entry, body = cached
+    assert body == b"a,b\n1,2\n"
+    assert entry.conditional_headers() == {"If-None-Match": '"v1"'}
+    assert cache.get("https://example.test/other.csv") is None
+
+
+def test_cache_evicts_by_age(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Entries older than max_age_seconds should be removed."""
+    cache = ResponseCache(tmp_path, max_bytes=1024, max_age_seconds=60)
+    cache.put("https://example.test/a.csv", b"x", '"v1"', None)
+    later = time.time() + 3600
+    monkeypatch.setattr(time, "time", lambda: later)
+
+    assert cache.evict() == 1
+    assert cache.get("https://example.test/a.csv") is None
+
+
+def test_cache_evicts_least_recent_over_size(tmp_path: Path) -> None:
+    """When over max_bytes, the least recently stored entries go first."""
+    cache = ResponseCache(tmp_path, max_bytes=10, max_age_seconds=60)
+    cache.put("https://example.test/old", b"123456", '"a"', None)
+    time.sleep(0.01)
+    cache.put("https://example.test/new", b"123456", '"b"', None)
+
+    assert cache.get("https://example.test/old") is None
+    assert cache.get("https://example.test/new") is not None
+
+
+# ---------------------------------------------------------------------------
+# fetch()
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture()
+def cache_settings(
+    test_settings: Settings, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> Iterator[Settings]:
+    """Settings with the response cache redirected to a temp directory."""
+    monkeypatch.setenv("HTTP_CACHE_DIR", str(tmp_path / "http_cache"))
+    monkeypatch.setenv("RETRY_INITIAL_WAIT_SECONDS", "0.001")
+    get_settings.cache_clear()
+    http.close_http_clients()
+    reset_circuit_breakers()
+
+    yield get_settings()
+
+    http.close_http_clients()
+    reset_circuit_breakers()
+
+
+def _serve(monkeypatch: pytest.MonkeyPatch, handler: httpx.MockTransport) -> None:
+    """Route the registry's clients through ``handler``."""
+    monkeypatch.setattr(
+        http,
+        "_build_client",
+        lambda source, settings: httpx.Client(
+            base_url=http.source_settings(source, settings).base_url,
+            params={"uid": "secret"},
+            transport=handler,
+        ),
+    )
+
+
+def test_fetch_revalidates_and_serves_304_from_disk(
+    cache_settings: Settings, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """The second fetch should send If-None-Match and reuse the cached body."""
+    seen: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        if request.headers.get("If-None-Match") == '"r1"':
+            return httpx.Response(304)
+        return httpx.Response(200, content=b"release-1", headers={"ETag": '"r1"'})
+
+    _serve(monkeypatch, httpx.MockTransport(handler))
+
+    first = http.fetch("beis", "/media/energy.csv")
+    second = http.fetch("beis", "/media/energy.csv")
+
+    assert first.content == second.content == b"release-1"
+    assert not first.not_modified
+    assert second.not_modified
+    assert "If-None-Match" not in seen[0].headers
+    assert "uid=secret" not in first.url
+
+
+def test_fetch_skip_unchanged_raises(
+    cache_settings: Settings, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """skip_unchanged should turn a 304 into SourceNotModified."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if "If-Modified-Since" in request.headers:
+            return httpx.Response(304)
+        return httpx.Response(
+            200, content=b"x", headers={"Last-Modified": "Wed, 01 May 2024 06:00:00 GMT"}
+        )
+
+    _serve(monkeypatch, httpx.MockTransport(handler))
+    http.fetch("ofcom", "/connected-nations.zip", skip_unchanged=True)
+
+    with pytest.raises(http.SourceNotModified) as excinfo:
+        http.fetch("ofcom", "/connected-nations.zip", skip_unchanged=True)
+
+    assert excinfo.value.source == "ofcom"
+
+
+@pytest.mark.parametrize("always_304", [False, True])
+def test_fetch_304_without_cached_copy(
+    cache_settings: Settings, monkeypatch: pytest.MonkeyPatch, always_304: bool
+) -> None:
+    """A 304 with nothing on disk is re-requested once, never returned as empty."""
+    monkeypatch.setenv("HTTP_CACHE_ENABLED", "false")
+    get_settings.cache_clear()
+    calls: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        if always_304 or len(calls) == 1:
+            return httpx.Response(304)
+        return httpx.Response(200, content=b"body")
+
+    _serve(monkeypatch, httpx.MockTransport(handler))
+
+    if always_304:
+        with pytest.raises(httpx.HTTPStatusError, match="no cached copy"):
+            http.fetch("ons", "/file.xlsx")
+    else:
+        assert http.fetch("ons", "/file.xlsx").content == b"body"
+    assert len(calls) == 2
+    assert calls[1].headers["Cache-Control"] == "no-cache"
+
+
+def test_fetch_raises_on_error_status(
+    cache_settings: Settings, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Non-2xx responses should surface as HTTPStatusError once retries run out."""
+    calls: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(500)
+
+    _serve(monkeypatch, httpx.MockTransport(handler))
+
+    with pytest.raises(httpx.HTTPStatusError):
+        http.fetch("ons", "/file.xlsx")
+
+    assert len(calls) == cache_settings.retry_max_attempts
+
+
+def test_fetch_retries_transient_error(
+    cache_settings: Settings, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """A single 502 should be retried straight away rather than failing the task."""
+    responses = iter([httpx.Response(502), httpx.Response(200, content=b"ok")])
+    _serve(monkeypatch, httpx.MockTransport(lambda request: next(responses)))
+
+    assert http.fetch("defra", "/data.csv").content == b"ok"
+
+
+def test_fetch_does_not_retry_fatal_status(
+    cache_settings: Settings, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """A 404 is not transient and should surface on the first attempt."""
+    calls: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(404)
+
+    _serve(monkeypatch, httpx.MockTransport(handler))
+
+    with pytest.raises(httpx.HTTPStatusError):
+        http.fetch("ons", "/missing.xlsx")
+
+    assert len(calls) == 1
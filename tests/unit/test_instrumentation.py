@@ -0,0 +1,111 @@
+"""Unit tests for yhovi_pipeline.utils.instrumentation."""
+
+from __future__ import annotations
+
+import json
+from datetime import date
+
+import pandas as pd
+from sqlalchemy import Engine, select
+
+from yhovi_pipeline.config import Settings
+from yhovi_pipeline.db.models import DatasetMetadata, ExtractionStatus
+from yhovi_pipeline.db.upsert import UpsertResult
+from yhovi_pipeline.tasks.load.sql_server import write_metadata
+from yhovi_pipeline.tasks.transform.normalise import normalise_to_indicator
+from yhovi_pipeline.utils.instrumentation import (
+    StageMetrics,
+    drain_metrics,
+    instrumented,
+    measure_stage,
+    record_http,
+    summarise,
+)
+
+
+@instrumented
+def _download(rows: int) -> pd.DataFrame:
+    record_http(1_000)
+    record_http(500)
+    return pd.DataFrame({"value": range(rows)})
+
+
+def test_instrumented_records_a_stage_per_call() -> None:
+    """Each call records time, rows and the HTTP traffic made inside it."""
+    drain_metrics()
+    _download(10)
+    record_http(99)  # outside any stage: not counted
+
+    [metrics] = drain_metrics()
+    assert metrics.stage == "_download"
+    assert metrics.rows == 10
+    assert (metrics.http_requests, metrics.bytes_downloaded) == (2, 1_500)
+    assert metrics.wall_seconds >= 0 and metrics.cpu_seconds >= 0
+    assert metrics.peak_memory_bytes is None or metrics.peak_memory_bytes > 0
+    assert drain_metrics() == []
+
+
+def test_nested_normalise_records_one_stage() -> None:
+    """normalise_to_indicator shares its body with the wide task, not its stage."""
+    drain_metrics()
+    normalise_to_indicator.fn(
+        pd.DataFrame({"lad": ["E08000035"], "name": ["Leeds"], "v": [1.0]}),
+        indicator_id="x",
+        indicator_name="X",
+        source="test",
+        dataset_code="X",
+        reference_period=date(2024, 1, 1),
+        lad_col="lad",
+        lad_name_col="name",
+        value_col="v",
+    )
+
+    assert [m.stage for m in drain_metrics()] == ["normalise_to_indicator"]
+
+
+def test_measure_stage_reports_upsert_rows() -> None:
+    """UpsertResults count rows written plus rows skipped."""
+    drain_metrics()
+
+    @instrumented
+    def load() -> UpsertResult:
+        return UpsertResult(inserted=2, updated=1, unchanged=4)
+
+    load()
+    with measure_stage("transform/custom") as metrics:
+        metrics.rows = 3
+
+    assert [m.rows for m in drain_metrics()] == [7, 3]
+
+
+def test_summarise_groups_by_stage_kind() -> None:
+    """Wall time is split by stage kind; traffic and CPU are totalled."""
+    metrics = [
+        StageMetrics("extract/nomis/bres", 2.0, 0.5, 100, 10, 2_048, 3),
+        StageMetrics("extract/nomis/aps", 1.0, 0.5, 300, 5, 1_024, 1),
+        StageMetrics("load/sql-server/upsert-indicators", 4.0, 1.0, 200, 15),
+    ]
+    summary = summarise(metrics)
+
+    assert summary["extract_seconds"] == 3.0
+    assert summary["transform_seconds"] == 0.0
+    assert summary["load_seconds"] == 4.0
+    assert summary["cpu_seconds"] == 2.0
+    assert summary["peak_memory_bytes"] == 300
+    assert (summary["bytes_downloaded"], summary["http_requests"]) == (3_072, 4)
+    stages = json.loads(summary["stage_metrics"])
+    assert stages[0]["rows_per_second"] == 5.0
+
+
+def test_write_metadata_stores_metrics(sqlite_engine: Engine, sqlite_settings: Settings) -> None:
+    """write_metadata stores the metrics recorded for its flow run."""
+    drain_metrics()
+    _download(4)
+    write_metadata.fn("UC_MONTHLY", "dwp", ExtractionStatus.SUCCESS)
+
+    with sqlite_engine.connect() as connection:
+        record = connection.execute(select(DatasetMetadata)).one()
+    assert record.http_requests == 2
+    assert record.bytes_downloaded == 1_500
+    assert record.extract_seconds == 0.0
+    assert json.loads(record.stage_metrics)[0]["stage"] == "_download"
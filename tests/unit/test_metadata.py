@@ -0,0 +1,80 @@
+"""Unit tests for yhovi_pipeline.utils.metadata and the write_metadata task."""
+
+from __future__ import annotations
+
+from sqlalchemy import Engine, select
+from sqlalchemy.orm import Session
+
+from yhovi_pipeline.config import Settings
+from yhovi_pipeline.db.models import DatasetMetadata, ExtractionStatus
+from yhovi_pipeline.db.upsert import UpsertResult
+from yhovi_pipeline.tasks.load.sql_server import MAX_ERROR_MESSAGE_LENGTH, write_metadata
+from yhovi_pipeline.utils.metadata import build_metadata_record
+
+
+def test_build_metadata_record() -> None:
+    """The record should carry the provenance fields it was given."""
+    record = build_metadata_record("UC_MONTHLY", "dwp", ExtractionStatus.RUNNING, "run-1")
+
+    assert record.dataset_code == "UC_MONTHLY"
+    assert record.source == "dwp"
+    assert record.extraction_status is ExtractionStatus.RUNNING
+    assert record.prefect_flow_run_id == "run-1"
+
+
+def test_write_metadata_persists_record(sqlite_engine: Engine, sqlite_settings: Settings) -> None:
+    """write_metadata should insert one audit row with load timestamps."""
+    write_metadata.fn(
+        dataset_code="UC_MONTHLY",
+        source="dwp",
+        status=ExtractionStatus.SUCCESS,
+        rows_extracted=22,
+        rows_loaded=3,
+        source_url="https://stat-xplore.dwp.gov.uk/webapi/rest/v1/table",
+    )
+
+    with Session(sqlite_engine) as session:
+        record = session.scalars(select(DatasetMetadata)).one()
+
+    assert record.extraction_status is ExtractionStatus.SUCCESS
+    assert record.rows_extracted == 22
+    assert record.rows_loaded == 3
+    assert record.extracted_at is not None
+    assert record.loaded_at is not None
+    assert record.error_message is None
+
+
+def test_write_metadata_truncates_error(sqlite_engine: Engine, sqlite_settings: Settings) -> None:
+    """Long error messages should be truncated before they are stored."""
+    write_metadata.fn(
+        dataset_code="UC_MONTHLY",
+        source="dwp",
+        status=ExtractionStatus.FAILED,
+        error_message="x" * (MAX_ERROR_MESSAGE_LENGTH + 100),
+    )
+
+    with Session(sqlite_engine) as session:
+        record = session.scalars(select(DatasetMetadata)).one()
+
+    assert record.error_message is not None
+    assert len(record.error_message) == MAX_ERROR_MESSAGE_LENGTH
+    assert record.loaded_at is None
+
+
+def test_write_metadata_records_upsert_breakdown(
+    sqlite_engine: Engine, sqlite_settings: Settings
+) -> None:
+    """An UpsertResult fills rows_loaded and the per-outcome counts."""
+    write_metadata.fn(
+        dataset_code="UC_MONTHLY",
+        source="dwp",
+        status=ExtractionStatus.SUCCESS,
+        upsert=UpsertResult(inserted=4, updated=2, unchanged=9),
+    )
+
+    with Session(sqlite_engine) as session:
+        record = session.scalars(select(DatasetMetadata)).one()
+
+    assert (record.rows_loaded, record.rows_inserted, record.rows_updated) == (6, 4, 2)
+    assert record.rows_unchanged == 9
+    assert record.loaded_at is not None
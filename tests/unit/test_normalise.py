@@ -0,0 +1,87 @@
+"""Unit tests for yhovi_pipeline.tasks.transform.normalise."""
+
+from __future__ import annotations
+
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from yhovi_pipeline.tasks.transform.normalise import (
+    IndicatorColumn,
+    normalise_wide_to_indicator,
+    parse_values,
+)
+
+
+def _wide() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "AreaCode": ["E08000035", "E06000014", None],
+            "AreaName": ["Leeds", "York", "England"],
+            "Year": ["2022-01-01", "2023-01-01", "2023-01-01"],
+            "births": ["1,200", "x", "99"],
+            "deaths": [800.0, 450.0, 1.0],
+        }
+    )
+
+
+def test_wide_normaliser_melts_every_column() -> None:
+    """Each mapped column becomes one block of rows, periods from period_col."""
+    batch = normalise_wide_to_indicator.fn(
+        _wide(),
+        columns={
+            "births": IndicatorColumn("business_births", "Business births", "count"),
+            "deaths": IndicatorColumn("business_deaths", "Business deaths", "count"),
+        },
+        source="ons",
+        dataset_code="BUSINESS_DEMOGRAPHY",
+        lad_col="AreaCode",
+        lad_name_col="AreaName",
+        period_col="Year",
+    )
+    frame = batch.to_frame()
+
+    assert frame["indicator_id"].tolist() == ["business_births"] * 2 + ["business_deaths"] * 2
+    assert frame["lad_code"].tolist() == ["E08000035", "E06000014"] * 2
+    assert frame["reference_period"].dt.year.tolist() == [2022, 2023, 2022, 2023]
+    assert frame["value"].fillna(-1).tolist() == [1200.0, -1, 800.0, 450.0]
+    assert frame["source"].tolist() == ["ons"] * 4
+
+
+def test_wide_normaliser_fixed_period_columns() -> None:
+    """Year columns of one indicator carry their own reference periods."""
+    sheet = pd.DataFrame({"code": ["E08000035"], "name": ["Leeds"], "2021": [10.5], "2022": [".."]})
+    gva = {
+        str(year): IndicatorColumn("gva", "GVA", "£m", date(year, 1, 1)) for year in (2021, 2022)
+    }
+    batch = normalise_wide_to_indicator.fn(
+        sheet, gva, source="ons", dataset_code="GVA", lad_col="code", lad_name_col="name"
+    )
+
+    assert batch.reference_period.astype(object).tolist() == [date(2021, 1, 1), date(2022, 1, 1)]
+    assert batch.value_missing.tolist() == [False, True]
+    assert list(batch.strings["indicator_id"].categories) == ["gva"]
+
+
+def test_wide_normaliser_requires_period_col() -> None:
+    """Columns without a fixed period need period_col."""
+    with pytest.raises(ValueError, match="period_col"):
+        normalise_wide_to_indicator.fn(
+            _wide(),
+            {"deaths": IndicatorColumn("business_deaths", "Business deaths")},
+            source="ons",
+            dataset_code="BUSINESS_DEMOGRAPHY",
+            lad_col="AreaCode",
+            lad_name_col="AreaName",
+        )
+
+
+def test_parse_values_rejects_unknown_text() -> None:
+    """Markers become NaN; any other text is an error, not a silent null."""
+    parsed = parse_values(pd.Series([" 3 ", "*", "[c]", None, "1,000.5"]))
+
+    assert pd.isna(parsed[1:4]).all()
+    assert parsed[[0, 4]].tolist() == [3.0, 1000.5]
+    with pytest.raises(ValueError, match="neither numeric nor suppressed"):
+        parse_values(pd.Series(["3", "see note"]))
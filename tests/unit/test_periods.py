@@ -0,0 +1,82 @@
+"""Unit tests for yhovi_pipeline.utils.periods."""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Iterator
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from yhovi_pipeline.utils import periods
+from yhovi_pipeline.utils.periods import (
+    ParsedPeriod,
+    parse_period,
+    parse_periods,
+    register_period_rule,
+)
+
+
+@pytest.mark.parametrize(
+    ("label", "expected"),
+    [
+        ("2024-04", ParsedPeriod(date(2024, 4, 1), "month")),
+        ("April 2024", ParsedPeriod(date(2024, 4, 1), "month")),
+        ("2023-05-17", ParsedPeriod(date(2023, 5, 17), "day")),
+        ("2023", ParsedPeriod(date(2023, 1, 1), "year")),
+        ("2022-23", ParsedPeriod(date(2022, 4, 1), "financial_year")),
+        ("2011/12", ParsedPeriod(date(2011, 4, 1), "financial_year")),
+        ("2024 Q3", ParsedPeriod(date(2024, 7, 1), "quarter")),
+        ("2024/25 Q4", ParsedPeriod(date(2025, 1, 1), "quarter")),
+        ("2018 - 20", ParsedPeriod(date(2018, 1, 1), "multi_year")),
+        ("2018/19 - 20/21", ParsedPeriod(date(2018, 4, 1), "multi_year")),
+    ],
+)
+def test_parse_period_formats(label: str, expected: ParsedPeriod) -> None:
+    """Each built-in format maps to the first day of its period."""
+    assert parse_period(label) == expected
+
+
+def test_parse_period_rejects_unknown_labels() -> None:
+    """Labels no rule matches are an error."""
+    with pytest.raises(ValueError, match="Unrecognised reference period"):
+        parse_period("Spring term")
+
+
+def test_parse_periods_parses_each_label_once() -> None:
+    """A column is parsed per distinct label and mapped back by code."""
+    parse_period.cache_clear()
+    column = pd.Series([2023, "2023", None, "2024-04"] * 1000, dtype=object)
+    parsed = parse_periods(column)
+
+    assert parse_period.cache_info().misses == 2
+    assert parsed.start[:4].astype(object).tolist() == [
+        date(2023, 1, 1),
+        date(2023, 1, 1),
+        None,
+        date(2024, 4, 1),
+    ]
+    assert parsed.granularity[:4].tolist()[3] == "month"
+    assert pd.isna(parsed.granularity[2])
+
+
+@pytest.fixture
+def _restore_rules() -> Iterator[None]:
+    saved = list(periods._RULES)
+    yield
+    periods._RULES[:] = saved
+    parse_period.cache_clear()
+
+
+@pytest.mark.usefixtures("_restore_rules")
+def test_register_period_rule_extends_the_parser() -> None:
+    """A registered rule is picked up, and clears memoised failures."""
+    with pytest.raises(ValueError):
+        parse_period("AY2023")
+
+    @register_period_rule("academic-year", r"AY(\d{4})", "year")
+    def _academic(match: re.Match[str]) -> date:
+        return date(int(match[1]), 9, 1)
+
+    assert parse_period("AY2023") == ParsedPeriod(date(2023, 9, 1), "year")
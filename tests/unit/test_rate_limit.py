@@ -0,0 +1,79 @@
+"""Unit tests for yhovi_pipeline.utils.rate_limit."""
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import httpx
+import pytest
+
+from yhovi_pipeline.config import Settings, get_settings
+from yhovi_pipeline.utils import http
+from yhovi_pipeline.utils.rate_limit import TokenBucket, rate_limit_hook
+
+
+def test_bucket_allows_burst_then_paces(tmp_path: Path) -> None:
+    """Up to ``capacity`` requests go at once; later ones are spaced at ``rate``."""
+    bucket = TokenBucket(tmp_path / "buckets.sqlite3", "nomis", rate=10.0, capacity=2)
+
+    delays = [bucket.reserve() for _ in range(4)]
+
+    assert delays[:2] == [0.0, 0.0]
+    assert delays[2] == pytest.approx(0.1, abs=0.02)
+    assert delays[3] == pytest.approx(0.2, abs=0.02)
+
+
+def test_buckets_share_state_through_file(tmp_path: Path) -> None:
+    """Separate bucket objects (as in separate processes) draw from one budget."""
+    path = tmp_path / "buckets.sqlite3"
+    first = TokenBucket(path, "dwp", rate=1.0, capacity=1)
+    second = TokenBucket(path, "dwp", rate=1.0, capacity=1)
+    other_source = TokenBucket(path, "fingertips", rate=1.0, capacity=1)
+
+    assert first.reserve() == 0.0
+    assert second.reserve() > 0.9
+    assert other_source.reserve() == 0.0
+
+
+def test_concurrent_reservations_are_serialised(tmp_path: Path) -> None:
+    """Threads racing for tokens each get a distinct slot."""
+    bucket = TokenBucket(tmp_path / "buckets.sqlite3", "nomis", rate=0.01, capacity=1)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        delays = sorted(pool.map(lambda _: bucket.reserve(), range(20)))
+
+    # One token per 100 s: the n-th reservation waits n * 100 s.
+    assert delays == pytest.approx([n * 100.0 for n in range(20)], abs=1.0)
+
+
+def test_hook_only_for_rate_limited_sources(
+    test_settings: Settings, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Sources without ``requests_per_second`` are not limited."""
+    monkeypatch.setenv("RATE_LIMIT_DB", str(tmp_path / "buckets.sqlite3"))
+    get_settings.cache_clear()
+    settings = get_settings()
+
+    assert rate_limit_hook("ons", settings) is None
+    assert rate_limit_hook("nomis", settings) is not None
+
+
+def test_client_requests_take_tokens(
+    test_settings: Settings, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Every request sent by a pooled client passes through the bucket."""
+    monkeypatch.setenv("RATE_LIMIT_DB", str(tmp_path / "buckets.sqlite3"))
+    monkeypatch.setenv("FINGERTIPS_HTTP__REQUESTS_PER_SECOND", "1000")
+    monkeypatch.setenv("FINGERTIPS_HTTP__BURST", "1")
+    get_settings.cache_clear()
+    taken: list[float] = []
+    monkeypatch.setattr(TokenBucket, "acquire", lambda self, tokens=1.0: taken.append(tokens))
+
+    client = http._build_client("fingertips", get_settings())
+    client._transport = httpx.MockTransport(lambda request: httpx.Response(200))
+    client.get("/indicator_metadata/all")
+    client.get("/indicator_metadata/all")
+    client.close()
+
+    assert taken == [1.0, 1.0]
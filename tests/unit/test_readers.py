@@ -0,0 +1,153 @@
+"""Unit tests for yhovi_pipeline.utils.readers."""
+
+from __future__ import annotations
+
+import io
+import zipfile
+from pathlib import Path
+
+import pandas as pd
+import pytest
+from openpyxl import Workbook
+
+from yhovi_pipeline.config import Settings, get_settings
+from yhovi_pipeline.utils.readers import (
+    CsvOptions,
+    iter_csv_filtered,
+    read_csv_filtered,
+    read_xlsx_filtered,
+    read_zip_csv_filtered,
+    wanted_geography_codes,
+)
+
+WANTED = frozenset({"E08000035", "E06000014"})
+COLUMNS = {"LA code": "str", "Year": "int", "Consumption": "float"}
+
+CSV = (
+    "LA code,LA name,Year,Consumption,Notes\n"
+    "E09000001,City of London,2022,1.5,x\n"
+    "E08000035,Leeds,2022,2.5,x\n"
+    "E06000014,York,2022,,x\n"
+    "W06000001,Anglesey,2022,4.0,x\n"
+)
+
+
+def test_csv_keeps_wanted_rows_and_columns() -> None:
+    df = read_csv_filtered(io.BytesIO(CSV.encode()), "LA code", WANTED, COLUMNS)
+
+    assert list(df.columns) == ["LA code", "Year", "Consumption"]
+    assert df["LA code"].tolist() == ["E08000035", "E06000014"]
+    assert df["Year"].dtype == "Int64"
+    assert df["Consumption"].dtype == "float64"
+    assert df["Consumption"].isna().tolist() == [False, True]
+
+
+def test_csv_blocks_are_filtered_independently() -> None:
+    """Small blocks yield one frame per block that has a wanted row."""
+    body = "".join(f"E{i:08d},n,2022,{i},x\n" for i in range(2000))
+    text = "title line\n" + CSV.splitlines()[0] + "\n" + body
+    wanted = {f"E{i:08d}" for i in (3, 1500)}
+
+    frames = list(
+        iter_csv_filtered(
+            io.BytesIO(text.encode()),
+            "LA code",
+            wanted,
+            COLUMNS,
+            CsvOptions(skip_rows=1, block_size=4096),
+        )
+    )
+
+    assert [frame["Consumption"].tolist() for frame in frames] == [[3.0], [1500.0]]
+
+
+def test_csv_with_no_match_returns_typed_empty_frame() -> None:
+    df = read_csv_filtered(io.BytesIO(CSV.encode()), "LA code", {"E99999999"}, COLUMNS)
+
+    assert df.empty
+    assert dict(df.dtypes.astype(str)) == {
+        "LA code": "str",
+        "Year": "Int64",
+        "Consumption": "float64",
+    }
+
+
+def test_csv_suppression_markers_in_numeric_columns_become_null() -> None:
+    text = (
+        "LA code,Year,Consumption\n"
+        'E08000035,2022," 1,234.5 "\n'
+        "E08000035,2022,x\n"
+        "E08000035,..,[c]\n"
+        "E06000014,2022,*\n"
+    )
+    df = read_csv_filtered(io.BytesIO(text.encode()), "LA code", WANTED, COLUMNS)
+
+    assert df["Consumption"].tolist()[0] == 1234.5
+    assert df["Consumption"].isna().tolist() == [False, True, True, True]
+    assert df["Year"].isna().tolist() == [False, False, True, False]
+
+    with pytest.raises(ValueError, match="'Consumption'"):
+        read_csv_filtered(
+            io.BytesIO(b"LA code,Year,Consumption\nE08000035,2022,lots\n"),
+            "LA code",
+            WANTED,
+            COLUMNS,
+        )
+
+
+def test_zip_reads_every_matching_member(tmp_path: Path) -> None:
+    archive = tmp_path / "release.zip"
+    with zipfile.ZipFile(archive, "w") as zf:
+        zf.writestr("2022/a.csv", CSV)
+        zf.writestr("2022/b.csv", CSV)
+        zf.writestr("README.txt", "not a csv")
+
+    df = read_zip_csv_filtered(archive, "LA code", WANTED, COLUMNS)
+    assert len(df) == 4
+
+    with pytest.raises(FileNotFoundError, match="matches"):
+        read_zip_csv_filtered(archive, "LA code", WANTED, COLUMNS, members="*.xlsx")
+
+
+def test_xlsx_reads_one_sheet_below_title_rows(
+    test_settings: Settings, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Rows are filtered by the workbook parser, through its Parquet cache."""
+    monkeypatch.setenv("WORKBOOK_CACHE_DIR", str(tmp_path / "workbook_cache"))
+    get_settings.cache_clear()
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.title = "Table 1"
+    sheet.append(["Sub-national consumption"])
+    sheet.append([])
+    for line in CSV.splitlines():
+        sheet.append(
+            [float(c) if c.replace(".", "").isdigit() else c or None for c in line.split(",")]
+        )
+    sheet.append(["E08000032", "Bradford", 2022, "[c]", "x"])
+    path = tmp_path / "release.xlsx"
+    workbook.save(path)
+
+    df = read_xlsx_filtered(path, "Table 1", "LA code", WANTED | {"E08000032"}, COLUMNS, 3)
+
+    assert df["LA code"].tolist() == ["E08000035", "E06000014", "E08000032"]
+    assert df["Year"].tolist() == [2022, 2022, 2022]
+    assert df["Year"].dtype == "Int64"
+    assert df["Consumption"].tolist()[0] == 2.5
+    assert df["Consumption"].isna().tolist() == [False, True, True]
+    assert len(list((tmp_path / "workbook_cache").glob("*.parquet"))) == 1
+    with pytest.raises(KeyError, match="no columns"):
+        read_xlsx_filtered(path, "Table 1", "LA code", WANTED, {"Missing": "str"}, header_row=3)
+
+
+@pytest.mark.usefixtures("warehouse_lookup")
+def test_wanted_geography_codes(geo_lookup_frame: pd.DataFrame) -> None:
+    """Hartlepool is outside Yorkshire; its LSOAs must not be wanted."""
+    codes = wanted_geography_codes()
+    by_lad = geo_lookup_frame.groupby("lad_code")
+
+    assert set(by_lad.get_group("E08000035")["lsoa_code"]) <= codes
+    assert set(by_lad.get_group("E08000035")["msoa_code"]) <= codes
+    assert not set(by_lad.get_group("E06000001")["lsoa_code"]) & codes
+    assert "E08000035" in codes
+    assert not any(code.startswith("E01") for code in wanted_geography_codes(("lad",)))
@@ -0,0 +1,96 @@
+"""Unit tests for the record/replay stand-in server (tests.replay.server)."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from pathlib import Path
+
+import httpx
+import pytest
+
+from tests.replay.server import Faults, FixtureStore, Recording, ReplayServer
+from yhovi_pipeline.config import Settings, get_settings
+from yhovi_pipeline.utils.http import close_http_clients, fetch
+from yhovi_pipeline.utils.retry import reset_circuit_breakers
+
+
+@pytest.fixture()
+def pipeline_env(
+    test_settings: Settings, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> Iterator[pytest.MonkeyPatch]:
+    """Fast retries, no response cache, and fresh clients once sources are pointed."""
+    monkeypatch.setenv("HTTP_CACHE_ENABLED", "false")
+    monkeypatch.setenv("RATE_LIMIT_DB", str(tmp_path / "rate_limits.sqlite3"))
+    monkeypatch.setenv("RETRY_INITIAL_WAIT_SECONDS", "0.001")
+    monkeypatch.setenv("RETRY_MAX_ATTEMPTS", "20")
+    monkeypatch.setenv("CIRCUIT_BREAKER_THRESHOLD", "100")
+    yield monkeypatch
+    close_http_clients()
+    reset_circuit_breakers()
+    get_settings.cache_clear()
+
+
+def _point_at(server: ReplayServer, monkeypatch: pytest.MonkeyPatch) -> None:
+    for name, value in server.environ().items():
+        monkeypatch.setenv(name, value)
+    get_settings.cache_clear()
+    close_http_clients()
+    reset_circuit_breakers()
+
+
+def test_record_then_replay_without_credentials(
+    pipeline_env: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    """Recorded answers replay offline; the NOMIS uid never reaches the fixtures."""
+    upstream_dir, recorded_dir = tmp_path / "upstream", tmp_path / "recorded"
+    FixtureStore(upstream_dir).put(
+        "nomis", "dataset/NM_1_1.data.csv", "geography=E08000035", Recording(200, b"a,b\n1,2\n")
+    )
+    pipeline_env.setenv("NOMIS_API_KEY", "secret-uid")
+
+    with ReplayServer(upstream_dir) as upstream:
+        with ReplayServer(
+            recorded_dir, record=True, upstreams={"nomis": upstream.base_url("nomis")}
+        ) as recorder:
+            _point_at(recorder, pipeline_env)
+            fetch("nomis", "dataset/NM_1_1.data.csv", {"geography": "E08000035"})
+        assert upstream.stats()["replayed"] == 1
+
+    with ReplayServer(recorded_dir) as replay:
+        _point_at(replay, pipeline_env)
+        result = fetch("nomis", "dataset/NM_1_1.data.csv", {"geography": "E08000035"})
+
+    assert result.content == b"a,b\n1,2\n"
+    assert replay.stats() == {"replayed": 1}
+    assert not any(b"secret-uid" in f.read_bytes() for f in recorded_dir.rglob("*.*"))
+
+
+def test_injected_throttling_and_errors_are_retried(
+    pipeline_env: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    """fetch() rides out seeded 429s and 503s and still returns every body."""
+    store = FixtureStore(tmp_path)
+    for i in range(20):
+        store.put("ons", f"file/{i}.csv", "", Recording(200, f"body {i}".encode()))
+    faults = Faults(throttle_rate=0.3, retry_after_seconds=0, error_rate=0.3, seed=7)
+
+    with ReplayServer(tmp_path, faults) as server:
+        _point_at(server, pipeline_env)
+        bodies = [fetch("ons", f"file/{i}.csv").content for i in range(20)]
+
+    assert bodies == [f"body {i}".encode() for i in range(20)]
+    stats = server.stats("ons")
+    assert stats["replayed"] == 20
+    assert stats["throttled"] > 0 and stats["error"] > 0
+
+
+def test_conditional_requests_and_missing_fixtures(tmp_path: Path) -> None:
+    """A matching ETag answers 304; an unrecorded path answers 404."""
+    FixtureStore(tmp_path).put("ons", "a.csv", "", Recording(200, b"x", {"ETag": '"v1"'}))
+
+    with ReplayServer(tmp_path) as server, httpx.Client(base_url=server.base_url("ons")) as client:
+        assert client.get("/a.csv", headers={"If-None-Match": '"v1"'}).status_code == 304
+        assert client.get("/a.csv", headers={"If-None-Match": '"v0"'}).content == b"x"
+        assert client.get("/b.csv").status_code == 404
+
+    assert server.stats() == {"not_modified": 1, "replayed": 1, "missing": 1}
@@ -0,0 +1,112 @@
+"""Unit tests for yhovi_pipeline.utils.results."""
+
+from __future__ import annotations
+
+import threading
+from datetime import date
+from types import SimpleNamespace
+from typing import Any
+
+import pandas as pd
+import pytest
+from prefect.serializers import Serializer
+
+from yhovi_pipeline.config import Settings, get_settings
+from yhovi_pipeline.db.upsert import UpsertResult
+from yhovi_pipeline.tasks.extract.nomis import extract_bres
+from yhovi_pipeline.utils.results import (
+    ARROW_SERIALIZER,
+    EXTRACT_CACHE_POLICY,
+    TRANSFORM_CACHE_POLICY,
+    VALIDATE_CACHE_POLICY,
+    ArrowSerializer,
+    ContentInputs,
+)
+
+
+def _frame() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "lad_code": ["E08000035", "E06000014"],
+            "value": [1.5, None],
+            "reference_period": [date(2024, 1, 1), date(2024, 1, 1)],
+        }
+    )
+
+
+def _key(policy: ContentInputs, **inputs: Any) -> str | None:
+    task_ctx: Any = SimpleNamespace(task=extract_bres)
+    return policy.compute_key(task_ctx, inputs, {})
+
+
+@pytest.mark.parametrize("compression", ["zstd", "lz4", "uncompressed"])
+def test_arrow_serializer_round_trips_frames(compression: str) -> None:
+    serializer = ArrowSerializer(compression=compression)  # type: ignore[arg-type]
+    frame = _frame()
+
+    blob = serializer.dumps(frame)
+
+    assert blob[:1] == b"A"
+    pd.testing.assert_frame_equal(serializer.loads(blob), frame)
+
+
+def test_arrow_serializer_pickles_other_results() -> None:
+    result = UpsertResult(inserted=2, max_reference_period=date(2024, 1, 1))
+
+    assert ARROW_SERIALIZER.loads(ARROW_SERIALIZER.dumps(result)) == result
+    with pytest.raises(ValueError, match="Not an ArrowSerializer payload"):
+        ARROW_SERIALIZER.loads(b"xyz")
+
+
+def test_serializer_is_resolvable_by_type() -> None:
+    """Prefect rebuilds a result's serializer from its ``type`` when reading it."""
+    serializer = Serializer(type="arrow", compression="lz4")
+
+    assert isinstance(serializer, ArrowSerializer)
+    assert serializer.compression == "lz4"
+
+
+def test_extract_key_requires_release_id() -> None:
+    assert _key(EXTRACT_CACHE_POLICY, reference_year=2023) is None
+    assert _key(EXTRACT_CACHE_POLICY, reference_year=2023, release_id=None) is None
+
+    key = _key(EXTRACT_CACHE_POLICY, reference_year=2023, release_id="2024-09")
+    assert key is not None
+    assert key == _key(EXTRACT_CACHE_POLICY, reference_year=2023, release_id="2024-09")
+    assert key != _key(EXTRACT_CACHE_POLICY, reference_year=2023, release_id="2025-09")
+
+
+def test_transform_key_follows_frame_content() -> None:
+    key = _key(TRANSFORM_CACHE_POLICY, df=_frame(), source="dwp")
+
+    assert key == _key(TRANSFORM_CACHE_POLICY, df=_frame(), source="dwp")
+    assert key != _key(TRANSFORM_CACHE_POLICY, df=_frame().assign(value=2.0), source="dwp")
+    assert key != _key(TRANSFORM_CACHE_POLICY, df=_frame(), source="nomis")
+
+
+def test_context_is_part_of_the_key() -> None:
+    vintage: str | None = "2021"
+    policy = ContentInputs(context=lambda: vintage)
+
+    key = _key(policy, df=_frame())
+    vintage = "2024"
+    assert _key(policy, df=_frame()) != key
+    vintage = None
+    assert _key(policy, df=_frame()) is None
+
+
+def test_unhashable_inputs_skip_the_cache() -> None:
+    """Inputs that neither JSON nor cloudpickle can serialise run uncached."""
+    assert _key(TRANSFORM_CACHE_POLICY, df=_frame(), lock=threading.Lock()) is None
+    assert _key(TRANSFORM_CACHE_POLICY, df=_frame().assign(value=[[1], [2]])) is None
+
+
+def test_validate_key_follows_yorkshire_lads(
+    test_settings: Settings, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    key = _key(VALIDATE_CACHE_POLICY, df=_frame())
+
+    monkeypatch.setenv("YORKSHIRE_LAD_CODES", '["E08000035"]')
+    get_settings.cache_clear()
+
+    assert _key(VALIDATE_CACHE_POLICY, df=_frame()) != key
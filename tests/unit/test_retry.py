@@ -0,0 +1,182 @@
+"""Unit tests for yhovi_pipeline.utils.retry."""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Iterator
+from datetime import UTC, datetime, timedelta
+from email.utils import format_datetime
+from unittest.mock import Mock
+
+import httpx
+import pytest
+from prefect.states import Completed, Failed
+
+from yhovi_pipeline.config import Settings, get_settings
+from yhovi_pipeline.utils.http import SourceNotModified
+from yhovi_pipeline.utils.retry import (
+    CircuitBreaker,
+    CircuitOpenError,
+    call_with_retry,
+    get_circuit_breaker,
+    is_retriable,
+    reset_circuit_breakers,
+    retry_after_seconds,
+    retry_if_transient,
+    wait_retry_after,
+)
+
+
+def _status_error(status: int, headers: dict[str, str] | None = None) -> httpx.HTTPStatusError:
+    request = httpx.Request("GET", "https://example.test/data")
+    response = httpx.Response(status, headers=headers, request=request)
+    return httpx.HTTPStatusError("error", request=request, response=response)
+
+
+@pytest.fixture()
+def fast_retries(test_settings: Settings, monkeypatch: pytest.MonkeyPatch) -> Iterator[Settings]:
+    """Settings with millisecond back-off and a low breaker threshold."""
+    monkeypatch.setenv("RETRY_INITIAL_WAIT_SECONDS", "0.001")
+    monkeypatch.setenv("RETRY_MAX_ATTEMPTS", "3")
+    monkeypatch.setenv("CIRCUIT_BREAKER_THRESHOLD", "3")
+    get_settings.cache_clear()
+    reset_circuit_breakers()
+
+    yield get_settings()
+
+    reset_circuit_breakers()
+
+
+# ---------------------------------------------------------------------------
+# Classification
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize(
+    ("exc", "expected"),
+    [
+        (_status_error(502), True),
+        (_status_error(429), True),
+        (_status_error(404), False),
+        (_status_error(401), False),
+        (httpx.ConnectError("refused"), True),
+        (httpx.ReadTimeout("slow"), True),
+        (ValueError("bad payload"), False),
+    ],
+)
+def test_is_retriable(exc: Exception, expected: bool) -> None:
+    """Gateway errors and transport failures retry; client errors do not."""
+    assert is_retriable(exc) is expected
+
+
+def test_retry_after_seconds_and_http_date() -> None:
+    """Both Retry-After forms are understood."""
+    later = datetime.now(UTC) + timedelta(seconds=30)
+
+    assert retry_after_seconds(_status_error(429, {"Retry-After": "7"})) == 7.0
+    assert retry_after_seconds(
+        _status_error(503, {"Retry-After": format_datetime(later, usegmt=True)})
+    ) == pytest.approx(30, abs=2)
+    assert retry_after_seconds(_status_error(503)) is None
+    assert retry_after_seconds(ValueError()) is None
+
+
+def test_wait_honours_retry_after_with_cap() -> None:
+    """Retry-After wins over back-off but never exceeds the cap."""
+    wait = wait_retry_after(initial=0.5, maximum=10.0)
+    state = Mock(attempt_number=1)
+
+    state.outcome.exception.return_value = _status_error(429, {"Retry-After": "3"})
+    assert wait(state) == 3.0
+
+    state.outcome.exception.return_value = _status_error(429, {"Retry-After": "3600"})
+    assert wait(state) == 10.0
+
+
+def test_wait_backs_off_with_jitter() -> None:
+    """Without Retry-After the wait is jittered below a doubling ceiling."""
+    wait = wait_retry_after(initial=0.5, maximum=10.0)
+    state = Mock()
+    state.outcome.exception.return_value = _status_error(502)
+
+    for attempt, ceiling in [(1, 0.5), (2, 1.0), (3, 2.0), (10, 10.0)]:
+        state.attempt_number = attempt
+        assert all(0 <= wait(state) <= ceiling for _ in range(50))
+
+
+def test_task_retry_condition() -> None:
+    """Only transient failures are retried at task level."""
+    assert retry_if_transient(None, None, Failed(data=_status_error(503)))  # type: ignore[arg-type]
+    assert not retry_if_transient(None, None, Failed(data=_status_error(404)))  # type: ignore[arg-type]
+    assert not retry_if_transient(
+        None,  # type: ignore[arg-type]
+        None,  # type: ignore[arg-type]
+        Failed(data=SourceNotModified("beis", "https://example.test")),
+    )
+    assert not retry_if_transient(None, None, Failed(data=CircuitOpenError("nomis", 60)))  # type: ignore[arg-type]
+    assert retry_if_transient(None, None, Completed())  # type: ignore[arg-type]
+
+
+# ---------------------------------------------------------------------------
+# Circuit breaker
+# ---------------------------------------------------------------------------
+
+
+def test_breaker_opens_and_half_opens(monkeypatch: pytest.MonkeyPatch) -> None:
+    """The circuit opens at the threshold and allows one trial after the reset."""
+    now = [1000.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    breaker = CircuitBreaker("dwp", threshold=2, reset_seconds=60)
+
+    breaker.record_failure()
+    breaker.before_call()
+    breaker.record_failure()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    now[0] += 61
+    breaker.before_call()  # trial call admitted
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()  # but only one at a time
+
+    breaker.record_success()
+    breaker.before_call()
+    assert not breaker.is_open
+
+
+def test_call_with_retry_recovers(fast_retries: Settings) -> None:
+    """Transient failures are retried until the call succeeds."""
+    outcomes: list[Exception | str] = [_status_error(502), httpx.ConnectError("x"), "ok"]
+
+    def call() -> str:
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    assert call_with_retry("nomis", call) == "ok"
+
+
+def test_open_circuit_fails_remaining_calls_fast(fast_retries: Settings) -> None:
+    """Once a source is down, later calls fail without touching it."""
+    calls = Mock(side_effect=httpx.ConnectError("down"))
+
+    with pytest.raises(httpx.ConnectError):
+        call_with_retry("fingertips", calls)
+    assert calls.call_count == 3
+
+    with pytest.raises(CircuitOpenError):
+        call_with_retry("fingertips", calls)
+    assert calls.call_count == 3
+
+
+def test_throttling_does_not_open_circuit(fast_retries: Settings) -> None:
+    """429s are retried but never count towards the breaker."""
+    calls = Mock(side_effect=_status_error(429))
+
+    for _ in range(3):
+        with pytest.raises(httpx.HTTPStatusError):
+            call_with_retry("ons", calls)
+
+    assert calls.call_count == 9
+    assert not get_circuit_breaker("ons").is_open
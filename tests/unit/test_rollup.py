@@ -0,0 +1,113 @@
+"""Unit tests for yhovi_pipeline.utils.rollup."""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from yhovi_pipeline.tasks.transform.geo import rollup_hierarchy
+from yhovi_pipeline.utils.geo_index import GeoIndex
+from yhovi_pipeline.utils.rollup import HierarchyRollup, Rate
+
+
+@pytest.fixture()
+def rollup(geo_lookup_frame: pd.DataFrame) -> HierarchyRollup:
+    return HierarchyRollup(GeoIndex.from_lookup(geo_lookup_frame))
+
+
+@pytest.fixture()
+def lsoa_data(geo_lookup_frame: pd.DataFrame) -> pd.DataFrame:
+    """Counts, a score and a population per LSOA (shuffled, one gap)."""
+    rng = np.random.default_rng(3)
+    n = len(geo_lookup_frame)
+    df = pd.DataFrame(
+        {
+            "lsoa_code": geo_lookup_frame["lsoa_code"].sample(frac=1.0, random_state=1).to_numpy(),
+            "claimants": rng.integers(0, 200, n).astype(float),
+            "score": rng.uniform(0, 50, n),
+            "population": rng.integers(1_000, 3_000, n).astype(float),
+        }
+    )
+    df.loc[5, "score"] = np.nan
+    return df
+
+
+def _reference(lookup: pd.DataFrame, df: pd.DataFrame, level: str) -> pd.DataFrame:
+    """Merge + groupby reference for one level."""
+    merged = df.merge(lookup, on="lsoa_code").dropna(subset=[f"{level}_code"])
+    weighted = merged["score"] * merged["population"]
+    weights = merged["population"].where(merged["score"].notna(), 0.0)
+    grouped = merged.assign(w_score=weighted, w=weights).groupby(f"{level}_code")
+    out = grouped[["claimants", "population", "w_score", "w"]].sum()
+    out["score"] = out["w_score"] / out["w"]
+    out["rate"] = out["claimants"] / out["population"] * 1000
+    return out.sort_index()
+
+
+def test_sums_match_groupby_at_every_level(
+    rollup: HierarchyRollup, geo_lookup_frame: pd.DataFrame, lsoa_data: pd.DataFrame
+) -> None:
+    """Summed columns agree with a groupby at MSOA, LAD and region level."""
+    result = rollup.rollup_frame(lsoa_data, ["claimants", "population"])
+
+    assert set(result.levels) == {"msoa", "lad", "region"}
+    for level, frame in result.levels.items():
+        expected = _reference(geo_lookup_frame, lsoa_data, level)
+        assert list(frame[f"{level}_code"]) == list(expected.index)
+        np.testing.assert_allclose(frame["claimants"], expected["claimants"])
+
+
+def test_weighted_mean_and_rates(
+    rollup: HierarchyRollup, geo_lookup_frame: pd.DataFrame, lsoa_data: pd.DataFrame
+) -> None:
+    """Weighted means skip gaps; rates come from summed numerator and denominator."""
+    result = rollup.rollup_frame(
+        lsoa_data,
+        ["score"],
+        weight_col="population",
+        rates={"rate": Rate("claimants", "population", per=1000)},
+        to=("lad", "region"),
+    )
+
+    for level in ("lad", "region"):
+        expected = _reference(geo_lookup_frame, lsoa_data, level)
+        frame = result.levels[level]
+        np.testing.assert_allclose(frame["score"], expected["score"])
+        np.testing.assert_allclose(frame["rate"], expected["rate"])
+
+
+def test_region_excludes_lads_without_region(
+    rollup: HierarchyRollup, lsoa_data: pd.DataFrame
+) -> None:
+    """York has no region in the lookup, so it feeds no region total."""
+    result = rollup.rollup_frame(lsoa_data, ["population"], to=("lad", "region"))
+    lads = result.levels["lad"].set_index("lad_code")["population"]
+    regions = result.levels["region"].set_index("region_code")["population"]
+
+    assert regions["E12000003"] == lads["E08000035"] + lads["E08000019"]
+    assert regions.sum() == lads.sum() - lads["E06000014"]
+
+
+def test_unknown_codes_and_msoa_input(rollup: HierarchyRollup) -> None:
+    """MSOA-level input rolls up too; unknown codes are counted and dropped."""
+    df = pd.DataFrame({"msoa_code": ["E02000000", "E02000003", "E02XXXXXX"], "jobs": [1.0, 2, 4]})
+
+    result = rollup.rollup_frame(df, ["jobs"], geo_col="msoa_code", level="msoa", to=("lad",))
+
+    assert result.unmatched == 1
+    assert result.levels["lad"].to_dict("records") == [
+        {"lad_code": "E08000019", "lad_name": "Sheffield", "jobs": 2.0},
+        {"lad_code": "E08000035", "lad_name": "Leeds", "jobs": 1.0},
+    ]
+
+    with pytest.raises(ValueError, match="down to"):
+        rollup.rollup_frame(df, ["jobs"], geo_col="msoa_code", level="msoa", to=("lsoa",))
+
+
+def test_rollup_hierarchy_task(rollup: HierarchyRollup, lsoa_data: pd.DataFrame) -> None:
+    """The task returns one frame per requested level."""
+    levels = rollup_hierarchy.fn(lsoa_data, ["claimants"], to=("region",), rollup=rollup)
+
+    assert list(levels) == ["region"]
+    assert list(levels["region"].columns) == ["region_code", "region_name", "claimants"]
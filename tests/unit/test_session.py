@@ -0,0 +1,92 @@
+"""Unit tests for yhovi_pipeline.db.session."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import pytest
+from sqlalchemy import QueuePool
+
+from yhovi_pipeline.config import Settings, get_settings
+from yhovi_pipeline.db.models import ExtractionStatus
+from yhovi_pipeline.db.session import (
+    dispose_engines,
+    get_engine,
+    get_sessionmaker,
+    warm_up_engine,
+)
+from yhovi_pipeline.tasks.load.sql_server import upsert_indicators, write_metadata
+from yhovi_pipeline.utils.watermarks import get_watermark
+
+
+@pytest.fixture(autouse=True)
+def _fresh_registry() -> Iterator[None]:
+    """Start and finish every test with an empty engine registry."""
+    dispose_engines()
+    yield
+    dispose_engines()
+
+
+def test_engine_is_shared_per_connection_string(sqlite_settings: Settings) -> None:
+    """Concurrent lookups get one engine; its pool is sized from Settings."""
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        engines = list(pool.map(lambda _: get_engine(), range(32)))
+
+    engine = engines[0]
+    assert len({id(e) for e in engines}) == 1
+    assert isinstance(engine.pool, QueuePool)
+    assert engine.pool.size() == sqlite_settings.db_pool_size
+    assert get_sessionmaker().kw["bind"] is engine
+    assert get_engine("sqlite://") is not engine
+
+
+def test_pyodbc_engines_use_fast_executemany(test_settings: Settings) -> None:
+    """Only mssql+pyodbc gets array binding; in-memory SQLite gets no pool sizing."""
+    from yhovi_pipeline.db.session import _engine_options
+
+    mssql = _engine_options(
+        test_settings.sql_server_connection_string.get_secret_value(), test_settings
+    )
+    memory = _engine_options("sqlite://", test_settings)
+
+    assert mssql["fast_executemany"] is True
+    assert mssql["pool_size"] == test_settings.db_pool_size
+    assert mssql["pool_pre_ping"] is True
+    assert memory == {"pool_pre_ping": True}
+
+
+def test_warm_up_fills_the_pool(sqlite_settings: Settings, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Warm-up leaves the configured number of idle connections in the pool."""
+    assert warm_up_engine() == 0
+
+    monkeypatch.setenv("DB_WARM_UP_CONNECTIONS", "3")
+    get_settings.cache_clear()
+
+    assert warm_up_engine() == 3
+    assert get_engine().pool.checkedin() == 3
+
+
+def test_load_tasks_reuse_the_pooled_engine(sqlite_settings: Settings) -> None:
+    """Loads, metadata writes and reads go through one engine that stays open."""
+    engine = get_engine()
+    frame = pd.DataFrame(
+        {
+            "indicator_id": ["x"],
+            "indicator_name": ["X"],
+            "lad_code": ["E08000035"],
+            "lad_name": ["Leeds"],
+            "reference_period": [pd.Timestamp("2024-01-01")],
+            "value": [1.0],
+            "unit": ["count"],
+            "source": ["test"],
+            "dataset_code": ["X"],
+        }
+    )
+    result = upsert_indicators.fn(frame, "X")
+    write_metadata.fn("X", "test", ExtractionStatus.SUCCESS, upsert=result, release_id="r1")
+
+    assert get_watermark("test", "X") is not None
+    assert get_engine() is engine
+    assert engine.pool.checkedin() >= 1
@@ -0,0 +1,128 @@
+"""Unit tests for yhovi_pipeline.utils.streaming and the streaming load task."""
+
+from __future__ import annotations
+
+import io
+from collections.abc import Iterator
+from datetime import date
+
+import pandas as pd
+import pytest
+from sqlalchemy import Engine, func, select
+
+from yhovi_pipeline.config import Settings, get_settings
+from yhovi_pipeline.db.models import Indicator
+from yhovi_pipeline.db.upsert import UpsertResult
+from yhovi_pipeline.tasks.load.sql_server import upsert_indicator_stream
+from yhovi_pipeline.utils.streaming import (
+    ThroughputMeter,
+    map_batches,
+    read_csv_batches,
+    rebatch,
+)
+
+
+def _frames(*sizes: int) -> list[pd.DataFrame]:
+    start = 0
+    frames = []
+    for size in sizes:
+        frames.append(pd.DataFrame({"n": range(start, start + size)}))
+        start += size
+    return frames
+
+
+def _indicators(start: int, stop: int) -> pd.DataFrame:
+    lads = [f"E0{i:07d}" for i in range(start, stop)]
+    return pd.DataFrame(
+        {
+            "indicator_id": "domestic_gas_kwh",
+            "indicator_name": "Domestic gas consumption",
+            "lad_code": lads,
+            "lad_name": lads,
+            "reference_period": date(2023, 1, 1),
+            "value": [float(i) for i in range(start, stop)],
+            "unit": "kWh",
+            "source": "beis",
+            "dataset_code": "SUBNATIONAL_GAS",
+        }
+    )
+
+
+def test_rebatch_bounds_batch_size() -> None:
+    batches = list(rebatch(_frames(3, 0, 10, 1, 1), batch_size=4))
+
+    assert [len(batch) for batch in batches] == [4, 4, 4, 3]
+    assert pd.concat(batches)["n"].tolist() == list(range(15))
+    with pytest.raises(ValueError, match="batch_size must be positive"):
+        list(rebatch([], batch_size=0))
+
+
+def test_map_batches_is_lazy_and_drops_empty_results() -> None:
+    seen: list[int] = []
+
+    def step(batch: pd.DataFrame, keep_over: int) -> pd.DataFrame:
+        seen.append(len(batch))
+        return batch[batch["n"] > keep_over]
+
+    stream = map_batches(iter(_frames(2, 2, 2)), step, keep_over=1)
+    assert seen == []
+    assert [batch["n"].tolist() for batch in stream] == [[2, 3], [4, 5]]
+    assert seen == [2, 2, 2]
+
+
+def test_read_csv_batches() -> None:
+    text = "code,value,other\n" + "".join(f"E{i},{i},x\n" for i in range(5))
+    batches = list(read_csv_batches(io.BytesIO(text.encode()), 2, {"code": "str", "value": "int"}))
+
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+    assert list(batches[0].columns) == ["code", "value"]
+    assert batches[0]["value"].dtype == "Int64"
+
+
+def test_throughput_meter_reports_rows_per_second(caplog: pytest.LogCaptureFixture) -> None:
+    now = 0.0
+    meter = ThroughputMeter("TEST", interval_seconds=5, clock=lambda: now)
+    caplog.set_level("INFO", logger="yhovi_pipeline.utils.streaming")
+
+    now = 2.0
+    meter.update(100)
+    assert not caplog.records
+    now = 6.0
+    meter.update(200)
+    meter.finish()
+
+    assert meter.rows_per_second == 50.0
+    assert [record.getMessage() for record in caplog.records] == [
+        "TEST progress: 300 rows in 2 batches, 6.0s, 50 rows/s",
+        "TEST done: 300 rows in 2 batches, 6.0s, 50 rows/s",
+    ]
+
+
+@pytest.fixture()
+def small_batches(sqlite_settings: Settings, monkeypatch: pytest.MonkeyPatch) -> Iterator[None]:
+    monkeypatch.setenv("STREAM_BATCH_SIZE", "4")
+    get_settings.cache_clear()
+    yield
+    get_settings.cache_clear()
+
+
+@pytest.mark.usefixtures("small_batches")
+def test_upsert_indicator_stream_commits_per_batch(sqlite_engine: Engine) -> None:
+    def count() -> int:
+        with sqlite_engine.connect() as connection:
+            return int(connection.scalar(select(func.count()).select_from(Indicator)) or 0)
+
+    def failing() -> Iterator[pd.DataFrame]:
+        yield _indicators(0, 5)
+        yield _indicators(5, 6)
+        raise RuntimeError("connection reset")
+
+    with pytest.raises(RuntimeError, match="connection reset"):
+        upsert_indicator_stream.fn(failing(), "SUBNATIONAL_GAS")
+    assert count() == 4
+
+    batches = (_indicators(start, start + 3) for start in range(0, 9, 3))
+    result = upsert_indicator_stream.fn(batches, "SUBNATIONAL_GAS")
+    assert result == UpsertResult(inserted=5, updated=4)
+    assert result.max_reference_period == date(2023, 1, 1)
+    assert count() == 9
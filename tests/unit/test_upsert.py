@@ -0,0 +1,169 @@
+"""Unit tests for yhovi_pipeline.db.upsert and the upsert_indicators task."""
+
+from __future__ import annotations
+
+from datetime import date
+
+import pandas as pd
+import pytest
+from sqlalchemy import Engine, func, select
+
+from yhovi_pipeline.config import Settings
+from yhovi_pipeline.db.models import Indicator
+from yhovi_pipeline.db.upsert import (
+    UpsertResult,
+    bulk_upsert_indicators,
+    content_hash,
+    prepare_indicator_frame,
+)
+from yhovi_pipeline.tasks.load.sql_server import upsert_indicators
+
+
+def _indicator_frame(values: list[float | None], period: date = date(2024, 4, 1)) -> pd.DataFrame:
+    """Build a normalised Indicator DataFrame with one row per LAD."""
+    lads = [f"E0800003{i}" for i in range(len(values))]
+    return pd.DataFrame(
+        {
+            "indicator_id": "claimant_rate",
+            "indicator_name": "Claimant rate",
+            "lad_code": lads,
+            "lad_name": [f"LAD {code}" for code in lads],
+            "reference_period": period,
+            "value": values,
+            "unit": "rate",
+            "source": "dwp",
+            "dataset_code": "UC_MONTHLY",
+        }
+    )
+
+
+def _rows(engine: Engine) -> dict[str, float | None]:
+    with engine.connect() as connection:
+        return dict(connection.execute(select(Indicator.lad_code, Indicator.value)).all())
+
+
+def test_bulk_upsert_inserts_new_rows(sqlite_engine: Engine) -> None:
+    """All rows should be inserted into an empty table."""
+    with sqlite_engine.begin() as connection:
+        result = bulk_upsert_indicators(connection, _indicator_frame([1.0, 2.0, None]))
+
+    assert result == UpsertResult(inserted=3)
+    assert _rows(sqlite_engine) == {"E08000030": 1.0, "E08000031": 2.0, "E08000032": None}
+
+
+def test_bulk_upsert_updates_existing_rows(sqlite_engine: Engine) -> None:
+    """Re-loading the same keys should update values, not duplicate rows."""
+    with sqlite_engine.begin() as connection:
+        bulk_upsert_indicators(connection, _indicator_frame([1.0, 2.0]))
+    with sqlite_engine.begin() as connection:
+        result = bulk_upsert_indicators(connection, _indicator_frame([5.0, 2.0, 3.0]), chunk_size=2)
+
+    assert result == UpsertResult(inserted=1, updated=2)
+    assert _rows(sqlite_engine) == {"E08000030": 5.0, "E08000031": 2.0, "E08000032": 3.0}
+    with sqlite_engine.connect() as connection:
+        assert connection.scalar(select(func.count()).select_from(Indicator)) == 3
+
+
+def test_bulk_upsert_collapses_duplicate_keys(sqlite_engine: Engine) -> None:
+    """Duplicate upsert keys in one batch keep the last row."""
+    df = pd.concat([_indicator_frame([1.0]), _indicator_frame([9.0])])
+    with sqlite_engine.begin() as connection:
+        assert bulk_upsert_indicators(connection, df).rows_loaded == 1
+
+    assert _rows(sqlite_engine) == {"E08000030": 9.0}
+
+
+def test_bulk_upsert_rolls_back_with_transaction(sqlite_engine: Engine) -> None:
+    """Nothing should be written when the caller's transaction fails."""
+    with pytest.raises(RuntimeError), sqlite_engine.begin() as connection:
+        bulk_upsert_indicators(connection, _indicator_frame([1.0]))
+        raise RuntimeError("load failed")
+
+    assert _rows(sqlite_engine) == {}
+
+
+def test_bulk_upsert_empty_frame_is_noop(sqlite_engine: Engine) -> None:
+    """An empty DataFrame should merge zero rows."""
+    with sqlite_engine.begin() as connection:
+        assert bulk_upsert_indicators(connection, _indicator_frame([])) == UpsertResult()
+
+
+def test_bulk_upsert_rejects_invalid_chunk_size(sqlite_engine: Engine) -> None:
+    """chunk_size must be a positive integer."""
+    with sqlite_engine.begin() as connection, pytest.raises(ValueError, match="chunk_size"):
+        bulk_upsert_indicators(connection, _indicator_frame([1.0]), chunk_size=0)
+
+
+def test_bulk_upsert_delta_skips_unchanged_rows(sqlite_engine: Engine) -> None:
+    """Delta mode should only write new keys and rows whose content changed."""
+    with sqlite_engine.begin() as connection:
+        bulk_upsert_indicators(connection, _indicator_frame([1.0, 2.0, None]))
+    with sqlite_engine.begin() as connection:
+        result = bulk_upsert_indicators(
+            connection, _indicator_frame([1.0, 7.0, None, 4.0]), delta=True
+        )
+
+    assert result == UpsertResult(inserted=1, updated=1, unchanged=2)
+    assert result.rows_loaded == 2
+    assert _rows(sqlite_engine) == {
+        "E08000030": 1.0,
+        "E08000031": 7.0,
+        "E08000032": None,
+        "E08000033": 4.0,
+    }
+
+
+def test_bulk_upsert_delta_leaves_updated_at_untouched(sqlite_engine: Engine) -> None:
+    """Re-delivering identical history should not touch ``updated_at``."""
+    with sqlite_engine.begin() as connection:
+        bulk_upsert_indicators(connection, _indicator_frame([1.0, 2.0]))
+    with sqlite_engine.connect() as connection:
+        before = connection.execute(select(Indicator.updated_at)).scalars().all()
+
+    with sqlite_engine.begin() as connection:
+        result = bulk_upsert_indicators(connection, _indicator_frame([1.0, 2.0]), delta=True)
+
+    assert result == UpsertResult(unchanged=2)
+    with sqlite_engine.connect() as connection:
+        assert connection.execute(select(Indicator.updated_at)).scalars().all() == before
+
+
+def test_content_hash_detects_changes() -> None:
+    """Hashes should differ when any value-bearing column changes."""
+    base = _indicator_frame([1.0])
+    baseline = content_hash(base).iloc[0]
+
+    assert content_hash(base.copy()).iloc[0] == baseline
+    assert content_hash(base.assign(value=1.5)).iloc[0] != baseline
+    assert content_hash(base.assign(unit=None)).iloc[0] != baseline
+    assert content_hash(base.assign(lad_name="Leeds")).iloc[0] != baseline
+    # Columns outside the hash (e.g. dataset_code) do not count as changes.
+    assert content_hash(base.assign(dataset_code="OTHER")).iloc[0] == baseline
+
+
+def test_prepare_indicator_frame_missing_columns() -> None:
+    """A frame without the Indicator columns should be rejected."""
+    with pytest.raises(ValueError, match="missing Indicator columns"):
+        prepare_indicator_frame(pd.DataFrame({"lad_code": ["E08000035"]}))
+
+
+def test_prepare_indicator_frame_coerces_types() -> None:
+    """Periods become dates and missing values become None."""
+    df = _indicator_frame([float("nan")]).assign(
+        reference_period=pd.Timestamp("2024-04-01"), unit=None
+    )
+    row = prepare_indicator_frame(df).iloc[0]
+
+    assert row["reference_period"] == date(2024, 4, 1)
+    assert row["value"] is None
+    assert row["unit"] is None
+
+
+def test_upsert_indicators_task(sqlite_engine: Engine, sqlite_settings: Settings) -> None:
+    """The task should upsert through the configured connection string."""
+    result = upsert_indicators.fn(_indicator_frame([1.0, 2.0]), "UC_MONTHLY")
+    assert result == UpsertResult(inserted=2)
+    assert len(_rows(sqlite_engine)) == 2
+
+    result = upsert_indicators.fn(_indicator_frame([1.0, 3.0]), "UC_MONTHLY", delta=True)
+    assert result == UpsertResult(updated=1, unchanged=1)
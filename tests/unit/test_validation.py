@@ -0,0 +1,130 @@
+"""Unit tests for yhovi_pipeline.utils.validation and the validate tasks."""
+
+from __future__ import annotations
+
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from yhovi_pipeline.config import YORKSHIRE_LAD_CODES
+from yhovi_pipeline.db.batch import IndicatorBatch
+from yhovi_pipeline.tasks.transform.validate import (
+    validate_dataset,
+    validate_schema,
+    validate_yorkshire_lads,
+)
+from yhovi_pipeline.utils.validation import (
+    MaxNullRate,
+    PeriodBounds,
+    RequiredColumns,
+    Rule,
+    RuleSet,
+    UniqueKey,
+    ValueRange,
+    YorkshireLads,
+)
+
+
+def _frame() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "indicator_id": ["rate"] * 4,
+            "lad_code": ["E08000035", "E08000035", "E06000014", "S12000036"],
+            "reference_period": [date(2024, 4, 1)] * 3 + [date(1990, 1, 1)],
+            "value": [1.0, 250.0, None, 3.0],
+        }
+    )
+
+
+RULES = RuleSet(
+    "TEST",
+    [
+        RequiredColumns(("lad_code", "value")),
+        YorkshireLads(),
+        ValueRange("value", 0, 100, severity="warning"),
+        MaxNullRate("value", 0.1, numeric=True, severity="warning"),
+        UniqueKey(),
+        PeriodBounds(earliest=date(2000, 1, 1)),
+        ValueRange("not_there", 0, 1),
+    ],
+)
+
+
+@pytest.mark.usefixtures("test_settings")
+def test_rule_set_reports_every_rule() -> None:
+    """Each rule reports its own failure count in one run."""
+    report = RULES.validate(_frame())
+    failures = {r.rule: r.failures for r in report.results}
+
+    assert report.rows == 4
+    assert failures == {
+        "required-columns": 0,
+        "yorkshire-lads:lad_code": 1,
+        "range:value": 1,
+        "null-rate:value": 1,
+        "unique-key:indicator_id,lad_code,reference_period": 1,
+        "period-bounds:reference_period": 1,
+        "range:not_there": 0,
+    }
+    assert [r.rule for r in report.results if r.skipped] == ["range:not_there"]
+    assert {r.rule for r in report.warnings} == {"range:value", "null-rate:value"}
+    assert all(r.seconds >= 0 for r in report.results)
+    assert [row["status"] for row in report.as_rows()][-2:] == ["failed", "skipped"]
+    with pytest.raises(ValueError, match="TEST failed validation: yorkshire-lads"):
+        report.raise_for_errors()
+
+
+@pytest.mark.usefixtures("test_settings")
+def test_rule_set_accepts_indicator_batches() -> None:
+    """Batches validate through their categorical columns."""
+    frame = (
+        _frame()
+        .iloc[:1]
+        .assign(indicator_name="Rate", lad_name="Leeds", unit=None, source="x", dataset_code="T")
+    )
+    report = RULES.validate(IndicatorBatch.from_frame(frame))
+
+    assert not report.errors and not report.warnings
+
+
+def test_required_columns_rejects_empty_frames_on_request() -> None:
+    """Empty frames pass RequiredColumns unless non_empty is set."""
+    empty = _frame().iloc[:0]
+
+    assert not RuleSet("T", [RequiredColumns(("lad_code",))]).validate(empty).errors
+    report = RuleSet("T", [RequiredColumns(("lad_code",), non_empty=True)]).validate(empty)
+    assert report.errors[0].detail == "no rows"
+
+
+def test_unique_key_ignores_null_keys() -> None:
+    """Rows with a null key part are not duplicates of one another."""
+    frame = _frame().assign(lad_code=[None, None, "E08000035", "E08000035"])
+    frame["reference_period"] = date(2024, 4, 1)
+
+    [result] = RuleSet("T", [UniqueKey()]).validate(frame).results
+
+    assert result.failures == 1
+
+
+def test_rule_requires_compile() -> None:
+    with pytest.raises(TypeError, match="abstract"):
+        Rule()  # type: ignore[abstract]
+
+
+@pytest.mark.usefixtures("test_settings")
+def test_validate_tasks() -> None:
+    """The tasks pass frames through, raising only on error rules."""
+    df = _frame()
+
+    assert validate_dataset.fn(df.iloc[:1], RULES) is not None
+    with pytest.raises(ValueError, match="failed validation"):
+        validate_dataset.fn(df, RULES)
+    with pytest.raises(ValueError, match="missing columns"):
+        validate_schema.fn(df, ["lad_code", "obs_value"], source="nomis")
+    with pytest.raises(ValueError, match="no rows"):
+        validate_schema.fn(df.iloc[:0], ["lad_code"], source="nomis")
+
+    complete = pd.DataFrame({"lad_code": YORKSHIRE_LAD_CODES})
+    assert validate_yorkshire_lads.fn(df).equals(df)
+    assert validate_yorkshire_lads.fn(complete).equals(complete)
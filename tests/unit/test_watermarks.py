@@ -0,0 +1,108 @@
+"""Unit tests for yhovi_pipeline.utils.watermarks."""
+
+from __future__ import annotations
+
+from datetime import date
+
+import pandas as pd
+
+from yhovi_pipeline.config import Settings
+from yhovi_pipeline.db.models import ExtractionStatus
+from yhovi_pipeline.tasks.load.sql_server import upsert_indicators, write_metadata
+from yhovi_pipeline.utils.watermarks import (
+    Watermark,
+    get_watermark,
+    pending_months,
+    pending_years,
+)
+
+
+def _record(status: ExtractionStatus, period: date | None, release: str | None) -> None:
+    write_metadata.fn(
+        dataset_code="UC_MONTHLY",
+        source="dwp",
+        status=status,
+        rows_loaded=22,
+        release_id=release,
+        max_reference_period=period,
+    )
+
+
+def test_get_watermark_none_before_first_success(sqlite_settings: Settings) -> None:
+    """A dataset that never loaded successfully has no watermark."""
+    _record(ExtractionStatus.FAILED, date(2024, 4, 1), "2024-05-14")
+
+    assert get_watermark("dwp", "UC_MONTHLY") is None
+
+
+def test_get_watermark_uses_successful_runs(sqlite_settings: Settings) -> None:
+    """Only successful runs count, and a backfill never winds the period back."""
+    _record(ExtractionStatus.SUCCESS, date(2024, 3, 1), "2024-04-16")
+    _record(ExtractionStatus.SUCCESS, date(2024, 4, 1), "2024-05-14")
+    _record(ExtractionStatus.SUCCESS, date(2019, 1, 1), "backfill")
+    _record(ExtractionStatus.FAILED, date(2024, 5, 1), "2024-06-11")
+
+    watermark = get_watermark("dwp", "UC_MONTHLY")
+
+    assert watermark == Watermark(
+        source="dwp",
+        dataset_code="UC_MONTHLY",
+        max_reference_period=date(2024, 4, 1),
+        release_id="backfill",
+    )
+    assert get_watermark("dwp", "OTHER") is None
+
+
+def test_load_advances_watermark(sqlite_settings: Settings) -> None:
+    """The latest period of the loaded frame reaches the watermark via the upsert result."""
+    df = pd.DataFrame(
+        {
+            "indicator_id": "claimant_rate",
+            "indicator_name": "Claimant rate",
+            "lad_code": ["E08000035", "E08000035"],
+            "lad_name": "Leeds",
+            "reference_period": [date(2024, 3, 1), date(2024, 4, 1)],
+            "value": [3.1, 3.2],
+            "unit": "rate",
+            "source": "dwp",
+            "dataset_code": "UC_MONTHLY",
+        }
+    )
+    result = upsert_indicators.fn(df, "UC_MONTHLY")
+    write_metadata.fn("UC_MONTHLY", "dwp", ExtractionStatus.SUCCESS, upsert=result)
+
+    watermark = get_watermark("dwp", "UC_MONTHLY")
+
+    assert watermark is not None
+    assert watermark.max_reference_period == date(2024, 4, 1)
+
+
+def test_pending_months_after_watermark() -> None:
+    """Only months after the watermark are requested."""
+    watermark = Watermark("dwp", "UC_MONTHLY", date(2024, 11, 1), None)
+
+    assert pending_months(watermark, date(2013, 8, 1), date(2025, 2, 1)) == [
+        "2024-12",
+        "2025-01",
+        "2025-02",
+    ]
+    assert pending_months(watermark, date(2013, 8, 1), date(2024, 11, 1)) == []
+
+
+def test_pending_months_full_backfill() -> None:
+    """Without a watermark the whole series is requested."""
+    assert pending_months(None, date(2024, 1, 15), date(2024, 3, 1)) == [
+        "2024-01",
+        "2024-02",
+        "2024-03",
+    ]
+
+
+def test_pending_years() -> None:
+    """Annual series resume from the year after the watermark."""
+    watermark = Watermark("nomis", "BRES", date(2022, 1, 1), None)
+
+    assert pending_years(watermark, 2015, 2024) == [2023, 2024]
+    assert pending_years(None, 2022, 2024) == [2022, 2023, 2024]
+    assert watermark.is_newer(date(2023, 1, 1))
+    assert not watermark.is_newer(date(2022, 1, 1))
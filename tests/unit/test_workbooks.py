@@ -0,0 +1,96 @@
+"""Unit tests for yhovi_pipeline.utils.workbooks."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+from openpyxl import Workbook
+
+from yhovi_pipeline.config import Settings, get_settings
+from yhovi_pipeline.utils import workbooks
+from yhovi_pipeline.utils.workbooks import parse_workbook_range, read_workbook_range
+
+
+@pytest.fixture()
+def workbook_path(tmp_path: Path) -> Path:
+    """A two-sheet workbook whose data table sits below a title block."""
+    workbook = Workbook()
+    notes = workbook.active
+    notes.title = "Notes"
+    notes.append(["Not the table"])
+    table = workbook.create_sheet("Table 3")
+    table.append(["Balanced GVA, current prices"])
+    table.append([])
+    table.append(["LAD code", "LAD  name", "2021", "2022", "Published", "Notes"])
+    table.append(["E08000035", "Leeds", 25000, 26100.5, datetime(2024, 4, 1), "x"])
+    table.append(["E06000014", "York", 6200, "[c]", datetime(2024, 4, 1), None])
+    table.append([])
+    table.append(["Source: ONS"])
+    path = tmp_path / "regionalgva.xlsx"
+    workbook.save(path)
+    return path
+
+
+@pytest.fixture()
+def cache_dir(
+    test_settings: Settings, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> Iterator[Path]:
+    monkeypatch.setenv("WORKBOOK_CACHE_DIR", str(tmp_path / "workbook_cache"))
+    get_settings.cache_clear()
+    yield tmp_path / "workbook_cache"
+    get_settings.cache_clear()
+
+
+def test_parse_range_targets_sheet_and_infers_types(workbook_path: Path) -> None:
+    df = parse_workbook_range(workbook_path, "Table 3", "A3:E5")
+
+    assert list(df.columns) == ["LAD code", "LAD name", "2021", "2022", "Published"]
+    assert df["LAD code"].tolist() == ["E08000035", "E06000014"]
+    assert str(df["2021"].dtype) == "Int64"
+    # A suppression marker makes the column textual rather than failing.
+    assert df["2022"].tolist() == ["26100.5", "[c]"]
+    assert df["Published"].dt.year.tolist() == [2024, 2024]
+
+
+def test_open_ended_range_without_header(workbook_path: Path) -> None:
+    df = parse_workbook_range(workbook_path, "Table 3", "A4:B", header=False)
+
+    assert list(df.columns) == ["column_0", "column_1"]
+    assert df["column_0"].tolist() == ["E08000035", "E06000014", "Source: ONS"]
+
+
+def test_parsed_range_is_cached_by_checksum(
+    workbook_path: Path, cache_dir: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    first = read_workbook_range(workbook_path, "Table 3", "A3:F5")
+    assert len(list(cache_dir.glob("*.parquet"))) == 1
+
+    def fail(*args: object) -> None:
+        raise AssertionError("workbook parsed again")
+
+    monkeypatch.setattr(workbooks, "parse_workbook_range", fail)
+    cached = read_workbook_range(workbook_path, "Table 3", "A3:F5")
+    assert cached.equals(first)
+
+    with pytest.raises(AssertionError, match="parsed again"):
+        read_workbook_range(workbook_path, "Table 3", "A3:E5")
+
+
+def test_where_keeps_wanted_rows(workbook_path: Path, cache_dir: Path) -> None:
+    """Rows are filtered while streaming, and filtered parses are cached separately."""
+    df = read_workbook_range(workbook_path, "Table 3", "A3:F", where=("LAD code", {"E06000014"}))
+    whole = read_workbook_range(workbook_path, "Table 3", "A3:F")
+
+    assert df["LAD name"].tolist() == ["York"]
+    assert len(whole) == 3
+    assert len(list(cache_dir.glob("*.parquet"))) == 2
+    with pytest.raises(KeyError, match="no column"):
+        parse_workbook_range(workbook_path, "Table 3", "A3:F", where=("GSS", {"E06000014"}))
+
+
+def test_missing_sheet(workbook_path: Path) -> None:
+    with pytest.raises(KeyError):
+        parse_workbook_range(workbook_path, "Table 9")